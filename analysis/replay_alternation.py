@@ -0,0 +1,269 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+
+# Make search_trace importable when this script is run from another
+# directory or imported as a module.
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from search_trace import GOAL, PROGRESS, read_trace
+
+# Offline screening of alternation policies (the "decision" and "probs"
+# options of alt(...)) from a recorded search trace (see
+# search_trace.py).
+#
+# The trace does not contain the open lists, so we cannot re-run the
+# search. Instead, we use the following model. The recorded search is
+# split into plateaus that end with an expansion that makes progress
+# (a new best heuristic value) or reaches the goal. For every plateau
+# and sublist, we estimate the probability that an expansion from this
+# sublist ends the plateau. A policy then chooses a sublist for every
+# expansion, and the number of expansions of a plateau is the number of
+# choices until the first success. Summing over all plateaus gives the
+# expansions to the goal. This ignores that the open lists change with
+# the policy, so the results are only useful for ranking policies
+# before running them for real.
+
+arg_parser = argparse.ArgumentParser(
+    description="Estimate expansions to the goal of alternation policies"
+)
+arg_parser.add_argument("trace", help="Search trace of a solved task")
+arg_parser.add_argument(
+    "--policy",
+    action="append",
+    default=[],
+    help="policy to evaluate (can be repeated): "
+    "'alternate', 'random', 'fixed:P1,P2,...' or "
+    "'progress:BASE,RATE,MAX' (see progress_policy)",
+)
+arg_parser.add_argument(
+    "--fixed-grid",
+    type=int,
+    default=0,
+    help="also evaluate fixed probabilities for two sublists in steps of 1/N",
+)
+arg_parser.add_argument("--seeds", type=int, default=1000, help="runs per policy")
+arg_parser.add_argument("--seed", type=int, default=42, help="random seed")
+arg_parser.add_argument(
+    "--prior",
+    type=float,
+    default=1.0,
+    help="weight (in expansions) of the per-sublist average success rate "
+    "when estimating the success rates of a plateau",
+)
+
+# Number of expansions simulated at once for policies whose
+# probabilities change during a plateau.
+BLOCK_SIZE = 256
+# Plateaus that take longer are cut off at this number of expansions.
+MAX_PLATEAU_EXPANSIONS = 10**7
+
+
+class PlateauModel:
+    """Success probabilities of the sublists for the plateaus of a trace.
+
+    success_rates[i, k] is the estimated probability that an expansion
+    from sublist k ends plateau i."""
+
+    def __init__(self, success_rates, recorded_expansions):
+        self.success_rates = success_rates
+        self.recorded_expansions = recorded_expansions
+
+    @property
+    def num_plateaus(self):
+        return self.success_rates.shape[0]
+
+    @property
+    def num_sublists(self):
+        return self.success_rates.shape[1]
+
+
+def build_plateau_model(trace, prior=1.0):
+    """Estimate the PlateauModel of a trace that ends with the goal.
+
+    Records of traces with trace_interval > 1 stand for all expansions
+    since the previous record. The success rate of a plateau is
+    smoothed towards the success rate of the sublist over all plateaus
+    with the given weight, so that sublists that were rarely (or never)
+    chosen within a plateau get a sensible estimate."""
+    if not len(trace) or not trace["flags"][-1] & GOAL:
+        raise ValueError("the trace does not end with a goal expansion")
+    trace = trace[trace["sublist"] >= 0]
+    if not len(trace):
+        raise ValueError("the trace contains no expansions from sublists")
+    weights = np.diff(trace["expansion"], prepend=trace["expansion"][0] - 1)
+    ends = (trace["flags"] & (PROGRESS | GOAL)) != 0
+    # Plateau index of every record: the record that ends a plateau
+    # belongs to it.
+    plateaus = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    num_plateaus = int(plateaus[-1]) + 1
+    num_sublists = int(trace["sublist"].max()) + 1
+
+    expansions = np.zeros((num_plateaus, num_sublists))
+    successes = np.zeros((num_plateaus, num_sublists))
+    np.add.at(expansions, (plateaus, trace["sublist"]), weights)
+    np.add.at(successes, (plateaus[ends], trace["sublist"][ends]), 1)
+
+    total_expansions = expansions.sum(axis=0)
+    overall_rate = successes.sum() / total_expansions.sum()
+    sublist_rates = np.divide(
+        successes.sum(axis=0),
+        total_expansions,
+        out=np.full(num_sublists, overall_rate),
+        where=total_expansions > 0,
+    )
+    success_rates = (successes + prior * sublist_rates) / (expansions + prior)
+    success_rates = np.clip(success_rates, 1e-9, 1.0)
+    return PlateauModel(success_rates, int(expansions.sum()))
+
+
+def fixed_policy(probs):
+    """Choose sublist k with probability probs[k] (decision=2)."""
+    probs = np.asarray(probs, dtype=float)
+    probs = probs / probs.sum()
+    return lambda steps, num_sublists: np.broadcast_to(
+        probs, steps.shape + (num_sublists,)
+    )
+
+
+def random_policy(steps, num_sublists):
+    """Choose a sublist uniformly at random (decision=1)."""
+    return np.full(steps.shape + (num_sublists,), 1.0 / num_sublists)
+
+
+def progress_policy(base, rate, max_prob):
+    """Choose the last sublist (the exploration list, e.g. type_based)
+    with a probability that grows linearly with the number of expansions
+    since the last progress, from base to at most max_prob; the other
+    sublists share the remaining probability. With a single sublist,
+    it is always chosen."""
+    if not 0 <= base <= max_prob <= 1:
+        raise ValueError("invalid progress policy: 0 <= base <= max <= 1")
+
+    def policy(steps, num_sublists):
+        if num_sublists == 1:
+            return np.ones(steps.shape + (1,))
+        explore = np.minimum(base + rate * steps, max_prob)
+        probs = np.empty(steps.shape + (num_sublists,))
+        probs[..., :-1] = ((1 - explore) / (num_sublists - 1))[..., None]
+        probs[..., -1] = explore
+        return probs
+
+    return policy
+
+
+ALTERNATE = "alternate"
+
+
+def simulate_policy(model, policy, num_seeds, rng):
+    """Return an array with the simulated expansions to the goal for
+    num_seeds runs of the policy.
+
+    A policy is either ALTERNATE (round-robin over the sublists as for
+    decision=0, ignoring boosts) or a function that maps an array of
+    numbers of expansions since the last progress to an array of
+    probability vectors over the sublists."""
+    total = np.zeros(num_seeds, dtype=np.int64)
+    for rates in model.success_rates:
+        if policy is ALTERNATE:
+            total += _simulate_alternation(rates, num_seeds, rng)
+        else:
+            total += _simulate_plateau(rates, policy, num_seeds, rng)
+    return total
+
+
+def _simulate_alternation(rates, num_seeds, rng):
+    # A round of the alternation expands once from every sublist, so
+    # the plateau ends in the first round with a success.
+    num_sublists = len(rates)
+    round_failure = np.prod(1 - rates)
+    rounds = rng.geometric(1 - round_failure, size=num_seeds) - 1
+    # Position of the first success within the last round.
+    first_success = np.cumprod(np.concatenate(([1], 1 - rates[:-1]))) * rates
+    positions = rng.choice(
+        num_sublists, size=num_seeds, p=first_success / first_success.sum()
+    )
+    return rounds * num_sublists + positions + 1
+
+
+def _simulate_plateau(rates, policy, num_seeds, rng):
+    num_sublists = len(rates)
+    probs = policy(np.zeros(1), num_sublists)
+    if _is_constant(policy, num_sublists):
+        # The number of expansions is geometrically distributed.
+        expansions = rng.geometric(probs[0] @ rates, size=num_seeds)
+        return np.minimum(expansions, MAX_PLATEAU_EXPANSIONS)
+    result = np.zeros(num_seeds, dtype=np.int64)
+    active = np.arange(num_seeds)
+    offset = 0
+    while len(active) and offset < MAX_PLATEAU_EXPANSIONS:
+        steps = offset + np.arange(BLOCK_SIZE)
+        probs = policy(steps, num_sublists)
+        success_probs = probs @ rates
+        successes = rng.random((len(active), BLOCK_SIZE)) < success_probs
+        done = successes.any(axis=1)
+        result[active[done]] = offset + successes[done].argmax(axis=1) + 1
+        active = active[~done]
+        offset += BLOCK_SIZE
+    result[active] = offset
+    return result
+
+
+def _is_constant(policy, num_sublists):
+    probs = policy(np.array([0.0, 1e6]), num_sublists)
+    return np.allclose(probs[0], probs[1])
+
+
+def parse_policy(spec):
+    name, _, args = spec.partition(":")
+    values = [float(value) for value in args.split(",")] if args else []
+    if name == "alternate":
+        return ALTERNATE
+    elif name == "random":
+        return random_policy
+    elif name == "fixed":
+        return fixed_policy(values)
+    elif name == "progress" and len(values) == 3:
+        return progress_policy(*values)
+    raise ValueError("invalid policy: %s" % spec)
+
+
+def summarize(expansions):
+    quantiles = np.quantile(expansions, [0.1, 0.5, 0.9])
+    return "mean %10.1f  q10 %8d  median %8d  q90 %8d" % (
+        expansions.mean(),
+        *quantiles,
+    )
+
+
+def main():
+    args = arg_parser.parse_args()
+    model = build_plateau_model(read_trace(args.trace), args.prior)
+    print(
+        "%d plateaus, %d sublists, %d recorded expansions"
+        % (model.num_plateaus, model.num_sublists, model.recorded_expansions)
+    )
+    specs = args.policy or ["alternate", "random"]
+    if args.fixed_grid:
+        if model.num_sublists != 2:
+            arg_parser.error("--fixed-grid needs a trace with two sublists")
+        specs += [
+            "fixed:%g,%g" % (i / args.fixed_grid, 1 - i / args.fixed_grid)
+            for i in range(1, args.fixed_grid)
+        ]
+    rng = np.random.default_rng(args.seed)
+    for spec in specs:
+        expansions = simulate_policy(model, parse_policy(spec), args.seeds, rng)
+        print("%-30s %s" % (spec, summarize(expansions)))
+
+
+if __name__ == "__main__":
+    main()
+
+# Example (screening fixed probabilities in steps of 0.05):
+
+"""
+python analysis/replay_alternation.py trace.bin --seeds 1000 --fixed-grid 20 \
+    --policy alternate --policy random --policy progress:0.1,0.001,0.9
+"""
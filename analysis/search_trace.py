@@ -0,0 +1,104 @@
+import argparse
+import os
+
+import numpy as np
+
+# Reader for the binary search traces written by eager and lazy search
+# with trace_file=... (see src/search/search_trace.h). The trace is
+# memory-mapped, so even traces of very long searches can be loaded
+# without reading them into memory.
+
+arg_parser = argparse.ArgumentParser(description="Summarize a search trace")
+arg_parser.add_argument("trace", help="Search trace file")
+
+MAGIC = b"FDTRACE\0"
+VERSION = 1
+HEADER_SIZE = 16
+
+# Must match SearchTraceRecord in src/search/search_trace.h. The planner
+# writes the records in native byte order, i.e., little-endian on all
+# platforms we run experiments on.
+RECORD_DTYPE = np.dtype(
+    [
+        ("expansion", "<i4"),
+        ("state_id", "<i4"),
+        ("g", "<i4"),
+        ("h", "<i4"),
+        ("sublist", "<i4"),
+        ("num_successors", "<i4"),
+        ("num_inserted", "<i4"),
+        ("flags", "<i4"),
+    ]
+)
+
+# Values of the "flags" field.
+PROGRESS = 1
+GOAL = 2
+
+# Value of the "h" field for dead ends.
+INFINITY = np.iinfo(np.int32).max
+
+
+def read_trace(path):
+    """Return the records of the trace as a read-only NumPy record array
+    backed by the file. Columns can be accessed as trace["h"] etc.
+
+    A partially written record at the end of the file (if the planner was
+    killed) is ignored."""
+    with open(path, "rb") as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+        raise ValueError("%s is not a search trace" % path)
+    version, record_size = np.frombuffer(header, dtype="<i4", offset=8)
+    if version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(
+            "unsupported search trace version %d (record size %d)"
+            % (version, record_size)
+        )
+    num_records = (os.path.getsize(path) - HEADER_SIZE) // record_size
+    if num_records == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)
+    return np.memmap(
+        path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(num_records,)
+    )
+
+
+def summarize_trace(trace):
+    """Return a dictionary with summary statistics of the trace."""
+    summary = {
+        "records": len(trace),
+        "expansions": int(trace["expansion"][-1]) + 1 if len(trace) else 0,
+        "progress": int(np.count_nonzero(trace["flags"] & PROGRESS)),
+        "solved": bool(len(trace) and trace["flags"][-1] & GOAL),
+    }
+    if len(trace):
+        summary["mean_successors"] = float(trace["num_successors"].mean())
+        summary["mean_inserted"] = float(trace["num_inserted"].mean())
+        h = trace["h"]
+        h = h[(h >= 0) & (h != INFINITY)]
+        if len(h):
+            summary["min_h"] = int(h.min())
+            summary["max_h"] = int(h.max())
+        sublists, counts = np.unique(trace["sublist"], return_counts=True)
+        summary["sublists"] = dict(zip(sublists.tolist(), counts.tolist()))
+    return summary
+
+
+def main():
+    args = arg_parser.parse_args()
+    trace = read_trace(args.trace)
+    for key, value in summarize_trace(trace).items():
+        print("%s: %s" % (key, value))
+
+
+if __name__ == "__main__":
+    main()
+
+# Example:
+
+"""
+./fast-downward.py domain.pddl problem.pddl --evaluator "hff=ff()" \
+    --search "eager(alt([single(hff), type_based([hff, g()])], decision=1), \
+                    trace_file=\"trace.bin\", trace_eval=hff)"
+python analysis/search_trace.py trace.bin
+"""
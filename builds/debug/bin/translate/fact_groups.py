@@ -0,0 +1,231 @@
+from array import array
+
+import invariant_finder
+import options
+import pddl
+import timers
+from typing import Dict, List, Set, Tuple
+
+
+DEBUG = False
+
+
+def expand_group(group, task, reachable_facts):
+    result = []
+    for fact in group:
+        try:
+            pos = list(fact.args).index("?X")
+        except ValueError:
+            if fact in reachable_facts:
+                result.append(fact)
+        else:
+            # NOTE: This could be optimized by only trying objects of the correct
+            #       type, or by using a unifier which directly generates the
+            #       applicable objects. It is not worth optimizing this at this stage,
+            #       though.
+            for obj in task.objects:
+                newargs = list(fact.args)
+                newargs[pos] = obj.name
+                atom = pddl.Atom(fact.predicate, newargs)
+                if atom in reachable_facts:
+                    result.append(atom)
+    return result
+
+def instantiate_groups(groups, task, reachable_facts):
+    return [expand_group(group, task, reachable_facts) for group in groups]
+
+class GroupCoverQueue:
+    def __init__(self, groups):
+        if groups:
+            self.max_size = max([len(group) for group in groups])
+            self.groups_by_size = [[] for i in range(self.max_size + 1)]
+            self.groups_by_fact = {}
+            for group in groups:
+                group = set(group) # Copy group, as it will be modified.
+                self.groups_by_size[len(group)].append(group)
+                for fact in group:
+                    self.groups_by_fact.setdefault(fact, []).append(group)
+            self._update_top()
+        else:
+            self.max_size = 0
+    def __bool__(self):
+        return self.max_size > 1
+    __nonzero__ = __bool__
+    def pop(self):
+        result = list(self.top) # Copy; this group will shrink further.
+        if options.use_partial_encoding:
+            for fact in result:
+                for group in self.groups_by_fact[fact]:
+                    group.remove(fact)
+        self._update_top()
+        return result
+    def _update_top(self):
+        while self.max_size > 1:
+            max_list = self.groups_by_size[self.max_size]
+            while max_list:
+                candidate = max_list.pop()
+                if len(candidate) == self.max_size:
+                    self.top = candidate
+                    return
+                self.groups_by_size[len(candidate)].append(candidate)
+            self.max_size -= 1
+
+def choose_groups(groups, reachable_facts, negative_in_goal):
+    if negative_in_goal:
+        # we remove atoms that occur negatively in the goal from the groups to
+        # enforce them to be encoded with a binary variable.
+        groups = [set(group) - negative_in_goal for group in groups]
+    queue = GroupCoverQueue(groups)
+    uncovered_facts = reachable_facts.copy()
+    result = []
+    while queue:
+        group = queue.pop()
+        uncovered_facts.difference_update(group)
+        result.append(group)
+    print(len(uncovered_facts), "uncovered facts")
+    result += [[fact] for fact in uncovered_facts]
+    return result
+
+def build_translation_key(groups):
+    group_keys = []
+    for group in groups:
+        group_key = [str(fact) for fact in group]
+        if len(group) == 1:
+            group_key.append(str(group[0].negate()))
+        else:
+            group_key.append("<none of those>")
+        group_keys.append(group_key)
+    return group_keys
+
+def collect_all_mutex_groups(groups, atoms):
+    # NOTE: This should be functionally identical to choose_groups
+    # when partial_encoding is set to False. Maybe a future
+    # refactoring could take that into account.
+    all_groups = []
+    uncovered_facts = atoms.copy()
+    for group in groups:
+        uncovered_facts.difference_update(group)
+        all_groups.append(group)
+    all_groups += [[fact] for fact in uncovered_facts]
+    return all_groups
+
+def sort_groups(groups):
+    return sorted(sorted(group) for group in groups)
+
+class MutexGroupIndex:
+    """Mutex groups in terms of the finite-domain facts (var/value
+    pairs) representing their atoms.
+
+    The facts of group i are (fact_vars[j], fact_values[j]) for
+    group_starts[i] <= j < group_starts[i + 1]. For every fact, we store
+    the ids of the groups that contain it. This allows to answer
+    queries about mutexes group by group rather than by enumerating
+    all pairs of facts in a group, which is quadratic in the group
+    size.
+    """
+
+    def __init__(self, strips_to_sas, ranges, groups, mutex_groups):
+        """strips_to_sas maps each atom to the facts representing it,
+        ranges are the variable domain sizes, groups are the groups
+        that define the variables, and mutex_groups are all mutex
+        groups (lists of atoms)."""
+        self.group_starts = array("q", [0])
+        self.fact_vars = array("i")
+        self.fact_values = array("i")
+        self.var_offsets = array("q", [0])
+        for var_range in ranges:
+            self.var_offsets.append(self.var_offsets[-1] + var_range)
+        self.groups_by_fact = [None] * self.var_offsets[-1]
+        for group_id, group in enumerate(mutex_groups):
+            for atom in group:
+                for var, value in strips_to_sas[atom]:
+                    self.fact_vars.append(var)
+                    self.fact_values.append(value)
+                    fact_id = self.var_offsets[var] + value
+                    if self.groups_by_fact[fact_id] is None:
+                        self.groups_by_fact[fact_id] = array("i")
+                    self.groups_by_fact[fact_id].append(group_id)
+            self.group_starts.append(len(self.fact_vars))
+
+        # A "lonely" atom forms a group of size 1 and hence is represented
+        # by a binary variable whose value 1 means that the atom is false.
+        self.lonely_vars = set()
+        for var, group in enumerate(groups):
+            if len(group) == 1:
+                assert strips_to_sas[group[0]] == [(var, 0)]
+                self.lonely_vars.add(var)
+
+    def __len__(self):
+        return len(self.group_starts) - 1
+
+    def get_group_size(self, group_id):
+        return self.group_starts[group_id + 1] - self.group_starts[group_id]
+
+    def get_group(self, group_id):
+        """Return the facts of the given group as a list of var/value
+        pairs."""
+        begin = self.group_starts[group_id]
+        end = self.group_starts[group_id + 1]
+        return list(zip(self.fact_vars[begin:end], self.fact_values[begin:end]))
+
+    def get_groups_of_fact(self, fact):
+        var, value = fact
+        return self.groups_by_fact[self.var_offsets[var] + value] or ()
+
+    def get_groups_of_facts(self, facts):
+        """Return the set of ids of all groups containing any of the
+        given facts."""
+        group_ids = set()
+        for fact in facts:
+            group_ids.update(self.get_groups_of_fact(fact))
+        return group_ids
+
+    def is_implied_by_groups(self, fact, group_ids):
+        """Return whether a condition that holds facts from the given
+        groups (see get_groups_of_facts) implies fact.
+
+        We only detect the following case: fact says that a lonely
+        atom X is false and the condition contains a fact representing
+        an atom that is mutex with X. The variable of fact must not
+        occur in the condition."""
+        var, value = fact
+        if value != 1 or var not in self.lonely_vars:
+            return False
+        return any(group_id in group_ids
+                   for group_id in self.get_groups_of_fact((var, 0)))
+
+
+def compute_groups(task: pddl.Task, atoms: Set[pddl.Literal],
+    reachable_action_params: Dict[pddl.Action, List[str]],
+    negative_in_goal: Set[pddl.Atom]) -> Tuple[
+        List[List[pddl.Atom]], # groups
+        # -> all selected mutex groups plus singleton groups for uncovered facts
+        List[List[pddl.Atom]], # mutex_groups
+        # -> all found mutex groups plus singleton groups for uncovered facts
+        List[List[str]], # translation_key
+        # -> string representations of group atoms (plus one for "other value")
+        ]:
+    groups = invariant_finder.get_groups(task, reachable_action_params)
+
+    with timers.timing("Instantiating groups"):
+        groups = instantiate_groups(groups, task, atoms)
+
+    # Sort here already to get deterministic mutex groups.
+    groups = sort_groups(groups)
+    # TODO: I think that collect_all_mutex_groups should do the same thing
+    #       as choose_groups with partial_encoding=False, so these two should
+    #       be unified.
+    with timers.timing("Collecting mutex groups"):
+        mutex_groups = collect_all_mutex_groups(groups, atoms)
+    with timers.timing("Choosing groups", block=True):
+        groups = choose_groups(groups, atoms, negative_in_goal)
+    groups = sort_groups(groups)
+    with timers.timing("Building translation key"):
+        translation_key = build_translation_key(groups)
+
+    if DEBUG:
+        for group in groups:
+            if len(group) >= 2:
+                print("{%s}" % ", ".join(map(str, group)))
+
+    return groups, mutex_groups, translation_key
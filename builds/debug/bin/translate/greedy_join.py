@@ -0,0 +1,153 @@
+import heapq
+
+import join_statistics
+import pddl
+import pddl_to_prolog
+
+class OccurrencesTracker:
+    """Keeps track of the number of times each variable appears
+    in a list of symbolic atoms."""
+    def __init__(self, rule):
+        self.occurrences = {}
+        self.update(rule.effect, +1)
+        for cond in rule.conditions:
+            self.update(cond, +1)
+    def update(self, symatom, delta):
+        for var in symatom.args:
+            if var[0] == "?":
+                if var not in self.occurrences:
+                    self.occurrences[var] = 0
+                self.occurrences[var] += delta
+                assert self.occurrences[var] >= 0
+                if not self.occurrences[var]:
+                    del self.occurrences[var]
+    def variables(self):
+        return set(self.occurrences)
+
+class CostMatrix:
+    """Join costs of all pairs of joinees.
+
+    The pairs are kept in a heap, ordered by (cost, index of the later
+    joinee, index of the earlier joinee), which is the order in which
+    a row-by-row scan of a triangular cost matrix would find them.
+    Pairs involving removed joinees are deleted lazily.
+
+    With join statistics, joinees have cardinality estimates (None if
+    unknown), and joins on common variables whose estimated result is
+    not larger than their larger input come first, smallest estimated
+    result first.
+    All other joins are ordered by the numbers of their variables."""
+    def __init__(self, joinees, statistics=None):
+        self.statistics = statistics
+        self.joinees = {}
+        self.estimates = {}
+        self.next_index = 0
+        self.heap = []
+        for joinee in joinees:
+            estimate = None
+            if statistics is not None:
+                estimate = statistics.estimate_condition(joinee)
+            self.add_entry(joinee, estimate)
+    def add_entry(self, joinee, estimate=None):
+        index = self.next_index
+        self.next_index += 1
+        for other_index, other in self.joinees.items():
+            cost = self.compute_join_cost(joinee, other, estimate,
+                                          self.estimates[other_index])
+            heapq.heappush(self.heap, (cost, index, other_index))
+        self.joinees[index] = joinee
+        self.estimates[index] = estimate
+    def delete_entry(self, index):
+        del self.joinees[index]
+        return self.estimates.pop(index)
+    def find_min_pair(self):
+        assert len(self.joinees) >= 2
+        while True:
+            _, left_index, right_index = self.heap[0]
+            if left_index in self.joinees and right_index in self.joinees:
+                return left_index, right_index
+            heapq.heappop(self.heap)
+    def remove_min_pair(self):
+        """Return the pair of joinees with minimal join cost and their
+        estimates."""
+        left_index, right_index = self.find_min_pair()
+        left, right = self.joinees[left_index], self.joinees[right_index]
+        assert left_index > right_index
+        left_estimate = self.delete_entry(left_index)
+        right_estimate = self.delete_entry(right_index)
+        return (left, right), (left_estimate, right_estimate)
+    def compute_join_cost(self, left_joinee, right_joinee,
+                          left_estimate=None, right_estimate=None):
+        left_vars = pddl_to_prolog.get_variables([left_joinee])
+        right_vars = pddl_to_prolog.get_variables([right_joinee])
+        if len(left_vars) > len(right_vars):
+            left_vars, right_vars = right_vars, left_vars
+        common_vars = left_vars & right_vars
+        cost = (len(left_vars) - len(common_vars),
+                len(right_vars) - len(common_vars),
+                -len(common_vars))
+        if self.statistics is None:
+            return cost
+        # Joins without common variables are products, which are only
+        # done as a last resort (see split_rules).
+        if (common_vars and left_estimate is not None and
+                right_estimate is not None):
+            size = join_statistics.estimate_join(
+                left_estimate, right_estimate).size
+            if size <= max(left_estimate.size, right_estimate.size):
+                return (0, size, cost)
+        return (1, 0, cost)
+    def can_join(self):
+        return len(self.joinees) >= 2
+
+class ResultList:
+    def __init__(self, rule, name_generator):
+        self.final_effect = rule.effect
+        self.result = []
+        self.name_generator = name_generator
+    def get_result(self):
+        self.result[-1].effect = self.final_effect
+        return self.result
+    def add_rule(self, type, conditions, effect_vars):
+        effect = pddl.Atom(next(self.name_generator), effect_vars)
+        rule = pddl_to_prolog.Rule(conditions, effect)
+        rule.type = type
+        self.result.append(rule)
+        return rule.effect
+
+def greedy_join(rule, name_generator, statistics=None):
+    assert len(rule.conditions) >= 2
+    cost_matrix = CostMatrix(rule.conditions, statistics)
+    occurrences = OccurrencesTracker(rule)
+    result = ResultList(rule, name_generator)
+
+    while cost_matrix.can_join():
+        joinees, estimates = cost_matrix.remove_min_pair()
+        joinees, estimates = list(joinees), list(estimates)
+        for joinee in joinees:
+            occurrences.update(joinee, -1)
+
+        common_vars = set(joinees[0].args) & set(joinees[1].args)
+        condition_vars = set(joinees[0].args) | set(joinees[1].args)
+        effect_vars = occurrences.variables() & condition_vars
+        for i, joinee in enumerate(joinees):
+            joinee_vars = set(joinee.args)
+            retained_vars = joinee_vars & (effect_vars | common_vars)
+            if retained_vars != joinee_vars:
+                joinees[i] = result.add_rule("project", [joinee], sorted(retained_vars))
+                if estimates[i] is not None:
+                    estimates[i] = join_statistics.estimate_projection(
+                        estimates[i], joinees[i].args)
+        joint_condition = result.add_rule("join", joinees, sorted(effect_vars))
+        joint_estimate = None
+        if None not in estimates:
+            joint_estimate = join_statistics.estimate_projection(
+                join_statistics.estimate_join(*estimates),
+                joint_condition.args)
+        cost_matrix.add_entry(joint_condition, joint_estimate)
+        occurrences.update(joint_condition, +1)
+
+    # assert occurrences.variables() == set(rule.effect.args)
+    # for var in set(rule.effect.args):
+    #     assert occurrences.occurrences[var] == 2 * rule.effect.args.count(var)
+    return result.get_result()
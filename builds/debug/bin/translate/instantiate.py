@@ -0,0 +1,285 @@
+#! /usr/bin/env python3
+
+
+from collections import defaultdict
+import heapq
+import multiprocessing
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import build_model
+import join_statistics
+import pddl_to_prolog
+import pddl
+import timers
+
+# Number of action atoms instantiated together by a worker process.
+CHUNK_SIZE = 5000
+
+# Data shared with the worker processes. We set it before starting the
+# workers, which inherit it when they are forked, so it does not need
+# to be pickled.
+_worker_data = None
+
+def get_fluent_predicates(task):
+    fluent_predicates = set()
+    for action in task.actions:
+        for effect in action.effects:
+            fluent_predicates.add(effect.literal.predicate)
+    for axiom in task.axioms:
+        fluent_predicates.add(axiom.name)
+    return fluent_predicates
+
+def get_fluent_facts(task, model, fluent_predicates=None):
+    if fluent_predicates is None:
+        fluent_predicates = get_fluent_predicates(task)
+    return {fact for fact in model
+            if fact.predicate in fluent_predicates}
+
+def get_objects_by_type(typed_objects, types):
+    result = defaultdict(list)
+    supertypes = {}
+    for type in types:
+        supertypes[type.name] = type.supertype_names
+    for obj in typed_objects:
+        result[obj.type_name].append(obj.name)
+        for type in supertypes[obj.type_name]:
+            result[type].append(obj.name)
+    return result
+
+def instantiate_goal(goal, init_facts, fluent_facts):
+    # With the way this module is designed, we need to "instantiate"
+    # the goal to make sure we properly deal with static conditions,
+    # in particular flagging unreachable negative static goals as
+    # impossible. See issue1055.
+    #
+    # This returns None for goals that are impossible due to static
+    # facts.
+
+    # HACK! The implementation of this probably belongs into
+    # pddl.condition or a similar file, not here. The `instantiate`
+    # method of conditions with its slightly weird interface and the
+    # existence of the `Impossible` exceptions should perhaps be
+    # implementation details of `pddl`.
+    result = []
+    try:
+        goal.instantiate({}, init_facts, fluent_facts, result)
+    except pddl.conditions.Impossible:
+        return None
+    return result
+
+def _instantiate_action_atoms(atom_indices):
+    """Instantiate the action atoms with the given indices in the model.
+    Return the list of resulting PropositionalActions (None for atoms
+    that do not yield an action) and a dictionary that maps action ids
+    (see instantiate_actions) to the number of resulting actions and
+    the time spent on their atoms."""
+    (model, action_ids, init_facts, init_assignments, fluent_facts,
+     type_to_objects, metric) = _worker_data
+    result = []
+    statistics = defaultdict(lambda: [0, 0.0])
+    clock = time.perf_counter
+    for index in atom_indices:
+        start_time = clock()
+        atom = model[index]
+        action = atom.predicate
+        variable_mapping = {par.name: arg
+                            for par, arg in zip(action.parameters, atom.args)}
+        inst_action = action.instantiate(
+            variable_mapping, init_facts, init_assignments,
+            fluent_facts, type_to_objects, metric)
+        result.append(inst_action)
+        action_statistics = statistics[action_ids[action]]
+        action_statistics[0] += inst_action is not None
+        action_statistics[1] += clock() - start_time
+    return result, dict(statistics)
+
+def instantiate_actions(model, action_atoms, init_facts, init_assignments,
+                        fluent_facts, type_to_objects, metric,
+                        num_processes, statistics):
+    """Instantiate the action atoms, given as a dictionary that maps
+    each action to the (sorted) indices of its atoms in the model.
+
+    If num_processes > 1, we split the atoms of each action into
+    chunks and instantiate them in a pool of worker processes. Return
+    the resulting PropositionalActions ordered by the index of their
+    atom, i.e., in the same order for all numbers of processes. If
+    statistics is not None, append an (action, number of atoms, number
+    of instantiated actions, time) tuple for each action."""
+    actions = list(action_atoms)
+    action_ids = {action: action_id for action_id, action in enumerate(actions)}
+    shared_data = (model, action_ids, init_facts, init_assignments,
+                   fluent_facts, type_to_objects, metric)
+    chunks = []
+    for action, atom_indices in action_atoms.items():
+        for start in range(0, len(atom_indices), CHUNK_SIZE):
+            chunks.append(atom_indices[start:start + CHUNK_SIZE])
+    if num_processes > 1 and len(chunks) > 1:
+        results = _map_in_worker_processes(
+            _instantiate_action_atoms, chunks,
+            min(num_processes, len(chunks)), shared_data)
+        # Restore the order of the atoms in the model.
+        inst_actions = [inst_action for _, inst_action in heapq.merge(
+            *[zip(atom_indices, result)
+              for atom_indices, (result, _) in zip(chunks, results)])]
+    else:
+        # Instantiating the atoms in the order of the model is faster
+        # than processing one action after the other.
+        atom_indices = list(heapq.merge(*action_atoms.values()))
+        results = _map_in_worker_processes(
+            _instantiate_action_atoms, [atom_indices], 0, shared_data)
+        inst_actions = results[0][0]
+
+    if statistics is not None:
+        totals = defaultdict(lambda: [0, 0.0])
+        for _, chunk_statistics in results:
+            for action_id, (num_actions, elapsed_time) in chunk_statistics.items():
+                totals[action_id][0] += num_actions
+                totals[action_id][1] += elapsed_time
+        for action_id, action in enumerate(actions):
+            num_actions, elapsed_time = totals[action_id]
+            statistics.append((action, len(action_atoms[action]),
+                               num_actions, elapsed_time))
+    return [inst_action for inst_action in inst_actions
+            if inst_action is not None]
+
+def _map_in_worker_processes(function, inputs, num_processes, shared_data):
+    """Return [function(x) for x in inputs], computed by num_processes
+    forked worker processes (or in this process if num_processes is 0).
+    The function can access shared_data as _worker_data."""
+    global _worker_data
+    old_worker_data = _worker_data
+    _worker_data = shared_data
+    try:
+        if not num_processes:
+            return [function(x) for x in inputs]
+        context = multiprocessing.get_context("fork")
+        with context.Pool(num_processes) as pool:
+            return pool.map(function, inputs, chunksize=1)
+    finally:
+        _worker_data = old_worker_data
+
+def can_instantiate_in_parallel():
+    return "fork" in multiprocessing.get_all_start_methods()
+
+# The input task must have been normalized
+# The model has been computed by build_model.compute_model
+def instantiate(task: pddl.Task, model: Any, num_processes: int = 1,
+                statistics: Optional[List[Tuple[pddl.Action, int, int, float]]] = None) -> Tuple[
+             bool, # relaxed_reachable
+             Set[pddl.Literal], # fluent_facts (ground)
+             List[pddl.PropositionalAction], # instantiated_actions
+             Optional[List[pddl.Literal]], # instantiated_goal
+             List[pddl.PropositionalAxiom], # instantiated_axioms
+             Dict[pddl.Action, List[str]] # reachable_action_parameters
+            ]:
+    relaxed_reachable = False
+    fluent_predicates = get_fluent_predicates(task)
+    fluent_facts = get_fluent_facts(task, model, fluent_predicates)
+    init_atoms = []
+    init_assignments = {}
+    for element in task.init:
+        if isinstance(element, pddl.Assign):
+            init_assignments[element.fluent] = element.expression
+        else:
+            init_atoms.append(element)
+    # Index the static facts once instead of checking them by creating
+    # and hashing new atoms for every instantiation.
+    init_facts = pddl.FactIndex(init_atoms, fluent_facts, fluent_predicates)
+
+    type_to_objects = get_objects_by_type(task.objects, task.types)
+
+    # Map each action to the indices of its atoms in the model.
+    action_atoms = defaultdict(list)
+    instantiated_axioms = []
+    reachable_action_parameters = defaultdict(list)
+    for index, atom in enumerate(model):
+        if isinstance(atom.predicate, pddl.Action):
+            action = atom.predicate
+            parameters = action.parameters
+            inst_parameters = atom.args[:len(parameters)]
+            # Note: It's important that we use the action object
+            # itself as the key in reachable_action_parameters (rather
+            # than action.name) since we can have multiple different
+            # actions with the same name after normalization, and we
+            # want to distinguish their instantiations.
+            reachable_action_parameters[action].append(inst_parameters)
+            action_atoms[action].append(index)
+        elif isinstance(atom.predicate, pddl.Axiom):
+            axiom = atom.predicate
+            variable_mapping = {par.name: arg
+                                for par, arg in zip(axiom.parameters, atom.args)}
+            inst_axiom = axiom.instantiate(variable_mapping, init_facts, fluent_facts)
+            if inst_axiom:
+                instantiated_axioms.append(inst_axiom)
+        elif atom.predicate == "@goal-reachable":
+            relaxed_reachable = True
+
+    instantiated_actions = instantiate_actions(
+        model, action_atoms, init_facts, init_assignments, fluent_facts,
+        type_to_objects, task.use_min_cost_metric, num_processes, statistics)
+
+    instantiated_goal = instantiate_goal(task.goal, init_facts, fluent_facts)
+
+    return (relaxed_reachable, fluent_facts,
+            instantiated_actions, instantiated_goal,
+            sorted(instantiated_axioms), reachable_action_parameters)
+
+
+def print_statistics(statistics):
+    total_actions = 0
+    total_time = 0
+    for action, num_atoms, num_actions, elapsed_time in statistics:
+        print("Instantiated %d of %d reachable atoms of %s in %.3fs "
+              "(%.0f actions/s)" % (num_actions, num_atoms, action.name,
+                                    elapsed_time,
+                                    num_actions / max(elapsed_time, 1e-6)))
+        total_actions += num_actions
+        total_time += elapsed_time
+    print("Instantiated %d actions in %.3fs (%.0f actions/s)" % (
+        total_actions, total_time, total_actions / max(total_time, 1e-6)))
+
+
+def explore(task, num_processes=1, filter_irrelevant=False,
+            rule_cache_dir=None, cardinality_join_order=False,
+            join_plans_file=None):
+    prog = pddl_to_prolog.translate(task, filter_irrelevant, rule_cache_dir,
+                                    cardinality_join_order)
+    model = build_model.compute_model(prog)
+    if join_plans_file is not None:
+        join_statistics.dump_join_plans(prog, model, join_plans_file)
+    if num_processes > 1 and not can_instantiate_in_parallel():
+        print("Parallel instantiation is not supported on this platform. "
+              "Using a single process.")
+        num_processes = 1
+    statistics = []
+    with timers.timing("Completing instantiation"):
+        result = instantiate(task, model, num_processes, statistics)
+    print_statistics(statistics)
+    return result
+
+
+if __name__ == "__main__":
+    import pddl_parser
+    task = pddl_parser.open()
+    relaxed_reachable, atoms, actions, goals, axioms, _ = explore(task)
+    print("goal relaxed reachable: %s" % relaxed_reachable)
+    print("%d atoms:" % len(atoms))
+    for atom in atoms:
+        print(" ", atom)
+    print()
+    print("%d actions:" % len(actions))
+    for action in actions:
+        action.dump()
+        print()
+    print("%d axioms:" % len(axioms))
+    for axiom in axioms:
+        axiom.dump()
+        print()
+    print()
+    if goals is None:
+        print("impossible goal")
+    else:
+        print("%d goals:" % len(goals))
+        for literal in goals:
+            literal.dump()
@@ -0,0 +1,167 @@
+"""Cardinality estimates for ordering the joins of Datalog rules.
+
+The estimates are based on the facts of static predicates (predicates
+that do not occur in the effect of any rule, e.g., type predicates and
+static relations of the initial state). For each such predicate, we
+count its facts and the distinct values at each argument position. The
+estimates for intermediate relations use the standard textbook
+assumptions (uniform distribution, independent attributes):
+
+  |R join S| = |R| * |S| / prod_v max(V(R, v), V(S, v))
+
+where v ranges over the common variables of R and S and V(R, v) is the
+number of distinct values of v in R. For relations that involve fluent
+predicates, there are no estimates.
+"""
+
+from collections import defaultdict
+
+
+class RelationEstimate:
+    def __init__(self, size, distinct_values):
+        self.size = size
+        # Maps variables to the estimated number of their distinct values.
+        self.distinct_values = distinct_values
+
+    def __str__(self):
+        return "%.0f" % self.size
+
+
+def compute_join_statistics(facts, rules):
+    """Return the JoinStatistics for the static predicates of the
+    Datalog program with the given facts and rules."""
+    static_predicates = {atom.predicate for atom in facts}
+    static_predicates -= {rule.effect.predicate for rule in rules}
+    return JoinStatistics(facts, static_predicates)
+
+
+def estimate_join(left, right):
+    size = left.size * right.size
+    distinct_values = {}
+    for var, left_values in left.distinct_values.items():
+        right_values = right.distinct_values.get(var)
+        if right_values is None:
+            distinct_values[var] = left_values
+        else:
+            size /= max(left_values, right_values, 1)
+            distinct_values[var] = min(left_values, right_values)
+    for var, right_values in right.distinct_values.items():
+        distinct_values.setdefault(var, right_values)
+    return _capped(size, distinct_values)
+
+
+def estimate_projection(estimate, args):
+    distinct_values = {var: estimate.distinct_values[var]
+                       for var in args if var[0] == "?"}
+    max_size = 1
+    for values in distinct_values.values():
+        max_size *= values
+    return _capped(min(estimate.size, max_size), distinct_values)
+
+
+def _capped(size, distinct_values):
+    return RelationEstimate(size, {var: min(values, size)
+                                   for var, values in distinct_values.items()})
+
+
+class JoinStatistics:
+    def __init__(self, facts, static_predicates):
+        values_by_predicate = defaultdict(set)
+        for atom in facts:
+            if atom.predicate in static_predicates:
+                values_by_predicate[atom.predicate].add(atom.args)
+        # Static predicates without facts are empty relations.
+        self.counts = {predicate: 0 for predicate in static_predicates}
+        self.distinct_values = {predicate: () for predicate in static_predicates}
+        for predicate, arg_tuples in values_by_predicate.items():
+            self.counts[predicate] = len(arg_tuples)
+            self.distinct_values[predicate] = tuple(
+                len(set(values)) for values in zip(*arg_tuples))
+
+    def get_predicate_key(self, predicate):
+        """Return the statistics of the predicate in a form that can be
+        used as part of a cache key (see rule_cache), or None if there
+        are none."""
+        if predicate not in self.counts:
+            return None
+        return (self.counts[predicate], self.distinct_values[predicate])
+
+    def get_rule_key(self, rule):
+        # Normalizing rules can add equality conditions (see
+        # pddl_to_prolog.Rule.rename_duplicate_variables).
+        return (tuple(self.get_predicate_key(cond.predicate)
+                      for cond in rule.conditions) +
+                (self.get_predicate_key("="),))
+
+    def estimate_condition(self, atom):
+        """Return an estimate for the relation of the condition atom, or
+        None if its predicate is not static."""
+        count = self.counts.get(atom.predicate)
+        if count is None:
+            return None
+        size = count
+        # Static predicates without facts have no distinct values.
+        values = self.distinct_values[atom.predicate] or (0,) * len(atom.args)
+        positions_by_var = defaultdict(list)
+        for position, arg in enumerate(atom.args):
+            if arg[0] == "?":
+                positions_by_var[arg].append(position)
+            else:
+                # Selection with a constant.
+                size /= max(values[position], 1)
+        distinct_values = {
+            var: min(values[position] for position in positions)
+            for var, positions in positions_by_var.items()}
+        return _capped(size, distinct_values)
+
+
+def estimate_rules(rules, statistics):
+    """Return a dictionary that maps the effect predicates of the given
+    split rules (see split_rules) to estimates of their relations."""
+    estimates = {}
+    effect_args = {}
+    def estimate_atom(atom):
+        if atom.predicate not in estimates:
+            return statistics.estimate_condition(atom)
+        estimate = estimates[atom.predicate]
+        if estimate is None:
+            return None
+        renaming = dict(zip(effect_args[atom.predicate], atom.args))
+        return RelationEstimate(
+            estimate.size, {renaming[var]: values for var, values
+                            in estimate.distinct_values.items()
+                            if renaming[var][0] == "?"})
+    for rule in rules:
+        condition_estimates = [estimate_atom(cond) for cond in rule.conditions]
+        if None in condition_estimates:
+            estimate = None
+        else:
+            estimate = condition_estimates[0]
+            for condition_estimate in condition_estimates[1:]:
+                estimate = estimate_join(estimate, condition_estimate)
+            estimate = estimate_projection(estimate, rule.effect.args)
+        if rule.effect.predicate in estimates:
+            # Several rules for the same predicate.
+            estimates[rule.effect.predicate] = None
+        else:
+            estimates[rule.effect.predicate] = estimate
+            effect_args[rule.effect.predicate] = rule.effect.args
+    return estimates
+
+
+def dump_join_plans(prog, model, filename):
+    """Write the split rules of the program with the estimated and
+    actual sizes of the relations of their effects."""
+    statistics = compute_join_statistics(
+        [fact.atom for fact in prog.facts], prog.rules)
+    actual_sizes = defaultdict(int)
+    for atom in model:
+        actual_sizes[atom.predicate] += 1
+    estimates = estimate_rules(prog.rules, statistics)
+    with open(filename, "w") as dump_file:
+        for rule in prog.rules:
+            estimate = estimates.get(rule.effect.predicate)
+            print("%s %s [estimated: %s, actual: %d]" % (
+                rule.type, rule,
+                "?" if estimate is None else estimate,
+                actual_sizes[rule.effect.predicate]), file=dump_file)
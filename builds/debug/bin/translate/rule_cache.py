@@ -0,0 +1,95 @@
+"""Cache for compiled Datalog rules.
+
+Normalizing and splitting the rules of the exploration program (see
+pddl_to_prolog.compile_rule) only depends on the rules themselves, and
+most rules only depend on the domain. The cache stores the compiled
+rules of all tasks of a domain in one file per domain, keyed by the
+conditions and effect arguments of the rules (see
+pddl_to_prolog.get_rule_key), so that only the rules that are new for
+a task (e.g., the rule for the goal) have to be compiled.
+
+The cache only contains strings, numbers and tuples. We don't store
+pddl.Atom objects because their hash values are only valid within a
+single Python process.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+import pddl_to_prolog
+
+# Increase this whenever the format or the content of the compiled
+# rules changes.
+CACHE_VERSION = 2
+
+
+class RuleCache:
+    def __init__(self, directory, domain_name):
+        self.directory = directory
+        digest = hashlib.sha256(
+            ("%d %s" % (CACHE_VERSION, domain_name)).encode("utf-8"))
+        self.filename = os.path.join(
+            directory, "rules-%s.pickle" % digest.hexdigest())
+        self.entries = self._load()
+        self.num_lookups = 0
+        self.num_hits = 0
+        self.changed = False
+
+    def _load(self):
+        try:
+            with open(self.filename, "rb") as cache_file:
+                version, entries = pickle.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except Exception as err:
+            # Treat unreadable cache files like missing ones.
+            print("Ignoring unreadable rule cache %s: %s" % (
+                self.filename, err))
+            return {}
+        if version != CACHE_VERSION or not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def get_compiled_rule(self, rule, statistics=None):
+        """Return the data of the compiled rule (see
+        pddl_to_prolog.CompiledRule) and add it to the cache if
+        necessary. With join statistics (see join_statistics), the
+        compiled rule also depends on the statistics of the condition
+        predicates, so they are part of the key."""
+        key = pddl_to_prolog.get_rule_key(rule)
+        if key is None:
+            return pddl_to_prolog.compile_rule(rule, statistics)
+        if statistics is not None:
+            key += (statistics.get_rule_key(rule),)
+        self.num_lookups += 1
+        data = self.entries.get(key)
+        if data is None:
+            data = pddl_to_prolog.compile_rule(rule, statistics)
+            self.entries[key] = data
+            self.changed = True
+        else:
+            self.num_hits += 1
+        return data
+
+    def print_statistics(self):
+        print("%d of %d rules found in rule cache." % (
+            self.num_hits, self.num_lookups))
+
+    def save(self):
+        if not self.changed:
+            return
+        # Write to a temporary file first, so that concurrent translator
+        # runs never see a partially written cache file.
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                    dir=self.directory, delete=False) as cache_file:
+                pickle.dump((CACHE_VERSION, self.entries), cache_file,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_file.name, self.filename)
+        except OSError as err:
+            print("Could not write rule cache %s: %s" % (self.filename, err))
+        else:
+            self.changed = False
@@ -0,0 +1,798 @@
+from array import array
+from typing import List, Tuple, Union
+
+SAS_FILE_VERSION = 3
+
+DEBUG = False
+
+VarValPair = Tuple[int, int]
+
+class SASTask:
+    """Planning task in finite-domain representation.
+
+    The user is responsible for making sure that the data fits a
+    number of structural restrictions. For example, conditions should
+    generally be sorted and mention each variable at most once. See
+    the validate methods for details."""
+
+    def __init__(self,
+                 variables: "SASTask",
+                 mutexes: List["SASMutexGroup"],
+                 init: "SASInit",
+                 goal: "SASGoal",
+                 operators: Union[List["SASOperator"], "SASOperatorTable"],
+                 axioms: List["SASAxiom"],
+                 metric: bool) -> None:
+        self.variables = variables
+        self.mutexes = mutexes
+        self.init = init
+        self.goal = goal
+        if isinstance(operators, SASOperatorTable):
+            operators.sort()
+            self.operators = operators
+        else:
+            self.operators = sorted(operators, key=lambda op: (
+                op.name, op.prevail, op.pre_post))
+        self.axioms = sorted(axioms, key=lambda axiom: (
+            axiom.condition, axiom.effect))
+        self.metric = metric
+        if DEBUG:
+            self.validate()
+
+    def validate(self):
+        """Fail an assertion if the task is invalid.
+
+        A task is valid if all its components are valid. Valid tasks
+        are almost in a kind of "canonical form", but not quite. For
+        example, operators and axioms are permitted to be listed in
+        any order, even though it would be possible to require some
+        kind of canonical sorting.
+
+        Note that we require that all derived variables are binary.
+        This is stricter than what later parts of the planner are
+        supposed to handle, but some parts of the translator rely on
+        this. We might want to consider making this a general
+        requirement throughout the planner.
+
+        Note also that there is *no* general rule on what the init (=
+        fallback) value of a derived variable is. For example, in
+        PSR-Large #1, it can be either 0 or 1. While it is "usually"
+        1, code should not rely on this.
+        """
+        self.variables.validate()
+        for mutex in self.mutexes:
+            mutex.validate(self.variables)
+        self.init.validate(self.variables)
+        self.goal.validate(self.variables)
+        for op in self.operators:
+            op.validate(self.variables)
+        for axiom in self.axioms:
+            axiom.validate(self.variables, self.init)
+        assert self.metric is False or self.metric is True, self.metric
+
+    def dump(self):
+        print("variables:")
+        self.variables.dump()
+        print("%d mutex groups:" % len(self.mutexes))
+        for mutex in self.mutexes:
+            print("group:")
+            mutex.dump()
+        print("init:")
+        self.init.dump()
+        print("goal:")
+        self.goal.dump()
+        print("%d operators:" % len(self.operators))
+        for operator in self.operators:
+            operator.dump()
+        print("%d axioms:" % len(self.axioms))
+        for axiom in self.axioms:
+            axiom.dump()
+        print("metric: %s" % self.metric)
+
+    def output(self, stream):
+        print("begin_version", file=stream)
+        print(SAS_FILE_VERSION, file=stream)
+        print("end_version", file=stream)
+        print("begin_metric", file=stream)
+        print(int(self.metric), file=stream)
+        print("end_metric", file=stream)
+        self.variables.output(stream)
+        print(len(self.mutexes), file=stream)
+        for mutex in self.mutexes:
+            mutex.output(stream)
+        self.init.output(stream)
+        self.goal.output(stream)
+        print(len(self.operators), file=stream)
+        if isinstance(self.operators, SASOperatorTable):
+            self.operators.output(stream)
+        else:
+            for op in self.operators:
+                op.output(stream)
+        print(len(self.axioms), file=stream)
+        for axiom in self.axioms:
+            axiom.output(stream)
+
+    def get_encoding_size(self):
+        task_size = 0
+        task_size += self.variables.get_encoding_size()
+        for mutex in self.mutexes:
+            task_size += mutex.get_encoding_size()
+        task_size += self.goal.get_encoding_size()
+        if isinstance(self.operators, SASOperatorTable):
+            task_size += self.operators.get_encoding_size()
+        else:
+            for op in self.operators:
+                task_size += op.get_encoding_size()
+        for axiom in self.axioms:
+            task_size += axiom.get_encoding_size()
+        return task_size
+
+
+class SASVariables:
+    def __init__(self, ranges: List[int], axiom_layers: List[int],
+                 value_names: List[List[str]]) -> None:
+        self.ranges = ranges
+        self.axiom_layers = axiom_layers
+        self.value_names = value_names
+
+    def validate(self):
+        """Validate variables.
+
+        All variables must have range at least 2, and derived
+        variables must have range exactly 2. See comment on derived
+        variables in the docstring of SASTask.validate.
+        """
+        assert len(self.ranges) == len(self.axiom_layers) == len(
+            self.value_names)
+        for (var_range, layer, var_value_names) in zip(
+                self.ranges, self.axiom_layers, self.value_names):
+            assert var_range == len(var_value_names)
+            assert var_range >= 2
+            assert layer == -1 or layer >= 0
+            if layer != -1:
+                assert var_range == 2
+
+    def validate_fact(self, fact):
+        """Assert that fact is a valid (var, value) pair."""
+        var, value = fact
+        assert 0 <= var < len(self.ranges)
+        assert 0 <= value < self.ranges[var]
+
+    def validate_condition(self, condition):
+        """Assert that the condition (list of facts) is sorted, mentions each
+        variable at most once, and only consists of valid facts."""
+        last_var = -1
+        for (var, value) in condition:
+            self.validate_fact((var, value))
+            assert var > last_var
+            last_var = var
+
+    def dump(self):
+        for var, (rang, axiom_layer) in enumerate(
+                zip(self.ranges, self.axiom_layers)):
+            if axiom_layer != -1:
+                axiom_str = " [axiom layer %d]" % axiom_layer
+            else:
+                axiom_str = ""
+            print("v%d in {%s}%s" % (var, list(range(rang)), axiom_str))
+
+    def output(self, stream):
+        print(len(self.ranges), file=stream)
+        for var, (rang, axiom_layer, values) in enumerate(zip(
+                self.ranges, self.axiom_layers, self.value_names)):
+            print("begin_variable", file=stream)
+            print("var%d" % var, file=stream)
+            print(axiom_layer, file=stream)
+            print(rang, file=stream)
+            assert rang == len(values), (rang, values)
+            for value in values:
+                print(value, file=stream)
+            print("end_variable", file=stream)
+
+    def get_encoding_size(self):
+        # A variable with range k has encoding size k + 1 to also give the
+        # variable itself some weight.
+        return len(self.ranges) + sum(self.ranges)
+
+
+class SASMutexGroup:
+    def __init__(self, facts: List[VarValPair]):
+        self.facts = sorted(facts)
+
+    def validate(self, variables):
+        """Assert that the facts in the mutex group are sorted and unique
+        and that they are all valid."""
+        for fact in self.facts:
+            variables.validate_fact(fact)
+        assert self.facts == sorted(set(self.facts))
+
+    def dump(self):
+        for var, val in self.facts:
+            print("v%d: %d" % (var, val))
+
+    def output(self, stream):
+        print("begin_mutex_group", file=stream)
+        print(len(self.facts), file=stream)
+        for var, val in self.facts:
+            print(var, val, file=stream)
+        print("end_mutex_group", file=stream)
+
+    def get_encoding_size(self):
+        return len(self.facts)
+
+
+class SASInit:
+    def __init__(self, values):
+        self.values = values
+
+    def validate(self, variables):
+        """Validate initial state.
+
+        Assert that the initial state contains the correct number of
+        values and that all values are in range.
+        """
+
+        assert len(self.values) == len(variables.ranges)
+        for fact in enumerate(self.values):
+            variables.validate_fact(fact)
+
+    def dump(self):
+        for var, val in enumerate(self.values):
+            print("v%d: %d" % (var, val))
+
+    def output(self, stream):
+        print("begin_state", file=stream)
+        for val in self.values:
+            print(val, file=stream)
+        print("end_state", file=stream)
+
+
+class SASGoal:
+    def __init__(self, pairs: List[Tuple[int, int]]) -> None:
+        self.pairs = sorted(pairs)
+
+    def validate(self, variables):
+        """Assert that the goal is nonempty and a valid condition."""
+        assert self.pairs
+        variables.validate_condition(self.pairs)
+
+    def dump(self):
+        for var, val in self.pairs:
+            print("v%d: %d" % (var, val))
+
+    def output(self, stream):
+        print("begin_goal", file=stream)
+        print(len(self.pairs), file=stream)
+        for var, val in self.pairs:
+            print(var, val, file=stream)
+        print("end_goal", file=stream)
+
+    def get_encoding_size(self):
+        return len(self.pairs)
+
+
+class SASOperator:
+    def __init__(self, name: str, prevail: List[VarValPair], pre_post:
+            List[Tuple[int, int, int, List[VarValPair]]], cost: int) -> None:
+        self.name = name
+        self.prevail = sorted(prevail)
+        self.pre_post = self._canonical_pre_post(pre_post)
+        self.cost = cost
+
+    @staticmethod
+    def _canonical_pre_post(pre_post):
+        # Return a sorted and uniquified version of pre_post. We would
+        # like to just use sorted(set(pre_post)), but this fails because
+        # the effect conditions are a list and hence not hashable.
+        def tuplify(entry):
+            var, pre, post, cond = entry
+            return var, pre, post, tuple(cond)
+        def listify(entry):
+            var, pre, post, cond = entry
+            return var, pre, post, list(cond)
+        pre_post = map(tuplify, pre_post)
+        pre_post = sorted(set(pre_post))
+        pre_post = list(map(listify, pre_post))
+        return pre_post
+
+    def validate(self, variables):
+        """Validate the operator.
+
+        Assert that
+        1. Prevail conditions are valid conditions (i.e., sorted and
+           all referring to different variables)
+        2. The pre_post list is sorted by (var, pre, post, cond), and the
+           same (var, pre, post, cond) 4-tuple is not repeated.
+        3. Effect conditions are valid conditions and do not contain variables
+           from the pre- or prevail conditions.
+        4. Variables occurring in pre_post rules do not have a prevail
+           condition.
+        5. Preconditions in pre_post are -1 or valid facts.
+        6. Effects are valid facts.
+        7. Effect variables are non-derived.
+        8. If a variable has multiple pre_post rules, then pre is
+           identical in all these rules.
+        9. There is at least one effect.
+        10. Costs are non-negative integers.
+
+        Odd things that are *not* illegal:
+        - The effect in a pre_post rule may be identical to the
+          precondition or to an effect condition of that effect.
+
+        TODO/open question:
+        - It is currently not very clear what the semantics of operators
+          should be when effects "conflict", i.e., when multiple effects
+          trigger and want to set a given variable to two different
+          values. In the case where both are unconditional effects, we
+          should make sure that our representation doesn't actually
+          contain two such effects, but when at least one of them is
+          conditional, things are not so easy.
+
+          To make our life simpler when generating SAS+ tasks from
+          PDDL tasks, it probably makes most sense to generalize the
+          PDDL rule in this case: there is a value order where certain
+          values "win" over others in this situation. It probably
+          makes sense to say the "highest" values should win in this
+          case, because that's consistent with the PDDL rules if we
+          say false = 0 and true = 1, and also with our sort order of
+          effects it means we get the right result if we just apply
+          effects in sequence.
+
+          But whatever we end up deciding, we need to be clear about it,
+          document it and make sure that all of our code knows the rules
+          and follows them.
+        """
+
+        variables.validate_condition(self.prevail)
+        assert self.pre_post == self._canonical_pre_post(self.pre_post)
+        prevail_vars = {var for (var, value) in self.prevail}
+        pre_values = {}
+        for var, pre, post, cond in self.pre_post:
+            variables.validate_condition(cond)
+            assert var not in prevail_vars
+            if pre != -1:
+                variables.validate_fact((var, pre))
+            variables.validate_fact((var, post))
+            assert variables.axiom_layers[var] == -1
+            if var in pre_values:
+                assert pre_values[var] == pre
+            else:
+                pre_values[var] = pre
+        for var, pre, post, cond in self.pre_post:
+            for cvar, cval in cond:
+                assert cvar not in pre_values or pre_values[cvar] == -1
+                assert cvar not in prevail_vars
+        assert self.pre_post
+        assert self.cost >= 0 and self.cost == int(self.cost)
+
+    def dump(self):
+        print(self.name)
+        print("Prevail:")
+        for var, val in self.prevail:
+            print("  v%d: %d" % (var, val))
+        print("Pre/Post:")
+        for var, pre, post, cond in self.pre_post:
+            if cond:
+                cond_str = " [%s]" % ", ".join(
+                    ["%d: %d" % tuple(c) for c in cond])
+            else:
+                cond_str = ""
+            print("  v%d: %d -> %d%s" % (var, pre, post, cond_str))
+
+    def output(self, stream):
+        print("begin_operator", file=stream)
+        print(self.name[1:-1], file=stream)
+        print(len(self.prevail), file=stream)
+        for var, val in self.prevail:
+            print(var, val, file=stream)
+        print(len(self.pre_post), file=stream)
+        for var, pre, post, cond in self.pre_post:
+            print(len(cond), end=' ', file=stream)
+            for cvar, cval in cond:
+                print(cvar, cval, end=' ', file=stream)
+            print(var, pre, post, file=stream)
+        print(self.cost, file=stream)
+        print("end_operator", file=stream)
+
+    def get_encoding_size(self):
+        size = 1 + len(self.prevail)
+        for var, pre, post, cond in self.pre_post:
+            size += 1 + len(cond)
+            if pre != -1:
+                size += 1
+        return size
+
+    def get_applicability_conditions(self):
+        """Return the combined applicability conditions
+        (prevail conditions and preconditions) of the operator.
+
+        Returns a sorted list of (var, value) pairs. This is
+        guaranteed to contain at most one fact per variable and
+        must hence be non-contradictory."""
+        conditions = {}
+        for var, val in self.prevail:
+            assert var not in conditions
+            conditions[var] = val
+        for var, pre, post, cond in self.pre_post:
+            if pre != -1:
+                assert var not in conditions or conditions[var] == pre
+                conditions[var] = pre
+        return sorted(conditions.items())
+
+class SASOperatorView:
+    """Read-only view of an operator stored in a SASOperatorTable.
+
+    Views offer the same attributes and (non-mutating) methods as
+    SASOperator. The prevail and pre_post lists are created on every
+    access, so code that uses them repeatedly should store them."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "SASOperatorTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def name(self):
+        return self._table.names[self._index]
+
+    @property
+    def cost(self):
+        return self._table.costs[self._index]
+
+    @property
+    def prevail(self):
+        return self._table.get_prevail(self._index)
+
+    @property
+    def pre_post(self):
+        return self._table.get_pre_post(self._index)
+
+    _canonical_pre_post = staticmethod(SASOperator._canonical_pre_post)
+    validate = SASOperator.validate
+    dump = SASOperator.dump
+    output = SASOperator.output
+    get_encoding_size = SASOperator.get_encoding_size
+    get_applicability_conditions = SASOperator.get_applicability_conditions
+
+
+class SASOperatorTable:
+    """Compact representation of a list of operators.
+
+    Instead of one SASOperator object per operator with nested lists
+    and tuples, the table stores all operators in flat integer arrays
+    ("struct of arrays"):
+
+    - names[op] and costs[op] are the name and cost of operator op.
+    - The prevail conditions of op are the pairs
+      (prevail_vars[i], prevail_values[i]) for
+      prevail_starts[op] <= i < prevail_starts[op + 1].
+    - The pre_post entries of op are the triples
+      (effect_vars[e], effect_pres[e], effect_posts[e]) for
+      effect_starts[op] <= e < effect_starts[op + 1].
+    - The effect conditions of pre_post entry e are the pairs
+      (condition_vars[i], condition_values[i]) for
+      condition_starts[e] <= i < condition_starts[e + 1].
+
+    This needs only a fraction of the memory of a list of SASOperator
+    objects. Indexing and iterating yield SASOperatorView objects, so
+    code that only reads operators works with both representations.
+    Stages that modify operators either build a new table or use the
+    bulk methods (e.g., renumber_variables). Operators are appended in
+    the canonical form established by SASOperator.__init__.
+    """
+
+    def __init__(self) -> None:
+        self.names = []  # type: List[str]
+        self.costs = array("q")
+        self.prevail_starts = array("q", [0])
+        self.prevail_vars = array("i")
+        self.prevail_values = array("i")
+        self.effect_starts = array("q", [0])
+        self.effect_vars = array("i")
+        self.effect_pres = array("i")
+        self.effect_posts = array("i")
+        self.condition_starts = array("q", [0])
+        self.condition_vars = array("i")
+        self.condition_values = array("i")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("operator index out of range")
+        return SASOperatorView(self, index % len(self))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SASOperatorView(self, index)
+
+    def append(self, op) -> None:
+        """Append a SASOperator (or an operator view) to the table.
+
+        The prevail conditions and pre_post entries of op are stored
+        in the given order, i.e., they must already be in the desired
+        (usually canonical) order."""
+        self.names.append(op.name)
+        self.costs.append(op.cost)
+        for var, val in op.prevail:
+            self.prevail_vars.append(var)
+            self.prevail_values.append(val)
+        self.prevail_starts.append(len(self.prevail_vars))
+        for var, pre, post, cond in op.pre_post:
+            self.effect_vars.append(var)
+            self.effect_pres.append(pre)
+            self.effect_posts.append(post)
+            for cvar, cval in cond:
+                self.condition_vars.append(cvar)
+                self.condition_values.append(cval)
+            self.condition_starts.append(len(self.condition_vars))
+        self.effect_starts.append(len(self.effect_vars))
+
+    def extend(self, operators) -> None:
+        for op in operators:
+            self.append(op)
+
+    def get_prevail(self, index):
+        begin = self.prevail_starts[index]
+        end = self.prevail_starts[index + 1]
+        return list(zip(self.prevail_vars[begin:end],
+                        self.prevail_values[begin:end]))
+
+    def get_pre_post(self, index):
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        pre_post = []
+        for eff in range(self.effect_starts[index],
+                         self.effect_starts[index + 1]):
+            begin = condition_starts[eff]
+            end = condition_starts[eff + 1]
+            cond = list(zip(condition_vars[begin:end],
+                            condition_values[begin:end]))
+            pre_post.append((self.effect_vars[eff], self.effect_pres[eff],
+                             self.effect_posts[eff], cond))
+        return pre_post
+
+    def sort(self) -> None:
+        """Sort the operators like SASTask sorts lists of operators,
+        i.e., by (name, prevail, pre_post)."""
+        names = self.names
+        order = sorted(range(len(self)), key=names.__getitem__)
+        # Operators rarely share names, so we only compare prevail
+        # conditions and pre_post entries for operators with equal names.
+        begin = 0
+        while begin < len(order):
+            end = begin + 1
+            while end < len(order) and names[order[end]] == names[order[begin]]:
+                end += 1
+            if end - begin > 1:
+                order[begin:end] = sorted(order[begin:end], key=lambda op: (
+                    self.get_prevail(op), self.get_pre_post(op)))
+            begin = end
+        if any(op != index for index, op in enumerate(order)):
+            self._permute(order)
+
+    def _permute(self, order):
+        """Reorder the table such that the i-th operator is the operator
+        that was previously at position order[i]."""
+        table = SASOperatorTable()
+        table.names = [self.names[op] for op in order]
+        table.costs = array("q", (self.costs[op] for op in order))
+        for op in order:
+            begin = self.prevail_starts[op]
+            end = self.prevail_starts[op + 1]
+            table.prevail_vars.extend(self.prevail_vars[begin:end])
+            table.prevail_values.extend(self.prevail_values[begin:end])
+            table.prevail_starts.append(len(table.prevail_vars))
+            begin = self.effect_starts[op]
+            end = self.effect_starts[op + 1]
+            table.effect_vars.extend(self.effect_vars[begin:end])
+            table.effect_pres.extend(self.effect_pres[begin:end])
+            table.effect_posts.extend(self.effect_posts[begin:end])
+            table.effect_starts.append(len(table.effect_vars))
+            for eff in range(begin, end):
+                cond_begin = self.condition_starts[eff]
+                cond_end = self.condition_starts[eff + 1]
+                table.condition_vars.extend(
+                    self.condition_vars[cond_begin:cond_end])
+                table.condition_values.extend(
+                    self.condition_values[cond_begin:cond_end])
+                table.condition_starts.append(len(table.condition_vars))
+        self.__dict__.update(table.__dict__)
+
+    def renumber_variables(self, new_var) -> None:
+        """Replace each variable v by new_var[v] in place.
+
+        Conditions and effects on variables v with new_var[v] == -1 are
+        removed, and so are operators that have no effects left. The
+        order of the remaining operators, conditions and effects is
+        preserved."""
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        effect_starts = self.effect_starts
+        prevail_starts = self.prevail_starts
+        # Each array is compacted in place: new_* is the number of
+        # entries kept so far, which never exceeds the read position.
+        new_ops = new_effs = new_prevails = new_conds = 0
+        cond_begin = prevail_begin = eff_begin = 0
+        for op in range(len(self)):
+            eff_end = effect_starts[op + 1]
+            op_new_effs = new_effs
+            op_new_conds = new_conds
+            for eff in range(eff_begin, eff_end):
+                cond_end = condition_starts[eff + 1]
+                var = new_var[self.effect_vars[eff]]
+                if var != -1:
+                    for cond in range(cond_begin, cond_end):
+                        cvar = new_var[condition_vars[cond]]
+                        if cvar != -1:
+                            condition_vars[op_new_conds] = cvar
+                            condition_values[op_new_conds] = condition_values[cond]
+                            op_new_conds += 1
+                    self.effect_vars[op_new_effs] = var
+                    self.effect_pres[op_new_effs] = self.effect_pres[eff]
+                    self.effect_posts[op_new_effs] = self.effect_posts[eff]
+                    op_new_effs += 1
+                    condition_starts[op_new_effs] = op_new_conds
+                cond_begin = cond_end
+            eff_begin = eff_end
+            prevail_end = prevail_starts[op + 1]
+            if op_new_effs > new_effs:
+                for index in range(prevail_begin, prevail_end):
+                    var = new_var[self.prevail_vars[index]]
+                    if var != -1:
+                        self.prevail_vars[new_prevails] = var
+                        self.prevail_values[new_prevails] = (
+                            self.prevail_values[index])
+                        new_prevails += 1
+                self.names[new_ops] = self.names[op]
+                self.costs[new_ops] = self.costs[op]
+                new_ops += 1
+                prevail_starts[new_ops] = new_prevails
+                effect_starts[new_ops] = new_effs = op_new_effs
+                new_conds = op_new_conds
+            prevail_begin = prevail_end
+        del self.names[new_ops:]
+        del self.costs[new_ops:]
+        del prevail_starts[new_ops + 1:]
+        del self.prevail_vars[new_prevails:]
+        del self.prevail_values[new_prevails:]
+        del effect_starts[new_ops + 1:]
+        del self.effect_vars[new_effs:]
+        del self.effect_pres[new_effs:]
+        del self.effect_posts[new_effs:]
+        del condition_starts[new_effs + 1:]
+        del condition_vars[new_conds:]
+        del condition_values[new_conds:]
+
+    def validate(self, variables):
+        for op in self:
+            op.validate(variables)
+
+    def dump(self):
+        for op in self:
+            op.dump()
+
+    def output(self, stream):
+        """Write all operators in the same format as SASOperator.output."""
+        prevail_vars = self.prevail_vars
+        prevail_values = self.prevail_values
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        for op, name in enumerate(self.names):
+            lines = ["begin_operator", name[1:-1]]
+            begin = self.prevail_starts[op]
+            end = self.prevail_starts[op + 1]
+            lines.append(str(end - begin))
+            for index in range(begin, end):
+                lines.append("%d %d" % (prevail_vars[index],
+                                        prevail_values[index]))
+            begin = self.effect_starts[op]
+            end = self.effect_starts[op + 1]
+            lines.append(str(end - begin))
+            for eff in range(begin, end):
+                cond_begin = condition_starts[eff]
+                cond_end = condition_starts[eff + 1]
+                parts = [str(cond_end - cond_begin)]
+                for index in range(cond_begin, cond_end):
+                    parts.append("%d %d" % (condition_vars[index],
+                                            condition_values[index]))
+                parts.append("%d %d %d" % (self.effect_vars[eff],
+                                           self.effect_pres[eff],
+                                           self.effect_posts[eff]))
+                lines.append(" ".join(parts))
+            lines.append(str(self.costs[op]))
+            lines.append("end_operator\n")
+            stream.write("\n".join(lines))
+
+    def get_encoding_size(self):
+        # Same as the sum of SASOperator.get_encoding_size over all
+        # operators: 1 per operator, prevail condition, effect and effect
+        # condition, plus 1 per precondition.
+        num_preconditions = len(self.effect_pres) - self.effect_pres.count(-1)
+        return (len(self) + len(self.prevail_vars) + len(self.effect_vars) +
+                len(self.condition_vars) + num_preconditions)
+
+
+class SASAxiom:
+    def __init__(self, condition: List[VarValPair], effect: VarValPair) -> None:
+        self.condition = sorted(condition)
+        self.effect = effect
+        assert self.effect[1] in (0, 1)
+
+        for _, val in condition:
+            assert val >= 0, condition
+
+    def validate(self, variables, init):
+
+        """Validate the axiom.
+
+        Assert that the axiom condition is a valid condition, that the
+        effect is a valid fact, that the effect variable is a derived
+        variable, and that the layering condition is satisfied.
+
+        See the docstring of SASTask.validate for information on the
+        restriction on derived variables. The layering condition boils
+        down to:
+
+        1. Axioms always set the "non-init" value of the derived
+           variable.
+        2. Derived variables in the condition must have a lower of
+           equal layer to derived variables appearing in the effect.
+        3. Conditions with equal layer are only allowed when the
+           condition uses the "non-init" value of that variable.
+
+        TODO/bug: rule #1 is currently disabled because we currently
+        have axioms that violate it. This is likely due to the
+        "extended domain transition graphs" described in the Fast
+        Downward paper, Section 5.1. However, we want to eventually
+        changes this. See issue454. For cases where rule #1 is violated,
+        "non-init" should be "init" in rule #3.
+        """
+
+        variables.validate_condition(self.condition)
+        variables.validate_fact(self.effect)
+        eff_var, eff_value = self.effect
+        eff_layer = variables.axiom_layers[eff_var]
+        assert eff_layer >= 0
+        eff_init_value = init.values[eff_var]
+        ## The following rule is currently commented out because of
+        ## the TODO/bug mentioned in the docstring.
+        # assert eff_value != eff_init_value
+        for cond_var, cond_value in self.condition:
+            cond_layer = variables.axiom_layers[cond_var]
+            if cond_layer != -1:
+                assert cond_layer <= eff_layer
+                if cond_layer == eff_layer:
+                    cond_init_value = init.values[cond_var]
+                    ## Once the TODO/bug above is addressed, the
+                    ## following four lines can be simplified because
+                    ## we are guaranteed to land in the "if" branch.
+                    if eff_value != eff_init_value:
+                        assert cond_value != cond_init_value
+                    else:
+                        assert cond_value == cond_init_value
+
+    def dump(self):
+        print("Condition:")
+        for var, val in self.condition:
+            print("  v%d: %d" % (var, val))
+        print("Effect:")
+        var, val = self.effect
+        print("  v%d: %d" % (var, val))
+
+    def output(self, stream):
+        print("begin_rule", file=stream)
+        print(len(self.condition), file=stream)
+        for var, val in self.condition:
+            print(var, val, file=stream)
+        var, val = self.effect
+        print(var, 1 - val, val, file=stream)
+        print("end_rule", file=stream)
+
+    def get_encoding_size(self):
+        return 1 + len(self.condition)
@@ -0,0 +1,439 @@
+import options
+import pddl
+import sccs
+import timers
+
+from collections import defaultdict
+from itertools import chain
+
+
+DEBUG = False
+
+# Derived variables are numbered in sorted order and the literals of the
+# derived variable with number i are numbered 2 * i (positive literal) and
+# 2 * i + 1 (negative literal).
+def _positive_literal_index(var_index):
+    return 2 * var_index
+
+
+def _negative_literal_index(var_index):
+    return 2 * var_index + 1
+
+
+class AxiomDependencies(object):
+    def __init__(self, axioms):
+        if DEBUG:
+            assert all(isinstance(axiom.effect, pddl.Atom) for axiom in axioms)
+        # We sort the variables to receive a deterministic result.
+        self.derived_variables = sorted({axiom.effect for axiom in axioms})
+        self.variable_to_index = {
+            var: index for index, var in enumerate(self.derived_variables)}
+        num_variables = len(self.derived_variables)
+        self.positive_dependencies = [set() for _ in range(num_variables)]
+        self.negative_dependencies = [set() for _ in range(num_variables)]
+        for axiom in axioms:
+            head = self.variable_to_index[axiom.effect]
+            for body_literal in axiom.condition:
+                body = self.variable_to_index.get(body_literal.positive())
+                if body is not None:
+                    if body_literal.negated:
+                        self.negative_dependencies[head].add(body)
+                    else:
+                        self.positive_dependencies[head].add(body)
+        self.is_necessary = [True] * num_variables
+
+    def get_literal_index(self, literal):
+        """Return the index of the given literal or None if it is not a
+        literal of a derived variable."""
+        var_index = self.variable_to_index.get(literal.positive())
+        if var_index is None:
+            return None
+        elif literal.negated:
+            return _negative_literal_index(var_index)
+        else:
+            return _positive_literal_index(var_index)
+
+    # Mark all variables whose literals are not necessary as unnecessary.
+    # We do not need to remove single dependencies because if the head of an
+    # axiom is necessary, then all variables in its body must be necessary by
+    # definition.
+    def remove_unnecessary_variables(self, necessary_literals):
+        for var_index in range(len(self.derived_variables)):
+            self.is_necessary[var_index] = bool(
+                necessary_literals[_positive_literal_index(var_index)] or
+                necessary_literals[_negative_literal_index(var_index)])
+
+    def get_necessary_variable_indices(self):
+        return [var_index for var_index, necessary
+                in enumerate(self.is_necessary) if necessary]
+
+
+class AxiomCluster(object):
+    def __init__(self, derived_variables):
+        self.variables = derived_variables
+        self.axioms = dict((v, []) for v in derived_variables)
+        # Positive children will be populated with clusters that contain an
+        # atom that occurs in the body of an axiom whose head is from this
+        # cluster. Negative children analogous for atoms that occur negated
+        # in the body.
+        self.positive_children = set()
+        self.negative_children = set()
+        self.needed_negatively = False
+        self.layer = 0
+
+
+def handle_axioms(operators, axioms, goals, layer_strategy, max_negated_axioms=0):
+    clusters = compute_clusters(axioms, goals, operators)
+    axiom_layers = compute_axiom_layers(clusters, layer_strategy)
+
+    # TODO: It would be cleaner if these negated rules were an implementation
+    # detail of the heuristics in the search component that make use of them
+    # rather than part of the translation process. They should be removed in
+    # the future. Similarly, it would be a good idea to remove the notion of
+    # axiom layers and derived variable default values from the output.
+    # (All derived variables should be binary and default to false.)
+    with timers.timing("Computing negative axioms"):
+        (num_negated_axioms, num_overapproximated_cyclic,
+         num_overapproximated_too_large) = compute_negative_axioms(
+             clusters, max_negated_axioms)
+    print("Translator negated axioms: %d" % num_negated_axioms)
+    print("Translator derived variables with overapproximated negation "
+          "(cyclic dependencies): %d" % num_overapproximated_cyclic)
+    print("Translator derived variables with overapproximated negation "
+          "(negation too large): %d" % num_overapproximated_too_large)
+
+    axioms = get_axioms(clusters)
+    if DEBUG:
+        verify_layering_condition(axioms, axiom_layers)
+    return axioms, axiom_layers
+
+
+# Return a bytearray with one entry per literal index (see
+# AxiomDependencies) that is 1 iff the literal is necessary.
+def compute_necessary_literals(dependencies, goals, operators):
+    necessary_literals = bytearray(2 * len(dependencies.derived_variables))
+    literals_to_process = []
+
+    def mark_necessary(literal_index):
+        if literal_index is not None and not necessary_literals[literal_index]:
+            necessary_literals[literal_index] = 1
+            literals_to_process.append(literal_index)
+
+    for g in goals:
+        mark_necessary(dependencies.get_literal_index(g))
+
+    for op in operators:
+        for l in op.precondition:
+            mark_necessary(dependencies.get_literal_index(l))
+
+        for condition, effect in chain(op.add_effects, op.del_effects):
+            for c in condition:
+                literal_index = dependencies.get_literal_index(c)
+                if literal_index is not None:
+                    # Mark both polarities (the index of the complementary
+                    # literal differs in the lowest bit).
+                    mark_necessary(literal_index)
+                    mark_necessary(literal_index ^ 1)
+
+    while literals_to_process:
+        literal_index = literals_to_process.pop()
+        var_index, negated = divmod(literal_index, 2)
+        for body in dependencies.positive_dependencies[var_index]:
+            mark_necessary(2 * body + negated)
+        for body in dependencies.negative_dependencies[var_index]:
+            mark_necessary(2 * body + 1 - negated)
+
+    return necessary_literals
+
+
+# Compute strongly connected components of the dependency graph restricted to
+# the necessary variables. The variables and their successors are visited in
+# sorted order (see AxiomDependencies) to receive a deterministic result.
+def get_strongly_connected_components(dependencies):
+    var_indices = dependencies.get_necessary_variable_indices()
+    to_node = {var_index: node for node, var_index in enumerate(var_indices)}
+
+    adjacency_list = []
+    for var_index in var_indices:
+        pos = dependencies.positive_dependencies[var_index]
+        neg = dependencies.negative_dependencies[var_index]
+        adjacency_list.append(sorted(to_node[body] for body in pos | neg))
+
+    node_groups = sccs.get_sccs_adjacency_list(adjacency_list)
+    return [[var_indices[node] for node in group] for group in node_groups]
+
+# Expects a list of axioms *with the same head* and returns a subset consisting
+# of all non-dominated axioms whose conditions have been cleaned up
+# (duplicate elimination).
+def compute_simplified_axioms(axioms):
+    """Remove duplicate axioms, duplicates within axioms, and dominated axioms."""
+
+    if DEBUG:
+        assert len(set(axiom.effect for axiom in axioms)) == 1
+
+    # Remove duplicates from axiom conditions.
+    for axiom in axioms:
+        axiom.condition = sorted(set(axiom.condition))
+
+    # Remove dominated axioms.
+    axioms_to_skip = set()
+    axioms_by_literal = defaultdict(set)
+    for axiom in axioms:
+        if axiom.effect in axiom.condition:
+            axioms_to_skip.add(id(axiom))
+        else:
+            for literal in axiom.condition:
+                axioms_by_literal[literal].add(id(axiom))
+
+    for axiom in axioms:
+        if id(axiom) in axioms_to_skip:
+            continue   # Required to keep one of multiple identical axioms.
+        if not axiom.condition:  # empty condition: dominates everything
+            return [axiom]
+        literals = iter(axiom.condition)
+        dominated_axioms = axioms_by_literal[next(literals)].copy()
+        for literal in literals:
+            dominated_axioms &= axioms_by_literal[literal]
+        for dominated_axiom in dominated_axioms:
+            if dominated_axiom != id(axiom):
+                axioms_to_skip.add(dominated_axiom)
+    return [axiom for axiom in axioms if id(axiom) not in axioms_to_skip]
+
+
+def compute_clusters(axioms, goals, operators):
+    dependencies = AxiomDependencies(axioms)
+
+    # Compute necessary literals and prune unnecessary vars from dependencies.
+    necessary_literals = compute_necessary_literals(dependencies, goals, operators)
+    dependencies.remove_unnecessary_variables(necessary_literals)
+
+    index_groups = get_strongly_connected_components(dependencies)
+    derived_variables = dependencies.derived_variables
+    clusters = [AxiomCluster([derived_variables[i] for i in group])
+                for group in index_groups]
+
+    # Compute mapping from variables to their clusters and set needed_negatively.
+    variable_to_cluster = [None] * len(derived_variables)
+    for cluster, group in zip(clusters, index_groups):
+        for var_index in group:
+            variable_to_cluster[var_index] = cluster
+            if necessary_literals[_negative_literal_index(var_index)]:
+                cluster.needed_negatively = True
+
+    # Assign axioms to their clusters.
+    for axiom in axioms:
+        # axiom.effect is derived but might have been pruned
+        cluster = variable_to_cluster[dependencies.variable_to_index[axiom.effect]]
+        if cluster is not None:
+            cluster.axioms[axiom.effect].append(axiom)
+
+    removed = 0
+    with timers.timing("Simplifying axioms"):
+        for cluster in clusters:
+            for variable in cluster.variables:
+                old_size = len(cluster.axioms[variable])
+                cluster.axioms[variable] = compute_simplified_axioms(cluster.axioms[variable])
+                removed += old_size - len(cluster.axioms[variable])
+    print("Translator axioms removed by simplifying: %d" % removed)
+
+    for from_index in dependencies.get_necessary_variable_indices():
+        from_cluster = variable_to_cluster[from_index]
+        # Create links between clusters (positive dependencies).
+        for to_index in dependencies.positive_dependencies[from_index]:
+            to_cluster = variable_to_cluster[to_index]
+            if from_cluster is not to_cluster:
+                from_cluster.positive_children.add(to_cluster)
+
+        # Create links between clusters (negative dependencies).
+        for to_index in dependencies.negative_dependencies[from_index]:
+            to_cluster = variable_to_cluster[to_index]
+            if from_cluster is to_cluster:
+                raise ValueError("axioms are not stratifiable")
+            from_cluster.negative_children.add(to_cluster)
+
+    return clusters
+
+
+# Assign every cluster the smallest possible layer.
+def compute_single_cluster_layer(cluster):
+    layer = 0
+    for pos_child in cluster.positive_children:
+        layer = max(pos_child.layer, layer)
+    for neg_child in cluster.negative_children:
+        layer = max(neg_child.layer + 1, layer)
+    return layer
+
+
+# Clusters must be ordered topologically based on AxiomDependencies.
+# Since we need to visit clusters containing variables that occur in the body
+# of an atom before we visit the cluster containing the head, we need to
+# traverse the clusters in reverse order.
+def compute_axiom_layers(clusters, strategy):
+    if strategy == "max":
+        layer = 0
+        for cluster in reversed(clusters):
+            cluster.layer = layer
+            layer += 1
+    elif strategy == "min":
+        for cluster in reversed(clusters):
+            cluster.layer = compute_single_cluster_layer(cluster)
+
+    layers = dict()
+    for cluster in clusters:
+        for variable in cluster.variables:
+            layers[variable] = cluster.layer
+    return layers
+
+
+# Add the negated axioms for all clusters that are needed negatively. Return
+# the number of negated axioms and the numbers of derived variables whose
+# negation is overapproximated because of cyclic dependencies and because the
+# exact negation would have more than max_negated_axioms axioms.
+def compute_negative_axioms(clusters, max_negated_axioms):
+    num_negated_axioms = 0
+    num_overapproximated_cyclic = 0
+    num_overapproximated_too_large = 0
+    for cluster in clusters:
+        if cluster.needed_negatively:
+            if len(cluster.variables) > 1:
+                # If the cluster contains multiple variables, they have a cyclic
+                # positive dependency. In this case, the "obvious" way of
+                # negating the formula defining the derived variable is
+                # semantically wrong. For details, see issue453.
+                #
+                # Therefore, in this case we perform a naive overapproximation
+                # instead, which assumes that derived variables occurring in
+                # such clusters can be false unconditionally. This is good
+                # enough for correctness of the code that uses these negated
+                # axioms (within heuristics of the search component), but loses
+                # accuracy. Negating the rules in an exact
+                # (non-overapproximating) way is possible but more expensive.
+                # Again, see issue453 for details.
+                for variable in cluster.variables:
+                    cluster.axioms[variable].append(
+                        overapproximate_negation(cluster.axioms[variable], variable))
+                num_overapproximated_cyclic += len(cluster.variables)
+                num_negated_axioms += len(cluster.variables)
+            else:
+                variable = next(iter(cluster.variables))
+                negated_axioms = negate(cluster.axioms[variable], max_negated_axioms)
+                if negated_axioms is None:
+                    # The exact negation is too large. We use the same
+                    # overapproximation as for cyclic dependencies above.
+                    negated_axioms = [overapproximate_negation(
+                        cluster.axioms[variable], variable)]
+                    num_overapproximated_too_large += 1
+                cluster.axioms[variable] += negated_axioms
+                num_negated_axioms += len(negated_axioms)
+    return (num_negated_axioms, num_overapproximated_cyclic,
+            num_overapproximated_too_large)
+
+
+def overapproximate_negation(axioms, variable):
+    """Return an axiom that makes the given derived variable false
+    unconditionally."""
+    return pddl.PropositionalAxiom(axioms[0].name, [], variable.negate())
+
+
+# Return the negation of the given axioms (which must have the same head) in
+# DNF. If max_negated_axioms is positive and the negation consists of more
+# axioms before simplification, return None instead.
+def negate(axioms, max_negated_axioms=0):
+    assert axioms
+    result = [pddl.PropositionalAxiom(axioms[0].name, [], axioms[0].effect.negate())]
+    for axiom in axioms:
+        condition = axiom.condition
+        if len(condition) == 0:
+            # The derived fact we want to negate is triggered with an
+            # empty condition, so it is always true and its negation
+            # is always false.
+            return []
+        elif len(condition) == 1:  # Handle easy special case quickly.
+            new_literal = condition[0].negate()
+            for result_axiom in result:
+                result_axiom.condition.append(new_literal)
+        else:
+            if 0 < max_negated_axioms < len(result) * len(condition):
+                return None
+            new_result = []
+            for literal in condition:
+                literal = literal.negate()
+                for result_axiom in result:
+                    new_axiom = result_axiom.clone()
+                    new_axiom.condition.append(literal)
+                    new_result.append(new_axiom)
+            result = new_result
+    result = compute_simplified_axioms(result)
+    return result
+
+
+def get_axioms(clusters):
+    axioms = []
+    for cluster in clusters:
+        for v in cluster.variables:
+            axioms += cluster.axioms[v]
+    return axioms
+
+
+def verify_layering_condition(axioms, axiom_layers):
+    # This function is only used for debugging.
+    variables_in_heads = set()
+    literals_in_heads = set()
+    variables_with_layers = set()
+
+    for axiom in axioms:
+        head = axiom.effect
+        variables_in_heads.add(head.positive())
+        literals_in_heads.add(head)
+    variables_with_layers = set(axiom_layers.keys())
+
+    # 1. A variable has a defined layer iff it appears in a head.
+    #    (This is stricter than it needs to be; we could allow
+    #    derived variables that are never generated by a rule.
+    #    But this test follows the axiom simplification step, and
+    #    after simplification this should not be too strict.)
+    #    All layers are integers and at least 0.
+    #    (Note: the "-1" layer for non-derived variables is
+    #    set elsewhere.)
+    print("Verifying 1...")
+    assert variables_in_heads == variables_with_layers
+    for atom, layer in axiom_layers.items():
+        assert isinstance(layer, int)
+        assert layer >= 0
+
+    # 2. For every rule head <- ... cond ... where cond is a literal
+    #    of a derived variable where the layer of head is equal to
+    #    the layer of cond, cond occurs with the same polarity in heads.
+    #
+    # Note regarding issue454 and issue453: Because of the negated axioms
+    # mentioned in these issues, a derived variable may appear with *both*
+    # polarities in heads. This makes this test less strong than it would
+    # be otherwise. When these issues are addressed and axioms only occur
+    # with one polarity in heads, this test will remain correct in its
+    # current form, but it will be able to detect more violations of the
+    # layering property.
+    print("Verifying 2...")
+    for axiom in axioms:
+        head = axiom.effect
+        head_positive = head.positive()
+        body = axiom.condition
+        for cond in body:
+            cond_positive = cond.positive()
+            if (cond_positive in variables_in_heads and
+                axiom_layers[cond_positive] == axiom_layers[head_positive]):
+                assert cond in literals_in_heads
+
+    # 3. For every rule head <- ... cond ... where cond is a literal
+    #    of a derived variable, the layer of head is greater or equal
+    #    to the layer of cond.
+    print("Verifying 3...")
+    for axiom in axioms:
+        head = axiom.effect
+        head_positive = head.positive()
+        body = axiom.condition
+        for cond in body:
+            cond_positive = cond.positive()
+            if cond_positive in variables_in_heads:
+                # We need the assertion to be on a single line for
+                # our error handler to be able to print the line.
+                assert (axiom_layers[cond_positive] <= axiom_layers[head_positive]), (axiom_layers[cond_positive], axiom_layers[head_positive])
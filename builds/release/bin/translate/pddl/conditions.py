@@ -0,0 +1,360 @@
+from typing import List
+import weakref
+
+from .pddl_types import TypedObject
+
+# Conditions (of any type) are immutable, because they need to
+# be hashed occasionally. Immutability also allows more efficient comparison
+# based on a precomputed hash value.
+#
+# Conditions are hash-consed (interned): creating a condition that is
+# structurally equal to an existing one returns the existing object (see
+# InternedCondition). Hence, equality of conditions is identity.
+#
+# Careful: Most other classes (e.g. Effects, Axioms, Actions) are not!
+
+# Maps the keys of all live conditions (see get_key) to weak references
+# to the conditions. Conditions that are no longer referenced are removed
+# automatically. (This is a leaner version of weakref.WeakValueDictionary,
+# whose bookkeeping is noticeable when creating millions of atoms.)
+_conditions = {}
+# Number of conditions created so far (not counting conditions that were
+# returned from _conditions).
+_num_created_conditions = 0
+
+class _ConditionRef(weakref.ref):
+    __slots__ = ["key"]
+
+def _remove_condition(ref, conditions=_conditions):
+    # A new condition with the same key may have replaced the dead one.
+    if conditions.get(ref.key) is ref:
+        del conditions[ref.key]
+
+class InternedCondition(type):
+    """Metaclass of conditions that returns the existing condition when
+    creating a condition that is structurally equal to it."""
+    def __call__(cls, *args):
+        key = cls.get_key(*args)
+        ref = _conditions.get(key)
+        if ref is not None:
+            condition = ref()
+            if condition is not None:
+                return condition
+        global _num_created_conditions
+        _num_created_conditions += 1
+        condition = type.__call__(cls, *key[1:])
+        ref = _ConditionRef(condition, _remove_condition)
+        ref.key = key
+        _conditions[key] = ref
+        return condition
+
+def get_number_of_conditions():
+    return len(_conditions)
+
+def get_number_of_created_conditions():
+    return _num_created_conditions
+
+class Condition(metaclass=InternedCondition):
+    __slots__ = ["hash", "__weakref__"]
+    @classmethod
+    def get_key(cls, parts):
+        return (cls, tuple(parts))
+    def __init__(self, parts: List["Condition"]):
+        self.parts = tuple(parts)
+        self.hash = hash((self.__class__, self.parts))
+    def __hash__(self):
+        return self.hash
+    def __reduce__(self):
+        # Create copies and unpickled conditions via the metaclass, so
+        # that they are interned as well.
+        return (self.__class__, self.get_key_args())
+    def get_key_args(self):
+        return (self.parts,)
+    def __lt__(self, other):
+        return self.hash < other.hash
+    def __le__(self, other):
+        return self.hash <= other.hash
+    def dump(self, indent="  "):
+        print("%s%s" % (indent, self._dump()))
+        for part in self.parts:
+            part.dump(indent + "  ")
+    def _dump(self):
+        return self.__class__.__name__
+    def _postorder_visit(self, method_name, *args):
+        part_results = [part._postorder_visit(method_name, *args)
+                        for part in self.parts]
+        method = getattr(self, method_name, self._propagate)
+        return method(part_results, *args)
+    def _propagate(self, parts, *args):
+        return self.change_parts(parts)
+    def simplified(self):
+        return self._postorder_visit("_simplified")
+    def relaxed(self):
+        return self._postorder_visit("_relaxed")
+    def untyped(self):
+        return self._postorder_visit("_untyped")
+
+    def uniquify_variables(self, type_map, renamings={}):
+        # Cannot used _postorder_visit because this requires preorder
+        # for quantified effects.
+        if not self.parts:
+            return self
+        else:
+            return self.__class__([part.uniquify_variables(type_map, renamings)
+                                   for part in self.parts])
+    def to_untyped_strips(self):
+        raise ValueError("Not a STRIPS condition: %s" % self.__class__.__name__)
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        raise ValueError("Cannot instantiate condition: not normalized")
+    def free_variables(self):
+        result = set()
+        for part in self.parts:
+            result |= part.free_variables()
+        return result
+    def has_disjunction(self):
+        for part in self.parts:
+            if part.has_disjunction():
+                return True
+        return False
+    def has_existential_part(self):
+        for part in self.parts:
+            if part.has_existential_part():
+                return True
+        return False
+    def has_universal_part(self):
+        for part in self.parts:
+            if part.has_universal_part():
+                return True
+        return False
+
+class ConstantCondition(Condition):
+    __slots__ = []
+    parts = ()
+    @classmethod
+    def get_key(cls):
+        return (cls,)
+    def __init__(self):
+        self.hash = hash(self.__class__)
+    def get_key_args(self):
+        return ()
+    def change_parts(self, parts):
+        return self
+
+class Impossible(Exception):
+    pass
+
+class Falsity(ConstantCondition):
+    __slots__ = []
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        raise Impossible()
+    def negate(self):
+        return Truth()
+
+class Truth(ConstantCondition):
+    __slots__ = []
+    def to_untyped_strips(self):
+        return []
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        pass
+    def negate(self):
+        return Falsity()
+
+class JunctorCondition(Condition):
+    __slots__ = ["parts"]
+    def change_parts(self, parts):
+        return self.__class__(parts)
+
+class Conjunction(JunctorCondition):
+    __slots__ = []
+    def _simplified(self, parts):
+        result_parts = []
+        for part in parts:
+            if isinstance(part, Conjunction):
+                result_parts += part.parts
+            elif isinstance(part, Falsity):
+                return Falsity()
+            elif not isinstance(part, Truth):
+                result_parts.append(part)
+        if not result_parts:
+            return Truth()
+        if len(result_parts) == 1:
+            return result_parts[0]
+        return Conjunction(result_parts)
+    def to_untyped_strips(self):
+        result = []
+        for part in self.parts:
+            result += part.to_untyped_strips()
+        return result
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        assert not result, "Condition not simplified"
+        for part in self.parts:
+            part.instantiate(var_mapping, init_facts, fluent_facts, result)
+    def negate(self):
+        return Disjunction([p.negate() for p in self.parts])
+
+class Disjunction(JunctorCondition):
+    __slots__ = []
+    def _simplified(self, parts):
+        result_parts = []
+        for part in parts:
+            if isinstance(part, Disjunction):
+                result_parts += part.parts
+            elif isinstance(part, Truth):
+                return Truth()
+            elif not isinstance(part, Falsity):
+                result_parts.append(part)
+        if not result_parts:
+            return Falsity()
+        if len(result_parts) == 1:
+            return result_parts[0]
+        return Disjunction(result_parts)
+    def negate(self):
+        return Conjunction([p.negate() for p in self.parts])
+    def has_disjunction(self):
+        return True
+
+class QuantifiedCondition(Condition):
+    __slots__ = ["parameters", "parts"]
+    @classmethod
+    def get_key(cls, parameters, parts):
+        return (cls, tuple(parameters), tuple(parts))
+    def __init__(self, parameters: List[TypedObject],
+                 parts: List[Condition]) -> None:
+        assert len(parts) == 1
+        self.parameters = tuple(parameters)
+        self.parts = tuple(parts)
+        self.hash = hash((self.__class__, self.parameters, self.parts))
+    def get_key_args(self):
+        return (self.parameters, self.parts)
+    def _dump(self, indent="  "):
+        arglist = ", ".join(map(str, self.parameters))
+        return "%s %s" % (self.__class__.__name__, arglist)
+    def _simplified(self, parts):
+        if isinstance(parts[0], ConstantCondition):
+            return parts[0]
+        else:
+            return self._propagate(parts)
+
+    def uniquify_variables(self, type_map, renamings={}):
+        renamings = dict(renamings) # Create a copy.
+        new_parameters = [par.uniquify_name(type_map, renamings)
+                          for par in self.parameters]
+        new_parts = (self.parts[0].uniquify_variables(type_map, renamings),)
+        return self.__class__(new_parameters, new_parts)
+
+    def free_variables(self):
+        result = Condition.free_variables(self)
+        for par in self.parameters:
+            result.discard(par.name)
+        return result
+    def change_parts(self, parts):
+        return self.__class__(self.parameters, parts)
+
+class UniversalCondition(QuantifiedCondition):
+    __slots__ = []
+    def _untyped(self, parts):
+        type_literals = [par.get_atom().negate() for par in self.parameters]
+        return UniversalCondition(self.parameters,
+                                  [Disjunction(type_literals + parts)])
+    def negate(self):
+        return ExistentialCondition(self.parameters, [p.negate() for p in self.parts])
+    def has_universal_part(self):
+        return True
+
+class ExistentialCondition(QuantifiedCondition):
+    __slots__ = []
+    def _untyped(self, parts):
+        type_literals = [par.get_atom() for par in self.parameters]
+        return ExistentialCondition(self.parameters,
+                                    [Conjunction(type_literals + parts)])
+    def negate(self):
+        return UniversalCondition(self.parameters, [p.negate() for p in self.parts])
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        assert not result, "Condition not simplified"
+        self.parts[0].instantiate(var_mapping, init_facts, fluent_facts, result)
+    def has_existential_part(self):
+        return True
+
+class Literal(Condition):
+    __slots__ = ["predicate", "args"]
+    parts = ()
+    @classmethod
+    def get_key(cls, predicate, args):
+        return (cls, predicate, tuple(args))
+    def __init__(self, predicate: str, args: List[str]) -> None:
+        self.predicate = predicate
+        self.args = tuple(args)
+        self.hash = hash((self.__class__, self.predicate, self.args))
+    def get_key_args(self):
+        return (self.predicate, self.args)
+    @property
+    def key(self):
+        return str(self.predicate), self.args
+    def __lt__(self, other):
+        return self.key < other.key
+    def __le__(self, other):
+        return self.key <= other.key
+    def __str__(self):
+        return "%s %s(%s)" % (self.__class__.__name__, self.predicate,
+                              ", ".join(map(str, self.args)))
+    def __repr__(self):
+        return '<%s>' % self
+    def _dump(self):
+        return str(self)
+    def change_parts(self, parts):
+        return self
+    def uniquify_variables(self, type_map, renamings={}):
+        return self.rename_variables(renamings)
+    def rename_variables(self, renamings):
+        new_args = tuple(renamings.get(arg, arg) for arg in self.args)
+        return self.__class__(self.predicate, new_args)
+    def replace_argument(self, position, new_arg):
+        new_args = list(self.args)
+        new_args[position] = new_arg
+        return self.__class__(self.predicate, new_args)
+    def free_variables(self):
+        return {arg for arg in self.args if arg[0] == "?"}
+
+class Atom(Literal):
+    __slots__ = []
+    negated = False
+    def to_untyped_strips(self):
+        return [self]
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        # init_facts is a FactIndex (see fact_index), which knows the
+        # reachable fluent facts, so we do not need to check fluent_facts.
+        args = tuple([var_mapping.get(arg, arg) for arg in self.args])
+        static_args = init_facts.get_static_args(self.predicate)
+        if static_args is not None:
+            if args not in static_args:
+                raise Impossible()
+        else:
+            atom = init_facts.get_fluent_atom(self.predicate, args)
+            if atom is None:
+                # Unreachable fluent atoms are also false initially.
+                raise Impossible()
+            result.append(atom)
+    def negate(self):
+        return NegatedAtom(self.predicate, self.args)
+    def positive(self):
+        return self
+
+class NegatedAtom(Literal):
+    __slots__ = []
+    negated = True
+    def _relaxed(self, parts):
+        return Truth()
+    def instantiate(self, var_mapping, init_facts, fluent_facts, result):
+        args = tuple([var_mapping.get(arg, arg) for arg in self.args])
+        static_args = init_facts.get_static_args(self.predicate)
+        if static_args is not None:
+            if args in static_args:
+                raise Impossible()
+        else:
+            negated_atom = init_facts.get_negated_fluent_atom(
+                self.predicate, args)
+            if negated_atom is not None:
+                result.append(negated_atom)
+    def negate(self):
+        return Atom(self.predicate, self.args)
+    positive = negate
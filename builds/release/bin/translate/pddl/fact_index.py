@@ -0,0 +1,85 @@
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+
+from .conditions import Atom, NegatedAtom
+
+Args = Tuple[str, ...]
+
+
+class FactIndex:
+    """Index of the facts needed for instantiating actions, axioms and
+    the goal (see Action.instantiate).
+
+    Static predicates (those that are not fluent) only have the facts
+    of the initial state, which we store as sets of argument tuples per
+    predicate, so that static conditions can be checked without creating
+    and hashing new atoms. For looking up static facts with some bound
+    arguments, we build an index per bound-argument pattern on demand.
+    Fluent facts are stored per predicate as dictionaries that map
+    argument tuples to the existing atoms, which can then be reused
+    instead of new atoms. The same holds for the negations of fluent
+    atoms, which we create on demand and keep alive for as long as the
+    index exists, so that they are interned only once (see
+    pddl.conditions)."""
+    def __init__(self, init_facts: Iterable[Atom], fluent_facts: Iterable[Atom],
+                 fluent_predicates: Set[str]) -> None:
+        self.init_facts = set(init_facts)
+        self.fluent_predicates = fluent_predicates
+        self.static_args: Dict[str, Set[Args]] = defaultdict(set)
+        for atom in self.init_facts:
+            if atom.predicate not in fluent_predicates:
+                self.static_args[atom.predicate].add(atom.args)
+        self.fluent_atoms: Dict[str, Dict[Args, Atom]] = defaultdict(dict)
+        for atom in fluent_facts:
+            self.fluent_atoms[atom.predicate][atom.args] = atom
+        self.pattern_indices: Dict[Tuple[str, Tuple[int, ...]],
+                                   Dict[Args, Set[Args]]] = {}
+        self.negated_atoms: Dict[Atom, NegatedAtom] = {}
+
+    def __contains__(self, atom: Atom) -> bool:
+        """Return True iff the atom is true in the initial state."""
+        return atom in self.init_facts
+
+    def get_static_args(self, predicate: str) -> Optional[Set[Args]]:
+        """Return the argument tuples of the initial facts of the static
+        predicate, or None if the predicate is fluent."""
+        if predicate in self.fluent_predicates:
+            return None
+        return self.static_args.get(predicate, _NO_ARGS)
+
+    def get_fluent_atom(self, predicate: str, args: Args) -> Optional[Atom]:
+        """Return the reachable fluent atom with the given predicate and
+        arguments, or None if there is none."""
+        atoms = self.fluent_atoms.get(predicate)
+        if atoms is None:
+            return None
+        return atoms.get(args)
+
+    def get_negated_fluent_atom(self, predicate: str,
+                                args: Args) -> Optional[NegatedAtom]:
+        """Return the negation of the reachable fluent atom with the given
+        predicate and arguments, or None if there is none."""
+        atom = self.get_fluent_atom(predicate, args)
+        if atom is None:
+            return None
+        negated_atom = self.negated_atoms.get(atom)
+        if negated_atom is None:
+            negated_atom = self.negated_atoms[atom] = atom.negate()
+        return negated_atom
+
+    def get_matching_static_args(self, predicate: str,
+                                 bound_positions: Tuple[int, ...],
+                                 bound_values: Args) -> Set[Args]:
+        """Return the argument tuples of the initial facts of the static
+        predicate that have the given values at the given positions."""
+        key = (predicate, bound_positions)
+        index = self.pattern_indices.get(key)
+        if index is None:
+            index = defaultdict(set)
+            for args in self.get_static_args(predicate):
+                index[tuple(args[pos] for pos in bound_positions)].add(args)
+            self.pattern_indices[key] = index
+        return index.get(bound_values, _NO_ARGS)
+
+
+_NO_ARGS: FrozenSet[Args] = frozenset()
@@ -0,0 +1,76 @@
+"""Backward relevance analysis on the predicate level.
+
+A predicate is relevant if it occurs in the goal, in the condition of
+an axiom for a relevant derived predicate, or in the precondition or
+an effect condition of a relevant action. An action is relevant if it
+has an (add or delete) effect on a relevant predicate.
+
+Actions and axioms that are not relevant can be removed from the task
+without affecting plan existence or plan costs: omitting all
+irrelevant actions from a plan yields a plan that is still valid and
+not more expensive. Since the analysis works on the lifted
+(normalized) task, we can remove irrelevant action schemas before
+computing the relaxed reachability model, which reduces the model
+size and the grounding time.
+"""
+
+from collections import defaultdict
+
+import pddl
+
+
+def collect_predicates(condition, result):
+    if isinstance(condition, pddl.Literal):
+        result.add(condition.predicate)
+    else:
+        for part in condition.parts:
+            collect_predicates(part, result)
+
+
+def get_action_condition_predicates(action):
+    predicates = set()
+    collect_predicates(action.precondition, predicates)
+    for effect in action.effects:
+        collect_predicates(effect.condition, predicates)
+    return predicates
+
+
+def compute_relevant_actions_and_axioms(task):
+    """Return the lists of relevant actions and relevant axioms of the
+    normalized task, in the order in which they occur in the task."""
+    actions_by_effect_predicate = defaultdict(list)
+    for action in task.actions:
+        for effect in action.effects:
+            actions_by_effect_predicate[effect.literal.predicate].append(action)
+    axioms_by_predicate = defaultdict(list)
+    for axiom in task.axioms:
+        axioms_by_predicate[axiom.name].append(axiom)
+
+    goal_predicates = set()
+    collect_predicates(task.goal, goal_predicates)
+    relevant_predicates = set(goal_predicates)
+    queue = list(goal_predicates)
+    relevant_actions = set()
+    relevant_axioms = set()
+
+    def mark_relevant(predicates):
+        for predicate in predicates:
+            if predicate not in relevant_predicates:
+                relevant_predicates.add(predicate)
+                queue.append(predicate)
+
+    while queue:
+        predicate = queue.pop()
+        for action in actions_by_effect_predicate[predicate]:
+            if action not in relevant_actions:
+                relevant_actions.add(action)
+                mark_relevant(get_action_condition_predicates(action))
+        for axiom in axioms_by_predicate[predicate]:
+            if axiom not in relevant_axioms:
+                relevant_axioms.add(axiom)
+                axiom_predicates = set()
+                collect_predicates(axiom.condition, axiom_predicates)
+                mark_relevant(axiom_predicates)
+
+    return ([action for action in task.actions if action in relevant_actions],
+            [axiom for axiom in task.axioms if axiom in relevant_axioms])
@@ -0,0 +1,57 @@
+import pytest
+
+import pddl
+
+
+def make_index():
+    init = [pddl.Atom("connected", ["a", "b"]),
+            pddl.Atom("connected", ["a", "c"]),
+            pddl.Atom("connected", ["b", "c"]),
+            pddl.Atom("at", ["a"])]
+    fluent_facts = [pddl.Atom("at", ["a"]), pddl.Atom("at", ["b"])]
+    return pddl.FactIndex(init, fluent_facts, {"at"}), fluent_facts
+
+
+def test_static_and_fluent_lookups():
+    index, fluent_facts = make_index()
+    assert pddl.Atom("connected", ["a", "b"]) in index
+    assert index.get_static_args("at") is None
+    assert index.get_static_args("unknown") == set()
+    assert index.get_fluent_atom("at", ("b",)) is fluent_facts[1]
+    assert index.get_matching_static_args("connected", (0,), ("a",)) == {
+        ("a", "b"), ("a", "c")}
+    assert index.get_matching_static_args("connected", (1,), ("a",)) == set()
+
+
+def test_literal_instantiation():
+    index, fluent_facts = make_index()
+    mapping = {"?x": "a", "?y": "b"}
+    result = []
+    pddl.Atom("connected", ["?x", "?y"]).instantiate(
+        mapping, index, set(fluent_facts), result)
+    pddl.Atom("at", ["?y"]).instantiate(
+        mapping, index, set(fluent_facts), result)
+    pddl.NegatedAtom("at", ["?x"]).instantiate(
+        mapping, index, set(fluent_facts), result)
+    assert result == [pddl.Atom("at", ["b"]), pddl.NegatedAtom("at", ["a"])]
+    with pytest.raises(pddl.conditions.Impossible):
+        pddl.Atom("connected", ["?y", "?x"]).instantiate(
+            mapping, index, set(fluent_facts), result)
+    with pytest.raises(pddl.conditions.Impossible):
+        pddl.NegatedAtom("connected", ["?x", "?y"]).instantiate(
+            mapping, index, set(fluent_facts), result)
+
+
+def test_universal_effect_instantiation():
+    index, fluent_facts = make_index()
+    effect = pddl.Effect(
+        [pddl.TypedObject("?z", "object")],
+        pddl.Conjunction([pddl.Atom("connected", ["?x", "?z"]),
+                          pddl.Atom("at", ["?z"])]),
+        pddl.NegatedAtom("at", ["?z"]))
+    objects_by_type = {"object": ["a", "b", "c"]}
+    result = []
+    effect.instantiate({"?x": "a"}, index, set(fluent_facts),
+                       objects_by_type, result)
+    assert result == [([pddl.Atom("at", ["b"])],
+                       pddl.NegatedAtom("at", ["b"]))]
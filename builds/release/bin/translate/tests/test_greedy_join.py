@@ -0,0 +1,31 @@
+import itertools
+
+import greedy_join
+import join_statistics
+import pddl
+from pddl_to_prolog import Rule
+
+
+def make_rule():
+    conditions = [pddl.Atom("a", ["?y"]),
+                  pddl.Atom("s", ["?y", "?z"]),
+                  pddl.Atom("t", ["?z", "?w"])]
+    return Rule(conditions, pddl.Atom("goal", ["?w"]))
+
+
+def get_first_join(statistics):
+    names = ("p$%d" % count for count in itertools.count())
+    rules = greedy_join.greedy_join(make_rule(), names, statistics)
+    join = next(rule for rule in rules if rule.type == "join")
+    return sorted(cond.predicate for cond in join.conditions)
+
+
+def test_join_order_without_statistics():
+    assert get_first_join(None) == ["a", "s"]
+
+
+def test_join_order_with_statistics():
+    facts = ([pddl.Atom("s", ["y%d" % i, "z%d" % i]) for i in range(10)] +
+             [pddl.Atom("t", ["z0", "w0"])])
+    statistics = join_statistics.JoinStatistics(facts, {"s", "t"})
+    assert get_first_join(statistics) == ["s", "t"]
@@ -0,0 +1,38 @@
+import normalize
+import pddl_parser
+import relevance_analysis
+
+DOMAIN = """
+(define (domain paint)
+  (:predicates (at ?b ?r) (connected ?r1 ?r2) (color ?b ?c) (painted ?b)
+               (goal-room ?r) (delivered ?b))
+  (:derived (delivered ?b) (exists (?r) (and (goal-room ?r) (at ?b ?r))))
+  (:derived (painted ?b) (exists (?c) (color ?b ?c)))
+  (:action move :parameters (?b ?from ?to)
+    :precondition (and (at ?b ?from) (connected ?from ?to))
+    :effect (and (at ?b ?to) (not (at ?b ?from))))
+  (:action paint :parameters (?b ?c)
+    :precondition (at ?b ?b)
+    :effect (color ?b ?c)))
+"""
+
+PROBLEM = """
+(define (problem p) (:domain paint)
+  (:objects b r1 r2 c)
+  (:init (at b r1) (connected r1 r2) (goal-room r2))
+  (:goal (delivered b)))
+"""
+
+
+def test_relevance_analysis(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    problem_file = tmp_path / "problem.pddl"
+    domain_file.write_text(DOMAIN)
+    problem_file.write_text(PROBLEM)
+    task = pddl_parser.open(domain_filename=str(domain_file),
+                            task_filename=str(problem_file))
+    normalize.normalize(task)
+    actions, axioms = relevance_analysis.compute_relevant_actions_and_axioms(
+        task)
+    assert [action.name for action in actions] == ["move"]
+    assert [axiom.name for axiom in axioms] == ["delivered"]
@@ -0,0 +1,96 @@
+from io import StringIO
+import re
+
+import normalize
+import pddl_parser
+import pddl_to_prolog
+
+DOMAIN = """
+(define (domain lights)
+  (:predicates (on ?x) (connected ?x ?y) (seen ?x ?y) (ready))
+  (:action switch :parameters (?x ?y ?z)
+    :precondition (and (on ?x) (connected ?x ?y) (connected ?y ?z)
+                       (connected ?z ?x) (on ?z))
+    :effect (and (on ?y) (seen ?x ?x)))
+  (:action look :parameters (?x ?y)
+    :precondition (on ?x)
+    :effect (seen ?x ?y))
+  (:action start :parameters ()
+    :precondition ()
+    :effect (ready)))
+"""
+
+PROBLEM = """
+(define (problem p) (:domain lights)
+  (:objects a b c)
+  (:init (on a) (connected a b) (connected b c) (connected c a))
+  (:goal (and (on c) (ready))))
+"""
+
+
+DOMAIN_WITH_AXIOMS = """
+(define (domain reach)
+  (:predicates (edge ?x ?y) (at ?x) (reachable ?x))
+  (:derived (reachable ?x) (at ?x))
+  (:derived (reachable ?y) (exists (?x) (and (reachable ?x) (edge ?x ?y))))
+  (:action move :parameters (?x ?y)
+    :precondition (and (at ?x) (edge ?x ?y))
+    :effect (and (at ?y) (not (at ?x)))))
+"""
+
+PROBLEM_WITH_AXIOMS = """
+(define (problem p) (:domain reach)
+  (:objects a b c)
+  (:init (at a) (edge a b) (edge b c))
+  (:goal (reachable c)))
+"""
+
+
+def parse_task(tmp_path, domain, problem):
+    domain_file = tmp_path / "domain.pddl"
+    problem_file = tmp_path / "problem.pddl"
+    domain_file.write_text(domain)
+    problem_file.write_text(problem)
+    task = pddl_parser.open(domain_filename=str(domain_file),
+                            task_filename=str(problem_file))
+    normalize.normalize(task)
+    return task
+
+
+def get_program_dump(task, rule_cache_dir=None):
+    prog = pddl_to_prolog.translate(task, rule_cache_dir=rule_cache_dir)
+    stream = StringIO()
+    prog.dump(stream)
+    return stream.getvalue()
+
+
+def test_cached_rules_match_compiled_rules(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    problem_file = tmp_path / "problem.pddl"
+    domain_file.write_text(DOMAIN)
+    problem_file.write_text(PROBLEM)
+    task = pddl_parser.open(domain_filename=str(domain_file),
+                            task_filename=str(problem_file))
+    normalize.normalize(task)
+    expected = get_program_dump(task)
+    cache_dir = tmp_path / "cache"
+    # The first run fills the cache, the second one uses it.
+    assert get_program_dump(task, str(cache_dir)) == expected
+    assert len(list(cache_dir.iterdir())) == 1
+    assert get_program_dump(task, str(cache_dir)) == expected
+
+
+def test_rules_with_action_and_axiom_conditions_are_cached(tmp_path, capsys):
+    cache_dir = str(tmp_path / "cache")
+    task = parse_task(tmp_path, DOMAIN_WITH_AXIOMS, PROBLEM_WITH_AXIOMS)
+    get_program_dump(task, cache_dir)
+    # Parse the task again, so that the rules refer to new action and
+    # axiom objects.
+    task = parse_task(tmp_path, DOMAIN_WITH_AXIOMS, PROBLEM_WITH_AXIOMS)
+    expected = get_program_dump(task)
+    capsys.readouterr()
+    assert get_program_dump(task, cache_dir) == expected
+    output = capsys.readouterr().out
+    num_hits, num_lookups = re.search(
+        r"(\d+) of (\d+) rules found in rule cache", output).groups()
+    assert num_hits == num_lookups
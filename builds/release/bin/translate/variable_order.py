@@ -0,0 +1,396 @@
+from array import array
+from collections import Counter, defaultdict, deque
+from itertools import chain
+import heapq
+
+import sas_tasks
+import sccs
+import timers
+
+DEBUG = False
+# Use NumPy (if available) to build causal graphs with at least this many
+# (non-unique) edges. We only import NumPy in this case because importing it
+# is comparatively expensive.
+NUMPY_MIN_EDGES = 100000
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+class CausalGraph:
+    """Weighted causal graph used for defining a variable order.
+
+    The causal graph only contains pre->eff edges (in contrast to the
+    variant that also has eff<->eff edges).
+
+    The variable order is defined such that removing all edges v->v'
+    with v>v' induces an acyclic subgraph of the causal graph. This
+    corresponds to the pruning of the causal graph as described in the
+    JAIR 2006 Fast Downward paper for the causal graph heuristic. The
+    greedy method is based on weighting the edges of the causal graph.
+    In this implementation these weights slightly differ from the
+    description in the JAIR paper to reproduce the behaviour of the
+    original implementation in the preprocessor component of the
+    planner.
+
+    The graph is stored in compressed sparse row format: the weighted
+    edges leaving variable v are (targets[i], weights[i]) for
+    offsets[v] <= i < offsets[v + 1], sorted by target.
+    """
+
+    def __init__(self, sas_task):
+        self.num_variables = len(sas_task.variables.ranges)
+        self.goal_map = dict(sas_task.goal.pairs)
+        self.ordering = []
+
+        edge_keys = array("q")
+        self.collect_edges_from_ops(sas_task.operators, edge_keys)
+        self.collect_edges_from_axioms(sas_task.axioms, edge_keys)
+        self.build_weighted_graph(edge_keys)
+
+    def get_ordering(self):
+        if not self.ordering:
+            sccs = self.get_strongly_connected_components()
+            self.calculate_topological_pseudo_sort(sccs)
+        return self.ordering
+
+    def get_successors(self, var):
+        begin, end = self.offsets[var], self.offsets[var + 1]
+        return self.targets[begin:end]
+
+    def get_weighted_successors(self, var):
+        begin, end = self.offsets[var], self.offsets[var + 1]
+        return zip(self.targets[begin:end], self.weights[begin:end])
+
+    def collect_edges_from_ops(self, operators, edge_keys):
+        ### Each edge source->target is encoded as the integer
+        ### source * num_variables + target and occurs once for every
+        ### time it is encountered, i.e., its weight is the number of
+        ### its occurrences.
+        ###
+        ### A source variable can be processed several times. This was
+        ### probably not intended originally but in experiments (cf.
+        ### issue26) it performed better than the (clearer) weighting
+        ### described in the Fast Downward paper (which would require
+        ### a more complicated implementation).
+        if isinstance(operators, sas_tasks.SASOperatorTable):
+            self.collect_edges_from_op_table(operators, edge_keys)
+            return
+        num_variables = self.num_variables
+        append = edge_keys.append
+        for op in operators:
+            source_vars = [var for (var, value) in op.prevail]
+            for var, pre, _, _ in op.pre_post:
+                if pre != -1:
+                    source_vars.append(var)
+
+            for target, _, _, cond in op.pre_post:
+                for source in chain(source_vars, (var for var, _ in cond)):
+                    if source != target:
+                        append(source * num_variables + target)
+
+    def collect_edges_from_op_table(self, table, edge_keys):
+        # Same as collect_edges_from_ops, but works directly on the
+        # arrays of the operator table.
+        num_variables = self.num_variables
+        append = edge_keys.append
+        prevail_vars = table.prevail_vars
+        effect_vars = table.effect_vars
+        effect_pres = table.effect_pres
+        condition_starts = table.condition_starts
+        condition_vars = table.condition_vars
+        for op in range(len(table)):
+            eff_begin = table.effect_starts[op]
+            eff_end = table.effect_starts[op + 1]
+            source_vars = prevail_vars[
+                table.prevail_starts[op]:table.prevail_starts[op + 1]].tolist()
+            for eff in range(eff_begin, eff_end):
+                if effect_pres[eff] != -1:
+                    source_vars.append(effect_vars[eff])
+            for eff in range(eff_begin, eff_end):
+                target = effect_vars[eff]
+                for source in chain(source_vars, condition_vars[
+                        condition_starts[eff]:condition_starts[eff + 1]]):
+                    if source != target:
+                        append(source * num_variables + target)
+
+    def collect_edges_from_axioms(self, axioms, edge_keys):
+        num_variables = self.num_variables
+        for ax in axioms:
+            target = ax.effect[0]
+            for source, _ in ax.condition:
+                if source != target:
+                    edge_keys.append(source * num_variables + target)
+
+    def build_weighted_graph(self, edge_keys):
+        numpy = None
+        if len(edge_keys) >= NUMPY_MIN_EDGES:
+            numpy = _import_numpy()
+        if numpy is not None:
+            keys, weights = numpy.unique(
+                numpy.frombuffer(edge_keys, dtype=numpy.int64),
+                return_counts=True)
+            sources = keys // self.num_variables
+            self.targets = (keys % self.num_variables).tolist()
+            self.weights = weights.tolist()
+            self.offsets = numpy.searchsorted(
+                sources, numpy.arange(self.num_variables + 1)).tolist()
+        else:
+            key_to_weight = Counter(edge_keys)
+            self.targets = []
+            self.weights = []
+            self.offsets = [0] * (self.num_variables + 1)
+            for key in sorted(key_to_weight):
+                source, target = divmod(key, self.num_variables)
+                self.targets.append(target)
+                self.weights.append(key_to_weight[key])
+                self.offsets[source + 1] += 1
+            for var in range(self.num_variables):
+                self.offsets[var + 1] += self.offsets[var]
+
+    def get_strongly_connected_components(self):
+        unweighted_graph = [self.get_successors(var)
+                            for var in range(self.num_variables)]
+        return sccs.get_sccs_adjacency_list(unweighted_graph)
+
+    def calculate_topological_pseudo_sort(self, sccs):
+        for scc in sccs:
+            if len(scc) > 1:
+                # component needs to be turned into acyclic subgraph
+
+                # Compute subgraph induced by scc
+                scc_vars = set(scc)
+                subgraph = defaultdict(list)
+                for var in scc:
+                    # for each variable in component only list edges inside
+                    # component.
+                    subgraph_edges = subgraph[var]
+                    for target, cost in self.get_weighted_successors(var):
+                        if target in scc_vars:
+                            if target in self.goal_map:
+                                subgraph_edges.append((target, 100000 + cost))
+                            subgraph_edges.append((target, cost))
+
+                self.ordering.extend(MaxDAG(subgraph, scc).get_result())
+            else:
+                self.ordering.append(scc[0])
+
+    def get_predecessor_graph(self):
+        predecessors = [[] for _ in range(self.num_variables)]
+        for source in range(self.num_variables):
+            for target in self.get_successors(source):
+                predecessors[target].append(source)
+        return predecessors
+
+    def calculate_important_vars(self, goal):
+        predecessors = self.get_predecessor_graph()
+        necessary = [False] * self.num_variables
+        stack = []
+        for var, _ in goal.pairs:
+            if not necessary[var]:
+                necessary[var] = True
+                stack.append(var)
+        while stack:
+            var = stack.pop()
+            for pred in predecessors[var]:
+                if not necessary[pred]:
+                    necessary[pred] = True
+                    stack.append(pred)
+        return necessary
+
+
+class MaxDAG:
+    """Defines a variable ordering for a SCC of the (weighted) causal
+    graph.
+
+    Conceptually, the greedy algorithm successively picks a node with
+    minimal cummulated weight of incoming arcs and removes its
+    incident edges from the graph until only a single node remains
+    (cf. computation of total order of vertices when pruning the
+    causal graph in the Fast Downward JAIR 2006 paper).
+    """
+
+    def __init__(self, graph, input_order):
+        self.weighted_graph = graph
+        # input_order is only used to get the same tie-breaking as
+        # with the old preprocessor
+        self.input_order = input_order
+
+    def get_result(self):
+        incoming_weights = defaultdict(int)
+        for weighted_edges in self.weighted_graph.values():
+            for target, weight in weighted_edges:
+                incoming_weights[target] += weight
+
+        weight_to_nodes = defaultdict(deque)
+        for node in self.input_order:
+            weight = incoming_weights[node]
+            weight_to_nodes[weight].append(node)
+        weights = list(weight_to_nodes.keys())
+        heapq.heapify(weights)
+
+        done = set()
+        result = []
+        while weights:
+            min_key = weights[0]
+            min_elem = None
+            entries = weight_to_nodes[min_key]
+            while entries and (min_elem is None or min_elem in done or
+                               min_key > incoming_weights[min_elem]):
+                min_elem = entries.popleft()
+            if not entries:
+                del weight_to_nodes[min_key]
+                heapq.heappop(weights) # remove min_key from heap
+            if min_elem is None or min_elem in done:
+                # since we use lazy deletion from the heap weights,
+                # there can be weights with a "done" entry in
+                # weight_to_nodes
+                continue
+            done.add(min_elem)
+            result.append(min_elem)
+            for target, weight in self.weighted_graph[min_elem]:
+                if target not in done:
+                    weight = weight % 100000
+                    if weight == 0:
+                        continue
+                    old_in_weight = incoming_weights[target]
+                    new_in_weight = old_in_weight - weight
+                    incoming_weights[target] = new_in_weight
+
+                    # add new entry to weight_to_nodes
+                    if new_in_weight not in weight_to_nodes:
+                        heapq.heappush(weights, new_in_weight)
+                    weight_to_nodes[new_in_weight].append(target)
+        return result
+
+
+class VariableOrder:
+    """Apply a given variable order to a SAS task."""
+    def __init__(self, ordering, num_variables):
+        """Ordering is a list of variable numbers in the desired order.
+
+        If a variable does not occur in the ordering, it is removed
+        from the task.
+        """
+        self.ordering = ordering
+        # new_var[v] is the new number of variable v or -1 if v is removed.
+        self.new_var = [-1] * num_variables
+        for i, v in enumerate(ordering):
+            self.new_var[v] = i
+
+    def apply_to_task(self, sas_task):
+        self._apply_to_variables(sas_task.variables)
+        self._apply_to_init(sas_task.init)
+        self._apply_to_goal(sas_task.goal)
+        self._apply_to_mutexes(sas_task.mutexes)
+        self._apply_to_operators(sas_task.operators)
+        self._apply_to_axioms(sas_task.axioms)
+        if DEBUG:
+            sas_task.validate()
+
+    def _apply_to_variables(self, variables):
+        ranges = []
+        layers = []
+        names = []
+        for index, var in enumerate(self.ordering):
+            ranges.append(variables.ranges[var])
+            layers.append(variables.axiom_layers[var])
+            names.append(variables.value_names[var])
+        variables.ranges = ranges
+        variables.axiom_layers = layers
+        variables.value_names = names
+
+    def _apply_to_init(self, init):
+        init.values = [init.values[var] for var in self.ordering]
+
+    def _apply_to_goal(self, goal):
+        new_var = self.new_var
+        goal.pairs = sorted((new_var[var], val)
+                            for var, val in goal.pairs
+                            if new_var[var] != -1)
+
+    def _apply_to_mutexes(self, mutexes):
+        new_var = self.new_var
+        new_mutexes = []
+        for group in mutexes:
+            facts = [(new_var[var], val) for var, val in group.facts
+                     if new_var[var] != -1]
+            if facts and len({var for var, _ in facts}) > 1:
+                group.facts = facts
+                new_mutexes.append(group)
+        print("%s of %s mutex groups necessary." % (len(new_mutexes),
+                                                    len(mutexes)))
+        mutexes[:] = new_mutexes
+
+    def _apply_to_operators(self, operators):
+        if isinstance(operators, sas_tasks.SASOperatorTable):
+            num_operators = len(operators)
+            operators.renumber_variables(self.new_var)
+            print("%s of %s operators necessary." % (len(operators),
+                                                     num_operators))
+            return
+        # We renumber the operators in place and move the necessary
+        # operators to the front of the list.
+        new_var = self.new_var
+        num_operators = len(operators)
+        num_new_ops = 0
+        for op in operators:
+            pre_post = []
+            for eff_var, pre, post, cond in op.pre_post:
+                new_eff_var = new_var[eff_var]
+                if new_eff_var != -1:
+                    new_cond = [(new_var[var], val) for var, val in cond
+                                if new_var[var] != -1]
+                    pre_post.append((new_eff_var, pre, post, new_cond))
+            if pre_post:
+                op.pre_post = pre_post
+                op.prevail = [(new_var[var], val)
+                              for var, val in op.prevail
+                              if new_var[var] != -1]
+                operators[num_new_ops] = op
+                num_new_ops += 1
+        del operators[num_new_ops:]
+        print("%s of %s operators necessary." % (num_new_ops,
+                                                 num_operators))
+
+    def _apply_to_axioms(self, axioms):
+        new_var = self.new_var
+        num_axioms = len(axioms)
+        num_new_axioms = 0
+        for ax in axioms:
+            eff_var, eff_val = ax.effect
+            if new_var[eff_var] != -1:
+                ax.condition = [(new_var[var], val)
+                                for var, val in ax.condition
+                                if new_var[var] != -1]
+                ax.effect = (new_var[eff_var], eff_val)
+                axioms[num_new_axioms] = ax
+                num_new_axioms += 1
+        del axioms[num_new_axioms:]
+        print("%s of %s axiom rules necessary." % (num_new_axioms,
+                                                   num_axioms))
+
+
+def find_and_apply_variable_order(sas_task, reorder_vars=True,
+                                  filter_unimportant_vars=True):
+    if reorder_vars or filter_unimportant_vars:
+        num_variables = len(sas_task.variables.ranges)
+        with timers.timing("Building causal graph"):
+            cg = CausalGraph(sas_task)
+        if reorder_vars:
+            with timers.timing("Computing variable order"):
+                order = cg.get_ordering()
+        else:
+            order = list(range(num_variables))
+        if filter_unimportant_vars:
+            with timers.timing("Computing necessary variables"):
+                necessary = cg.calculate_important_vars(sas_task.goal)
+            print("%s of %s variables necessary." % (sum(necessary),
+                                                     len(order)))
+            order = [var for var in order if necessary[var]]
+        with timers.timing("Applying variable order", block=True):
+            VariableOrder(order, num_variables).apply_to_task(sas_task)
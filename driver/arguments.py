@@ -278,6 +278,20 @@ def _set_translator_output_options(parser, args):
     args.translate_options += ["--sas-file", args.search_input]
 
 
+def _check_stream_sas_args(parser, args):
+    if not args.stream_sas:
+        return
+    if os.name != "posix":
+        returncodes.exit_with_driver_unsupported_error(
+            "--stream-sas is only supported on POSIX systems.")
+    if "translate" not in args.components or "search" not in args.components:
+        print_usage_and_exit_with_driver_input_error(
+            parser, "--stream-sas needs both the translate and the search component.")
+    if args.portfolio:
+        print_usage_and_exit_with_driver_input_error(
+            parser, "--stream-sas cannot be combined with --portfolio.")
+
+
 def _get_time_limit_in_seconds(limit, parser):
     match = re.match(r"^(\d+)(s|m|h)?$", limit, flags=re.I)
     if not match:
@@ -408,6 +422,12 @@ def parse_args():
         "--keep-sas-file", action="store_true",
         help="keep translator output file (implied by --sas-file, default: "
             "delete file if translator and search component are active)")
+    driver_other.add_argument(
+        "--stream-sas", action="store_true",
+        help="run translator and search component concurrently and pipe the "
+            "translator output directly into the search component instead of "
+            "going through the intermediate file (with --keep-sas-file or "
+            "--sas-file, the output is additionally written to disk)")
 
     driver_other.add_argument(
         "--portfolio", metavar="FILE",
@@ -483,5 +503,6 @@ def parse_args():
         _set_components_and_inputs(parser, args)
         if "translate" not in args.components or "search" not in args.components:
             args.keep_sas_file = True
+        _check_stream_sas_args(parser, args)
 
     return args
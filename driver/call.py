@@ -46,7 +46,24 @@ def _get_preexec_function(time_limit, memory_limit):
         return set_limits
 
 
-def check_call(nick, cmd, stdin=None, time_limit=None, memory_limit=None):
+def _check_call(cmd, on_start, **kwargs):
+    """Like subprocess.check_call, but pass the subprocess.Popen object
+    to on_start (if given) after starting the process."""
+    with subprocess.Popen(cmd, **kwargs) as process:
+        try:
+            if on_start is not None:
+                on_start(process)
+            returncode = process.wait()
+        except BaseException:
+            process.kill()
+            raise
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    return returncode
+
+
+def check_call(nick, cmd, stdin=None, time_limit=None, memory_limit=None,
+               on_start=None):
     print_call_settings(nick, cmd, stdin, time_limit, memory_limit)
 
     kwargs = {"preexec_fn": _get_preexec_function(time_limit, memory_limit)}
@@ -54,9 +71,21 @@ def check_call(nick, cmd, stdin=None, time_limit=None, memory_limit=None):
     sys.stdout.flush()
     if stdin:
         with open(stdin) as stdin_file:
-            return subprocess.check_call(cmd, stdin=stdin_file, **kwargs)
+            return _check_call(cmd, on_start, stdin=stdin_file, **kwargs)
     else:
-        return subprocess.check_call(cmd, **kwargs)
+        return _check_call(cmd, on_start, **kwargs)
+
+
+def start_process(nick, cmd, time_limit=None, memory_limit=None, **kwargs):
+    """Start cmd in the background with the given limits and return the
+    subprocess.Popen object. Additional keyword arguments are passed on
+    to subprocess.Popen."""
+    print_call_settings(nick, cmd, None, time_limit, memory_limit)
+
+    preexec_fn = _get_preexec_function(time_limit, memory_limit)
+
+    sys.stdout.flush()
+    return subprocess.Popen(cmd, preexec_fn=preexec_fn, **kwargs)
 
 
 def get_error_output_and_returncode(nick, cmd, time_limit=None, memory_limit=None):
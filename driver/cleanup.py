@@ -1,6 +1,8 @@
 from itertools import count
 import os
 
+from .plan_manager import get_manifest_file
+
 def _try_remove(f):
     try:
         os.remove(f)
@@ -11,6 +13,7 @@ def _try_remove(f):
 def cleanup_temporary_files(args):
     _try_remove(args.sas_file)
     _try_remove(args.plan_file)
+    _try_remove(get_manifest_file(args.plan_file))
 
     for i in count(1):
         if not _try_remove("%s.%s" % (args.plan_file, i)):
@@ -35,7 +35,13 @@ def main():
 
     exitcode = None
     for component in args.components:
-        if component == "translate":
+        if component == "translate" and args.stream_sas:
+            (exitcode, continue_execution) = run_components.run_translate_and_search(args)
+            component = "translate and search"
+        elif component == "search" and args.stream_sas:
+            # Already run together with the translator.
+            continue
+        elif component == "translate":
             (exitcode, continue_execution) = run_components.run_translate(args)
         elif component == "search":
             (exitcode, continue_execution) = run_components.run_search(args)
@@ -2,19 +2,43 @@ import itertools
 import os
 import os.path
 import re
+import threading
 
 from . import returncodes
 
 
 _PLAN_INFO_REGEX = re.compile(r"; cost = (\d+) \((unit cost|general cost)\)\n")
+# Number of bytes read at once when scanning plan files.
+_BLOCK_SIZE = 2 ** 16
 
 
 def _read_last_line(filename):
-    line = None
-    with open(filename) as input_file:
-        for line in input_file:
-            pass
-    return line
+    """Return the last line of the given file (including the trailing
+    newline, if any) or None for empty files. The file is read
+    backwards from its end, so only the last block(s) are read."""
+    with open(filename, "rb") as input_file:
+        pos = input_file.seek(0, os.SEEK_END)
+        data = b""
+        while pos > 0:
+            block_size = min(pos, _BLOCK_SIZE)
+            pos -= block_size
+            input_file.seek(pos)
+            data = input_file.read(block_size) + data
+            # Ignore a newline at the very end: it belongs to the last line.
+            newline_pos = data.rfind(b"\n", 0, len(data) - 1)
+            if newline_pos != -1:
+                return data[newline_pos + 1:].decode()
+    return data.decode() or None
+
+
+def _count_plan_steps(plan_filename):
+    """Return the number of actions in a complete plan file, i.e., the
+    number of lines without the cost footer."""
+    num_lines = 0
+    with open(plan_filename, "rb") as input_file:
+        for block in iter(lambda: input_file.read(_BLOCK_SIZE), b""):
+            num_lines += block.count(b"\n")
+    return num_lines - 1
 
 
 def _parse_plan(plan_filename):
@@ -39,10 +63,20 @@ class PlanManager:
             portfolio_bound = "infinity"
         self._portfolio_bound = portfolio_bound
         self._single_plan = single_plan
+        # Plans may be processed both by a PlanMonitor thread while the
+        # search is running and by the main thread afterwards.
+        self._lock = threading.Lock()
 
     def get_plan_prefix(self):
         return self._plan_prefix
 
+    def get_manifest_file(self):
+        """Return the name of the file that lists the processed plans.
+
+        Each line of the manifest describes one plan file in the
+        format "<filename> <cost> <length>"."""
+        return get_manifest_file(self._plan_prefix)
+
     def get_plan_counter(self):
         return len(self._plan_costs)
 
@@ -67,13 +101,21 @@ class PlanManager:
             returncodes.exit_with_driver_critical_error("no plans found yet: cost type not set")
         return self._problem_type
 
-    def process_new_plans(self):
+    def process_new_plans(self, search_finished=True):
         """Update information about plans after a planner run.
 
         Read newly generated plans and store the relevant information.
-        If the last plan file is incomplete, delete it.
+        Each new plan is appended to the manifest file. If the last plan
+        file is incomplete, delete it.
+
+        If search_finished is False, the planner may still be writing
+        the last plan file, so we stop at the first incomplete plan
+        instead of deleting it.
         """
+        with self._lock:
+            self._process_new_plans(search_finished)
 
+    def _process_new_plans(self, search_finished):
         had_incomplete_plan = False
         for counter in itertools.count(self.get_plan_counter() + 1):
             plan_filename = self._get_plan_file(counter)
@@ -85,6 +127,8 @@ class PlanManager:
                 bogus_plan("plan found after incomplete plan")
             cost, problem_type = _parse_plan(plan_filename)
             if cost is None:
+                if not search_finished:
+                    break
                 had_incomplete_plan = True
                 print("%s is incomplete. Deleted the file." % plan_filename)
                 os.remove(plan_filename)
@@ -100,13 +144,33 @@ class PlanManager:
                     if cost >= self._plan_costs[-1]:
                         bogus_plan("plan quality has not improved")
                 self._plan_costs.append(cost)
+                self._add_to_manifest(
+                    plan_filename, cost, _count_plan_steps(plan_filename))
+
+    def _add_to_manifest(self, plan_filename, cost, length):
+        with open(self.get_manifest_file(), "a") as manifest:
+            manifest.write("%s %d %d\n" % (plan_filename, cost, length))
+
+    def get_manifest(self):
+        """Return a list of (filename, cost, length) triples for all
+        plans recorded in the manifest file."""
+        return read_manifest(self.get_manifest_file())
 
     def get_existing_plans(self):
         """Yield all plans that match the given plan prefix."""
         if os.path.exists(self._plan_prefix):
             yield self._plan_prefix
 
-        for counter in itertools.count(start=1):
+        # Plans listed in the manifest are known to exist, so we only
+        # need to probe for plans that have been written afterwards.
+        start = 1
+        for plan_filename, _, _ in self.get_manifest():
+            if plan_filename != self._get_plan_file(start):
+                break
+            yield plan_filename
+            start += 1
+
+        for counter in itertools.count(start=start):
             plan_filename = self._get_plan_file(counter)
             if os.path.exists(plan_filename):
                 yield plan_filename
@@ -115,8 +179,27 @@ class PlanManager:
 
     def delete_existing_plans(self):
         """Delete all plans that match the given plan prefix."""
-        for plan in self.get_existing_plans():
+        for plan in list(self.get_existing_plans()):
             os.remove(plan)
+        if os.path.exists(self.get_manifest_file()):
+            os.remove(self.get_manifest_file())
 
     def _get_plan_file(self, number):
         return "%s.%d" % (self._plan_prefix, number)
+
+
+def get_manifest_file(plan_prefix):
+    return "%s.manifest" % plan_prefix
+
+
+def read_manifest(manifest_filename):
+    """Return a list of (filename, cost, length) triples for all plans
+    listed in the given manifest file."""
+    if not os.path.exists(manifest_filename):
+        return []
+    plans = []
+    with open(manifest_filename) as manifest:
+        for line in manifest:
+            filename, cost, length = line.rsplit(None, 2)
+            plans.append((filename, int(cost), int(length)))
+    return plans
@@ -0,0 +1,167 @@
+"""Watch for new plan files while a search is running.
+
+A PlanMonitor calls PlanManager.process_new_plans(search_finished=False)
+whenever a new plan file may have been completed. On Linux, we use
+inotify to get notified about closed files in the plan directory. On
+other systems, we poll for the next plan file in regular intervals.
+
+With terminate_after_plan=True, the monitor terminates the watched
+search process (see PlanMonitor.watch_process) as soon as it has
+processed a new plan. Portfolios use this in single-plan mode, where
+the driver does not need further plans of the running configuration.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import threading
+
+# Flags from <sys/inotify.h>.
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+
+DEFAULT_POLL_INTERVAL = 1.0
+
+
+def _get_libc():
+    libc_name = ctypes.util.find_library("c")
+    if libc_name is None:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        # Check that the inotify functions exist.
+        libc.inotify_init1
+        libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+def _create_inotify_watch(directory):
+    """Return a file descriptor that becomes readable whenever a file in
+    the given directory is closed after writing or moved there, or
+    None if inotify is not available."""
+    libc = _get_libc()
+    if libc is None:
+        return None
+    fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+    if fd < 0:
+        return None
+    watch = libc.inotify_add_watch(
+        fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO)
+    if watch < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class PlanMonitor:
+    """Context manager that processes new plans of a PlanManager in a
+    background thread while the body of the with statement runs.
+
+    Errors in the background thread (e.g., the SystemExit raised for
+    bogus plans) terminate the watched process and are raised again
+    when the with statement is left."""
+    def __init__(self, plan_manager, poll_interval=DEFAULT_POLL_INTERVAL,
+                 terminate_after_plan=False):
+        self._plan_manager = plan_manager
+        self._poll_interval = poll_interval
+        self._terminate_after_plan = terminate_after_plan
+        # Protects the process and the termination flag, which are
+        # accessed by both threads.
+        self._process_lock = threading.Lock()
+        self._process = None
+        self._terminated_process = False
+        self._initial_plan_counter = None
+        self._error = None
+        self._thread = None
+        self._inotify_fd = None
+        self._wakeup_read_fd = None
+        self._wakeup_write_fd = None
+
+    def uses_inotify(self):
+        return self._inotify_fd is not None
+
+    def watch_process(self, process):
+        """Set the subprocess.Popen object of the search process that
+        writes the plans."""
+        with self._process_lock:
+            self._process = process
+            if self._terminate_after_plan and self._has_new_plan():
+                # The plan was processed before we knew the process.
+                self._terminate_process()
+
+    def terminated_process(self):
+        """Return True if the monitor terminated the watched process."""
+        with self._process_lock:
+            return self._terminated_process
+
+    def _has_new_plan(self):
+        return self._plan_manager.get_plan_counter() > self._initial_plan_counter
+
+    def _terminate_process(self):
+        # Must be called with self._process_lock held.
+        if self._process is not None and not self._terminated_process:
+            self._process.terminate()
+            self._terminated_process = True
+
+    def __enter__(self):
+        self._initial_plan_counter = self._plan_manager.get_plan_counter()
+        plan_dir = os.path.dirname(self._plan_manager.get_plan_prefix()) or "."
+        self._inotify_fd = _create_inotify_watch(plan_dir)
+        self._wakeup_read_fd, self._wakeup_write_fd = os.pipe()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        os.write(self._wakeup_write_fd, b"x")
+        self._thread.join()
+        for fd in [self._inotify_fd, self._wakeup_read_fd,
+                   self._wakeup_write_fd]:
+            if fd is not None:
+                os.close(fd)
+        self._thread = None
+        self._inotify_fd = None
+        self._wakeup_read_fd = None
+        self._wakeup_write_fd = None
+        error, self._error = self._error, None
+        # Do not hide an exception raised in the body of the with statement.
+        if error is not None and exc_type is None:
+            raise error
+
+    def _run(self):
+        try:
+            self._watch_plans()
+        except BaseException as err:
+            self._error = err
+            with self._process_lock:
+                self._terminate_process()
+
+    def _watch_plans(self):
+        fds = [self._wakeup_read_fd]
+        if self._inotify_fd is not None:
+            fds.append(self._inotify_fd)
+            # inotify tells us when to look, so no polling is necessary.
+            timeout = None
+        else:
+            timeout = self._poll_interval
+        while True:
+            readable, _, _ = select.select(fds, [], [], timeout)
+            if self._wakeup_read_fd in readable:
+                break
+            if self._inotify_fd in readable:
+                # We only need to know that something happened, so we
+                # discard the events.
+                try:
+                    while os.read(self._inotify_fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            self._plan_manager.process_new_plans(search_finished=False)
+            if self._terminate_after_plan and self._has_new_plan():
+                with self._process_lock:
+                    self._terminate_process()
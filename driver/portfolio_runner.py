@@ -22,6 +22,7 @@ from . import call
 from . import limits
 from . import returncodes
 from . import util
+from .plan_monitor import PlanMonitor
 
 
 DEFAULT_TIMEOUT = 1800
@@ -62,7 +63,8 @@ def adapt_args(args, search_cost_type, heuristic_cost_type, plan_manager):
             break
 
 
-def run_search(executable, args, sas_file, plan_manager, time, memory):
+def run_search(executable, args, sas_file, plan_manager, time, memory,
+               on_start=None):
     complete_args = [executable] + args + [
         "--internal-plan-file", plan_manager.get_plan_prefix()]
     print("args: %s" % complete_args)
@@ -70,7 +72,7 @@ def run_search(executable, args, sas_file, plan_manager, time, memory):
     try:
         exitcode = call.check_call(
             "search", complete_args, stdin=sas_file,
-            time_limit=time, memory_limit=memory)
+            time_limit=time, memory_limit=memory, on_start=on_start)
     except subprocess.CalledProcessError as err:
         exitcode = err.returncode
     print("exitcode: %d" % exitcode)
@@ -101,8 +103,16 @@ def run_sat_config(configs, pos, search_cost_type, heuristic_cost_type,
         args.extend([
             "--internal-previous-portfolio-plans",
             str(plan_manager.get_plan_counter())])
-    result = run_search(executable, args, sas_file, plan_manager, run_time, memory)
+    # Register plans as soon as they are written, not only after the run.
+    # In single-plan mode, we stop the search once it has found a plan.
+    single_plan = plan_manager.abort_portfolio_after_first_plan()
+    with PlanMonitor(plan_manager, terminate_after_plan=single_plan) as monitor:
+        result = run_search(executable, args, sas_file, plan_manager,
+                            run_time, memory, on_start=monitor.watch_process)
     plan_manager.process_new_plans()
+    if monitor.terminated_process():
+        print("Terminated search after its first plan.")
+        result = returncodes.SUCCESS
     return result
 
 
@@ -4,6 +4,7 @@ import os.path
 import shutil
 import subprocess
 import sys
+import threading
 
 from . import call
 from . import limits
@@ -26,6 +27,9 @@ REL_SEARCH_PATH = f"downward{BINARY_EXT}"
 # older version because this is what our build instructions recommend.
 VALIDATE = (shutil.which(f"validate{BINARY_EXT}") or
             shutil.which(f"Validate{BINARY_EXT}"))
+# Number of bytes forwarded at once from the translator to the search
+# component when streaming the SAS task.
+STREAM_CHUNK_SIZE = 2 ** 16
 
 
 def get_executable(build, rel_path):
@@ -68,7 +72,10 @@ def run_translate(args):
         cmd,
         time_limit=time_limit,
         memory_limit=memory_limit)
+    return _process_translate_result(stderr, returncode)
 
+
+def _process_translate_result(stderr, returncode):
     # We collect stderr of the translator and print it here, unless
     # the translator ran out of memory and all output in stderr is
     # related to MemoryError.
@@ -133,17 +140,141 @@ def run_search(args):
                 time_limit=time_limit,
                 memory_limit=memory_limit)
         except subprocess.CalledProcessError as err:
-            # TODO: if we ever add support for SEARCH_PLAN_FOUND_AND_* directly
-            # in the planner, this assertion no longer holds. Furthermore, we
-            # would need to return (err.returncode, True) if the returncode is
-            # in [0..10].
-            # Negative exit codes are allowed for passing out signals.
-            assert err.returncode >= 10 or err.returncode < 0, "got returncode < 10: {}".format(err.returncode)
-            return (err.returncode, False)
+            return _process_search_error(err.returncode)
         else:
             return (0, True)
 
 
+def _process_search_error(returncode):
+    # TODO: if we ever add support for SEARCH_PLAN_FOUND_AND_* directly
+    # in the planner, this assertion no longer holds. Furthermore, we
+    # would need to return (returncode, True) if the returncode is
+    # in [0..10].
+    # Negative exit codes are allowed for passing out signals.
+    assert returncode >= 10 or returncode < 0, "got returncode < 10: {}".format(returncode)
+    return (returncode, False)
+
+
+def _forward_sas_stream(source, start_search, sas_file):
+    """Copy the translator output from source to the stdin of the search
+    process (started lazily by calling start_search) and, if sas_file
+    is not None, to that file. Return the search process or None if the
+    translator produced no output."""
+    process = None
+    search_stdin = None
+    while True:
+        chunk = source.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        if process is None:
+            process = start_search()
+            search_stdin = process.stdin
+        if sas_file is not None:
+            sas_file.write(chunk)
+        if search_stdin is not None:
+            try:
+                search_stdin.write(chunk)
+            except BrokenPipeError:
+                # The search stopped reading its input (e.g. because it
+                # failed). Keep draining the pipe so that the translator
+                # does not block.
+                search_stdin = None
+    if search_stdin is not None:
+        try:
+            search_stdin.close()
+        except BrokenPipeError:
+            pass
+    return process
+
+
+def run_translate_and_search(args):
+    """Run translator and search concurrently. The translator writes the
+    SAS task into a pipe, which the driver forwards to the stdin of the
+    search component (and to args.sas_file if args.keep_sas_file is
+    set). The search component is started as soon as the first bytes of
+    the task arrive and parses the task while the translator is still
+    writing it.
+
+    Return a pair (exitcode, continue_execution) like the other run_*
+    functions."""
+    logging.info("Running translator and search (%s) with streamed "
+                 "translator output." % args.build)
+    translate_time_limit = limits.get_time_limit(
+        args.translate_time_limit, args.overall_time_limit)
+    translate_memory_limit = limits.get_memory_limit(
+        args.translate_memory_limit, args.overall_memory_limit)
+    search_time_limit = limits.get_time_limit(
+        args.search_time_limit, args.overall_time_limit)
+    search_memory_limit = limits.get_memory_limit(
+        args.search_memory_limit, args.overall_memory_limit)
+    translate = get_executable(args.build, REL_TRANSLATE_PATH)
+    executable = get_executable(args.build, REL_SEARCH_PATH)
+    if not args.search_options:
+        returncodes.exit_with_driver_input_error(
+            "search needs --alias, --portfolio, or search options")
+
+    plan_manager = PlanManager(args.plan_file)
+    plan_manager.delete_existing_plans()
+
+    read_fd, write_fd = os.pipe()
+    translate_options = list(args.translate_options)
+    sas_file_pos = translate_options.index("--sas-file") + 1
+    translate_options[sas_file_pos] = "/dev/fd/{}".format(write_fd)
+    assert sys.executable, "Path to interpreter could not be found"
+    translate_cmd = (
+        [sys.executable] + [translate] + args.translate_inputs +
+        translate_options)
+    translate_process = call.start_process(
+        "translator", translate_cmd,
+        time_limit=translate_time_limit,
+        memory_limit=translate_memory_limit,
+        stderr=subprocess.PIPE,
+        pass_fds=(write_fd,))
+    # Only the translator may hold the write end, so that we see the end
+    # of the stream as soon as the translator terminates.
+    os.close(write_fd)
+
+    translate_stderr = []
+    stderr_reader = threading.Thread(
+        target=lambda: translate_stderr.append(translate_process.stderr.read()))
+    stderr_reader.start()
+
+    search_options = args.search_options + [
+        "--internal-plan-file", args.plan_file]
+
+    def start_search():
+        return call.start_process(
+            "search", [executable] + search_options,
+            time_limit=search_time_limit,
+            memory_limit=search_memory_limit,
+            stdin=subprocess.PIPE)
+
+    with os.fdopen(read_fd, "rb") as source:
+        if args.keep_sas_file:
+            with open(args.sas_file, "wb") as sas_file:
+                search_process = _forward_sas_stream(
+                    source, start_search, sas_file)
+        else:
+            search_process = _forward_sas_stream(source, start_search, None)
+
+    translate_returncode = translate_process.wait()
+    stderr_reader.join()
+    translate_exitcode, continue_execution = _process_translate_result(
+        translate_stderr[0], translate_returncode)
+    if not continue_execution:
+        if search_process is not None:
+            # The search received an incomplete task.
+            search_process.kill()
+            search_process.wait()
+        return (translate_exitcode, False)
+
+    assert search_process is not None, "translator produced no output"
+    search_returncode = search_process.wait()
+    if search_returncode != 0:
+        return _process_search_error(search_returncode)
+    return (0, True)
+
+
 def run_validate(args):
     if not VALIDATE:
         returncodes.exit_with_driver_input_error(
@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 import subprocess
 import sys
+import time
 import traceback
 
 import pytest
@@ -16,6 +17,8 @@ from .aliases import ALIASES, PORTFOLIOS
 from .arguments import EXAMPLES
 from .call import check_call
 from . import limits
+from .plan_manager import PlanManager, _read_last_line
+from .plan_monitor import PlanMonitor
 from . import returncodes
 from .run_components import get_executable, REL_SEARCH_PATH
 from .util import REPO_ROOT_DIR, find_domain_filename
@@ -51,6 +54,22 @@ def test_show_aliases():
     run_driver(["--show-aliases"])
 
 
+def test_stream_sas():
+    task = "misc/tests/benchmarks/gripper/prob01.pddl"
+    streamed_sas = Path(REPO_ROOT_DIR) / "streamed.sas"
+    translated_sas = Path(REPO_ROOT_DIR) / "translated.sas"
+    try:
+        run_driver(["--stream-sas", "--sas-file", streamed_sas.name, task,
+                    "--search", "astar(blind())"])
+        assert (Path(REPO_ROOT_DIR) / "sas_plan").exists()
+        run_driver(["--translate", "--sas-file", translated_sas.name, task])
+        assert streamed_sas.read_text() == translated_sas.read_text()
+    finally:
+        for sas_file in [streamed_sas, translated_sas]:
+            if sas_file.exists():
+                sas_file.unlink()
+
+
 def test_portfolios():
     for name, portfolio in PORTFOLIOS.items():
         parameters = ["--portfolio", portfolio,
@@ -130,3 +149,78 @@ def test_automatic_domain_file_name_computation():
         for filename in filenames:
             if "domain" not in filename:
                 assert find_domain_filename(os.path.join(dirpath, filename))
+
+
+def _write_plan(filename, num_steps, cost, complete=True):
+    with open(filename, "w") as plan_file:
+        for step in range(num_steps):
+            print("(op%d)" % step, file=plan_file)
+        if complete:
+            print("; cost = %d (unit cost)" % cost, file=plan_file)
+
+
+def test_read_last_line(tmp_path):
+    plan = tmp_path / "plan"
+    plan.write_text("")
+    assert _read_last_line(plan) is None
+    plan.write_text("(op)\n" * 100000 + "; cost = 3 (unit cost)\n")
+    assert _read_last_line(plan) == "; cost = 3 (unit cost)\n"
+    plan.write_text("(op)\n(op")
+    assert _read_last_line(plan) == "(op"
+
+
+def test_plan_manager_manifest(tmp_path):
+    prefix = str(tmp_path / "sas_plan")
+    plan_manager = PlanManager(prefix)
+    _write_plan(prefix + ".1", 5, 5)
+    _write_plan(prefix + ".2", 3, 3)
+    _write_plan(prefix + ".3", 2, 2, complete=False)
+    plan_manager.process_new_plans(search_finished=False)
+    assert plan_manager.get_plan_counter() == 2
+    assert os.path.exists(prefix + ".3")
+    plan_manager.process_new_plans()
+    assert not os.path.exists(prefix + ".3")
+    assert PlanManager(prefix).get_manifest() == [
+        (prefix + ".1", 5, 5), (prefix + ".2", 3, 3)]
+    assert list(PlanManager(prefix).get_existing_plans()) == [
+        prefix + ".1", prefix + ".2"]
+    plan_manager.delete_existing_plans()
+    assert not os.listdir(tmp_path)
+
+
+def test_plan_monitor(tmp_path):
+    prefix = str(tmp_path / "sas_plan")
+    plan_manager = PlanManager(prefix)
+    with PlanMonitor(plan_manager, poll_interval=0.01):
+        _write_plan(prefix + ".1", 4, 4)
+        for _ in range(500):
+            if plan_manager.get_plan_counter() == 1:
+                break
+            time.sleep(0.01)
+    assert plan_manager.get_plan_counter() == 1
+    assert plan_manager.get_next_portfolio_cost_bound() == 4
+
+
+def test_plan_monitor_terminates_process_after_plan(tmp_path):
+    prefix = str(tmp_path / "sas_plan")
+    plan_manager = PlanManager(prefix, single_plan=True)
+    with PlanMonitor(plan_manager, poll_interval=0.01,
+                     terminate_after_plan=True) as monitor:
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        monitor.watch_process(process)
+        _write_plan(prefix + ".1", 4, 4)
+        process.wait(timeout=5)
+    assert monitor.terminated_process()
+    assert plan_manager.get_plan_counter() == 1
+
+
+def test_plan_monitor_reraises_errors(tmp_path):
+    prefix = str(tmp_path / "sas_plan")
+    plan_manager = PlanManager(prefix)
+    with pytest.raises(SystemExit) as excinfo:
+        with PlanMonitor(plan_manager, poll_interval=0.01):
+            _write_plan(prefix + ".1", 3, 3)
+            # Plans must improve, so the second plan is bogus.
+            _write_plan(prefix + ".2", 4, 4)
+            time.sleep(0.2)
+    assert excinfo.value.code == returncodes.DRIVER_CRITICAL_ERROR
@@ -0,0 +1,273 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Benchmark the translator phases.
+Translate the given benchmarks and synthetic scaled-up tasks (see
+pddl_generators), record the time and peak memory of each translator phase
+(i.e., of each timers.timing block), store the results for the current commit
+and report regressions compared to the results of an earlier commit.
+"""
+
+import argparse
+from collections import defaultdict
+import datetime
+import json
+from pathlib import Path
+import subprocess
+import sys
+import tempfile
+
+import pddl_generators
+
+
+DIR = Path(__file__).resolve().parent
+REPO = DIR.parents[1]
+TRANSLATOR = REPO / "src" / "translate" / "translate.py"
+DEFAULT_RESULTS_DIR = DIR / "translator-benchmark-results"
+DEFAULT_GENERATED_TASKS = [
+    "gripper:20,40,80", "miconic:10,20,40", "philosophers:5,10,20",
+    "satellite:2,4,6"]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=HELP)
+    parser.add_argument(
+        "suite", nargs="*", default=["all"],
+        help='Use "all" to benchmark all tasks in the benchmark directory '
+             '(default), "none" to benchmark no such task, or '
+             '"<domain>:<problem>" to benchmark individual tasks')
+    parser.add_argument(
+        "--benchmarks-dir", default=DIR / "benchmarks", type=Path,
+        help="path to benchmark directory (default: %(default)s)")
+    parser.add_argument(
+        "--generated", action="append", metavar="DOMAIN:SIZE[,SIZE,...]",
+        help="also benchmark generated tasks of the given sizes "
+             "(may be repeated, default: {}). Available domains: {}".format(
+                 " ".join(DEFAULT_GENERATED_TASKS),
+                 ", ".join(sorted(pddl_generators.GENERATORS))))
+    parser.add_argument(
+        "--skip-generated", action="store_true",
+        help="do not benchmark generated tasks")
+    parser.add_argument(
+        "--seed", type=int, default=pddl_generators.DEFAULT_SEED,
+        help="seed for generating tasks (default: %(default)s)")
+    parser.add_argument(
+        "--runs-per-task", type=int, default=3,
+        help="translate each task this many times and use the minimum "
+             "(default: %(default)d)")
+    parser.add_argument(
+        "--results-dir", default=DEFAULT_RESULTS_DIR, type=Path,
+        help="directory for storing results by commit (default: %(default)s)")
+    parser.add_argument(
+        "--compare-to", metavar="COMMIT",
+        help="compare to the results of this commit (default: the most recent "
+             "ancestor of HEAD with stored results)")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1,
+        help="report a regression if a phase takes more time or memory "
+             "than this fraction on top of the old value (default: %(default)s)")
+    parser.add_argument(
+        "--min-time-difference", type=float, default=0.05,
+        help="ignore time differences below this many seconds "
+             "(default: %(default)s)")
+    parser.add_argument(
+        "--min-memory-difference", type=int, default=1024,
+        help="ignore peak memory differences below this many KB "
+             "(default: %(default)s)")
+    args = parser.parse_args()
+    if args.generated is None:
+        args.generated = [] if args.skip_generated else DEFAULT_GENERATED_TASKS
+    return args
+
+
+def git(*args):
+    return subprocess.check_output(
+        ["git"] + list(args), cwd=REPO, encoding="utf-8").strip()
+
+
+def get_commit_key():
+    """Return the hash of HEAD with the suffix "-dirty" if the translator
+    has uncommitted changes."""
+    commit = git("rev-parse", "HEAD")
+    if git("status", "--porcelain", "--", "src/translate"):
+        commit += "-dirty"
+    return commit
+
+
+def get_results_file(results_dir, commit):
+    return results_dir / f"{commit}.json"
+
+
+def find_baseline_commit(results_dir, current_commit):
+    for commit in git("rev-list", "HEAD").splitlines():
+        if commit != current_commit and get_results_file(results_dir, commit).exists():
+            return commit
+    return None
+
+
+def get_benchmark_tasks(args):
+    """Return a list of (name, domain_file, problem_file) triples."""
+    tasks = []
+    for task in args.suite:
+        if task == "none":
+            continue
+        elif task == "all":
+            for domain_dir in sorted(args.benchmarks_dir.iterdir()):
+                if not domain_dir.is_dir():
+                    continue
+                for problem in sorted(domain_dir.glob("*.pddl")):
+                    if "domain" not in problem.name:
+                        tasks.append((
+                            f"{domain_dir.name}:{problem.name}",
+                            domain_dir / "domain.pddl", problem))
+        else:
+            domain, problem = task.split(":")
+            domain_dir = args.benchmarks_dir / domain
+            tasks.append((task, domain_dir / "domain.pddl", domain_dir / problem))
+    return tasks
+
+
+def get_generated_tasks(args, directory):
+    try:
+        specs = pddl_generators.parse_task_specs(args.generated)
+    except ValueError as err:
+        sys.exit(f"Error: {err}")
+    tasks = []
+    for domain, size in specs:
+        domain_file, problem_file = pddl_generators.write_task(
+            domain, size, directory, args.seed)
+        tasks.append((
+            f"generated-{domain}:{problem_file.name}",
+            domain_file, problem_file))
+    return tasks
+
+
+def translate(domain_file, problem_file, directory):
+    """Translate the task and return a dictionary mapping phase names to
+    their timing records."""
+    timings_file = Path(directory) / "timings.json"
+    cmd = [sys.executable, str(TRANSLATOR), str(domain_file), str(problem_file),
+           "--sas-file", str(Path(directory) / "output.sas"),
+           "--timings-file", str(timings_file)]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL)
+    except subprocess.CalledProcessError as err:
+        sys.exit(f"Call failed: {' '.join(cmd)}\n{err}")
+    phases = {}
+    occurrences = defaultdict(int)
+    for record in json.loads(timings_file.read_text()):
+        # Make names unique if a phase is run several times.
+        name = record["name"]
+        occurrences[name] += 1
+        if occurrences[name] > 1:
+            name = f"{name} #{occurrences[name]}"
+        phases[name] = {
+            "depth": record["depth"],
+            "wall_clock_time": record["wall_clock_time"],
+            "cpu_time": record["cpu_time"],
+            "peak_memory": record["peak_memory"],
+        }
+    return phases
+
+
+def _min_or_none(old, new):
+    """Return the minimum of the values that are not None (peak memory
+    is None if it could not be measured), or None if both are None."""
+    values = [value for value in [old, new] if value is not None]
+    return min(values) if values else None
+
+
+def benchmark_task(domain_file, problem_file, runs):
+    """Translate the task several times and keep the minimum time and
+    peak memory of each phase."""
+    best = None
+    with tempfile.TemporaryDirectory() as directory:
+        for _ in range(runs):
+            phases = translate(domain_file, problem_file, directory)
+            if best is None:
+                best = phases
+                continue
+            for name, record in phases.items():
+                if name not in best:
+                    best[name] = record
+                    continue
+                for attribute in ["wall_clock_time", "cpu_time", "peak_memory"]:
+                    best[name][attribute] = _min_or_none(
+                        best[name][attribute], record[attribute])
+    return best
+
+
+def find_regressions(args, results, baseline):
+    regressions = []
+    for task, phases in results.items():
+        for name, record in phases.items():
+            old_record = baseline.get(task, {}).get(name)
+            if old_record is None:
+                continue
+            for attribute, min_difference in [
+                    ("wall_clock_time", args.min_time_difference),
+                    ("peak_memory", args.min_memory_difference)]:
+                old, new = old_record[attribute], record[attribute]
+                if old is None or new is None:
+                    continue
+                if (new - old > min_difference and
+                        new > old * (1 + args.threshold)):
+                    regressions.append((task, name, attribute, old, new))
+    return regressions
+
+
+def print_results(results, baseline):
+    for task, phases in results.items():
+        print(f"{task}:")
+        for name, record in phases.items():
+            line = "  {}{:<{}} {:8.3f}s {!s:>10} KB".format(
+                "  " * record["depth"], name, 50 - 2 * record["depth"],
+                record["wall_clock_time"], record["peak_memory"])
+            old_record = baseline.get(task, {}).get(name)
+            if old_record is not None:
+                line += "  (before: {:.3f}s {} KB)".format(
+                    old_record["wall_clock_time"], old_record["peak_memory"])
+            print(line)
+
+
+def main():
+    args = parse_args()
+    commit = get_commit_key()
+    results = {}
+    with tempfile.TemporaryDirectory() as generated_dir:
+        tasks = get_benchmark_tasks(args) + get_generated_tasks(args, generated_dir)
+        for name, domain_file, problem_file in tasks:
+            print(f"Benchmark {name}", flush=True)
+            results[name] = benchmark_task(
+                domain_file, problem_file, args.runs_per_task)
+
+    args.results_dir.mkdir(parents=True, exist_ok=True)
+    results_file = get_results_file(args.results_dir, commit)
+    results_file.write_text(json.dumps({
+        "commit": commit,
+        "date": datetime.datetime.now().isoformat(),
+        "tasks": results,
+    }, indent=2))
+    print(f"Wrote results to {results_file}")
+
+    baseline_commit = args.compare_to or find_baseline_commit(
+        args.results_dir, commit)
+    baseline = {}
+    if baseline_commit is not None:
+        baseline_file = get_results_file(args.results_dir, baseline_commit)
+        if not baseline_file.exists():
+            sys.exit(f"Error: no results for commit {baseline_commit}")
+        baseline = json.loads(baseline_file.read_text())["tasks"]
+        print(f"Comparing to {baseline_commit}")
+    print_results(results, baseline)
+
+    regressions = find_regressions(args, results, baseline)
+    for task, name, attribute, old, new in regressions:
+        print(f"Regression: {task}, {name}, {attribute}: {old} -> {new}")
+    if regressions:
+        sys.exit(f"Error: found {len(regressions)} regressions.")
+
+
+if __name__ == "__main__":
+    main()
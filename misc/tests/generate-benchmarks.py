@@ -0,0 +1,47 @@
+#! /usr/bin/env python3
+
+
+HELP = """\
+Generate scaled-up tasks of the benchmark domains.
+The tasks are written in the same layout as the benchmarks directory (one
+subdirectory with a domain.pddl file per domain), so the output directory can
+be passed to the benchmark scripts, e.g., run_benchmarks.sh.
+"""
+
+import argparse
+import sys
+
+import pddl_generators
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=HELP)
+    parser.add_argument(
+        "tasks", nargs="+", metavar="DOMAIN:SIZE[,SIZE,...]",
+        help="domain and sizes of the tasks to generate. Available domains: "
+             "{}".format(", ".join(sorted(pddl_generators.GENERATORS))))
+    parser.add_argument(
+        "--output-dir", required=True,
+        help="directory for the generated tasks")
+    parser.add_argument(
+        "--seeds", default=str(pddl_generators.DEFAULT_SEED),
+        help="comma-separated list of seeds; one task is generated per "
+             "domain, size and seed (default: %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        tasks = pddl_generators.parse_task_specs(args.tasks)
+    except ValueError as err:
+        sys.exit(f"Error: {err}")
+    for domain, size in tasks:
+        for seed in args.seeds.split(","):
+            _, problem_file = pddl_generators.write_task(
+                domain, size, args.output_dir, int(seed))
+            print(f"Wrote {problem_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Generators for scaled-up instances of the domains in ../benchmarks.
+
+Each generator module defines the name of the benchmark directory that
+holds its domain file (DOMAIN) and a function generate_problem(size, rng)
+that returns the PDDL problem as a string. All random choices are made
+with rng, so a problem is determined by its domain, size and seed.
+"""
+
+from pathlib import Path
+import random
+
+from . import gripper
+from . import miconic
+from . import philosophers
+from . import satellite
+
+
+BENCHMARKS_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+GENERATORS = {
+    module.DOMAIN: module
+    for module in [gripper, miconic, philosophers, satellite]
+}
+DEFAULT_SEED = 2024
+
+
+def get_domain_file(domain):
+    return BENCHMARKS_DIR / GENERATORS[domain].DOMAIN / "domain.pddl"
+
+
+def get_problem_name(domain, size, seed=DEFAULT_SEED):
+    return f"{domain}-{size}-seed{seed}.pddl"
+
+
+def generate_problem(domain, size, seed=DEFAULT_SEED):
+    # Include the domain and the size in the seed to get independent
+    # random choices for different tasks with the same seed.
+    rng = random.Random(f"{domain}-{size}-{seed}")
+    return GENERATORS[domain].generate_problem(size, rng)
+
+
+def write_task(domain, size, directory, seed=DEFAULT_SEED):
+    """Write the domain file and a problem of the given size for the
+    given domain to directory/domain. Return the paths of both files."""
+    directory = Path(directory) / domain
+    directory.mkdir(parents=True, exist_ok=True)
+    domain_file = directory / "domain.pddl"
+    domain_file.write_text(get_domain_file(domain).read_text())
+    problem_file = directory / get_problem_name(domain, size, seed)
+    problem_file.write_text(generate_problem(domain, size, seed))
+    return domain_file, problem_file
+
+
+def parse_task_specs(specs):
+    """Parse strings of the form "DOMAIN:SIZE[,SIZE,...]" and return a
+    list of (domain, size) pairs."""
+    tasks = []
+    for spec in specs:
+        domain, sizes = spec.split(":")
+        if domain not in GENERATORS:
+            raise ValueError(f"no generator for domain {domain}")
+        tasks.extend((domain, int(size)) for size in sizes.split(","))
+    return tasks
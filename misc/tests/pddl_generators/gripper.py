@@ -0,0 +1,24 @@
+"""Gripper tasks that move a given number of balls from rooma to roomb.
+The tasks are fully determined by their size."""
+
+from .util import join_facts
+
+DOMAIN = "gripper"
+
+
+def generate_problem(num_balls, rng):
+    balls = [f"ball{i}" for i in range(1, num_balls + 1)]
+    objects = ["rooma", "roomb"] + balls + ["left", "right"]
+    init = ["(room rooma)", "(room roomb)"]
+    init += [f"(ball {ball})" for ball in balls]
+    init += ["(at-robby rooma)", "(free left)", "(free right)"]
+    init += [f"(at {ball} rooma)" for ball in balls]
+    init += ["(gripper left)", "(gripper right)"]
+    goal = [f"(at {ball} roomb)" for ball in balls]
+    return f"""\
+(define (problem strips-gripper-{num_balls})
+   (:domain gripper-strips)
+   (:objects {" ".join(objects)})
+   (:init {join_facts(init)})
+   (:goal (and {join_facts(goal)})))
+"""
@@ -0,0 +1,30 @@
+"""Miconic (STRIPS) tasks with a given number of floors and as many
+passengers. Origin and destination of each passenger are two different
+random floors."""
+
+from .util import join_facts
+
+DOMAIN = "miconic"
+
+
+def generate_problem(num_floors, rng):
+    assert num_floors >= 2, "miconic tasks need at least two floors"
+    floors = [f"f{i}" for i in range(num_floors)]
+    passengers = [f"p{i}" for i in range(num_floors)]
+    init = [f"(passenger {p})" for p in passengers]
+    init += [f"(floor {f})" for f in floors]
+    init += [f"(above {floors[i]} {floors[j]})"
+             for i in range(num_floors) for j in range(i + 1, num_floors)]
+    for passenger in passengers:
+        origin, destination = rng.sample(floors, 2)
+        init.append(f"(origin {passenger} {origin})")
+        init.append(f"(destin {passenger} {destination})")
+    init.append(f"(lift-at {floors[0]})")
+    goal = [f"(served {p})" for p in passengers]
+    return f"""\
+(define (problem miconic-{num_floors})
+   (:domain miconic)
+   (:objects {" ".join(passengers + floors)})
+   (:init {join_facts(init)})
+   (:goal (and {join_facts(goal)})))
+"""
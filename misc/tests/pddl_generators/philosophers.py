@@ -0,0 +1,70 @@
+"""Dining philosophers tasks (compiled from Promela, see
+../benchmarks/philosophers) with a given number of philosophers. The
+goal is to reach a deadlock. The tasks are fully determined by their
+size."""
+
+from .util import join_facts
+
+DOMAIN = "philosophers"
+
+STATES = ["state-1", "state-6", "state-3", "state-4", "state-5"]
+
+
+def generate_problem(num_philosophers, rng):
+    assert num_philosophers >= 2, "philosophers tasks need at least two philosophers"
+    n = num_philosophers
+    philosophers = [f"philosopher-{i}" for i in range(n)]
+    forks = [f"forks-{i}-" for i in range(n)]
+    own_write = "forks--pid-Wfork"
+    own_read = "forks--pid-Rfork"
+    next_read = f"forks-__-pidp1__{n}_-Rfork"
+    next_write = f"forks-__-pidp1__{n}_-Wfork"
+    transitions = [own_write, own_read, next_read, next_write]
+
+    objects = (
+        [f"{p} - process" for p in philosophers] +
+        [f"{f} - queue" for f in forks] +
+        ["queue-1 - queuetype", "qs-0 - queue-state",
+         "empty - message", "fork - message",
+         "zero - number_", "one - number_",
+         "philosopher - proctype"] +
+        [f"{state} - state" for state in STATES] +
+        [f"{t} - transition" for t in transitions])
+
+    init = ["(queue-next queue-1 qs-0 qs-0)",
+            "(is-not-max queue-1 zero)",
+            "(is-max queue-1 one)"]
+    for philosopher in philosophers:
+        init += [f"(pending {philosopher})",
+                 f"(at-process {philosopher} state-1)",
+                 f"(is-a-process {philosopher} philosopher)"]
+    init += ["(is-zero zero)", "(dec one zero)", "(inc zero one)",
+             "(is-not-zero one)"]
+    for fork in forks:
+        init += [f"(is-a-queue {fork} queue-1)",
+                 f"(queue-head {fork} qs-0)",
+                 f"(queue-tail {fork} qs-0)",
+                 f"(queue-head-msg {fork} empty)",
+                 f"(queue-size {fork} zero)",
+                 f"(settled {fork})"]
+    for i, philosopher in enumerate(philosophers):
+        own_fork = forks[i]
+        next_fork = forks[(i + 1) % n]
+        init += [f"(writes {philosopher} {own_fork} {own_write})",
+                 f"(reads {philosopher} {own_fork} {own_read})",
+                 f"(reads {philosopher} {next_fork} {next_read})",
+                 f"(writes {philosopher} {next_fork} {next_write})"]
+    init += [f"(trans-msg {t} fork)" for t in transitions]
+    init += ["(trans philosopher {} state-1 state-6)".format(own_write),
+             "(trans philosopher {} state-6 state-3)".format(own_read),
+             "(trans philosopher {} state-3 state-4)".format(next_read),
+             "(trans philosopher {} state-4 state-5)".format(own_write),
+             "(trans philosopher {} state-5 state-6)".format(next_write)]
+    goal = [f"(blocked {p})" for p in philosophers]
+    return f"""\
+(define (problem philosophers-{num_philosophers})
+   (:domain protocol)
+   (:objects {join_facts(objects)})
+   (:init {join_facts(init)})
+   (:goal (and {join_facts(goal)})))
+"""
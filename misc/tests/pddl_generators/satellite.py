@@ -0,0 +1,66 @@
+"""Satellite (STRIPS) tasks with a given number of satellites.
+
+Like in the IPC 2002 generator, each satellite carries one to three
+instruments that support random non-empty sets of the three modes and
+are calibrated at random ground stations. There are nine targets and
+seven observations per satellite, and every second satellite has a
+random pointing goal."""
+
+from .util import join_facts
+
+DOMAIN = "satellite"
+
+MODES = ["thermograph0", "spectrograph1", "image2"]
+NUM_GROUND_STATIONS = 3
+MAX_INSTRUMENTS_PER_SATELLITE = 3
+TARGETS_PER_SATELLITE = 9
+OBSERVATIONS_PER_SATELLITE = 7
+
+
+def generate_problem(num_satellites, rng):
+    assert num_satellites >= 1, "satellite tasks need at least one satellite"
+    satellites = [f"satellite{i}" for i in range(num_satellites)]
+    ground_stations = [f"GroundStation{i}" for i in range(NUM_GROUND_STATIONS)]
+    targets = [
+        "{}{}".format(rng.choice(["Star", "Planet", "Phenomenon"]), i)
+        for i in range(NUM_GROUND_STATIONS,
+                       NUM_GROUND_STATIONS + TARGETS_PER_SATELLITE * num_satellites)]
+    directions = ground_stations + targets
+
+    instruments = []
+    init = []
+    supported_modes = set()
+    for satellite in satellites:
+        init.append(f"(satellite {satellite})")
+        for _ in range(rng.randint(1, MAX_INSTRUMENTS_PER_SATELLITE)):
+            instrument = f"instrument{len(instruments)}"
+            instruments.append(instrument)
+            init.append(f"(instrument {instrument})")
+            modes = rng.sample(MODES, rng.randint(1, len(MODES)))
+            supported_modes.update(modes)
+            init += [f"(supports {instrument} {mode})" for mode in modes]
+            init.append("(calibration_target {} {})".format(
+                instrument, rng.choice(ground_stations)))
+            init.append(f"(on_board {instrument} {satellite})")
+        init.append(f"(power_avail {satellite})")
+        init.append("(pointing {} {})".format(satellite, rng.choice(directions)))
+    init += [f"(mode {mode})" for mode in MODES]
+    init += [f"(direction {direction})" for direction in directions]
+
+    goal = []
+    for satellite in satellites[::2]:
+        goal.append("(pointing {} {})".format(satellite, rng.choice(targets)))
+    # Only ask for images that some instrument can take.
+    observations = rng.sample(
+        [(target, mode) for target in targets for mode in sorted(supported_modes)],
+        OBSERVATIONS_PER_SATELLITE * num_satellites)
+    goal += [f"(have_image {target} {mode})" for target, mode in observations]
+
+    objects = satellites + instruments + MODES + directions
+    return f"""\
+(define (problem satellite-{num_satellites})
+   (:domain satellite)
+   (:objects {join_facts(objects)})
+   (:init {join_facts(init)})
+   (:goal (and {join_facts(goal)})))
+"""
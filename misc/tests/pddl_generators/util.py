@@ -0,0 +1,3 @@
+def join_facts(facts):
+    """Join PDDL facts with one fact per line."""
+    return "\n          ".join(facts)
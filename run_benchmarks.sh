@@ -1,7 +1,11 @@
 #!/bin/bash
 
-# Path to the root directory containing all benchmark folders
-BENCHMARKS_ROOT_DIR="misc/tests/benchmarks"
+# Path to the root directory containing all benchmark folders. Pass a
+# different directory as first argument to run on other tasks, e.g., on
+# scaled-up tasks created with misc/tests/generate-benchmarks.py:
+#   python3 misc/tests/generate-benchmarks.py gripper:20,40 --output-dir generated
+#   ./run_benchmarks.sh generated
+BENCHMARKS_ROOT_DIR="${1:-misc/tests/benchmarks}"
 
 # Get a count of problem files (excluding the domain file)
 NUM_PROBLEMS=$(find $BENCHMARKS_ROOT_DIR -type f -name "*.pddl" | grep -v "domain.pddl" | wc -l)
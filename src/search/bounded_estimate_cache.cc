@@ -0,0 +1,159 @@
+#include "bounded_estimate_cache.h"
+
+#include "task_proxy.h"
+
+#include "utils/hash.h"
+
+#include <algorithm>
+#include <cassert>
+
+using namespace std;
+
+BoundedEstimateCache::BoundedEstimateCache(size_t max_bytes)
+    : bucket_mask(0),
+      capacity(0),
+      clock_hand(0),
+      registry(nullptr) {
+    /*
+      Each entry needs sizeof(Entry) bytes in the ring and two buckets
+      (we ignore the reference bits). We use the largest power of two as
+      the capacity that fits into the memory budget.
+    */
+    const size_t bytes_per_entry = sizeof(Entry) + 2 * sizeof(int);
+    size_t num_buckets = 2;
+    while (num_buckets < (1U << 30) &&
+           num_buckets * bytes_per_entry <= max_bytes) {
+        num_buckets *= 2;
+    }
+    buckets.assign(num_buckets, EMPTY);
+    bucket_mask = num_buckets - 1;
+    capacity = num_buckets / 2;
+    entries.reserve(capacity);
+    referenced.reserve(capacity);
+}
+
+int BoundedEstimateCache::get_state_id(const State &state) {
+    return state.get_id().value;
+}
+
+int BoundedEstimateCache::get_home_bucket(int state_id) const {
+    return utils::get_hash32(state_id) & bucket_mask;
+}
+
+int BoundedEstimateCache::find_bucket(int state_id) const {
+    for (int bucket = get_home_bucket(state_id);;
+         bucket = (bucket + 1) & bucket_mask) {
+        int pos = buckets[bucket];
+        if (pos == EMPTY)
+            return EMPTY;
+        if (entries[pos].state_id == state_id)
+            return bucket;
+    }
+}
+
+void BoundedEstimateCache::remove_from_buckets(int bucket) {
+    /*
+      Move later entries of the probe sequence into the gap, so that
+      lookups do not stop early at the removed bucket.
+    */
+    int gap = bucket;
+    for (int next = (gap + 1) & bucket_mask; buckets[next] != EMPTY;
+         next = (next + 1) & bucket_mask) {
+        int home = get_home_bucket(entries[buckets[next]].state_id);
+        // Move the entry if its home bucket is not in (gap, next].
+        if (((next - home) & bucket_mask) >= ((next - gap) & bucket_mask)) {
+            buckets[gap] = buckets[next];
+            gap = next;
+        }
+    }
+    buckets[gap] = EMPTY;
+}
+
+int BoundedEstimateCache::advance_clock_hand() {
+    while (referenced[clock_hand]) {
+        referenced[clock_hand] = false;
+        clock_hand = (clock_hand + 1) % capacity;
+    }
+    int pos = clock_hand;
+    clock_hand = (clock_hand + 1) % capacity;
+    return pos;
+}
+
+void BoundedEstimateCache::clear() {
+    entries.clear();
+    referenced.clear();
+    fill(buckets.begin(), buckets.end(), EMPTY);
+    clock_hand = 0;
+    registry = nullptr;
+}
+
+bool BoundedEstimateCache::contains(const State &state) const {
+    return state.get_registry() && state.get_registry() == registry &&
+           find_bucket(get_state_id(state)) != EMPTY;
+}
+
+int BoundedEstimateCache::get_estimate(const State &state) const {
+    assert(contains(state));
+    return entries[buckets[find_bucket(get_state_id(state))]].estimate;
+}
+
+bool BoundedEstimateCache::lookup(const State &state, int &estimate) {
+    if (!contains(state))
+        return false;
+    int pos = buckets[find_bucket(get_state_id(state))];
+    referenced[pos] = true;
+    estimate = entries[pos].estimate;
+    return true;
+}
+
+void BoundedEstimateCache::erase(const State &state) {
+    if (!contains(state))
+        return;
+    int bucket = find_bucket(get_state_id(state));
+    int pos = buckets[bucket];
+    remove_from_buckets(bucket);
+    entries[pos].state_id = EMPTY;
+    referenced[pos] = false;
+}
+
+bool BoundedEstimateCache::insert(const State &state, int estimate) {
+    const StateRegistry *state_registry = state.get_registry();
+    if (!state_registry)
+        return false;
+    if (state_registry != registry) {
+        clear();
+        registry = state_registry;
+    }
+    int state_id = get_state_id(state);
+    int bucket = find_bucket(state_id);
+    if (bucket != EMPTY) {
+        entries[buckets[bucket]].estimate = estimate;
+        return false;
+    }
+
+    bool evicted = false;
+    int pos;
+    if (static_cast<int>(entries.size()) < capacity) {
+        pos = entries.size();
+        entries.push_back({state_id, estimate});
+        referenced.push_back(false);
+    } else {
+        pos = advance_clock_hand();
+        int old_state_id = entries[pos].state_id;
+        // The entry is empty if it has been erased.
+        if (old_state_id != EMPTY) {
+            remove_from_buckets(find_bucket(old_state_id));
+            evicted = true;
+        }
+        entries[pos] = {state_id, estimate};
+    }
+    /*
+      We search for the free bucket after evicting because the eviction
+      can move entries within the table.
+    */
+    bucket = get_home_bucket(state_id);
+    while (buckets[bucket] != EMPTY)
+        bucket = (bucket + 1) & bucket_mask;
+    buckets[bucket] = pos;
+    return evicted;
+}
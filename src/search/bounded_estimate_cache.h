@@ -0,0 +1,88 @@
+#ifndef BOUNDED_ESTIMATE_CACHE_H
+#define BOUNDED_ESTIMATE_CACHE_H
+
+#include <cstddef>
+#include <vector>
+
+class State;
+class StateRegistry;
+
+/*
+  This class caches integer estimates of registered states within a
+  fixed memory budget. Unlike PerStateInformation, which stores an
+  entry for every state of the registry, it holds at most a fixed
+  number of entries and evicts entries with the CLOCK policy (an
+  approximation of least-recently-used) when it is full:
+
+  The entries are stored in a ring, and each entry has a reference bit
+  that is set when the entry is looked up. To make room for a new
+  entry, the clock hand moves along the ring, clears the reference bits
+  of the entries it passes and evicts the first entry whose reference
+  bit was already cleared. New entries start with a cleared reference
+  bit, so entries that are never looked up are evicted first.
+
+  Entries are found with a hash table with linear probing that maps
+  state IDs to positions in the ring. The table has twice as many
+  buckets as the ring has entries, so that the table is at most half
+  full.
+
+  The cache only refers to the states of one registry at a time. When
+  it is used with a state of another registry, it forgets all entries.
+  Unregistered states are never cached.
+*/
+class BoundedEstimateCache {
+    struct Entry {
+        int state_id;
+        int estimate;
+    };
+
+    static const int EMPTY = -1;
+
+    // Erased entries have the state ID EMPTY.
+    std::vector<Entry> entries;
+    std::vector<bool> referenced;
+    // Positions of the entries in the ring, or EMPTY.
+    std::vector<int> buckets;
+    int bucket_mask;
+    int capacity;
+    int clock_hand;
+    const StateRegistry *registry;
+
+    static int get_state_id(const State &state);
+    int get_home_bucket(int state_id) const;
+    // Return the bucket of the entry for the given state ID, or EMPTY.
+    int find_bucket(int state_id) const;
+    void remove_from_buckets(int bucket);
+    // Return the position of the next entry to be replaced.
+    int advance_clock_hand();
+public:
+    // Create a cache that uses at most max_bytes bytes for its entries.
+    explicit BoundedEstimateCache(std::size_t max_bytes);
+
+    void clear();
+
+    int get_capacity() const {
+        return capacity;
+    }
+
+    bool contains(const State &state) const;
+    /*
+      Return the estimate for the given state, which must be cached.
+      Unlike lookup(), this does not count as a reference to the entry.
+    */
+    int get_estimate(const State &state) const;
+    /*
+      If the given state is cached, store its estimate in estimate, mark
+      the entry as referenced and return true. Otherwise, return false.
+    */
+    bool lookup(const State &state, int &estimate);
+    /*
+      Cache the estimate for the given state, replacing any previous
+      estimate for it. Return true if another entry had to be evicted.
+    */
+    bool insert(const State &state, int estimate);
+    // Remove the estimate for the given state if it is cached.
+    void erase(const State &state);
+};
+
+#endif
@@ -55,6 +55,17 @@ const EvaluationResult &EvaluationContext::get_result(Evaluator *evaluator) {
     return result;
 }
 
+void EvaluationContext::store_result(
+    Evaluator *evaluator, EvaluationResult &&result) {
+    assert(cache[evaluator].is_uninitialized());
+    if (statistics &&
+        evaluator->is_used_for_counting_evaluations() &&
+        result.get_count_evaluation()) {
+        statistics->inc_evaluations();
+    }
+    cache[evaluator] = move(result);
+}
+
 const EvaluatorCache &EvaluationContext::get_cache() const {
     return cache;
 }
@@ -73,6 +84,10 @@ bool EvaluationContext::is_preferred() const {
     return preferred;
 }
 
+SearchStatistics *EvaluationContext::get_statistics() const {
+    return statistics;
+}
+
 bool EvaluationContext::is_evaluator_value_infinite(Evaluator *eval) {
     return get_result(eval).is_infinite();
 }
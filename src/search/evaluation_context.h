@@ -89,10 +89,18 @@ public:
         SearchStatistics *statistics = nullptr, bool calculate_preferred = false);
 
     const EvaluationResult &get_result(Evaluator *eval);
+    /*
+      Store a result for the given evaluator that has been computed
+      outside of this context (e.g., by a ParallelEvaluator). The result
+      is counted in the statistics like a result computed by get_result.
+    */
+    void store_result(Evaluator *eval, EvaluationResult &&result);
     const EvaluatorCache &get_cache() const;
     const State &get_state() const;
     int get_g_value() const;
     bool is_preferred() const;
+    // Return the statistics for counting evaluations, or nullptr.
+    SearchStatistics *get_statistics() const;
 
     /*
       Use get_evaluator_value() to query finite evaluator values. It
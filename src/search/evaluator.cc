@@ -1,5 +1,7 @@
 #include "evaluator.h"
 
+#include "evaluation_context.h"
+
 #include "plugins/plugin.h"
 #include "utils/logging.h"
 #include "utils/system.h"
@@ -46,6 +48,17 @@ void Evaluator::report_new_minimum_value(
     }
 }
 
+void Evaluator::compute_batch_results(
+    const State &, const vector<State> &states,
+    vector<EvaluationResult> &results) {
+    results.clear();
+    results.reserve(states.size());
+    for (const State &state : states) {
+        EvaluationContext eval_context(state);
+        results.push_back(eval_context.get_result(this));
+    }
+}
+
 const string &Evaluator::get_description() const {
     return description;
 }
@@ -74,6 +87,14 @@ int Evaluator::get_cached_estimate(const State &) const {
     ABORT("Called get_cached_estimate when estimate is not cached.");
 }
 
+shared_ptr<Evaluator> Evaluator::create_worker_copy() const {
+    return nullptr;
+}
+
+void Evaluator::store_worker_result(
+    EvaluationContext &, const EvaluationResult &) {
+}
+
 void add_evaluator_options_to_feature(plugins::Feature &feature) {
     utils::add_log_options_to_feature(feature);
 }
@@ -5,7 +5,9 @@
 
 #include "utils/logging.h"
 
+#include <memory>
 #include <set>
+#include <vector>
 
 class EvaluationContext;
 class State;
@@ -83,6 +85,20 @@ public:
     virtual EvaluationResult compute_result(
         EvaluationContext &eval_context) = 0;
 
+    /*
+      compute_batch_results should compute the results for the given
+      states, which are successors of parent_state (e.g., the new
+      successors of an expanded state), and store them in results in
+      the same order. Preferred operators need not be computed, and
+      the results are not counted in any statistics.
+
+      The default implementation evaluates each state on its own.
+      Evaluators can override it to share work between the states.
+    */
+    virtual void compute_batch_results(
+        const State &parent_state, const std::vector<State> &states,
+        std::vector<EvaluationResult> &results);
+
     void report_value_for_initial_state(const EvaluationResult &result) const;
     void report_new_minimum_value(const EvaluationResult &result) const;
 
@@ -98,6 +114,23 @@ public:
       the given state is cached, i.e., is_estimate_cached returns true.
     */
     virtual int get_cached_estimate(const State &state) const;
+
+    /*
+      create_worker_copy should return a new evaluator that computes the
+      same estimates as this one and shares no mutable data with it, so
+      that the copy can compute estimates in another thread (see
+      ParallelEvaluator). The copy does not cache its estimates and does
+      not log. Evaluators that do not support this return nullptr (the
+      default).
+    */
+    virtual std::shared_ptr<Evaluator> create_worker_copy() const;
+    /*
+      Store the result that a worker copy computed for the state of the
+      given evaluation context, as if the result had been computed by
+      this evaluator. The default implementation does nothing.
+    */
+    virtual void store_worker_result(
+        EvaluationContext &eval_context, const EvaluationResult &result);
 };
 
 extern void add_evaluator_options_to_feature(plugins::Feature &feature);
@@ -2,11 +2,13 @@
 
 #include "evaluation_context.h"
 #include "evaluation_result.h"
+#include "search_statistics.h"
 
 #include "plugins/plugin.h"
 #include "task_utils/task_properties.h"
 #include "tasks/cost_adapted_task.h"
 #include "tasks/root_task.h"
+#include "utils/memory.h"
 
 #include <cassert>
 #include <cstdlib>
@@ -20,6 +22,13 @@ Heuristic::Heuristic(const plugins::Options &opts)
       cache_evaluator_values(opts.get<bool>("cache_estimates")),
       task(opts.get<shared_ptr<AbstractTask>>("transform")),
       task_proxy(*task) {
+    int max_cache_memory = opts.get<int>(
+        "max_cache_memory", numeric_limits<int>::max());
+    if (cache_evaluator_values &&
+        max_cache_memory != numeric_limits<int>::max()) {
+        bounded_cache = utils::make_unique_ptr<BoundedEstimateCache>(
+            static_cast<size_t>(max_cache_memory) * 1024 * 1024);
+    }
 }
 
 Heuristic::~Heuristic() {
@@ -33,6 +42,14 @@ State Heuristic::convert_ancestor_state(const State &ancestor_state) const {
     return task_proxy.convert_ancestor_state(ancestor_state);
 }
 
+void Heuristic::invalidate_cached_value(const State &state) {
+    assert(cache_evaluator_values);
+    if (bounded_cache)
+        bounded_cache->erase(state);
+    else
+        heuristic_cache[state].dirty = true;
+}
+
 void Heuristic::add_options_to_feature(plugins::Feature &feature) {
     add_evaluator_options_to_feature(feature);
     feature.add_option<shared_ptr<AbstractTask>>(
@@ -41,6 +58,48 @@ void Heuristic::add_options_to_feature(plugins::Feature &feature) {
         " Currently, adapt_costs() and no_transform() are available.",
         "no_transform()");
     feature.add_option<bool>("cache_estimates", "cache heuristic estimates", "true");
+    feature.add_option<int>(
+        "max_cache_memory",
+        "maximum memory in MiB for cached estimates. With "
+        "infinity, the estimates of all registered states are cached (4 bytes "
+        "per state). Otherwise, at most as many estimates as fit into this "
+        "memory (16 bytes per estimate) are cached, and estimates are evicted "
+        "with the CLOCK policy when the cache is full. The search statistics "
+        "then include the hits, misses and evictions of the cache. Ignored "
+        "if cache_estimates is false.",
+        "infinity",
+        plugins::Bounds("1", "infinity"));
+}
+
+bool Heuristic::lookup_cached_value(
+    const State &state, int &heuristic, SearchStatistics *statistics) {
+    if (bounded_cache) {
+        bool hit = bounded_cache->lookup(state, heuristic);
+        if (statistics) {
+            if (hit)
+                statistics->inc_cache_hits();
+            else
+                statistics->inc_cache_misses();
+        }
+        return hit;
+    }
+    HEntry entry = heuristic_cache[state];
+    if (entry.h != NO_VALUE && !entry.dirty) {
+        heuristic = entry.h;
+        return true;
+    }
+    return false;
+}
+
+void Heuristic::cache_value(
+    const State &state, int heuristic, SearchStatistics *statistics) {
+    if (bounded_cache) {
+        bool evicted = bounded_cache->insert(state, heuristic);
+        if (evicted && statistics)
+            statistics->inc_cache_evictions();
+    } else {
+        heuristic_cache[state] = HEntry(heuristic, false);
+    }
 }
 
 EvaluationResult Heuristic::compute_result(EvaluationContext &eval_context) {
@@ -54,13 +113,12 @@ EvaluationResult Heuristic::compute_result(EvaluationContext &eval_context) {
     int heuristic = NO_VALUE;
 
     if (!calculate_preferred && cache_evaluator_values &&
-        heuristic_cache[state].h != NO_VALUE && !heuristic_cache[state].dirty) {
-        heuristic = heuristic_cache[state].h;
+        lookup_cached_value(state, heuristic, eval_context.get_statistics())) {
         result.set_count_evaluation(false);
     } else {
         heuristic = compute_heuristic(state);
         if (cache_evaluator_values) {
-            heuristic_cache[state] = HEntry(heuristic, false);
+            cache_value(state, heuristic, eval_context.get_statistics());
         }
         result.set_count_evaluation(true);
     }
@@ -100,10 +158,24 @@ bool Heuristic::does_cache_estimates() const {
 }
 
 bool Heuristic::is_estimate_cached(const State &state) const {
+    if (bounded_cache)
+        return bounded_cache->contains(state);
     return heuristic_cache[state].h != NO_VALUE;
 }
 
 int Heuristic::get_cached_estimate(const State &state) const {
     assert(is_estimate_cached(state));
+    if (bounded_cache)
+        return bounded_cache->get_estimate(state);
     return heuristic_cache[state].h;
 }
+
+void Heuristic::store_worker_result(
+    EvaluationContext &eval_context, const EvaluationResult &result) {
+    if (cache_evaluator_values) {
+        int heuristic = result.is_infinite() ?
+            DEAD_END : result.get_evaluator_value();
+        cache_value(eval_context.get_state(), heuristic,
+                    eval_context.get_statistics());
+    }
+}
@@ -1,6 +1,7 @@
 #ifndef HEURISTIC_H
 #define HEURISTIC_H
 
+#include "bounded_estimate_cache.h"
 #include "evaluator.h"
 #include "operator_id.h"
 #include "per_state_information.h"
@@ -11,6 +12,7 @@
 #include <memory>
 #include <vector>
 
+class SearchStatistics;
 class TaskProxy;
 
 namespace plugins {
@@ -44,6 +46,18 @@ class Heuristic : public Evaluator {
     */
     ordered_set::OrderedSet<OperatorID> preferred_operators;
 
+    /*
+      Cache with limited memory that replaces heuristic_cache if
+      max_cache_memory is given. Its hits, misses and evictions are
+      counted in the statistics of the evaluation contexts.
+    */
+    std::unique_ptr<BoundedEstimateCache> bounded_cache;
+
+    bool lookup_cached_value(
+        const State &state, int &heuristic, SearchStatistics *statistics);
+    void cache_value(
+        const State &state, int heuristic, SearchStatistics *statistics);
+
 protected:
     /*
       Cache for saving h values
@@ -72,6 +86,13 @@ protected:
 
     State convert_ancestor_state(const State &ancestor_state) const;
 
+    /*
+      Make sure that the cached estimate for the given state is not used
+      by compute_result() (e.g., because the estimate of a path-dependent
+      heuristic changed).
+    */
+    void invalidate_cached_value(const State &state);
+
 public:
     explicit Heuristic(const plugins::Options &opts);
     virtual ~Heuristic() override;
@@ -88,6 +109,10 @@ public:
     virtual bool does_cache_estimates() const override;
     virtual bool is_estimate_cached(const State &state) const override;
     virtual int get_cached_estimate(const State &state) const override;
+
+    virtual void store_worker_result(
+        EvaluationContext &eval_context,
+        const EvaluationResult &result) override;
 };
 
 #endif
@@ -22,6 +22,10 @@ AdditiveHeuristic::AdditiveHeuristic(const plugins::Options &opts)
     }
 }
 
+shared_ptr<Evaluator> AdditiveHeuristic::create_worker_copy() const {
+    return create_worker_copy_of_type<AdditiveHeuristic>();
+}
+
 void AdditiveHeuristic::write_overflow_warning() {
     if (!did_write_overflow_warning) {
         // TODO: Should have a planner-wide warning mechanism to handle
@@ -62,7 +66,7 @@ void AdditiveHeuristic::setup_exploration_queue_state(const State &state) {
     }
 }
 
-void AdditiveHeuristic::relaxed_exploration() {
+void AdditiveHeuristic::relaxed_exploration(bool stop_at_goals) {
     int unsolved_goals = goal_propositions.size();
     while (!queue.empty()) {
         pair<int, PropID> top_pair = queue.pop();
@@ -74,7 +78,7 @@ void AdditiveHeuristic::relaxed_exploration() {
         assert(prop_cost <= distance);
         if (prop_cost < distance)
             continue;
-        if (prop->is_goal && --unsolved_goals == 0)
+        if (prop->is_goal && --unsolved_goals == 0 && stop_at_goals)
             return;
         for (OpID op_id : precondition_of_pool.get_slice(
                  prop->precondition_of, prop->num_precondition_occurences)) {
@@ -115,10 +119,25 @@ void AdditiveHeuristic::mark_preferred_operators(
     }
 }
 
-int AdditiveHeuristic::compute_add_and_ff(const State &state) {
+void AdditiveHeuristic::compute_complete_exploration(const State &state) {
     setup_exploration_queue();
     setup_exploration_queue_state(state);
-    relaxed_exploration();
+    relaxed_exploration(false);
+}
+
+int AdditiveHeuristic::compute_operator_cost(OpID op_id) {
+    int cost = get_operator(op_id)->base_cost;
+    for (PropID precond : get_preconditions(op_id))
+        increase_cost(cost, get_proposition(precond)->cost);
+    return cost;
+}
+
+int AdditiveHeuristic::compute_add_and_ff(const State &state) {
+    if (!is_warm_start_active() || !update_exploration(state)) {
+        setup_exploration_queue();
+        setup_exploration_queue_state(state);
+        relaxed_exploration(true);
+    }
 
     int total_cost = 0;
     for (PropID goal_id : goal_propositions) {
@@ -150,7 +169,7 @@ public:
     AdditiveHeuristicFeature() : TypedFeature("add") {
         document_title("Additive heuristic");
 
-        Heuristic::add_options_to_feature(*this);
+        relaxation_heuristic::RelaxationHeuristic::add_options_to_feature(*this);
 
         document_language_support("action costs", "supported");
         document_language_support("conditional effects", "supported");
@@ -34,7 +34,7 @@ class AdditiveHeuristic : public relaxation_heuristic::RelaxationHeuristic {
 
     void setup_exploration_queue();
     void setup_exploration_queue_state(const State &state);
-    void relaxed_exploration();
+    void relaxed_exploration(bool stop_at_goals);
     void mark_preferred_operators(const State &state, PropID goal_id);
 
     void enqueue_if_necessary(PropID prop_id, int cost, OpID op_id) {
@@ -61,12 +61,16 @@ class AdditiveHeuristic : public relaxation_heuristic::RelaxationHeuristic {
     void write_overflow_warning();
 protected:
     virtual int compute_heuristic(const State &ancestor_state) override;
+    virtual void compute_complete_exploration(const State &state) override;
+    virtual int compute_operator_cost(OpID op_id) override;
 
     // Common part of h^add and h^ff computation.
     int compute_add_and_ff(const State &state);
 public:
     explicit AdditiveHeuristic(const plugins::Options &opts);
 
+    virtual std::shared_ptr<Evaluator> create_worker_copy() const override;
+
     /*
       TODO: The two methods below are temporarily needed for the CEGAR
       heuristic. In the long run it might be better to split the
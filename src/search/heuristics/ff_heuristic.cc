@@ -19,6 +19,10 @@ FFHeuristic::FFHeuristic(const plugins::Options &opts)
     }
 }
 
+shared_ptr<Evaluator> FFHeuristic::create_worker_copy() const {
+    return create_worker_copy_of_type<FFHeuristic>();
+}
+
 void FFHeuristic::mark_preferred_operators_and_relaxed_plan(
     const State &state, PropID goal_id) {
     Proposition *goal = get_proposition(goal_id);
@@ -74,7 +78,7 @@ public:
     FFHeuristicFeature() : TypedFeature("ff") {
         document_title("FF heuristic");
 
-        Heuristic::add_options_to_feature(*this);
+        relaxation_heuristic::RelaxationHeuristic::add_options_to_feature(*this);
 
         document_language_support("action costs", "supported");
         document_language_support("conditional effects", "supported");
@@ -33,6 +33,8 @@ protected:
     virtual int compute_heuristic(const State &ancestor_state) override;
 public:
     explicit FFHeuristic(const plugins::Options &opts);
+
+    virtual std::shared_ptr<Evaluator> create_worker_copy() const override;
 };
 }
 
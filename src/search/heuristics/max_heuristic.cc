@@ -29,6 +29,10 @@ HSPMaxHeuristic::HSPMaxHeuristic(const plugins::Options &opts)
     }
 }
 
+shared_ptr<Evaluator> HSPMaxHeuristic::create_worker_copy() const {
+    return create_worker_copy_of_type<HSPMaxHeuristic>();
+}
+
 // heuristic computation
 void HSPMaxHeuristic::setup_exploration_queue() {
     queue.clear();
@@ -42,18 +46,18 @@ void HSPMaxHeuristic::setup_exploration_queue() {
         op.cost = op.base_cost; // will be increased by precondition costs
 
         if (op.unsatisfied_preconditions == 0)
-            enqueue_if_necessary(op.effect, op.base_cost);
+            enqueue_if_necessary(op.effect, op.base_cost, get_op_id(op));
     }
 }
 
 void HSPMaxHeuristic::setup_exploration_queue_state(const State &state) {
     for (FactProxy fact : state) {
         PropID init_prop = get_prop_id(fact);
-        enqueue_if_necessary(init_prop, 0);
+        enqueue_if_necessary(init_prop, 0, NO_OP);
     }
 }
 
-void HSPMaxHeuristic::relaxed_exploration() {
+void HSPMaxHeuristic::relaxed_exploration(bool stop_at_goals) {
     int unsolved_goals = goal_propositions.size();
     while (!queue.empty()) {
         pair<int, PropID> top_pair = queue.pop();
@@ -65,7 +69,7 @@ void HSPMaxHeuristic::relaxed_exploration() {
         assert(prop_cost <= distance);
         if (prop_cost < distance)
             continue;
-        if (prop->is_goal && --unsolved_goals == 0)
+        if (prop->is_goal && --unsolved_goals == 0 && stop_at_goals)
             return;
         for (OpID op_id : precondition_of_pool.get_slice(
                  prop->precondition_of, prop->num_precondition_occurences)) {
@@ -75,17 +79,33 @@ void HSPMaxHeuristic::relaxed_exploration() {
             --unary_op->unsatisfied_preconditions;
             assert(unary_op->unsatisfied_preconditions >= 0);
             if (unary_op->unsatisfied_preconditions == 0)
-                enqueue_if_necessary(unary_op->effect, unary_op->cost);
+                enqueue_if_necessary(unary_op->effect, unary_op->cost, op_id);
         }
     }
 }
 
+void HSPMaxHeuristic::compute_complete_exploration(const State &state) {
+    setup_exploration_queue();
+    setup_exploration_queue_state(state);
+    relaxed_exploration(false);
+}
+
+int HSPMaxHeuristic::compute_operator_cost(OpID op_id) {
+    int max_precondition_cost = 0;
+    for (PropID precond : get_preconditions(op_id))
+        max_precondition_cost = max(max_precondition_cost,
+                                    get_proposition(precond)->cost);
+    return get_operator(op_id)->base_cost + max_precondition_cost;
+}
+
 int HSPMaxHeuristic::compute_heuristic(const State &ancestor_state) {
     State state = convert_ancestor_state(ancestor_state);
 
-    setup_exploration_queue();
-    setup_exploration_queue_state(state);
-    relaxed_exploration();
+    if (!is_warm_start_active() || !update_exploration(state)) {
+        setup_exploration_queue();
+        setup_exploration_queue_state(state);
+        relaxed_exploration(true);
+    }
 
     int total_cost = 0;
     for (PropID goal_id : goal_propositions) {
@@ -103,7 +123,7 @@ public:
     HSPMaxHeuristicFeature() : TypedFeature("hmax") {
         document_title("Max heuristic");
 
-        Heuristic::add_options_to_feature(*this);
+        relaxation_heuristic::RelaxationHeuristic::add_options_to_feature(*this);
 
         document_language_support("action costs", "supported");
         document_language_support("conditional effects", "supported");
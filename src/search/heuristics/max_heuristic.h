@@ -11,6 +11,8 @@ namespace max_heuristic {
 using relaxation_heuristic::PropID;
 using relaxation_heuristic::OpID;
 
+using relaxation_heuristic::NO_OP;
+
 using relaxation_heuristic::Proposition;
 using relaxation_heuristic::UnaryOperator;
 
@@ -19,21 +21,26 @@ class HSPMaxHeuristic : public relaxation_heuristic::RelaxationHeuristic {
 
     void setup_exploration_queue();
     void setup_exploration_queue_state(const State &state);
-    void relaxed_exploration();
+    void relaxed_exploration(bool stop_at_goals);
 
-    void enqueue_if_necessary(PropID prop_id, int cost) {
+    void enqueue_if_necessary(PropID prop_id, int cost, OpID op_id) {
         assert(cost >= 0);
         Proposition *prop = get_proposition(prop_id);
         if (prop->cost == -1 || prop->cost > cost) {
             prop->cost = cost;
+            prop->reached_by = op_id;
             queue.push(cost, prop_id);
         }
         assert(prop->cost != -1 && prop->cost <= cost);
     }
 protected:
     virtual int compute_heuristic(const State &ancestor_state) override;
+    virtual void compute_complete_exploration(const State &state) override;
+    virtual int compute_operator_cost(OpID op_id) override;
 public:
     explicit HSPMaxHeuristic(const plugins::Options &opts);
+
+    virtual std::shared_ptr<Evaluator> create_worker_copy() const override;
 };
 }
 
@@ -1,5 +1,7 @@
 #include "relaxation_heuristic.h"
 
+#include "../evaluation_result.h"
+#include "../plugins/plugin.h"
 #include "../task_utils/task_properties.h"
 #include "../utils/collections.h"
 #include "../utils/logging.h"
@@ -36,7 +38,14 @@ UnaryOperator::UnaryOperator(
 
 // construction and destruction
 RelaxationHeuristic::RelaxationHeuristic(const plugins::Options &opts)
-    : Heuristic(opts) {
+    : Heuristic(opts),
+      worker_options(opts),
+      warm_start(opts.get<bool>("warm_start", false)),
+      use_parent_exploration(false),
+      parent_exploration_overwritten(false) {
+    worker_options.set<bool>("cache_estimates", false);
+    worker_options.set<utils::Verbosity>("verbosity", utils::Verbosity::SILENT);
+
     // Build propositions.
     propositions.resize(task_properties::get_num_facts(task_proxy));
 
@@ -90,12 +99,209 @@ RelaxationHeuristic::RelaxationHeuristic(const plugins::Options &opts)
             precondition_of_pool.append(precondition_of_vec);
         propositions[prop_id].num_precondition_occurences = precondition_of_vec.size();
     }
+
+    if (warm_start) {
+        build_achievers();
+        unsupported.resize(propositions.size(), false);
+    }
+}
+
+void RelaxationHeuristic::build_achievers() {
+    int num_propositions = propositions.size();
+    achiever_offsets.assign(num_propositions + 1, 0);
+    for (const UnaryOperator &op : unary_operators)
+        ++achiever_offsets[op.effect + 1];
+    for (PropID prop_id = 0; prop_id < num_propositions; ++prop_id)
+        achiever_offsets[prop_id + 1] += achiever_offsets[prop_id];
+    achievers.resize(unary_operators.size());
+    vector<int> next_position(achiever_offsets.begin(), achiever_offsets.end() - 1);
+    int num_unary_ops = unary_operators.size();
+    for (OpID op_id = 0; op_id < num_unary_ops; ++op_id)
+        achievers[next_position[unary_operators[op_id].effect]++] = op_id;
 }
 
 bool RelaxationHeuristic::dead_ends_are_reliable() const {
     return !task_properties::has_axioms(task_proxy);
 }
 
+void RelaxationHeuristic::save_proposition(PropID prop_id) {
+    const Proposition &prop = propositions[prop_id];
+    changed_propositions.push_back({prop_id, prop.cost, prop.reached_by});
+}
+
+void RelaxationHeuristic::mark_unsupported(PropID prop_id) {
+    save_proposition(prop_id);
+    Proposition &prop = propositions[prop_id];
+    prop.cost = -1;
+    prop.reached_by = NO_OP;
+    unsupported[prop_id] = true;
+    unsupported_propositions.push_back(prop_id);
+}
+
+bool RelaxationHeuristic::is_operator_reached(OpID op_id) const {
+    for (PropID precond : get_preconditions(op_id)) {
+        if (unsupported[precond] || propositions[precond].cost == -1)
+            return false;
+    }
+    return true;
+}
+
+void RelaxationHeuristic::enqueue_update(PropID prop_id, int cost, OpID op_id) {
+    assert(cost >= 0);
+    Proposition &prop = propositions[prop_id];
+    if (prop.cost == -1 || prop.cost > cost) {
+        save_proposition(prop_id);
+        prop.cost = cost;
+        prop.reached_by = op_id;
+        update_queue.push(cost, prop_id);
+    }
+}
+
+void RelaxationHeuristic::unmark_supporters(PropID prop_id) {
+    Proposition &prop = propositions[prop_id];
+    if (prop.marked) {
+        prop.marked = false;
+        if (prop.reached_by != NO_OP) {
+            for (PropID precond : get_preconditions(prop.reached_by))
+                unmark_supporters(precond);
+        }
+    }
+}
+
+void RelaxationHeuristic::restore_parent_exploration() {
+    if (parent_exploration_overwritten) {
+        assert(changed_propositions.empty());
+        propositions = parent_propositions;
+        parent_exploration_overwritten = false;
+        return;
+    }
+    // Preferred operators and relaxed plans mark the supporters of the goals.
+    for (PropID goal_id : goal_propositions)
+        unmark_supporters(goal_id);
+    for (auto it = changed_propositions.rbegin();
+         it != changed_propositions.rend(); ++it) {
+        Proposition &prop = propositions[it->prop_id];
+        prop.cost = it->cost;
+        prop.reached_by = it->reached_by;
+        unsupported[it->prop_id] = false;
+    }
+    changed_propositions.clear();
+    unsupported_propositions.clear();
+    update_queue.clear();
+}
+
+bool RelaxationHeuristic::update_exploration(const State &state) {
+    assert(use_parent_exploration);
+    restore_parent_exploration();
+    state.unpack();
+    const vector<int> &values = state.get_unpacked_values();
+    int num_variables = values.size();
+
+    /*
+      Facts of the parent state that do not hold in this state lose
+      their support, and so do all propositions whose achiever depends
+      on an unsupported proposition.
+    */
+    for (int var = 0; var < num_variables; ++var) {
+        if (values[var] != parent_values[var]) {
+            PropID prop_id = get_prop_id(var, parent_values[var]);
+            if (propositions[prop_id].reached_by == NO_OP)
+                mark_unsupported(prop_id);
+        }
+    }
+    size_t max_unsupported = propositions.size() / MAX_UNSUPPORTED_DIVISOR;
+    for (size_t i = 0; i < unsupported_propositions.size(); ++i) {
+        if (unsupported_propositions.size() > max_unsupported) {
+            restore_parent_exploration();
+            parent_exploration_overwritten = true;
+            return false;
+        }
+        const Proposition &prop = propositions[unsupported_propositions[i]];
+        for (OpID op_id : precondition_of_pool.get_slice(
+                 prop.precondition_of, prop.num_precondition_occurences)) {
+            PropID effect = unary_operators[op_id].effect;
+            if (!unsupported[effect] &&
+                propositions[effect].reached_by == op_id)
+                mark_unsupported(effect);
+        }
+    }
+
+    // New facts are reached for free.
+    for (int var = 0; var < num_variables; ++var) {
+        if (values[var] != parent_values[var])
+            enqueue_update(get_prop_id(var, values[var]), 0, NO_OP);
+    }
+
+    /*
+      Unsupported propositions can be reached by achievers whose
+      preconditions all keep their support.
+    */
+    for (PropID prop_id : unsupported_propositions) {
+        for (int i = achiever_offsets[prop_id];
+             i < achiever_offsets[prop_id + 1]; ++i) {
+            OpID op_id = achievers[i];
+            if (is_operator_reached(op_id))
+                enqueue_update(prop_id, compute_operator_cost(op_id), op_id);
+        }
+    }
+
+    /*
+      The remaining propositions keep their costs from the parent
+      exploration unless the changes above make them cheaper. All
+      propositions with changed costs are dequeued in the order of their
+      costs, when their costs are final.
+    */
+    while (!update_queue.empty()) {
+        pair<int, PropID> top_pair = update_queue.pop();
+        int distance = top_pair.first;
+        PropID prop_id = top_pair.second;
+        const Proposition &prop = propositions[prop_id];
+        assert(prop.cost != -1 && prop.cost <= distance);
+        if (prop.cost < distance)
+            continue;
+        unsupported[prop_id] = false;
+        for (OpID op_id : precondition_of_pool.get_slice(
+                 prop.precondition_of, prop.num_precondition_occurences)) {
+            if (is_operator_reached(op_id))
+                enqueue_update(unary_operators[op_id].effect,
+                               compute_operator_cost(op_id), op_id);
+        }
+    }
+    return true;
+}
+
+void RelaxationHeuristic::compute_batch_results(
+    const State &parent_state, const vector<State> &states,
+    vector<EvaluationResult> &results) {
+    if (!warm_start) {
+        Heuristic::compute_batch_results(parent_state, states, results);
+        return;
+    }
+    State parent = convert_ancestor_state(parent_state);
+    compute_complete_exploration(parent);
+    parent_propositions = propositions;
+    parent.unpack();
+    parent_values = parent.get_unpacked_values();
+    use_parent_exploration = true;
+    Heuristic::compute_batch_results(parent_state, states, results);
+    restore_parent_exploration();
+    use_parent_exploration = false;
+    parent_propositions.clear();
+}
+
+void RelaxationHeuristic::add_options_to_feature(plugins::Feature &feature) {
+    Heuristic::add_options_to_feature(feature);
+    feature.add_option<bool>(
+        "warm_start",
+        "compute the estimates for a batch of successor states (see the "
+        "option parallel_evals of eager search) by updating the relaxed "
+        "exploration of their parent state instead of exploring each state "
+        "from scratch. The h^add and h^max values do not change, but h^FF "
+        "can select different relaxed plans when several achievers of a "
+        "fact have the same cost.",
+        "false");
+}
+
 PropID RelaxationHeuristic::get_prop_id(int var, int value) const {
     return proposition_offsets[var] + value;
 }
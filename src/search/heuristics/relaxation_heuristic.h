@@ -5,6 +5,8 @@
 
 #include "../heuristic.h"
 
+#include "../algorithms/priority_queues.h"
+#include "../plugins/options.h"
 #include "../utils/collections.h"
 
 #include <cassert>
@@ -13,6 +15,10 @@
 class FactProxy;
 class OperatorProxy;
 
+namespace plugins {
+class Feature;
+}
+
 namespace relaxation_heuristic {
 struct Proposition;
 struct UnaryOperator;
@@ -60,6 +66,57 @@ class RelaxationHeuristic : public Heuristic {
 
     // proposition_offsets[var_no]: first PropID related to variable var_no
     std::vector<PropID> proposition_offsets;
+
+    // Options for creating worker copies (without caching and logging).
+    plugins::Options worker_options;
+
+    /*
+      Data for warm starts (see compute_batch_results). While the
+      parent exploration is in use, the propositions store the
+      exploration of the current state, and changed_propositions holds
+      the old values of all propositions that differ from the parent
+      exploration, unless the current state was explored from scratch
+      (parent_exploration_overwritten). In this case, we restore the
+      parent exploration from parent_propositions.
+    */
+    struct SavedProposition {
+        PropID prop_id;
+        int cost;
+        OpID reached_by;
+    };
+
+    /*
+      We explore a state from scratch if more than a
+      1/MAX_UNSUPPORTED_DIVISOR fraction of the propositions lose their
+      achiever in the parent exploration.
+    */
+    static const int MAX_UNSUPPORTED_DIVISOR = 4;
+
+    const bool warm_start;
+    bool use_parent_exploration;
+    bool parent_exploration_overwritten;
+    std::vector<int> parent_values;
+    std::vector<Proposition> parent_propositions;
+    /*
+      The unary operators with effect prop_id are stored in achievers
+      from position achiever_offsets[prop_id] to (excluding) position
+      achiever_offsets[prop_id + 1].
+    */
+    std::vector<int> achiever_offsets;
+    std::vector<OpID> achievers;
+    std::vector<SavedProposition> changed_propositions;
+    // Propositions whose achiever in the parent exploration is invalid.
+    std::vector<bool> unsupported;
+    std::vector<PropID> unsupported_propositions;
+    priority_queues::AdaptiveQueue<PropID> update_queue;
+
+    void build_achievers();
+    void save_proposition(PropID prop_id);
+    void mark_unsupported(PropID prop_id);
+    bool is_operator_reached(OpID op_id) const;
+    void enqueue_update(PropID prop_id, int cost, OpID op_id);
+    void unmark_supporters(PropID prop_id);
+    void restore_parent_exploration();
 protected:
     std::vector<UnaryOperator> unary_operators;
     std::vector<Proposition> propositions;
@@ -109,10 +166,65 @@ protected:
     const Proposition *get_proposition(int var, int value) const;
     Proposition *get_proposition(int var, int value);
     Proposition *get_proposition(const FactProxy &fact);
+
+    /*
+      Create a worker copy (see Evaluator::create_worker_copy) of the
+      given heuristic type. Subclasses must override create_worker_copy
+      with their own type.
+    */
+    template<typename HeuristicType>
+    std::shared_ptr<Evaluator> create_worker_copy_of_type() const {
+        return std::make_shared<HeuristicType>(worker_options);
+    }
+
+    /*
+      Compute the costs and achievers (reached_by) of all propositions
+      for the given state, without stopping when the goals are reached.
+    */
+    virtual void compute_complete_exploration(const State &state) = 0;
+    /*
+      Compute the cost of the operator from the costs of its
+      preconditions, which must all be reached.
+    */
+    virtual int compute_operator_cost(OpID op_id) = 0;
+
+    /*
+      Return true if the heuristic is computed for a successor of the
+      parent state of a batch with warm starts. In this case, subclasses
+      compute the costs of the propositions with update_exploration()
+      instead of exploring from scratch.
+    */
+    bool is_warm_start_active() const {
+        return use_parent_exploration;
+    }
+
+    /*
+      Update the exploration of the parent state to the given state:
+      propositions that lose their achiever in the parent exploration
+      are recomputed, and cost decreases caused by new facts are
+      propagated like in Dijkstra's algorithm. The resulting costs are
+      exact; the achievers can differ from the ones of an exploration
+      from scratch when several achievers have the same cost.
+
+      If too many propositions lose their achiever, updating is more
+      expensive than exploring from scratch. In this case, we return
+      false, and the caller has to explore the state from scratch.
+    */
+    bool update_exploration(const State &state);
 public:
     explicit RelaxationHeuristic(const plugins::Options &options);
 
     virtual bool dead_ends_are_reliable() const override;
+
+    /*
+      With warm starts, we explore the parent state completely once and
+      update this exploration for each state of the batch.
+    */
+    virtual void compute_batch_results(
+        const State &parent_state, const std::vector<State> &states,
+        std::vector<EvaluationResult> &results) override;
+
+    static void add_options_to_feature(plugins::Feature &feature);
 };
 }
 
@@ -0,0 +1,129 @@
+#include "key_histogram.h"
+
+#include "utils/logging.h"
+
+#include <algorithm>
+#include <cassert>
+
+using namespace std;
+
+KeyHistogram::KeyHistogram()
+    : offset(0),
+      use_sparse_counts(false),
+      num_entries(0),
+      min_key(0),
+      max_key(0),
+      key_sum(0),
+      key_square_sum(0) {
+}
+
+void KeyHistogram::reserve_key(int key) {
+    assert(!use_sparse_counts);
+    if (max_key - min_key >= MAX_DENSE_RANGE) {
+        for (size_t i = 0; i < counts.size(); ++i) {
+            if (counts[i])
+                sparse_counts.emplace(offset + i, counts[i]);
+        }
+        vector<int>().swap(counts);
+        use_sparse_counts = true;
+    } else if (key < offset) {
+        // Grow to the front geometrically, like to the back.
+        int new_offset = max(
+            0, min(key, offset - static_cast<int>(counts.size())));
+        counts.insert(counts.begin(), offset - new_offset, 0);
+        offset = new_offset;
+    } else if (key - offset >= static_cast<int>(counts.size())) {
+        counts.resize(key - offset + 1, 0);
+    }
+}
+
+void KeyHistogram::add(int key, int count) {
+    assert(key >= 0 && count >= 0);
+    if (count == 0)
+        return;
+    if (num_entries == 0) {
+        // Start over, so that removed keys do not widen the range.
+        clear();
+        offset = key;
+        min_key = max_key = key;
+    } else if (key < min_key) {
+        min_key = key;
+    } else if (key > max_key) {
+        max_key = key;
+    }
+    if (!use_sparse_counts)
+        reserve_key(key);
+    if (use_sparse_counts)
+        sparse_counts[key] += count;
+    else
+        counts[key - offset] += count;
+    num_entries += count;
+    key_sum += static_cast<int64_t>(key) * count;
+    key_square_sum += static_cast<double>(key) * key * count;
+}
+
+void KeyHistogram::remove(int key) {
+    assert(get_count(key) > 0);
+    --num_entries;
+    key_sum -= key;
+    key_square_sum -= static_cast<double>(key) * key;
+    if (use_sparse_counts) {
+        auto it = sparse_counts.find(key);
+        if (--it->second == 0)
+            sparse_counts.erase(it);
+        if (num_entries) {
+            min_key = sparse_counts.begin()->first;
+            max_key = sparse_counts.rbegin()->first;
+        }
+    } else if (--counts[key - offset] == 0 && num_entries) {
+        if (key == min_key) {
+            while (counts[min_key - offset] == 0)
+                ++min_key;
+        } else if (key == max_key) {
+            while (counts[max_key - offset] == 0)
+                --max_key;
+        }
+    }
+}
+
+int KeyHistogram::get_count(int key) const {
+    if (use_sparse_counts) {
+        auto it = sparse_counts.find(key);
+        return it == sparse_counts.end() ? 0 : it->second;
+    }
+    if (key < offset || key - offset >= static_cast<int>(counts.size()))
+        return 0;
+    return counts[key - offset];
+}
+
+void KeyHistogram::clear() {
+    counts.clear();
+    offset = 0;
+    use_sparse_counts = false;
+    sparse_counts.clear();
+    num_entries = 0;
+    min_key = 0;
+    max_key = 0;
+    key_sum = 0;
+    key_square_sum = 0;
+}
+
+double KeyHistogram::get_mean() const {
+    return num_entries ? static_cast<double>(key_sum) / num_entries : 0.0;
+}
+
+double KeyHistogram::get_variance() const {
+    if (!num_entries)
+        return 0.0;
+    double mean = get_mean();
+    return max(0.0, key_square_sum / num_entries - mean * mean);
+}
+
+void KeyHistogram::dump(utils::LogProxy &log) const {
+    log << num_entries << " entries";
+    if (num_entries) {
+        log << ", keys in [" << min_key << ", " << max_key << "]"
+            << ", mean " << get_mean() << ", variance " << get_variance();
+    }
+    log << endl;
+}
@@ -0,0 +1,89 @@
+#ifndef KEY_HISTOGRAM_H
+#define KEY_HISTOGRAM_H
+
+#include <cassert>
+#include <cstdint>
+#include <map>
+#include <vector>
+
+namespace utils {
+class LogProxy;
+}
+
+/*
+  Histogram of non-negative integer keys (e.g., heuristic values) that
+  supports adding and removing single keys in constant time, for
+  tracking the distribution of the keys in an open list without
+  iterating over it. Infinite values have to be filtered out by the
+  caller.
+
+  The counts are stored in a vector that covers the range of the keys
+  currently in the histogram, starting at an offset. If this range
+  exceeds MAX_DENSE_RANGE, e.g., because of a few very large keys, the
+  counts are moved to a map, so that the memory stays proportional to
+  the number of distinct keys. Adding and removing keys then takes
+  logarithmic time. When the histogram becomes empty, the storage
+  starts over with the next key.
+
+  The minimum and maximum key are updated incrementally. When the last
+  key with the minimum (maximum) value is removed, we scan for the next
+  non-empty key, so removals are constant-time amortized as long as the
+  keys do not jump back and forth across large ranges.
+*/
+class KeyHistogram {
+    static const int MAX_DENSE_RANGE = 1 << 16;
+
+    // counts[key - offset] is the number of entries with this key.
+    std::vector<int> counts;
+    int offset;
+    // If set, the counts are stored in sparse_counts instead of counts.
+    bool use_sparse_counts;
+    std::map<int, int> sparse_counts;
+    int num_entries;
+    int min_key;
+    int max_key;
+    int64_t key_sum;
+    // The sum of squares can exceed 64 bits for large keys.
+    double key_square_sum;
+
+    // Make room for the key in counts, or switch to sparse_counts.
+    void reserve_key(int key);
+public:
+    KeyHistogram();
+
+    void add(int key, int count = 1);
+    void remove(int key);
+
+    void clear();
+
+    int get_num_entries() const {
+        return num_entries;
+    }
+
+    bool empty() const {
+        return num_entries == 0;
+    }
+
+    int get_count(int key) const;
+
+    // Return the minimum key. The histogram must not be empty.
+    int get_min_key() const {
+        assert(!empty());
+        return min_key;
+    }
+
+    // Return the maximum key. The histogram must not be empty.
+    int get_max_key() const {
+        assert(!empty());
+        return max_key;
+    }
+
+    // Return the mean key, or 0 if the histogram is empty.
+    double get_mean() const;
+    // Return the (population) variance of the keys, or 0 if empty.
+    double get_variance() const;
+
+    void dump(utils::LogProxy &log) const;
+};
+
+#endif
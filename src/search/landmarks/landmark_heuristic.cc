@@ -186,7 +186,7 @@ void LandmarkHeuristic::notify_state_transition(
     if (cache_evaluator_values) {
         /* TODO:  It may be more efficient to check that the past landmark
             set has actually changed and only then mark the h value as dirty. */
-        heuristic_cache[state].dirty = true;
+        invalidate_cached_value(state);
     }
 }
 
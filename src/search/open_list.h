@@ -6,12 +6,19 @@
 #include "evaluation_context.h"
 #include "operator_id.h"
 
+class KeyHistogram;
+class SearchProgressMonitor;
 class StateID;
 
+namespace utils {
+class LogProxy;
+}
+
 
 template<class Entry>
 class OpenList {
     bool only_preferred;
+    const SearchProgressMonitor *progress_monitor;
 
 protected:
     /*
@@ -81,6 +88,51 @@ public:
     */
     virtual void boost_preferred();
 
+    /*
+      Return the index of the sublist from which the last call to
+      remove_min took its entry, or -1 if the open list has no sublists
+      or remove_min has not been called yet.
+
+      The default implementation returns -1. This is used for tracing
+      the choices of alternation open lists (see SearchTrace).
+    */
+    virtual int get_last_selected_sublist() const;
+
+    /*
+      Return the histogram of the keys (e.g., heuristic values) of the
+      entries in the open list, or nullptr if the open list does not
+      maintain one. Open lists that support this maintain the histogram
+      incrementally if asked to (usually with the "histogram" option),
+      so that it can be queried after every expansion. Entries with
+      infinite keys are not counted.
+
+      The default implementation returns nullptr.
+    */
+    virtual const KeyHistogram *get_key_histogram() const;
+
+    /*
+      Give the open list read access to the progress monitor of the
+      search algorithm (or nullptr), e.g., for alternation decisions
+      based on search progress. The monitor outlives the open list.
+
+      Open lists that contain other open lists must pass the monitor
+      on to them.
+    */
+    virtual void set_progress_monitor(const SearchProgressMonitor *monitor);
+
+    /*
+      Return the progress monitor set with set_progress_monitor, or
+      nullptr.
+    */
+    const SearchProgressMonitor *get_progress_monitor() const;
+
+    /*
+      Print statistics about the open list at the end of the search.
+
+      The default implementation prints nothing.
+    */
+    virtual void print_statistics(utils::LogProxy &log) const;
+
     /*
       Add all path-dependent evaluators that this open lists uses (directly or
       indirectly) into the result set.
@@ -135,13 +187,39 @@ using EdgeOpenList = OpenList<EdgeOpenListEntry>;
 
 template<class Entry>
 OpenList<Entry>::OpenList(bool only_preferred)
-    : only_preferred(only_preferred) {
+    : only_preferred(only_preferred),
+      progress_monitor(nullptr) {
 }
 
 template<class Entry>
 void OpenList<Entry>::boost_preferred() {
 }
 
+template<class Entry>
+int OpenList<Entry>::get_last_selected_sublist() const {
+    return -1;
+}
+
+template<class Entry>
+void OpenList<Entry>::print_statistics(utils::LogProxy &) const {
+}
+
+template<class Entry>
+const KeyHistogram *OpenList<Entry>::get_key_histogram() const {
+    return nullptr;
+}
+
+template<class Entry>
+void OpenList<Entry>::set_progress_monitor(
+    const SearchProgressMonitor *monitor) {
+    progress_monitor = monitor;
+}
+
+template<class Entry>
+const SearchProgressMonitor *OpenList<Entry>::get_progress_monitor() const {
+    return progress_monitor;
+}
+
 template<class Entry>
 void OpenList<Entry>::insert(
     EvaluationContext &eval_context, const Entry &entry) {
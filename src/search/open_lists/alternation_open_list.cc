@@ -24,6 +24,7 @@ class AlternationOpenList : public OpenList<Entry> {
     const int decision;
     const vector<double> probs;
     std::mt19937 rng;
+    int last_selected;
 protected:
     virtual void do_insertion(EvaluationContext &eval_context,
                               const Entry &entry) override;
@@ -36,6 +37,10 @@ public:
     virtual bool empty() const override;
     virtual void clear() override;
     virtual void boost_preferred() override;
+    virtual int get_last_selected_sublist() const override;
+    virtual void set_progress_monitor(
+        const SearchProgressMonitor *monitor) override;
+    virtual void print_statistics(utils::LogProxy &log) const override;
     virtual void get_path_dependent_evaluators(
         set<Evaluator *> &evals) override;
     virtual bool is_dead_end(
@@ -50,7 +55,8 @@ AlternationOpenList<Entry>::AlternationOpenList(const plugins::Options &opts)
     : boost_amount(opts.get<int>("boost")), 
     decision(opts.get<int>("decision")), 
     rng(opts.get<int>("seed")), // std::random_device{}()
-    probs(opts.get_list<double>("probs")) { 
+    probs(opts.get_list<double>("probs")),
+    last_selected(-1) { 
     vector<shared_ptr<OpenListFactory>> open_list_factories(
         opts.get_list<shared_ptr<OpenListFactory>>("sublists"));
     open_lists.reserve(open_list_factories.size());
@@ -102,6 +108,7 @@ Entry AlternationOpenList<Entry>::remove_min() {
         const auto &best_list = open_lists[best];
         assert(!best_list->empty());
         ++priorities[best];
+        last_selected = best;
         return best_list->remove_min();
         
     } else if (decision == 1) { // Random alternation strategy
@@ -127,6 +134,7 @@ Entry AlternationOpenList<Entry>::remove_min() {
         cout << "Invalid decision value" << endl;
         utils::exit_with(ExitCode::SEARCH_CRITICAL_ERROR);
     }
+    last_selected = selected_index;
     return open_lists[selected_index]->remove_min();
 }
 
@@ -151,6 +159,25 @@ void AlternationOpenList<Entry>::boost_preferred() {
             priorities[i] -= boost_amount;
 }
 
+template<class Entry>
+int AlternationOpenList<Entry>::get_last_selected_sublist() const {
+    return last_selected;
+}
+
+template<class Entry>
+void AlternationOpenList<Entry>::set_progress_monitor(
+    const SearchProgressMonitor *monitor) {
+    OpenList<Entry>::set_progress_monitor(monitor);
+    for (const auto &sublist : open_lists)
+        sublist->set_progress_monitor(monitor);
+}
+
+template<class Entry>
+void AlternationOpenList<Entry>::print_statistics(utils::LogProxy &log) const {
+    for (const auto &sublist : open_lists)
+        sublist->print_statistics(log);
+}
+
 template<class Entry>
 void AlternationOpenList<Entry>::get_path_dependent_evaluators(
     set<Evaluator *> &evals) {
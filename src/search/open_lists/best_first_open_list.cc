@@ -1,6 +1,7 @@
 #include "best_first_open_list.h"
 
 #include "../evaluator.h"
+#include "../key_histogram.h"
 #include "../open_list.h"
 
 #include "../plugins/plugin.h"
@@ -22,6 +23,9 @@ class BestFirstOpenList : public OpenList<Entry> {
 
     shared_ptr<Evaluator> evaluator;
 
+    bool use_histogram;
+    KeyHistogram histogram;
+
 protected:
     virtual void do_insertion(EvaluationContext &eval_context,
                               const Entry &entry) override;
@@ -34,6 +38,7 @@ public:
     virtual Entry remove_min() override;
     virtual bool empty() const override;
     virtual void clear() override;
+    virtual const KeyHistogram *get_key_histogram() const override;
     virtual void get_path_dependent_evaluators(set<Evaluator *> &evals) override;
     virtual bool is_dead_end(
         EvaluationContext &eval_context) const override;
@@ -46,7 +51,8 @@ template<class Entry>
 BestFirstOpenList<Entry>::BestFirstOpenList(const plugins::Options &opts)
     : OpenList<Entry>(opts.get<bool>("pref_only")),
       size(0),
-      evaluator(opts.get<shared_ptr<Evaluator>>("eval")) {
+      evaluator(opts.get<shared_ptr<Evaluator>>("eval")),
+      use_histogram(opts.get<bool>("histogram", false)) {
 }
 
 template<class Entry>
@@ -54,7 +60,8 @@ BestFirstOpenList<Entry>::BestFirstOpenList(
     const shared_ptr<Evaluator> &evaluator, bool preferred_only)
     : OpenList<Entry>(preferred_only),
       size(0),
-      evaluator(evaluator) {
+      evaluator(evaluator),
+      use_histogram(false) {
 }
 
 template<class Entry>
@@ -63,6 +70,8 @@ void BestFirstOpenList<Entry>::do_insertion(
     int key = eval_context.get_evaluator_value(evaluator.get());
     buckets[key].push_back(entry);
     ++size;
+    if (use_histogram && key != EvaluationResult::INFTY)
+        histogram.add(key);
 }
 
 template<class Entry>
@@ -74,6 +83,8 @@ Entry BestFirstOpenList<Entry>::remove_min() {
     assert(!bucket.empty());
     Entry result = bucket.front();
     bucket.pop_front();
+    if (use_histogram && it->first != EvaluationResult::INFTY)
+        histogram.remove(it->first);
     if (bucket.empty())
         buckets.erase(it);
     --size;
@@ -89,6 +100,12 @@ template<class Entry>
 void BestFirstOpenList<Entry>::clear() {
     buckets.clear();
     size = 0;
+    histogram.clear();
+}
+
+template<class Entry>
+const KeyHistogram *BestFirstOpenList<Entry>::get_key_histogram() const {
+    return use_histogram ? &histogram : nullptr;
 }
 
 template<class Entry>
@@ -135,6 +152,11 @@ public:
         add_option<bool>(
             "pref_only",
             "insert only nodes generated by preferred operators", "false");
+        add_option<bool>(
+            "histogram",
+            "maintain a histogram of the evaluator values of the entries "
+            "(see OpenList::get_key_histogram)",
+            "false");
 
         document_note(
             "Implementation Notes",
@@ -1,6 +1,7 @@
 #include "epsilon_greedy_open_list.h"
 
 #include "../evaluator.h"
+#include "../key_histogram.h"
 #include "../open_list.h"
 
 #include "../plugins/plugin.h"
@@ -10,8 +11,8 @@
 #include "../utils/rng.h"
 #include "../utils/rng_options.h"
 
-#include <functional>
 #include <memory>
+#include <utility>
 
 using namespace std;
 
@@ -33,13 +34,24 @@ class EpsilonGreedyOpenList : public OpenList<Entry> {
         }
     };
 
+    /*
+      Binary min-heap ordered by (h, id). With epsilon=1, the minimum is
+      never needed, so we keep the nodes in arbitrary order instead.
+    */
     vector<HeapNode> heap;
     shared_ptr<Evaluator> evaluator;
 
     double epsilon;
-    int size;
+    bool only_random;
     int next_id;
 
+    bool use_histogram;
+    KeyHistogram histogram;
+
+    void sift_up(size_t pos);
+    void sift_down(size_t pos);
+    HeapNode remove_at(size_t pos);
+
 protected:
     virtual void do_insertion(EvaluationContext &eval_context,
                               const Entry &entry) override;
@@ -56,28 +68,72 @@ public:
     virtual void get_path_dependent_evaluators(set<Evaluator *> &evals) override;
     virtual bool empty() const override;
     virtual void clear() override;
+    virtual const KeyHistogram *get_key_histogram() const override;
 };
 
-template<class HeapNode>
-static void adjust_heap_up(vector<HeapNode> &heap, size_t pos) {
+template<class Entry>
+void EpsilonGreedyOpenList<Entry>::sift_up(size_t pos) {
     assert(utils::in_bounds(pos, heap));
+    HeapNode node = move(heap[pos]);
     while (pos != 0) {
         size_t parent_pos = (pos - 1) / 2;
-        if (heap[pos] > heap[parent_pos]) {
+        if (!(heap[parent_pos] > node))
             break;
-        }
-        swap(heap[pos], heap[parent_pos]);
+        heap[pos] = move(heap[parent_pos]);
         pos = parent_pos;
     }
+    heap[pos] = move(node);
+}
+
+template<class Entry>
+void EpsilonGreedyOpenList<Entry>::sift_down(size_t pos) {
+    assert(utils::in_bounds(pos, heap));
+    HeapNode node = move(heap[pos]);
+    size_t size = heap.size();
+    while (true) {
+        size_t child_pos = 2 * pos + 1;
+        if (child_pos >= size)
+            break;
+        if (child_pos + 1 < size && heap[child_pos] > heap[child_pos + 1])
+            ++child_pos;
+        if (!(node > heap[child_pos]))
+            break;
+        heap[pos] = move(heap[child_pos]);
+        pos = child_pos;
+    }
+    heap[pos] = move(node);
+}
+
+template<class Entry>
+typename EpsilonGreedyOpenList<Entry>::HeapNode
+EpsilonGreedyOpenList<Entry>::remove_at(size_t pos) {
+    assert(utils::in_bounds(pos, heap));
+    HeapNode result = move(heap[pos]);
+    // Move the last node into the gap and restore the heap property.
+    if (pos + 1 < heap.size()) {
+        heap[pos] = move(heap.back());
+        heap.pop_back();
+        if (!only_random) {
+            if (pos != 0 && heap[(pos - 1) / 2] > heap[pos])
+                sift_up(pos);
+            else
+                sift_down(pos);
+        }
+    } else {
+        heap.pop_back();
+    }
+    return result;
 }
 
 template<class Entry>
 void EpsilonGreedyOpenList<Entry>::do_insertion(
     EvaluationContext &eval_context, const Entry &entry) {
-    heap.emplace_back(
-        next_id++, eval_context.get_evaluator_value(evaluator.get()), entry);
-    push_heap(heap.begin(), heap.end(), greater<HeapNode>());
-    ++size;
+    int h = eval_context.get_evaluator_value(evaluator.get());
+    heap.emplace_back(next_id++, h, entry);
+    if (!only_random)
+        sift_up(heap.size() - 1);
+    if (use_histogram && h != EvaluationResult::INFTY)
+        histogram.add(h);
 }
 
 template<class Entry>
@@ -86,22 +142,20 @@ EpsilonGreedyOpenList<Entry>::EpsilonGreedyOpenList(const plugins::Options &opts
       rng(utils::parse_rng_from_options(opts)),
       evaluator(opts.get<shared_ptr<Evaluator>>("eval")),
       epsilon(opts.get<double>("epsilon")),
-      size(0),
-      next_id(0) {
+      only_random(epsilon == 1.0),
+      next_id(0),
+      use_histogram(opts.get<bool>("histogram", false)) {
 }
 
 template<class Entry>
 Entry EpsilonGreedyOpenList<Entry>::remove_min() {
-    assert(size > 0);
-    if (rng->random() < epsilon) {
-        int pos = rng->random(size);
-        heap[pos].h = numeric_limits<int>::min();
-        adjust_heap_up(heap, pos);
-    }
-    pop_heap(heap.begin(), heap.end(), greater<HeapNode>());
-    HeapNode heap_node = heap.back();
-    heap.pop_back();
-    --size;
+    assert(!heap.empty());
+    size_t pos = 0;
+    if (only_random || rng->random() < epsilon)
+        pos = rng->random(heap.size());
+    HeapNode heap_node = remove_at(pos);
+    if (use_histogram && heap_node.h != EvaluationResult::INFTY)
+        histogram.remove(heap_node.h);
     return heap_node.entry;
 }
 
@@ -125,14 +179,19 @@ void EpsilonGreedyOpenList<Entry>::get_path_dependent_evaluators(
 
 template<class Entry>
 bool EpsilonGreedyOpenList<Entry>::empty() const {
-    return size == 0;
+    return heap.empty();
 }
 
 template<class Entry>
 void EpsilonGreedyOpenList<Entry>::clear() {
     heap.clear();
-    size = 0;
     next_id = 0;
+    histogram.clear();
+}
+
+template<class Entry>
+const KeyHistogram *EpsilonGreedyOpenList<Entry>::get_key_histogram() const {
+    return use_histogram ? &histogram : nullptr;
 }
 
 EpsilonGreedyOpenListFactory::EpsilonGreedyOpenListFactory(
@@ -178,6 +237,11 @@ public:
             "probability for choosing the next entry randomly",
             "0.2",
             plugins::Bounds("0.0", "1.0"));
+        add_option<bool>(
+            "histogram",
+            "maintain a histogram of the evaluator values of the entries "
+            "(see OpenList::get_key_histogram)",
+            "false");
         utils::add_rng_options(*this);
     }
 };
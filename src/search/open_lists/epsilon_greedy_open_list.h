@@ -40,6 +40,12 @@
     swap-and-pop to remove the entry in constant time. Otherwise, the
     removal is linear in the number of entries in the bucket (O(n), since
     there could be only one bucket).
+
+    Our heap supports removing the entry at any position by moving the
+    last entry into its place and sifting it up or down, so a random
+    entry is removed with a single O(log(n)) repair of the heap. With
+    epsilon=1, the minimum is never needed, so we store the entries in
+    arbitrary order and remove random entries with swap-and-pop in O(1).
 */
 
 namespace epsilon_greedy_open_list {
@@ -0,0 +1,376 @@
+#include "exploration_type_based_open_list.h"
+
+#include "type_buckets.h"
+
+#include "../evaluator.h"
+#include "../open_list.h"
+#include "../task_proxy.h"
+
+#include "../plugins/plugin.h"
+#include "../tasks/root_task.h"
+#include "../utils/hash.h"
+#include "../utils/logging.h"
+#include "../utils/memory.h"
+#include "../utils/rng.h"
+#include "../utils/rng_options.h"
+#include "../utils/system.h"
+
+#include <cmath>
+#include <memory>
+#include <vector>
+
+using namespace std;
+using utils::ExitCode;
+
+namespace exploration_type_based_open_list {
+/*
+  Complete binary tree over the weights of the types for sampling a
+  type with probability proportional to its weight. Inner nodes are
+  recomputed as the sum of their children (instead of adding the
+  difference of the weights) so that rounding errors do not accumulate.
+*/
+class WeightTree {
+    // Number of leaves (a power of two). Leaf i is at capacity + i.
+    int capacity;
+    vector<double> nodes;
+
+    void grow(int min_capacity);
+public:
+    WeightTree() : capacity(0) {
+    }
+
+    void set_weight(int index, double weight);
+
+    double get_total_weight() const {
+        return capacity ? nodes[1] : 0.0;
+    }
+
+    // Return the index i with sum_{j < i} w_j <= value < sum_{j <= i} w_j.
+    int find(double value) const;
+
+    void clear() {
+        capacity = 0;
+        nodes.clear();
+    }
+};
+
+void WeightTree::grow(int min_capacity) {
+    int new_capacity = max(capacity, 1);
+    while (new_capacity < min_capacity)
+        new_capacity *= 2;
+    vector<double> new_nodes(2 * new_capacity, 0.0);
+    copy(nodes.begin() + capacity, nodes.end(),
+         new_nodes.begin() + new_capacity);
+    for (int node = new_capacity - 1; node > 0; --node)
+        new_nodes[node] = new_nodes[2 * node] + new_nodes[2 * node + 1];
+    capacity = new_capacity;
+    nodes.swap(new_nodes);
+}
+
+void WeightTree::set_weight(int index, double weight) {
+    if (index >= capacity)
+        grow(index + 1);
+    int node = capacity + index;
+    nodes[node] = weight;
+    for (node /= 2; node > 0; node /= 2)
+        nodes[node] = nodes[2 * node] + nodes[2 * node + 1];
+}
+
+int WeightTree::find(double value) const {
+    assert(get_total_weight() > 0);
+    int node = 1;
+    while (node < capacity) {
+        int left = 2 * node;
+        // Never descend into a subtree without weight due to rounding.
+        if (value < nodes[left] || nodes[left + 1] == 0) {
+            node = left;
+        } else {
+            value -= nodes[left];
+            node = left + 1;
+        }
+    }
+    return node - capacity;
+}
+
+template<class Entry>
+class ExplorationTypeBasedOpenList : public OpenList<Entry> {
+    shared_ptr<utils::RandomNumberGenerator> rng;
+    vector<shared_ptr<Evaluator>> evaluators;
+    vector<int> band_widths;
+    vector<int> projection;
+    int projection_hash_size;
+    double decay;
+
+    type_buckets::TypeBuckets<Entry> buckets;
+    // Number of times each type has been chosen.
+    vector<int> num_selections;
+    // Weights of the types, zero for types with empty buckets.
+    WeightTree weights;
+
+    double get_weight(int type) const;
+    void push_key(EvaluationContext &eval_context);
+
+protected:
+    virtual void do_insertion(
+        EvaluationContext &eval_context, const Entry &entry) override;
+
+public:
+    explicit ExplorationTypeBasedOpenList(const plugins::Options &opts);
+    virtual ~ExplorationTypeBasedOpenList() override = default;
+
+    virtual Entry remove_min() override;
+    virtual bool empty() const override;
+    virtual void clear() override;
+    virtual void print_statistics(utils::LogProxy &log) const override;
+    virtual bool is_dead_end(EvaluationContext &eval_context) const override;
+    virtual bool is_reliable_dead_end(
+        EvaluationContext &eval_context) const override;
+    virtual void get_path_dependent_evaluators(set<Evaluator *> &evals) override;
+};
+
+static int get_key_size(const plugins::Options &opts) {
+    int num_evaluators =
+        opts.get_list<shared_ptr<Evaluator>>("evaluators").size();
+    int projection_size = opts.get_list<int>("projection").size();
+    if (opts.get<int>("projection_hash_size") > 0)
+        projection_size = min(projection_size, 1);
+    return num_evaluators + projection_size;
+}
+
+template<class Entry>
+ExplorationTypeBasedOpenList<Entry>::ExplorationTypeBasedOpenList(
+    const plugins::Options &opts)
+    : rng(utils::parse_rng_from_options(opts)),
+      evaluators(opts.get_list<shared_ptr<Evaluator>>("evaluators")),
+      band_widths(opts.get_list<int>("band_widths")),
+      projection(opts.get_list<int>("projection")),
+      projection_hash_size(opts.get<int>("projection_hash_size")),
+      decay(opts.get<double>("decay")),
+      buckets(get_key_size(opts), false) {
+    if (band_widths.empty())
+        band_widths.assign(evaluators.size(), 1);
+    int num_variables = tasks::g_root_task->get_num_variables();
+    for (int var : projection) {
+        if (var < 0 || var >= num_variables) {
+            cerr << "Projection variable " << var << " out of range: "
+                 << "the task has " << num_variables << " variables." << endl;
+            utils::exit_with(ExitCode::SEARCH_INPUT_ERROR);
+        }
+    }
+}
+
+template<class Entry>
+double ExplorationTypeBasedOpenList<Entry>::get_weight(int type) const {
+    if (buckets.get_bucket_size(type) == 0)
+        return 0.0;
+    if (decay == 0)
+        return 1.0;
+    return pow(1.0 + num_selections[type], -decay);
+}
+
+template<class Entry>
+void ExplorationTypeBasedOpenList<Entry>::push_key(
+    EvaluationContext &eval_context) {
+    for (size_t i = 0; i < evaluators.size(); ++i) {
+        int value = eval_context.get_evaluator_value_or_infinity(
+            evaluators[i].get());
+        if (value != EvaluationResult::INFTY)
+            value /= band_widths[i];
+        buckets.push_key_value(value);
+    }
+    if (projection.empty())
+        return;
+    const State &state = eval_context.get_state();
+    if (projection_hash_size == 0) {
+        for (int var : projection)
+            buckets.push_key_value(state[var].get_value());
+    } else {
+        utils::HashState hash_state;
+        for (int var : projection)
+            utils::feed(hash_state, state[var].get_value());
+        buckets.push_key_value(hash_state.get_hash32() % projection_hash_size);
+    }
+}
+
+template<class Entry>
+void ExplorationTypeBasedOpenList<Entry>::do_insertion(
+    EvaluationContext &eval_context, const Entry &entry) {
+    push_key(eval_context);
+    int type = buckets.insert(entry);
+    if (type == static_cast<int>(num_selections.size()))
+        num_selections.push_back(0);
+    if (buckets.get_bucket_size(type) == 1)
+        weights.set_weight(type, get_weight(type));
+}
+
+template<class Entry>
+Entry ExplorationTypeBasedOpenList<Entry>::remove_min() {
+    int type = weights.find(rng->random() * weights.get_total_weight());
+    int pos = rng->random(buckets.get_bucket_size(type));
+    Entry result = buckets.remove(type, pos);
+    ++num_selections[type];
+    weights.set_weight(type, get_weight(type));
+    return result;
+}
+
+template<class Entry>
+bool ExplorationTypeBasedOpenList<Entry>::empty() const {
+    return buckets.empty();
+}
+
+template<class Entry>
+void ExplorationTypeBasedOpenList<Entry>::clear() {
+    buckets.clear();
+    num_selections.clear();
+    weights.clear();
+}
+
+template<class Entry>
+void ExplorationTypeBasedOpenList<Entry>::print_statistics(
+    utils::LogProxy &log) const {
+    buckets.print_statistics(log, "Exploration type-based open list");
+    int num_selected_types = 0;
+    int max_selections = 0;
+    for (int selections : num_selections) {
+        if (selections) {
+            ++num_selected_types;
+            max_selections = max(max_selections, selections);
+        }
+    }
+    log << "Exploration type-based open list: " << num_selected_types
+        << " types selected at least once, at most " << max_selections
+        << " times" << endl;
+}
+
+template<class Entry>
+bool ExplorationTypeBasedOpenList<Entry>::is_dead_end(
+    EvaluationContext &eval_context) const {
+    // If one evaluator is sure we have a dead end, return true.
+    if (is_reliable_dead_end(eval_context))
+        return true;
+    // Otherwise, return true if all evaluators agree this is a dead-end.
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        if (!eval_context.is_evaluator_value_infinite(evaluator.get()))
+            return false;
+    }
+    return !evaluators.empty();
+}
+
+template<class Entry>
+bool ExplorationTypeBasedOpenList<Entry>::is_reliable_dead_end(
+    EvaluationContext &eval_context) const {
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        if (evaluator->dead_ends_are_reliable() &&
+            eval_context.is_evaluator_value_infinite(evaluator.get()))
+            return true;
+    }
+    return false;
+}
+
+template<class Entry>
+void ExplorationTypeBasedOpenList<Entry>::get_path_dependent_evaluators(
+    set<Evaluator *> &evals) {
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        evaluator->get_path_dependent_evaluators(evals);
+    }
+}
+
+ExplorationTypeBasedOpenListFactory::ExplorationTypeBasedOpenListFactory(
+    const plugins::Options &options)
+    : options(options) {
+}
+
+unique_ptr<StateOpenList>
+ExplorationTypeBasedOpenListFactory::create_state_open_list() {
+    return utils::make_unique_ptr<
+        ExplorationTypeBasedOpenList<StateOpenListEntry>>(options);
+}
+
+unique_ptr<EdgeOpenList>
+ExplorationTypeBasedOpenListFactory::create_edge_open_list() {
+    return utils::make_unique_ptr<
+        ExplorationTypeBasedOpenList<EdgeOpenListEntry>>(options);
+}
+
+class ExplorationTypeBasedOpenListFeature : public plugins::TypedFeature<OpenListFactory, ExplorationTypeBasedOpenListFactory> {
+public:
+    ExplorationTypeBasedOpenListFeature() : TypedFeature("exploration_type_based") {
+        document_title("Exploration type-based open list");
+        document_synopsis(
+            "Type-based open list for exploration (e.g., in Type-GBFS "
+            "and Type-WA* as a sublist of an alternation open list). "
+            "The type of an entry consists of the values of the given "
+            "evaluators divided by the band widths and the values of the "
+            "state on the projection variables (for edge open lists, the "
+            "state is the parent state). When retrieving an entry, a type "
+            "with a non-empty bucket is chosen with probability "
+            "proportional to 1 / (1 + s)^decay, where s is the number of "
+            "times the type has been chosen before, and one of the "
+            "contained entries is selected uniformly randomly.");
+
+        add_list_option<shared_ptr<Evaluator>>(
+            "evaluators",
+            "Evaluators used to determine the bucket for each entry, "
+            "e.g., [h, g()] for the (h, g) types of Type-WA*.",
+            "[]");
+        add_list_option<int>(
+            "band_widths",
+            "Width of the value bands for each evaluator: values v and v' "
+            "of the i-th evaluator belong to the same type if "
+            "v / w_i = v' / w_i (rounded down). Defaults to 1 for all "
+            "evaluators.",
+            "[]");
+        add_list_option<int>(
+            "projection",
+            "Variables whose values in the state are part of the type.",
+            "[]");
+        add_option<int>(
+            "projection_hash_size",
+            "If positive, the values of the projection are hashed into "
+            "this many classes instead of using them directly.",
+            "0",
+            plugins::Bounds("0", "infinity"));
+        add_option<double>(
+            "decay",
+            "Decay of the weight of a type with the number of times it "
+            "has been chosen (0 chooses types uniformly).",
+            "1.0",
+            plugins::Bounds("0.0", "infinity"));
+        utils::add_rng_options(*this);
+
+        document_note(
+            "Example",
+            "Type-WA* with exploration types from bands of h and g and a "
+            "hashed projection onto the first two variables:\n{{{\n"
+            "--evaluator \"h=ff()\" --search \"eager(alt(["
+            "tiebreaking([sum([g(), weight(h, 2)]), h]), "
+            "exploration_type_based([h, g()], band_widths=[1, 5], "
+            "projection=[0, 1], projection_hash_size=64)]), "
+            "reopen_closed=true)\"\n}}}\n");
+    }
+
+    virtual shared_ptr<ExplorationTypeBasedOpenListFactory> create_component(const plugins::Options &options, const utils::Context &context) const override {
+        int num_evaluators =
+            options.get_list<shared_ptr<Evaluator>>("evaluators").size();
+        if (num_evaluators == 0 && options.get_list<int>("projection").empty()) {
+            context.error(
+                "At least one of 'evaluators' and 'projection' has to be "
+                "non-empty.");
+        }
+        vector<int> band_widths = options.get_list<int>("band_widths");
+        if (!band_widths.empty()) {
+            if (static_cast<int>(band_widths.size()) != num_evaluators) {
+                context.error(
+                    "'band_widths' must have one entry per evaluator.");
+            }
+            for (int width : band_widths) {
+                if (width <= 0)
+                    context.error("'band_widths' must be positive.");
+            }
+        }
+        return make_shared<ExplorationTypeBasedOpenListFactory>(options);
+    }
+};
+
+static plugins::FeaturePlugin<ExplorationTypeBasedOpenListFeature> _plugin;
+}
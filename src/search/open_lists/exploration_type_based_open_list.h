@@ -0,0 +1,46 @@
+#ifndef OPEN_LISTS_EXPLORATION_TYPE_BASED_OPEN_LIST_H
+#define OPEN_LISTS_EXPLORATION_TYPE_BASED_OPEN_LIST_H
+
+#include "../open_list_factory.h"
+
+#include "../plugins/plugin.h"
+
+/*
+  Type-based open list for exploration in Type-GBFS and Type-WA*
+  (usually as a sublist of an alternation open list).
+
+  In contrast to the type-based open list, the type of an entry can be
+  defined by bands of evaluator values (e.g., [h, g] with band widths
+  [2, 5]) and by the values of the state (the parent state for edge
+  open lists) on a projection onto some variables, optionally hashed
+  into a fixed number of classes. Types are chosen with a weight of
+  1 / (1 + s)^decay, where s is the number of times the type has been
+  chosen before, so that rarely explored types are preferred. With
+  decay=0, types are chosen uniformly like in the type-based open list.
+
+  The buckets are stored like in the type-based open list (see
+  type_buckets.h), but types are kept when their buckets become empty
+  because their selection counts are needed. The weights of the types
+  are kept in a sum tree, so that the complexities are:
+
+    n = number of entries
+    m = number of types
+
+    Insert entry            O(1) if the bucket was non-empty,
+                            O(log(m)) otherwise
+    Remove entry            O(log(m))
+*/
+
+namespace exploration_type_based_open_list {
+class ExplorationTypeBasedOpenListFactory : public OpenListFactory {
+    plugins::Options options;
+public:
+    explicit ExplorationTypeBasedOpenListFactory(const plugins::Options &options);
+    virtual ~ExplorationTypeBasedOpenListFactory() override = default;
+
+    virtual std::unique_ptr<StateOpenList> create_state_open_list() override;
+    virtual std::unique_ptr<EdgeOpenList> create_edge_open_list() override;
+};
+}
+
+#endif
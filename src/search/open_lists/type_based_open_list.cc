@@ -1,18 +1,18 @@
 #include "type_based_open_list.h"
 
+#include "type_buckets.h"
+
 #include "../evaluator.h"
+#include "../key_histogram.h"
 #include "../open_list.h"
 
 #include "../plugins/plugin.h"
-#include "../utils/collections.h"
-#include "../utils/hash.h"
 #include "../utils/markup.h"
 #include "../utils/memory.h"
 #include "../utils/rng.h"
 #include "../utils/rng_options.h"
 
 #include <memory>
-#include <unordered_map>
 #include <vector>
 
 using namespace std;
@@ -22,11 +22,11 @@ template<class Entry>
 class TypeBasedOpenList : public OpenList<Entry> {
     shared_ptr<utils::RandomNumberGenerator> rng;
     vector<shared_ptr<Evaluator>> evaluators;
+    type_buckets::TypeBuckets<Entry> buckets;
 
-    using Key = vector<int>;
-    using Bucket = vector<Entry>;
-    vector<pair<Key, Bucket>> keys_and_buckets;
-    utils::HashMap<Key, int> key_to_bucket_index;
+    bool use_histogram;
+    // Histogram of the values of the first evaluator.
+    KeyHistogram histogram;
 
 protected:
     virtual void do_insertion(
@@ -39,6 +39,8 @@ public:
     virtual Entry remove_min() override;
     virtual bool empty() const override;
     virtual void clear() override;
+    virtual void print_statistics(utils::LogProxy &log) const override;
+    virtual const KeyHistogram *get_key_histogram() const override;
     virtual bool is_dead_end(EvaluationContext &eval_context) const override;
     virtual bool is_reliable_dead_end(
         EvaluationContext &eval_context) const override;
@@ -48,57 +50,58 @@ public:
 template<class Entry>
 void TypeBasedOpenList<Entry>::do_insertion(
     EvaluationContext &eval_context, const Entry &entry) {
-    vector<int> key;
-    key.reserve(evaluators.size());
     for (const shared_ptr<Evaluator> &evaluator : evaluators) {
-        key.push_back(
+        buckets.push_key_value(
             eval_context.get_evaluator_value_or_infinity(evaluator.get()));
     }
-
-    auto it = key_to_bucket_index.find(key);
-    if (it == key_to_bucket_index.end()) {
-        key_to_bucket_index[key] = keys_and_buckets.size();
-        keys_and_buckets.push_back(make_pair(move(key), Bucket({entry})));
-    } else {
-        size_t bucket_index = it->second;
-        assert(utils::in_bounds(bucket_index, keys_and_buckets));
-        keys_and_buckets[bucket_index].second.push_back(entry);
+    int type = buckets.insert(entry);
+    if (use_histogram) {
+        int key = buckets.get_key_value(type, 0);
+        if (key != EvaluationResult::INFTY)
+            histogram.add(key);
     }
 }
 
 template<class Entry>
 TypeBasedOpenList<Entry>::TypeBasedOpenList(const plugins::Options &opts)
     : rng(utils::parse_rng_from_options(opts)),
-      evaluators(opts.get_list<shared_ptr<Evaluator>>("evaluators")) {
+      evaluators(opts.get_list<shared_ptr<Evaluator>>("evaluators")),
+      buckets(evaluators.size(), true),
+      use_histogram(opts.get<bool>("histogram", false)) {
 }
 
 template<class Entry>
 Entry TypeBasedOpenList<Entry>::remove_min() {
-    size_t bucket_id = rng->random(keys_and_buckets.size());
-    auto &key_and_bucket = keys_and_buckets[bucket_id];
-    const Key &min_key = key_and_bucket.first;
-    Bucket &bucket = key_and_bucket.second;
-    int pos = rng->random(bucket.size());
-    Entry result = utils::swap_and_pop_from_vector(bucket, pos);
-
-    if (bucket.empty()) {
-        // Swap the empty bucket with the last bucket, then delete it.
-        key_to_bucket_index[keys_and_buckets.back().first] = bucket_id;
-        key_to_bucket_index.erase(min_key);
-        utils::swap_and_pop_from_vector(keys_and_buckets, bucket_id);
+    size_t index = rng->random(buckets.get_num_non_empty_types());
+    int type = buckets.get_non_empty_type(index);
+    int pos = rng->random(buckets.get_bucket_size(type));
+    if (use_histogram) {
+        int key = buckets.get_key_value(type, 0);
+        if (key != EvaluationResult::INFTY)
+            histogram.remove(key);
     }
-    return result;
+    return buckets.remove(type, pos);
 }
 
 template<class Entry>
 bool TypeBasedOpenList<Entry>::empty() const {
-    return keys_and_buckets.empty();
+    return buckets.empty();
 }
 
 template<class Entry>
 void TypeBasedOpenList<Entry>::clear() {
-    keys_and_buckets.clear();
-    key_to_bucket_index.clear();
+    buckets.clear();
+    histogram.clear();
+}
+
+template<class Entry>
+void TypeBasedOpenList<Entry>::print_statistics(utils::LogProxy &log) const {
+    buckets.print_statistics(log, "Type-based open list");
+}
+
+template<class Entry>
+const KeyHistogram *TypeBasedOpenList<Entry>::get_key_histogram() const {
+    return use_histogram ? &histogram : nullptr;
 }
 
 template<class Entry>
@@ -173,6 +176,11 @@ public:
         add_list_option<shared_ptr<Evaluator>>(
             "evaluators",
             "Evaluators used to determine the bucket for each entry.");
+        add_option<bool>(
+            "histogram",
+            "maintain a histogram of the values of the first evaluator "
+            "(see OpenList::get_key_histogram)",
+            "false");
         utils::add_rng_options(*this);
     }
 
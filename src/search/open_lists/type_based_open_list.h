@@ -10,8 +10,15 @@
   reference in plug-in documentation).
 
   The original implementation uses a std::map for storing and looking
-  up buckets. Our implementation stores the buckets in a std::vector
-  and uses a std::unordered_map for looking up indexes in the vector.
+  up buckets. Our implementation numbers the types (combinations of
+  evaluator values) and stores their keys contiguously in a table that
+  is hashed by type number. The non-empty types are kept in a
+  std::vector, from which we choose uniformly at random.
+
+  The entries of all buckets are stored in shared pools of fixed-size
+  segments (see type_buckets.h). Types are removed when their buckets
+  become empty, so the memory of a type is reused once all of its
+  entries have been removed.
 
   In the table below we list the amortized worst-case time complexities
   for the original implementation and the version below.
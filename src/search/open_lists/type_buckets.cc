@@ -0,0 +1,97 @@
+#include "type_buckets.h"
+
+#include "../utils/hash.h"
+#include "../utils/logging.h"
+
+#include <algorithm>
+
+using namespace std;
+
+namespace type_buckets {
+size_t TypeKeyTable::KeyHash::operator()(int type) const {
+    utils::HashState hash_state;
+    const int *key = table->get_key(type);
+    for (int i = 0; i < table->key_size; ++i)
+        utils::feed(hash_state, key[i]);
+    return hash_state.get_hash64();
+}
+
+bool TypeKeyTable::KeyEqual::operator()(int type1, int type2) const {
+    const int *key1 = table->get_key(type1);
+    return equal(key1, key1 + table->key_size, table->get_key(type2));
+}
+
+TypeKeyTable::TypeKeyTable(int key_size)
+    : key_size(key_size),
+      num_types(0),
+      types(0, KeyHash {this}, KeyEqual {this}) {
+}
+
+int TypeKeyTable::lookup_type() {
+    assert(values.size() == static_cast<size_t>(num_types + 1) * key_size);
+    if (removed_types.empty()) {
+        auto result = types.insert(num_types);
+        if (result.second)
+            return num_types++;
+        values.resize(values.size() - key_size);
+        return *result.first;
+    }
+    auto it = types.find(num_types);
+    int type;
+    if (it != types.end()) {
+        type = *it;
+    } else {
+        // Move the key to the space of a removed type.
+        type = removed_types.back();
+        removed_types.pop_back();
+        copy(values.end() - key_size, values.end(),
+             values.begin() + static_cast<size_t>(type) * key_size);
+        types.insert(type);
+    }
+    values.resize(values.size() - key_size);
+    return type;
+}
+
+void TypeKeyTable::remove_type(int type) {
+    assert(type >= 0 && type < num_types);
+    types.erase(type);
+    removed_types.push_back(type);
+}
+
+void TypeKeyTable::clear() {
+    types.clear();
+    values.clear();
+    removed_types.clear();
+    num_types = 0;
+}
+
+void print_bucket_statistics(
+    utils::LogProxy &log, const string &name, int num_types,
+    const vector<int> &bucket_sizes, int num_small_segments,
+    int small_segment_size, int num_segments, int segment_size) {
+    // Histogram of the bucket sizes in powers of two.
+    vector<int> size_histogram;
+    int num_entries = 0;
+    for (int size : bucket_sizes) {
+        num_entries += size;
+        int bin = 0;
+        while (size >> (bin + 1))
+            ++bin;
+        if (bin >= static_cast<int>(size_histogram.size()))
+            size_histogram.resize(bin + 1, 0);
+        ++size_histogram[bin];
+    }
+    log << name << ": " << num_types << " types, "
+        << bucket_sizes.size() << " non-empty buckets, "
+        << num_entries << " entries, "
+        << num_small_segments << " segments of " << small_segment_size
+        << " entries, " << num_segments << " segments of " << segment_size
+        << " entries" << endl;
+    log << name << " bucket sizes:";
+    for (size_t bin = 0; bin < size_histogram.size(); ++bin) {
+        log << " [" << (1 << bin) << ", " << (1 << (bin + 1)) - 1 << "]: "
+            << size_histogram[bin];
+    }
+    log << endl;
+}
+}
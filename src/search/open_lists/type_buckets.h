@@ -0,0 +1,336 @@
+#ifndef OPEN_LISTS_TYPE_BUCKETS_H
+#define OPEN_LISTS_TYPE_BUCKETS_H
+
+#include "../utils/collections.h"
+
+#include <cassert>
+#include <string>
+#include <unordered_set>
+#include <vector>
+
+namespace utils {
+class LogProxy;
+}
+
+namespace type_buckets {
+/*
+  Table of the keys of the types. A key is a fixed number of ints, e.g.,
+  evaluator values. The keys are stored contiguously in one vector, and
+  types are hashed by their position in it, so a type does not need an
+  allocation of its own. Types are numbered consecutively. Removed
+  types are reused for new keys, so the numbers of the types stay below
+  the maximal number of types that existed at the same time.
+*/
+class TypeKeyTable {
+    struct KeyHash {
+        const TypeKeyTable *table;
+        std::size_t operator()(int type) const;
+    };
+
+    struct KeyEqual {
+        const TypeKeyTable *table;
+        bool operator()(int type1, int type2) const;
+    };
+
+    int key_size;
+    // Number of used and removed types.
+    int num_types;
+    std::vector<int> values;
+    std::unordered_set<int, KeyHash, KeyEqual> types;
+    std::vector<int> removed_types;
+
+    const int *get_key(int type) const {
+        return values.data() + static_cast<std::size_t>(type) * key_size;
+    }
+public:
+    explicit TypeKeyTable(int key_size);
+    // The hash functions point to the table.
+    TypeKeyTable(const TypeKeyTable &) = delete;
+
+    /*
+      Append the next value of the key to be looked up with
+      lookup_type(). Lookups use the space of the next new type, so
+      the key does not have to be copied if the type is new.
+    */
+    void push_key_value(int value) {
+        values.push_back(value);
+    }
+
+    // Return the type of the pushed key, adding a new type if necessary.
+    int lookup_type();
+
+    // Remove the type, so that its number can be reused for a new key.
+    void remove_type(int type);
+
+    // Return the number of types (including removed types).
+    int get_num_types() const {
+        return num_types;
+    }
+
+    int get_num_removed_types() const {
+        return removed_types.size();
+    }
+
+    // Return the value at the given position of the key of the type.
+    int get_key_value(int type, int index) const {
+        assert(type >= 0 && type < num_types);
+        assert(index >= 0 && index < key_size);
+        return get_key(type)[index];
+    }
+
+    void clear();
+};
+
+/*
+  Pool of segments of SEGMENT_SIZE entries. The segments are allocated
+  in chunks of SEGMENTS_PER_CHUNK segments, which are never moved, and
+  released segments are reused.
+*/
+template<class Entry, int SEGMENT_SIZE>
+class SegmentPool {
+    static const int SEGMENTS_PER_CHUNK = 1024;
+
+    std::vector<std::vector<Entry>> chunks;
+    std::vector<int> free_segments;
+    int num_segments;
+public:
+    SegmentPool()
+        : num_segments(0) {
+    }
+
+    Entry &get_entry(int segment, int pos) {
+        assert(segment >= 0 && segment < num_segments);
+        assert(pos >= 0 && pos < SEGMENT_SIZE);
+        return chunks[segment / SEGMENTS_PER_CHUNK][
+            (segment % SEGMENTS_PER_CHUNK) * SEGMENT_SIZE + pos];
+    }
+
+    /*
+      Return a free segment. Entries have no default constructor, so
+      new segments are filled with copies of the given entry.
+    */
+    int allocate(const Entry &entry) {
+        if (free_segments.empty()) {
+            if (num_segments % SEGMENTS_PER_CHUNK == 0) {
+                chunks.emplace_back();
+                chunks.back().reserve(SEGMENTS_PER_CHUNK * SEGMENT_SIZE);
+            }
+            std::vector<Entry> &chunk = chunks.back();
+            chunk.insert(chunk.end(), SEGMENT_SIZE, entry);
+            return num_segments++;
+        }
+        int segment = free_segments.back();
+        free_segments.pop_back();
+        return segment;
+    }
+
+    void release(int segment) {
+        free_segments.push_back(segment);
+    }
+
+    int get_num_segments() const {
+        return num_segments;
+    }
+
+    void clear() {
+        chunks.clear();
+        free_segments.clear();
+        num_segments = 0;
+    }
+};
+
+/*
+  Buckets of entries for type-based open lists, indexed by type.
+
+  The entries of all buckets are stored in shared pools of segments.
+  The first SMALL_SEGMENT_SIZE entries of a bucket are stored in a small
+  segment, and further entries in segments of SEGMENT_SIZE entries,
+  whose list the bucket keeps. Segments of shrinking buckets are reused
+  by other buckets. Compared to one std::vector per bucket, this avoids
+  per-type allocations for the keys and for buckets with at most
+  SMALL_SEGMENT_SIZE entries, bounds the unused space to less than one
+  segment per bucket, and returns the memory of shrinking buckets to
+  the pools.
+
+  With remove_empty_types, a type is removed from the key table when its
+  bucket becomes empty, and its number and bucket are reused for new
+  types. Otherwise, types are never removed, so that users can keep
+  information about types whose buckets are empty.
+
+  The non-empty types are also kept in a vector: a type is appended
+  when its bucket becomes non-empty and swapped with the last type when
+  it becomes empty.
+*/
+template<class Entry>
+class TypeBuckets {
+    static const int SMALL_SEGMENT_SIZE = 4;
+    static const int SEGMENT_SIZE = 16;
+
+    struct Bucket {
+        int size;
+        // Position of the type in non_empty_types, or -1 if empty.
+        int non_empty_index;
+        // Small segment with the first entries, or -1 if empty.
+        int small_segment;
+        // Segments that hold the remaining entries, in order.
+        std::vector<int> segments;
+
+        Bucket() : size(0), non_empty_index(-1), small_segment(-1) {
+        }
+    };
+
+    TypeKeyTable key_table;
+    bool remove_empty_types;
+    std::vector<Bucket> buckets;
+    std::vector<int> non_empty_types;
+
+    SegmentPool<Entry, SMALL_SEGMENT_SIZE> small_segments;
+    SegmentPool<Entry, SEGMENT_SIZE> segments;
+
+    Entry &get_entry(Bucket &bucket, int pos);
+public:
+    TypeBuckets(int key_size, bool remove_empty_types)
+        : key_table(key_size),
+          remove_empty_types(remove_empty_types) {
+    }
+
+    // See TypeKeyTable::push_key_value.
+    void push_key_value(int value) {
+        key_table.push_key_value(value);
+    }
+
+    // Add the entry to the bucket of the pushed key and return its type.
+    int insert(const Entry &entry);
+
+    // Remove the entry at the given position of the bucket of the type.
+    Entry remove(int type, int pos);
+
+    int get_bucket_size(int type) const {
+        assert(utils::in_bounds(type, buckets));
+        return buckets[type].size;
+    }
+
+    // See TypeKeyTable::get_num_types.
+    int get_num_types() const {
+        return key_table.get_num_types();
+    }
+
+    // See TypeKeyTable::get_key_value.
+    int get_key_value(int type, int index) const {
+        return key_table.get_key_value(type, index);
+    }
+
+    int get_num_non_empty_types() const {
+        return non_empty_types.size();
+    }
+
+    int get_non_empty_type(int index) const {
+        return non_empty_types[index];
+    }
+
+    bool empty() const {
+        return non_empty_types.empty();
+    }
+
+    void clear();
+
+    /*
+      Print the number of types, non-empty buckets, entries and segments
+      and a histogram of the sizes of the non-empty buckets.
+    */
+    void print_statistics(utils::LogProxy &log, const std::string &name) const;
+};
+
+/*
+  Print the line for print_statistics. This is not part of the template
+  to avoid including the logging code in every open list.
+*/
+extern void print_bucket_statistics(
+    utils::LogProxy &log, const std::string &name, int num_types,
+    const std::vector<int> &bucket_sizes, int num_small_segments,
+    int small_segment_size, int num_segments, int segment_size);
+
+template<class Entry>
+Entry &TypeBuckets<Entry>::get_entry(Bucket &bucket, int pos) {
+    if (pos < SMALL_SEGMENT_SIZE)
+        return small_segments.get_entry(bucket.small_segment, pos);
+    pos -= SMALL_SEGMENT_SIZE;
+    return segments.get_entry(
+        bucket.segments[pos / SEGMENT_SIZE], pos % SEGMENT_SIZE);
+}
+
+template<class Entry>
+int TypeBuckets<Entry>::insert(const Entry &entry) {
+    int type = key_table.lookup_type();
+    if (type == static_cast<int>(buckets.size()))
+        buckets.emplace_back();
+    Bucket &bucket = buckets[type];
+    if (bucket.size == 0) {
+        bucket.non_empty_index = non_empty_types.size();
+        non_empty_types.push_back(type);
+        bucket.small_segment = small_segments.allocate(entry);
+    } else if (bucket.size >= SMALL_SEGMENT_SIZE &&
+               (bucket.size - SMALL_SEGMENT_SIZE) % SEGMENT_SIZE == 0) {
+        bucket.segments.push_back(segments.allocate(entry));
+    }
+    get_entry(bucket, bucket.size++) = entry;
+    return type;
+}
+
+template<class Entry>
+Entry TypeBuckets<Entry>::remove(int type, int pos) {
+    Bucket &bucket = buckets[type];
+    assert(pos >= 0 && pos < bucket.size);
+    // Swap the entry with the last one of the bucket, then remove it.
+    Entry &entry = get_entry(bucket, pos);
+    Entry result = entry;
+    entry = get_entry(bucket, --bucket.size);
+    if (bucket.size >= SMALL_SEGMENT_SIZE &&
+        (bucket.size - SMALL_SEGMENT_SIZE) % SEGMENT_SIZE == 0) {
+        segments.release(bucket.segments.back());
+        bucket.segments.pop_back();
+    }
+
+    if (bucket.size == 0) {
+        small_segments.release(bucket.small_segment);
+        bucket.small_segment = -1;
+        // Return the memory of the segment list.
+        std::vector<int>().swap(bucket.segments);
+        // Swap the type with the last non-empty type, then remove it.
+        buckets[non_empty_types.back()].non_empty_index =
+            bucket.non_empty_index;
+        utils::swap_and_pop_from_vector(
+            non_empty_types, bucket.non_empty_index);
+        bucket.non_empty_index = -1;
+        if (remove_empty_types)
+            key_table.remove_type(type);
+    }
+    return result;
+}
+
+template<class Entry>
+void TypeBuckets<Entry>::clear() {
+    key_table.clear();
+    buckets.clear();
+    non_empty_types.clear();
+    small_segments.clear();
+    segments.clear();
+}
+
+template<class Entry>
+void TypeBuckets<Entry>::print_statistics(
+    utils::LogProxy &log, const std::string &name) const {
+    std::vector<int> bucket_sizes;
+    bucket_sizes.reserve(non_empty_types.size());
+    for (int type : non_empty_types)
+        bucket_sizes.push_back(buckets[type].size);
+    int num_types =
+        key_table.get_num_types() - key_table.get_num_removed_types();
+    print_bucket_statistics(
+        log, name, num_types, bucket_sizes,
+        small_segments.get_num_segments(), SMALL_SEGMENT_SIZE,
+        segments.get_num_segments(), SEGMENT_SIZE);
+}
+}
+
+#endif
@@ -0,0 +1,159 @@
+#include "parallel_evaluator.h"
+
+#include "evaluation_context.h"
+#include "evaluator.h"
+#include "task_proxy.h"
+
+#include "plugins/plugin.h"
+#include "utils/memory.h"
+#include "utils/system.h"
+
+#include <cassert>
+#include <iostream>
+
+using namespace std;
+
+ParallelEvaluator::ParallelEvaluator(const plugins::Options &opts)
+    : evaluators(opts.get_list<shared_ptr<Evaluator>>("parallel_evals")),
+      batch_id(0),
+      num_busy_threads(0),
+      stopped(false),
+      parent_state(nullptr),
+      states(nullptr),
+      num_batches(0) {
+    int num_threads = opts.get<int>("evaluation_threads");
+    worker_evaluators.resize(num_threads);
+    batch_states.resize(num_threads);
+    batch_results.resize(num_threads);
+    for (const shared_ptr<Evaluator> &evaluator : evaluators) {
+        for (int thread_id = 0; thread_id < num_threads; ++thread_id) {
+            shared_ptr<Evaluator> copy = evaluator->create_worker_copy();
+            if (!copy) {
+                cerr << "Evaluator " << evaluator->get_description()
+                     << " does not support parallel evaluation." << endl;
+                utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
+            }
+            worker_evaluators[thread_id].push_back(move(copy));
+        }
+    }
+    for (int thread_id = 1; thread_id < num_threads; ++thread_id) {
+        threads.emplace_back(&ParallelEvaluator::run_thread, this, thread_id);
+    }
+}
+
+ParallelEvaluator::~ParallelEvaluator() {
+    {
+        lock_guard<mutex> lock(batch_mutex);
+        stopped = true;
+    }
+    batch_started.notify_all();
+    for (thread &worker : threads) {
+        worker.join();
+    }
+}
+
+void ParallelEvaluator::evaluate_states(int thread_id) {
+    int num_states = states->size();
+    int begin = num_states * thread_id / num_batches;
+    int end = num_states * (thread_id + 1) / num_batches;
+    if (begin == end)
+        return;
+    vector<State> &batch = batch_states[thread_id];
+    vector<EvaluationResult> &batch_result = batch_results[thread_id];
+    batch.assign(states->begin() + begin, states->begin() + end);
+    const vector<shared_ptr<Evaluator>> &copies = worker_evaluators[thread_id];
+    int num_evaluators = copies.size();
+    for (int i = 0; i < num_evaluators; ++i) {
+        copies[i]->compute_batch_results(*parent_state, batch, batch_result);
+        assert(batch_result.size() == batch.size());
+        for (int j = 0; j < end - begin; ++j) {
+            results[(begin + j) * num_evaluators + i] = move(batch_result[j]);
+        }
+    }
+    batch.clear();
+}
+
+void ParallelEvaluator::run_thread(int thread_id) {
+    int last_batch_id = 0;
+    while (true) {
+        {
+            unique_lock<mutex> lock(batch_mutex);
+            batch_started.wait(lock, [&]() {
+                                   return stopped || batch_id != last_batch_id;
+                               });
+            if (stopped)
+                return;
+            last_batch_id = batch_id;
+        }
+        evaluate_states(thread_id);
+        {
+            lock_guard<mutex> lock(batch_mutex);
+            --num_busy_threads;
+        }
+        batch_finished.notify_one();
+    }
+}
+
+void ParallelEvaluator::evaluate(
+    const State &parent, const vector<State> &successors) {
+    results.assign(successors.size() * evaluators.size(), EvaluationResult());
+    parent_state = &parent;
+    states = &successors;
+    if (successors.size() <= 1 || threads.empty()) {
+        num_batches = 1;
+        evaluate_states(0);
+        return;
+    }
+    num_batches = worker_evaluators.size();
+    {
+        lock_guard<mutex> lock(batch_mutex);
+        ++batch_id;
+        num_busy_threads = threads.size();
+    }
+    batch_started.notify_all();
+    evaluate_states(0);
+    unique_lock<mutex> lock(batch_mutex);
+    batch_finished.wait(lock, [&]() {return num_busy_threads == 0;});
+}
+
+void ParallelEvaluator::store_results(
+    int index, EvaluationContext &eval_context) {
+    int num_evaluators = evaluators.size();
+    assert(index >= 0 && (index + 1) * num_evaluators <=
+           static_cast<int>(results.size()));
+    for (int i = 0; i < num_evaluators; ++i) {
+        EvaluationResult &result = results[index * num_evaluators + i];
+        assert(!result.is_uninitialized());
+        evaluators[i]->store_worker_result(eval_context, result);
+        eval_context.store_result(evaluators[i].get(), move(result));
+    }
+}
+
+void add_parallel_evaluation_options_to_feature(plugins::Feature &feature) {
+    feature.add_list_option<shared_ptr<Evaluator>>(
+        "parallel_evals",
+        "evaluators whose estimates for the new successors of an expanded "
+        "state are computed in batches (in parallel with more than one "
+        "evaluation thread) before the successors are inserted (see "
+        "ParallelEvaluator). Only path-independent evaluators that support "
+        "worker copies (currently ff, add and hmax) can be used. This does "
+        "not change the search behavior (unless the evaluators change their "
+        "estimates for batches, e.g., ff with warm_start), but the "
+        "evaluations statistic also counts estimates that the search does "
+        "not look up (e.g., for successors that another evaluator already "
+        "recognizes as dead ends).",
+        "[]");
+    feature.add_option<int>(
+        "evaluation_threads",
+        "number of threads for computing the estimates of parallel_evals "
+        "(including the search thread)",
+        "1",
+        plugins::Bounds("1", "infinity"));
+}
+
+unique_ptr<ParallelEvaluator> create_parallel_evaluator(
+    const plugins::Options &opts) {
+    if (opts.get_list<shared_ptr<Evaluator>>("parallel_evals").empty())
+        return nullptr;
+    return utils::make_unique_ptr<ParallelEvaluator>(opts);
+}
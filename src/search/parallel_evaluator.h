@@ -0,0 +1,94 @@
+#ifndef PARALLEL_EVALUATOR_H
+#define PARALLEL_EVALUATOR_H
+
+#include "evaluation_result.h"
+
+#include <condition_variable>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+class EvaluationContext;
+class Evaluator;
+class State;
+
+namespace plugins {
+class Feature;
+class Options;
+}
+
+/*
+  This class computes the estimates of some path-independent evaluators
+  (parallel_evals) for the successors of a state with several threads.
+  The successors are split into one contiguous batch per thread, and
+  each thread evaluates its batch with its own copies of the evaluators
+  (see Evaluator::create_worker_copy and
+  Evaluator::compute_batch_results), so the evaluators need not be
+  thread-safe. The calling thread evaluates a batch as well, so we
+  start evaluation_threads - 1 additional threads. With one thread,
+  the calling thread evaluates all successors in one batch.
+
+  The result for a state does not depend on the number of threads or
+  on the batch it belongs to. The search algorithm transfers the
+  results to the evaluation contexts of the states with
+  store_results(), which also lets the original evaluators cache them.
+  Afterwards, the search proceeds exactly as if the evaluation contexts
+  had computed the results themselves.
+
+  The threads only read the states and the task while evaluate() runs,
+  so the caller must not modify the state registry in the meantime.
+*/
+class ParallelEvaluator {
+    std::vector<std::shared_ptr<Evaluator>> evaluators;
+    // worker_evaluators[i][j] is the copy of evaluators[j] for thread i.
+    std::vector<std::vector<std::shared_ptr<Evaluator>>> worker_evaluators;
+    std::vector<std::thread> threads;
+
+    std::mutex batch_mutex;
+    std::condition_variable batch_started;
+    std::condition_variable batch_finished;
+    int batch_id;
+    int num_busy_threads;
+    bool stopped;
+
+    const State *parent_state;
+    const std::vector<State> *states;
+    int num_batches;
+    // The states and results of the current batch of each thread.
+    std::vector<std::vector<State>> batch_states;
+    std::vector<std::vector<EvaluationResult>> batch_results;
+    /*
+      results[i * evaluators.size() + j] is the result of evaluators[j]
+      for (*states)[i].
+    */
+    std::vector<EvaluationResult> results;
+
+    void evaluate_states(int thread_id);
+    void run_thread(int thread_id);
+public:
+    explicit ParallelEvaluator(const plugins::Options &opts);
+    ~ParallelEvaluator();
+
+    // Compute the results for the given successors of parent_state.
+    void evaluate(const State &parent_state, const std::vector<State> &states);
+    /*
+      Store the results for the state with the given index in the last
+      call of evaluate() in the given evaluation context, which must
+      belong to this state.
+    */
+    void store_results(int index, EvaluationContext &eval_context);
+};
+
+extern void add_parallel_evaluation_options_to_feature(
+    plugins::Feature &feature);
+
+/*
+  Return a ParallelEvaluator based on the given options, or nullptr if
+  no evaluators are given. Only use this together with
+  "add_parallel_evaluation_options_to_feature()".
+*/
+extern std::unique_ptr<ParallelEvaluator> create_parallel_evaluator(
+    const plugins::Options &opts);
+
+#endif
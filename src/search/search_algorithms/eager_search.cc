@@ -27,7 +27,11 @@ EagerSearch::EagerSearch(const plugins::Options &opts)
       f_evaluator(opts.get<shared_ptr<Evaluator>>("f_eval", nullptr)),
       preferred_operator_evaluators(opts.get_list<shared_ptr<Evaluator>>("preferred")),
       lazy_evaluator(opts.get<shared_ptr<Evaluator>>("lazy_evaluator", nullptr)),
-      pruning_method(opts.get<shared_ptr<PruningMethod>>("pruning")) {
+      pruning_method(opts.get<shared_ptr<PruningMethod>>("pruning")),
+      trace(create_search_trace(opts)),
+      progress_monitor(create_search_progress_monitor(opts)),
+      parallel_evaluator(create_parallel_evaluator(opts)) {
+    open_list->set_progress_monitor(progress_monitor.get());
     if (lazy_evaluator && !lazy_evaluator->does_cache_estimates()) {
         cerr << "lazy_evaluator must cache its estimates" << endl;
         utils::exit_with(utils::ExitCode::SEARCH_INPUT_ERROR);
@@ -94,6 +98,7 @@ void EagerSearch::initialize() {
         node.open_initial();
 
         open_list->insert(eval_context, initial_state.get_id());
+        monitor_insertion(eval_context);
     }
 
     print_initial_evaluator_values(eval_context);
@@ -105,6 +110,13 @@ void EagerSearch::print_statistics() const {
     statistics.print_detailed_statistics();
     search_space.print_statistics();
     pruning_method->print_statistics();
+    open_list->print_statistics(log);
+    if (trace) {
+        trace->flush();
+        trace->print_statistics(log);
+    }
+    if (progress_monitor)
+        progress_monitor->print_statistics(log);
 }
 
 SearchStatus EagerSearch::step() {
@@ -164,12 +176,22 @@ SearchStatus EagerSearch::step() {
         assert(!node->is_dead_end());
         update_f_value_statistics(eval_context);
         statistics.inc_expanded();
+        if (progress_monitor) {
+            int value = eval_context.get_evaluator_value_or_infinity(
+                progress_monitor->get_evaluator());
+            progress_monitor->on_remove(value);
+            if (progress_monitor->on_expansion(value, statistics))
+                progress_monitor->print_status(log);
+        }
         break;
     }
 
     const State &s = node->get_state();
-    if (check_goal_and_set_plan(s))
+    if (check_goal_and_set_plan(s)) {
+        if (trace)
+            trace_expansion(*node, 0, 0, SearchTraceRecord::GOAL);
         return SOLVED;
+    }
 
     vector<OperatorID> applicable_ops;
     successor_generator.generate_applicable_ops(s, applicable_ops);
@@ -189,12 +211,27 @@ SearchStatus EagerSearch::step() {
                                     preferred_operators);
     }
 
+    /*
+      With parallel evaluation, we generate all successors first and
+      compute the estimates of the new ones in parallel. The loop below
+      then finds these estimates in the evaluation contexts, so it
+      behaves exactly as with sequential evaluation.
+    */
+    if (parallel_evaluator)
+        evaluate_successors_in_parallel(*node, applicable_ops);
+
+    int num_inserted = 0;
+    int trace_flags = 0;
+    int succ_index = 0;
     for (OperatorID op_id : applicable_ops) {
         OperatorProxy op = task_proxy.get_operators()[op_id];
         if ((node->get_real_g() + op.get_cost()) >= bound)
             continue;
 
-        State succ_state = state_registry.get_successor_state(s, op);
+        State succ_state = parallel_evaluator ?
+            successors[succ_index] : state_registry.get_successor_state(s, op);
+        int result_index = parallel_evaluator ?
+            successor_result_indices[succ_index++] : -1;
         statistics.inc_generated();
         bool is_preferred = preferred_operators.contains(op_id);
 
@@ -219,6 +256,8 @@ SearchStatus EagerSearch::step() {
 
             EvaluationContext succ_eval_context(
                 succ_state, succ_g, is_preferred, &statistics);
+            if (result_index != -1)
+                parallel_evaluator->store_results(result_index, succ_eval_context);
             statistics.inc_evaluated_states();
 
             if (open_list->is_dead_end(succ_eval_context)) {
@@ -229,14 +268,18 @@ SearchStatus EagerSearch::step() {
             succ_node.open(*node, op, get_adjusted_cost(op));
 
             open_list->insert(succ_eval_context, succ_state.get_id());
+            ++num_inserted;
+            monitor_insertion(succ_eval_context);
             if (search_progress.check_progress(succ_eval_context)) {
                 statistics.print_checkpoint_line(succ_node.get_g());
                 reward_progress();
+                trace_flags |= SearchTraceRecord::PROGRESS;
             }
         } else if (succ_node.get_g() > node->get_g() + get_adjusted_cost(op)) {
             // We found a new cheapest path to an open or closed state.
             if (reopen_closed_nodes) {
-                if (succ_node.is_closed()) {
+                bool was_closed = succ_node.is_closed();
+                if (was_closed) {
                     /*
                       TODO: It would be nice if we had a way to test
                       that reopening is expected behaviour, i.e., exit
@@ -269,6 +312,10 @@ SearchStatus EagerSearch::step() {
                   from scratch.
                 */
                 open_list->insert(succ_eval_context, succ_state.get_id());
+                ++num_inserted;
+                // Open states are already counted by the monitor.
+                if (was_closed)
+                    monitor_insertion(succ_eval_context);
             } else {
                 // If we do not reopen closed nodes, we just update the parent pointers.
                 // Note that this could cause an incompatibility between
@@ -278,9 +325,70 @@ SearchStatus EagerSearch::step() {
         }
     }
 
+    if (trace) {
+        trace_expansion(*node, applicable_ops.size(), num_inserted,
+                        trace_flags);
+    }
+
     return IN_PROGRESS;
 }
 
+void EagerSearch::evaluate_successors_in_parallel(
+    const SearchNode &node, const vector<OperatorID> &applicable_ops) {
+    successors.clear();
+    successor_result_indices.clear();
+    new_successors.clear();
+    for (OperatorID op_id : applicable_ops) {
+        OperatorProxy op = task_proxy.get_operators()[op_id];
+        if ((node.get_real_g() + op.get_cost()) >= bound)
+            continue;
+        successors.push_back(
+            state_registry.get_successor_state(node.get_state(), op));
+        const State &succ_state = successors.back();
+        /*
+          States that are reached more than once are evaluated more than
+          once, but their results are only used for the first occurrence.
+        */
+        if (search_space.get_node(succ_state).is_new()) {
+            successor_result_indices.push_back(new_successors.size());
+            new_successors.push_back(succ_state);
+        } else {
+            successor_result_indices.push_back(-1);
+        }
+    }
+    parallel_evaluator->evaluate(node.get_state(), new_successors);
+}
+
+void EagerSearch::trace_expansion(
+    const SearchNode &node, int num_successors, int num_inserted, int flags) {
+    int expansion = statistics.get_expanded() - 1;
+    if (!trace->is_traced(expansion, flags))
+        return;
+    Evaluator *trace_evaluator = trace->get_evaluator();
+    int h = -1;
+    if (trace_evaluator) {
+        /*
+          We do not ask for preferred operators and pass no statistics,
+          so that evaluators that cache their estimates only look up
+          the value and the evaluation is not counted.
+        */
+        EvaluationContext eval_context(
+            node.get_state(), node.get_g(), false, nullptr);
+        h = eval_context.get_evaluator_value_or_infinity(trace_evaluator);
+    }
+    trace->add_record(
+        node.get_state().get_id(),
+        {expansion, -1, node.get_g(), h, open_list->get_last_selected_sublist(),
+         num_successors, num_inserted, flags});
+}
+
+void EagerSearch::monitor_insertion(EvaluationContext &eval_context) {
+    if (progress_monitor) {
+        progress_monitor->on_insert(eval_context.get_evaluator_value_or_infinity(
+                                        progress_monitor->get_evaluator()));
+    }
+}
+
 void EagerSearch::reward_progress() {
     // Boost the "preferred operator" open lists somewhat whenever
     // one of the heuristics finds a state with a new best h value.
@@ -310,5 +418,8 @@ void EagerSearch::update_f_value_statistics(EvaluationContext &eval_context) {
 void add_options_to_feature(plugins::Feature &feature) {
     SearchAlgorithm::add_pruning_option(feature);
     SearchAlgorithm::add_options_to_feature(feature);
+    add_search_trace_options_to_feature(feature);
+    add_search_progress_monitor_options_to_feature(feature);
+    add_parallel_evaluation_options_to_feature(feature);
 }
 }
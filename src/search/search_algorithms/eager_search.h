@@ -2,7 +2,10 @@
 #define SEARCH_ALGORITHMS_EAGER_SEARCH_H
 
 #include "../open_list.h"
+#include "../parallel_evaluator.h"
 #include "../search_algorithm.h"
+#include "../search_progress_monitor.h"
+#include "../search_trace.h"
 
 #include <memory>
 #include <vector>
@@ -27,9 +30,27 @@ class EagerSearch : public SearchAlgorithm {
 
     std::shared_ptr<PruningMethod> pruning_method;
 
+    std::unique_ptr<SearchTrace> trace;
+    std::unique_ptr<SearchProgressMonitor> progress_monitor;
+
+    std::unique_ptr<ParallelEvaluator> parallel_evaluator;
+    /*
+      With parallel evaluation, the successors of the expanded state
+      that are within the bound, and for each of them the index of its
+      results in the parallel evaluator (-1 if it was not evaluated).
+    */
+    std::vector<State> successors;
+    std::vector<int> successor_result_indices;
+    std::vector<State> new_successors;
+
     void start_f_value_statistics(EvaluationContext &eval_context);
     void update_f_value_statistics(EvaluationContext &eval_context);
     void reward_progress();
+    void trace_expansion(const SearchNode &node, int num_successors,
+                         int num_inserted, int flags);
+    void monitor_insertion(EvaluationContext &eval_context);
+    void evaluate_successors_in_parallel(
+        const SearchNode &node, const std::vector<OperatorID> &applicable_ops);
 
 protected:
     virtual void initialize() override;
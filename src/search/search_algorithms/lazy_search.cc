@@ -30,11 +30,14 @@ LazySearch::LazySearch(const plugins::Options &opts)
       current_operator_id(OperatorID::no_operator),
       current_g(0),
       current_real_g(0),
-      current_eval_context(current_state, 0, true, &statistics) {
+      current_eval_context(current_state, 0, true, &statistics),
+      trace(create_search_trace(opts)),
+      progress_monitor(create_search_progress_monitor(opts)) {
     /*
       We initialize current_eval_context in such a way that the initial node
       counts as "preferred".
     */
+    open_list->set_progress_monitor(progress_monitor.get());
 }
 
 void LazySearch::set_preferred_operator_evaluators(
@@ -86,7 +89,7 @@ vector<OperatorID> LazySearch::get_successor_operators(
     }
 }
 
-void LazySearch::generate_successors() {
+void LazySearch::generate_successors(int &num_successors, int &num_inserted) {
     ordered_set::OrderedSet<OperatorID> preferred_operators;
     for (const shared_ptr<Evaluator> &preferred_operator_evaluator : preferred_operator_evaluators) {
         collect_preferred_operators(current_eval_context,
@@ -101,6 +104,8 @@ void LazySearch::generate_successors() {
         get_successor_operators(preferred_operators);
 
     statistics.inc_generated(successor_operators.size());
+    num_successors = successor_operators.size();
+    num_inserted = 0;
 
     for (OperatorID op_id : successor_operators) {
         OperatorProxy op = task_proxy.get_operators()[op_id];
@@ -111,6 +116,7 @@ void LazySearch::generate_successors() {
             EvaluationContext new_eval_context(
                 current_eval_context, new_g, is_preferred, nullptr);
             open_list->insert(new_eval_context, make_pair(current_state.get_id(), op_id));
+            ++num_inserted;
         }
     }
 }
@@ -134,6 +140,15 @@ SearchStatus LazySearch::fetch_next_state() {
     current_g = pred_node.get_g() + get_adjusted_cost(current_operator);
     current_real_g = pred_node.get_real_g() + current_operator.get_cost();
 
+    if (progress_monitor) {
+        // The entry was counted with the value of its parent.
+        EvaluationContext pred_eval_context(
+            current_predecessor, pred_node.get_g(), false, nullptr);
+        progress_monitor->on_remove(
+            pred_eval_context.get_evaluator_value_or_infinity(
+                progress_monitor->get_evaluator()));
+    }
+
     /*
       Note: We mark the node in current_eval_context as "preferred"
       here. This probably doesn't matter much either way because the
@@ -189,14 +204,25 @@ SearchStatus LazySearch::step() {
                 }
             }
             node.close();
-            if (check_goal_and_set_plan(current_state))
+            if (check_goal_and_set_plan(current_state)) {
+                if (trace)
+                    trace_expansion(0, 0, SearchTraceRecord::GOAL);
                 return SOLVED;
+            }
+            int trace_flags = 0;
             if (search_progress.check_progress(current_eval_context)) {
                 statistics.print_checkpoint_line(current_g);
                 reward_progress();
+                trace_flags |= SearchTraceRecord::PROGRESS;
             }
-            generate_successors();
+            int num_successors;
+            int num_inserted;
+            generate_successors(num_successors, num_inserted);
+            if (trace)
+                trace_expansion(num_successors, num_inserted, trace_flags);
             statistics.inc_expanded();
+            if (progress_monitor)
+                monitor_expansion(num_inserted);
         } else {
             node.mark_as_dead_end();
             statistics.inc_dead_ends();
@@ -212,8 +238,45 @@ void LazySearch::reward_progress() {
     open_list->boost_preferred();
 }
 
+void LazySearch::trace_expansion(
+    int num_successors, int num_inserted, int flags) {
+    int expansion = statistics.get_expanded();
+    if (!trace->is_traced(expansion, flags))
+        return;
+    Evaluator *trace_evaluator = trace->get_evaluator();
+    int h = -1;
+    if (trace_evaluator) {
+        // See EagerSearch::trace_expansion.
+        EvaluationContext eval_context(current_state, current_g, false, nullptr);
+        h = eval_context.get_evaluator_value_or_infinity(trace_evaluator);
+    }
+    trace->add_record(
+        current_state.get_id(),
+        {expansion, -1, current_g, h, open_list->get_last_selected_sublist(),
+         num_successors, num_inserted, flags});
+}
+
+void LazySearch::monitor_expansion(int num_inserted) {
+    /*
+      The successors are inserted as edges from the expanded state, so
+      they are counted with the value of the expanded state.
+    */
+    int value = current_eval_context.get_evaluator_value_or_infinity(
+        progress_monitor->get_evaluator());
+    progress_monitor->on_insert(value, num_inserted);
+    if (progress_monitor->on_expansion(value, statistics))
+        progress_monitor->print_status(log);
+}
+
 void LazySearch::print_statistics() const {
     statistics.print_detailed_statistics();
     search_space.print_statistics();
+    open_list->print_statistics(log);
+    if (trace) {
+        trace->flush();
+        trace->print_statistics(log);
+    }
+    if (progress_monitor)
+        progress_monitor->print_statistics(log);
 }
 }
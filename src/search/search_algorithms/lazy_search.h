@@ -7,7 +7,9 @@
 #include "../operator_id.h"
 #include "../search_algorithm.h"
 #include "../search_progress.h"
+#include "../search_progress_monitor.h"
 #include "../search_space.h"
+#include "../search_trace.h"
 
 #include "../utils/rng.h"
 
@@ -35,13 +37,18 @@ protected:
     int current_real_g;
     EvaluationContext current_eval_context;
 
+    std::unique_ptr<SearchTrace> trace;
+    std::unique_ptr<SearchProgressMonitor> progress_monitor;
+
     virtual void initialize() override;
     virtual SearchStatus step() override;
 
-    void generate_successors();
+    void generate_successors(int &num_successors, int &num_inserted);
     SearchStatus fetch_next_state();
 
     void reward_progress();
+    void trace_expansion(int num_successors, int num_inserted, int flags);
+    void monitor_expansion(int num_inserted);
 
     std::vector<OperatorID> get_successor_operators(
         const ordered_set::OrderedSet<OperatorID> &preferred_operators) const;
@@ -1,6 +1,9 @@
 #include "lazy_search.h"
 #include "search_common.h"
 
+#include "../search_progress_monitor.h"
+#include "../search_trace.h"
+
 #include "../plugins/plugin.h"
 
 using namespace std;
@@ -19,6 +22,8 @@ public:
             "use preferred operators of these evaluators", "[]");
         SearchAlgorithm::add_succ_order_options(*this);
         SearchAlgorithm::add_options_to_feature(*this);
+        add_search_trace_options_to_feature(*this);
+        add_search_progress_monitor_options_to_feature(*this);
     }
 
     virtual shared_ptr<lazy_search::LazySearch> create_component(const plugins::Options &options, const utils::Context &) const override {
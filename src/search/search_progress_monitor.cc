@@ -0,0 +1,141 @@
+#include "search_progress_monitor.h"
+
+#include "evaluation_result.h"
+#include "evaluator.h"
+#include "search_statistics.h"
+
+#include "plugins/plugin.h"
+#include "utils/logging.h"
+#include "utils/memory.h"
+#include "utils/timer.h"
+
+#include <algorithm>
+#include <cassert>
+
+using namespace std;
+
+SearchProgressMonitor::SearchProgressMonitor(const plugins::Options &opts)
+    : evaluator(opts.get<shared_ptr<Evaluator>>("monitor_eval")),
+      window_size(opts.get<int>("monitor_window")),
+      print_interval(opts.get<int>("monitor_interval")),
+      num_expansions(0),
+      best_value(-1),
+      num_improvements(0),
+      last_improvement(0),
+      max_plateau_length(0),
+      snapshots(window_size + 1) {
+    snapshots[0] = {utils::g_timer(), 0, 0, 0};
+}
+
+void SearchProgressMonitor::update_best_value(int value) {
+    if (best_value == -1 || value < best_value) {
+        best_value = value;
+        ++num_improvements;
+        max_plateau_length = max(max_plateau_length, get_plateau_length());
+        last_improvement = num_expansions;
+    }
+}
+
+const SearchProgressMonitor::Snapshot &
+SearchProgressMonitor::get_window_start() const {
+    int start = num_expansions - get_window_expansions();
+    return snapshots[start % snapshots.size()];
+}
+
+void SearchProgressMonitor::on_insert(int value, int count) {
+    if (value == EvaluationResult::INFTY || count == 0)
+        return;
+    update_best_value(value);
+    open_values.add(value, count);
+}
+
+void SearchProgressMonitor::on_remove(int value) {
+    // Entries whose value changed while they were open may be missing.
+    if (open_values.get_count(value) > 0)
+        open_values.remove(value);
+}
+
+bool SearchProgressMonitor::on_expansion(
+    int value, const SearchStatistics &statistics) {
+    if (value != EvaluationResult::INFTY)
+        update_best_value(value);
+    ++num_expansions;
+    snapshots[num_expansions % snapshots.size()] = {
+        utils::g_timer(), statistics.get_generated(),
+        statistics.get_dead_ends(), num_improvements};
+    return print_interval && num_expansions % print_interval == 0;
+}
+
+int SearchProgressMonitor::get_max_plateau_length() const {
+    return max(max_plateau_length, get_plateau_length());
+}
+
+int SearchProgressMonitor::get_window_expansions() const {
+    return min(num_expansions, window_size);
+}
+
+double SearchProgressMonitor::get_expansion_rate() const {
+    const Snapshot &last = snapshots[num_expansions % snapshots.size()];
+    double time = last.time - get_window_start().time;
+    return time > 0 ? get_window_expansions() / time : 0.0;
+}
+
+double SearchProgressMonitor::get_dead_end_rate() const {
+    const Snapshot &last = snapshots[num_expansions % snapshots.size()];
+    const Snapshot &start = get_window_start();
+    int generated = last.generated - start.generated;
+    return generated ? static_cast<double>(last.dead_ends - start.dead_ends) /
+           generated : 0.0;
+}
+
+int SearchProgressMonitor::get_window_improvements() const {
+    const Snapshot &last = snapshots[num_expansions % snapshots.size()];
+    return last.improvements - get_window_start().improvements;
+}
+
+void SearchProgressMonitor::print_status(utils::LogProxy &log) const {
+    log << "Progress: " << num_expansions << " expansions"
+        << ", best value " << best_value
+        << ", plateau " << get_plateau_length()
+        << ", window: " << get_expansion_rate() << " expansions/s, "
+        << get_dead_end_rate() << " dead-end rate, "
+        << get_window_improvements() << " improvements"
+        << ", open: ";
+    open_values.dump(log);
+}
+
+void SearchProgressMonitor::print_statistics(utils::LogProxy &log) const {
+    log << "Progress monitor best value: " << best_value << endl;
+    log << "Progress monitor improvements: " << num_improvements << endl;
+    log << "Progress monitor longest plateau: " << get_max_plateau_length()
+        << " expansions" << endl;
+}
+
+void add_search_progress_monitor_options_to_feature(plugins::Feature &feature) {
+    feature.add_option<shared_ptr<Evaluator>>(
+        "monitor_eval",
+        "monitor the search progress with respect to this evaluator "
+        "(see SearchProgressMonitor); no monitoring if not given. "
+        "(Optional; the evaluator is evaluated on every inserted and "
+        "expanded state, so it should be used by the open list or cache "
+        "its estimates.)",
+        plugins::ArgumentInfo::NO_DEFAULT);
+    feature.add_option<int>(
+        "monitor_window",
+        "number of expansions in the sliding window of the progress monitor",
+        "1000",
+        plugins::Bounds("1", "infinity"));
+    feature.add_option<int>(
+        "monitor_interval",
+        "print the status of the progress monitor every n expansions "
+        "(0 for never)",
+        "0",
+        plugins::Bounds("0", "infinity"));
+}
+
+unique_ptr<SearchProgressMonitor> create_search_progress_monitor(
+    const plugins::Options &opts) {
+    if (!opts.contains("monitor_eval"))
+        return nullptr;
+    return utils::make_unique_ptr<SearchProgressMonitor>(opts);
+}
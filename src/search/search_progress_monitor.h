@@ -0,0 +1,142 @@
+#ifndef SEARCH_PROGRESS_MONITOR_H
+#define SEARCH_PROGRESS_MONITOR_H
+
+#include "key_histogram.h"
+
+#include <memory>
+#include <vector>
+
+class Evaluator;
+class SearchStatistics;
+
+namespace plugins {
+class Feature;
+class Options;
+}
+
+namespace utils {
+class LogProxy;
+}
+
+/*
+  This class collects signals for detecting uninformative heuristic
+  regions (UHRs) during eager and lazy search, so that open lists
+  (e.g., decision functions of alternation open lists) can react to
+  them without rescanning the open list. All signals refer to the
+  values of one evaluator (monitor_eval) and are updated in constant
+  time per event:
+
+  - the best value seen so far and the length of the current plateau,
+    i.e., the number of expansions since the best value last improved,
+  - over a sliding window of the last monitor_window expansions: the
+    expansion rate, the fraction of generated states that are dead ends
+    and the number of improvements of the best value,
+  - a histogram of the values of the entries in the open list.
+
+  The search algorithm reports insertions into and removals from the
+  open list with the values of the inserted states (eager search) or of
+  the parents of the inserted edges (lazy search). Entries with
+  infinite values are not counted. The histogram assumes that the
+  value of a state does not change while the state is open; entries
+  whose value changes (e.g., with lazy_evaluator in eager search) can
+  remain in the histogram.
+
+  Open lists get read access to the monitor through
+  OpenList::set_progress_monitor.
+*/
+class SearchProgressMonitor {
+    // Values of the counters after some number of expansions.
+    struct Snapshot {
+        double time;
+        int generated;
+        int dead_ends;
+        int improvements;
+    };
+
+    std::shared_ptr<Evaluator> evaluator;
+    int window_size;
+    int print_interval;
+
+    int num_expansions;
+    int best_value;
+    int num_improvements;
+    int last_improvement;
+    int max_plateau_length;
+    /*
+      Ring buffer with the snapshots after the last window_size + 1
+      expansions. The snapshot after k expansions is stored at position
+      k % (window_size + 1).
+    */
+    std::vector<Snapshot> snapshots;
+
+    KeyHistogram open_values;
+
+    void update_best_value(int value);
+    const Snapshot &get_window_start() const;
+public:
+    explicit SearchProgressMonitor(const plugins::Options &opts);
+
+    Evaluator *get_evaluator() const {
+        return evaluator.get();
+    }
+
+    // Report that count entries with the given value were inserted.
+    void on_insert(int value, int count = 1);
+    // Report that an entry with the given value was removed.
+    void on_remove(int value);
+    /*
+      Report the expansion of a state with the given value. Returns true
+      if a status line should be printed (every monitor_interval
+      expansions).
+    */
+    bool on_expansion(int value, const SearchStatistics &statistics);
+
+    int get_num_expansions() const {
+        return num_expansions;
+    }
+
+    // Return the best value seen so far, or -1 if there is none.
+    int get_best_value() const {
+        return best_value;
+    }
+
+    // Return the number of expansions since the best value improved.
+    int get_plateau_length() const {
+        return num_expansions - last_improvement;
+    }
+
+    int get_max_plateau_length() const;
+
+    // Return the number of expansions in the sliding window.
+    int get_window_expansions() const;
+    // Return the expansions per second in the sliding window.
+    double get_expansion_rate() const;
+    /*
+      Return the fraction of the states generated in the sliding window
+      that are dead ends.
+    */
+    double get_dead_end_rate() const;
+    // Return the number of improvements in the sliding window.
+    int get_window_improvements() const;
+
+    // Return the histogram of the values of the open entries.
+    const KeyHistogram &get_open_values() const {
+        return open_values;
+    }
+
+    void print_status(utils::LogProxy &log) const;
+    void print_statistics(utils::LogProxy &log) const;
+};
+
+extern void add_search_progress_monitor_options_to_feature(
+    plugins::Feature &feature);
+
+/*
+  Return a SearchProgressMonitor based on the given options, or nullptr
+  if no evaluator is given. Only use this together with
+  "add_search_progress_monitor_options_to_feature()".
+*/
+extern std::unique_ptr<SearchProgressMonitor> create_search_progress_monitor(
+    const plugins::Options &opts);
+
+#endif
@@ -19,6 +19,10 @@ SearchStatistics::SearchStatistics(utils::LogProxy &log)
     dead_end_states = 0;
     generated_ops = 0;
 
+    cache_hits = 0;
+    cache_misses = 0;
+    cache_evictions = 0;
+
     lastjump_expanded_states = 0;
     lastjump_reopened_states = 0;
     lastjump_evaluated_states = 0;
@@ -70,6 +74,11 @@ void SearchStatistics::print_detailed_statistics() const {
     log << "Evaluations: " << evaluations << endl;
     log << "Generated " << generated_states << " state(s)." << endl;
     log << "Dead ends: " << dead_end_states << " state(s)." << endl;
+    if (cache_hits || cache_misses) {
+        log << "Cache hits: " << cache_hits << endl;
+        log << "Cache misses: " << cache_misses << endl;
+        log << "Cache evictions: " << cache_evictions << endl;
+    }
 
     if (lastjump_f_value >= 0) {
         log << "Expanded until last jump: "
@@ -26,6 +26,11 @@ class SearchStatistics {
 
     int generated_ops;    // no of operators that were returned as applicable
 
+    // Statistics of heuristics with bounded caches (see BoundedEstimateCache)
+    int cache_hits;
+    int cache_misses;
+    int cache_evictions;
+
     // Statistics related to f values
     int lastjump_f_value; //f value obtained in the last jump
     int lastjump_expanded_states; // same guy but at point where the last jump in the open list
@@ -46,6 +51,9 @@ public:
     void inc_generated_ops(int inc = 1) {generated_ops += inc;}
     void inc_evaluations(int inc = 1) {evaluations += inc;}
     void inc_dead_ends(int inc = 1) {dead_end_states += inc;}
+    void inc_cache_hits(int inc = 1) {cache_hits += inc;}
+    void inc_cache_misses(int inc = 1) {cache_misses += inc;}
+    void inc_cache_evictions(int inc = 1) {cache_evictions += inc;}
 
     // Methods that access statistics.
     int get_expanded() const {return expanded_states;}
@@ -54,6 +62,10 @@ public:
     int get_generated() const {return generated_states;}
     int get_reopened() const {return reopened_states;}
     int get_generated_ops() const {return generated_ops;}
+    int get_dead_ends() const {return dead_end_states;}
+    int get_cache_hits() const {return cache_hits;}
+    int get_cache_misses() const {return cache_misses;}
+    int get_cache_evictions() const {return cache_evictions;}
 
     /*
       Call the following method with the f value of every expanded
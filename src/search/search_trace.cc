@@ -0,0 +1,84 @@
+#include "search_trace.h"
+
+#include "evaluator.h"
+
+#include "plugins/plugin.h"
+#include "utils/logging.h"
+#include "utils/memory.h"
+#include "utils/system.h"
+
+#include <iostream>
+
+using namespace std;
+using utils::ExitCode;
+
+static const char TRACE_MAGIC[8] = "FDTRACE";
+static const int32_t TRACE_VERSION = 1;
+// Number of records that are collected before writing them.
+static const size_t BUFFER_SIZE = 4096;
+
+SearchTrace::SearchTrace(const plugins::Options &opts)
+    : filename(opts.get<string>("trace_file")),
+      interval(opts.get<int>("trace_interval")),
+      evaluator(opts.get<shared_ptr<Evaluator>>("trace_eval", nullptr)),
+      file(filename, ios::binary),
+      num_records(0),
+      write_timer(false) {
+    if (!file) {
+        cerr << "could not open search trace file " << filename << endl;
+        utils::exit_with(ExitCode::SEARCH_INPUT_ERROR);
+    }
+    buffer.reserve(BUFFER_SIZE);
+    int32_t header[2] = {TRACE_VERSION, sizeof(SearchTraceRecord)};
+    file.write(TRACE_MAGIC, sizeof(TRACE_MAGIC));
+    file.write(reinterpret_cast<const char *>(header), sizeof(header));
+}
+
+SearchTrace::~SearchTrace() {
+    flush();
+}
+
+void SearchTrace::write_buffer() {
+    write_timer.resume();
+    file.write(reinterpret_cast<const char *>(buffer.data()),
+               buffer.size() * sizeof(SearchTraceRecord));
+    num_records += buffer.size();
+    buffer.clear();
+    write_timer.stop();
+}
+
+void SearchTrace::flush() {
+    write_buffer();
+    file.flush();
+}
+
+void SearchTrace::print_statistics(utils::LogProxy &log) const {
+    int64_t num_buffered = buffer.size();
+    log << "Search trace records: " << num_records + num_buffered << endl;
+    log << "Search trace write time: " << write_timer << endl;
+}
+
+void add_search_trace_options_to_feature(plugins::Feature &feature) {
+    feature.add_option<string>(
+        "trace_file",
+        "write a binary trace of the expansions to this file "
+        "(see analysis/search_trace.py); no trace if empty",
+        "\"\"");
+    feature.add_option<int>(
+        "trace_interval",
+        "only trace every n-th expansion (and the goal expansion)",
+        "1",
+        plugins::Bounds("1", "infinity"));
+    feature.add_option<shared_ptr<Evaluator>>(
+        "trace_eval",
+        "evaluator whose values of the expanded states are traced. "
+        "(Optional; the evaluator is evaluated on every traced state, "
+        "so it should cache its estimates.)",
+        plugins::ArgumentInfo::NO_DEFAULT);
+}
+
+unique_ptr<SearchTrace> create_search_trace(const plugins::Options &opts) {
+    if (opts.get<string>("trace_file").empty())
+        return nullptr;
+    return utils::make_unique_ptr<SearchTrace>(opts);
+}
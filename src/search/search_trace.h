@@ -0,0 +1,118 @@
+#ifndef SEARCH_TRACE_H
+#define SEARCH_TRACE_H
+
+#include "state_id.h"
+
+#include "utils/timer.h"
+
+#include <cstdint>
+#include <fstream>
+#include <memory>
+#include <string>
+#include <vector>
+
+class Evaluator;
+
+namespace plugins {
+class Feature;
+class Options;
+}
+
+namespace utils {
+class LogProxy;
+}
+
+/*
+  Fixed-size record describing one expansion of a search algorithm.
+
+  All fields are 32-bit integers in native byte order, so that the
+  trace file can be memory-mapped as an array of records (see
+  analysis/search_trace.py, which must be kept in sync with this
+  struct).
+*/
+struct SearchTraceRecord {
+    // Number of expansions before this one.
+    int32_t expansion;
+    int32_t state_id;
+    int32_t g;
+    // Value of the trace evaluator (INT32_MAX for infinity), or -1.
+    int32_t h;
+    // Sublist of the open list that produced the expanded state, or -1
+    // (see OpenList::get_last_selected_sublist).
+    int32_t sublist;
+    // Number of applicable operators (after pruning).
+    int32_t num_successors;
+    // Number of successors inserted into the open list.
+    int32_t num_inserted;
+    int32_t flags;
+
+    /*
+      A new best value of an evaluator used for boosting was found for
+      some successor (eager search) or for the expanded state itself
+      (lazy search, which evaluates states when expanding them).
+    */
+    static const int32_t PROGRESS = 1;
+    // The expanded state is a goal state.
+    static const int32_t GOAL = 2;
+};
+
+/*
+  This class writes a binary trace of the expansions of a search
+  algorithm, which can be used for analyzing and replaying search
+  behavior (e.g., the choices of alternation open lists) offline.
+
+  The file consists of a header (the magic string "FDTRACE", a format
+  version and the record size as 32-bit integers) followed by one
+  SearchTraceRecord per traced expansion. Records are collected in a
+  buffer of fixed size and written in blocks. The search algorithm
+  has to flush the trace when it is done (we do this when printing the
+  statistics). If the planner is killed, the file ends with a
+  partially written block. With trace_interval=k, only every k-th
+  expansion (and the expansion of the goal state) is traced.
+*/
+class SearchTrace {
+    std::string filename;
+    int interval;
+    std::shared_ptr<Evaluator> evaluator;
+    std::ofstream file;
+    std::vector<SearchTraceRecord> buffer;
+    int64_t num_records;
+    utils::Timer write_timer;
+
+    void write_buffer();
+public:
+    explicit SearchTrace(const plugins::Options &opts);
+    ~SearchTrace();
+
+    bool is_traced(int expansion, int flags) const {
+        return expansion % interval == 0 || (flags & SearchTraceRecord::GOAL);
+    }
+
+    // Return the evaluator whose values are traced, or nullptr.
+    Evaluator *get_evaluator() const {
+        return evaluator.get();
+    }
+
+    // Add the record for the expansion of the given state.
+    void add_record(StateID state_id, SearchTraceRecord record) {
+        record.state_id = state_id.value;
+        buffer.push_back(record);
+        if (buffer.size() == buffer.capacity())
+            write_buffer();
+    }
+
+    void flush();
+    void print_statistics(utils::LogProxy &log) const;
+};
+
+extern void add_search_trace_options_to_feature(plugins::Feature &feature);
+
+/*
+  Return a SearchTrace based on the given options, or nullptr if no
+  trace file is given. Only use this together with
+  "add_search_trace_options_to_feature()".
+*/
+extern std::unique_ptr<SearchTrace> create_search_trace(
+    const plugins::Options &opts);
+
+#endif
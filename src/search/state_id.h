@@ -14,6 +14,8 @@ class StateID {
     template<typename>
     friend class PerStateArray;
     friend class PerStateBitset;
+    friend class BoundedEstimateCache;
+    friend class SearchTrace;
 
     int value;
     explicit StateID(int value_)
@@ -9,33 +9,63 @@ from itertools import chain
 
 DEBUG = False
 
+# Derived variables are numbered in sorted order and the literals of the
+# derived variable with number i are numbered 2 * i (positive literal) and
+# 2 * i + 1 (negative literal).
+def _positive_literal_index(var_index):
+    return 2 * var_index
+
+
+def _negative_literal_index(var_index):
+    return 2 * var_index + 1
+
+
 class AxiomDependencies(object):
     def __init__(self, axioms):
         if DEBUG:
             assert all(isinstance(axiom.effect, pddl.Atom) for axiom in axioms)
-        self.derived_variables = {axiom.effect for axiom in axioms}
-        self.positive_dependencies = defaultdict(set)
-        self.negative_dependencies = defaultdict(set)
+        # We sort the variables to receive a deterministic result.
+        self.derived_variables = sorted({axiom.effect for axiom in axioms})
+        self.variable_to_index = {
+            var: index for index, var in enumerate(self.derived_variables)}
+        num_variables = len(self.derived_variables)
+        self.positive_dependencies = [set() for _ in range(num_variables)]
+        self.negative_dependencies = [set() for _ in range(num_variables)]
         for axiom in axioms:
-            head = axiom.effect
+            head = self.variable_to_index[axiom.effect]
             for body_literal in axiom.condition:
-                body_atom = body_literal.positive()
-                if body_atom in self.derived_variables:
+                body = self.variable_to_index.get(body_literal.positive())
+                if body is not None:
                     if body_literal.negated:
-                        self.negative_dependencies[head].add(body_atom)
+                        self.negative_dependencies[head].add(body)
                     else:
-                        self.positive_dependencies[head].add(body_atom)
+                        self.positive_dependencies[head].add(body)
+        self.is_necessary = [True] * num_variables
+
+    def get_literal_index(self, literal):
+        """Return the index of the given literal or None if it is not a
+        literal of a derived variable."""
+        var_index = self.variable_to_index.get(literal.positive())
+        if var_index is None:
+            return None
+        elif literal.negated:
+            return _negative_literal_index(var_index)
+        else:
+            return _positive_literal_index(var_index)
 
-    # Remove all information for variables whose literals are not necessary.
-    # We do not need to remove single entries from the dicts because if the key
-    # (= head of an axiom) is relevant, then all its values (= body of axiom)
-    # must be relevant by definition.
+    # Mark all variables whose literals are not necessary as unnecessary.
+    # We do not need to remove single dependencies because if the head of an
+    # axiom is necessary, then all variables in its body must be necessary by
+    # definition.
     def remove_unnecessary_variables(self, necessary_literals):
-        for var in self.derived_variables.copy():
-            if var not in necessary_literals and var.negate() not in necessary_literals:
-                self.derived_variables.remove(var)
-                self.positive_dependencies.pop(var, None)
-                self.negative_dependencies.pop(var, None)
+        for var_index in range(len(self.derived_variables)):
+            self.is_necessary[var_index] = bool(
+                necessary_literals[_positive_literal_index(var_index)] or
+                necessary_literals[_negative_literal_index(var_index)])
+
+    def get_necessary_variable_indices(self):
+        return [var_index for var_index, necessary
+                in enumerate(self.is_necessary) if necessary]
 
 
 class AxiomCluster(object):
@@ -52,7 +82,7 @@ class AxiomCluster(object):
         self.layer = 0
 
 
-def handle_axioms(operators, axioms, goals, layer_strategy):
+def handle_axioms(operators, axioms, goals, layer_strategy, max_negated_axioms=0):
     clusters = compute_clusters(axioms, goals, operators)
     axiom_layers = compute_axiom_layers(clusters, layer_strategy)
 
@@ -63,7 +93,14 @@ def handle_axioms(operators, axioms, goals, layer_strategy):
     # axiom layers and derived variable default values from the output.
     # (All derived variables should be binary and default to false.)
     with timers.timing("Computing negative axioms"):
-        compute_negative_axioms(clusters)
+        (num_negated_axioms, num_overapproximated_cyclic,
+         num_overapproximated_too_large) = compute_negative_axioms(
+             clusters, max_negated_axioms)
+    print("Translator negated axioms: %d" % num_negated_axioms)
+    print("Translator derived variables with overapproximated negation "
+          "(cyclic dependencies): %d" % num_overapproximated_cyclic)
+    print("Translator derived variables with overapproximated negation "
+          "(negation too large): %d" % num_overapproximated_too_large)
 
     axioms = get_axioms(clusters)
     if DEBUG:
@@ -71,59 +108,59 @@ def handle_axioms(operators, axioms, goals, layer_strategy):
     return axioms, axiom_layers
 
 
+# Return a bytearray with one entry per literal index (see
+# AxiomDependencies) that is 1 iff the literal is necessary.
 def compute_necessary_literals(dependencies, goals, operators):
-    necessary_literals = set()
+    necessary_literals = bytearray(2 * len(dependencies.derived_variables))
+    literals_to_process = []
+
+    def mark_necessary(literal_index):
+        if literal_index is not None and not necessary_literals[literal_index]:
+            necessary_literals[literal_index] = 1
+            literals_to_process.append(literal_index)
 
     for g in goals:
-        if g.positive() in dependencies.derived_variables:
-            necessary_literals.add(g)
+        mark_necessary(dependencies.get_literal_index(g))
 
     for op in operators:
-        derived_preconditions = (l for l in op.precondition if l.positive()
-                                 in dependencies.derived_variables)
-        necessary_literals.update(derived_preconditions)
+        for l in op.precondition:
+            mark_necessary(dependencies.get_literal_index(l))
 
         for condition, effect in chain(op.add_effects, op.del_effects):
             for c in condition:
-                if c.positive() in dependencies.derived_variables:
-                    necessary_literals.add(c)
-                    necessary_literals.add(c.negate())
+                literal_index = dependencies.get_literal_index(c)
+                if literal_index is not None:
+                    # Mark both polarities (the index of the complementary
+                    # literal differs in the lowest bit).
+                    mark_necessary(literal_index)
+                    mark_necessary(literal_index ^ 1)
 
-    literals_to_process = list(necessary_literals)
     while literals_to_process:
-        l = literals_to_process.pop()
-        atom = l.positive()
-        for body_atom in dependencies.positive_dependencies[atom]:
-            l2 = body_atom.negate() if l.negated else body_atom
-            if l2 not in necessary_literals:
-                literals_to_process.append(l2)
-                necessary_literals.add(l2)
-        for body_atom in dependencies.negative_dependencies[atom]:
-            l2 = body_atom if l.negated else body_atom.negate()
-            if l2 not in necessary_literals:
-                literals_to_process.append(l2)
-                necessary_literals.add(l2)
+        literal_index = literals_to_process.pop()
+        var_index, negated = divmod(literal_index, 2)
+        for body in dependencies.positive_dependencies[var_index]:
+            mark_necessary(2 * body + negated)
+        for body in dependencies.negative_dependencies[var_index]:
+            mark_necessary(2 * body + 1 - negated)
 
     return necessary_literals
 
 
-# Compute strongly connected components of the dependency graph.
-# In order to receive a deterministic result, we first sort the variables.
-# We then build adjacency lists over the variable indices based on dependencies.
+# Compute strongly connected components of the dependency graph restricted to
+# the necessary variables. The variables and their successors are visited in
+# sorted order (see AxiomDependencies) to receive a deterministic result.
 def get_strongly_connected_components(dependencies):
-    sorted_vars = sorted(dependencies.derived_variables)
-    variable_to_index = {var: index for index, var in enumerate(sorted_vars)}
+    var_indices = dependencies.get_necessary_variable_indices()
+    to_node = {var_index: node for node, var_index in enumerate(var_indices)}
 
     adjacency_list = []
-    for derived_var in sorted_vars:
-        pos = dependencies.positive_dependencies[derived_var]
-        neg = dependencies.negative_dependencies[derived_var]
-        indices = [variable_to_index[atom] for atom in sorted(pos.union(neg))]
-        adjacency_list.append(indices)
+    for var_index in var_indices:
+        pos = dependencies.positive_dependencies[var_index]
+        neg = dependencies.negative_dependencies[var_index]
+        adjacency_list.append(sorted(to_node[body] for body in pos | neg))
 
-    index_groups = sccs.get_sccs_adjacency_list(adjacency_list)
-    groups = [[sorted_vars[i] for i in g] for g in index_groups]
-    return groups
+    node_groups = sccs.get_sccs_adjacency_list(adjacency_list)
+    return [[var_indices[node] for node in group] for group in node_groups]
 
 # Expects a list of axioms *with the same head* and returns a subset consisting
 # of all non-dominated axioms whose conditions have been cleaned up
@@ -170,22 +207,25 @@ def compute_clusters(axioms, goals, operators):
     necessary_literals = compute_necessary_literals(dependencies, goals, operators)
     dependencies.remove_unnecessary_variables(necessary_literals)
 
-    groups = get_strongly_connected_components(dependencies)
-    clusters = [AxiomCluster(group) for group in groups]
+    index_groups = get_strongly_connected_components(dependencies)
+    derived_variables = dependencies.derived_variables
+    clusters = [AxiomCluster([derived_variables[i] for i in group])
+                for group in index_groups]
 
     # Compute mapping from variables to their clusters and set needed_negatively.
-    variable_to_cluster = {}
-    for cluster in clusters:
-        for variable in cluster.variables:
-            variable_to_cluster[variable] = cluster
-            if variable.negate() in necessary_literals:
+    variable_to_cluster = [None] * len(derived_variables)
+    for cluster, group in zip(clusters, index_groups):
+        for var_index in group:
+            variable_to_cluster[var_index] = cluster
+            if necessary_literals[_negative_literal_index(var_index)]:
                 cluster.needed_negatively = True
 
     # Assign axioms to their clusters.
     for axiom in axioms:
         # axiom.effect is derived but might have been pruned
-        if axiom.effect in dependencies.derived_variables:
-            variable_to_cluster[axiom.effect].axioms[axiom.effect].append(axiom)
+        cluster = variable_to_cluster[dependencies.variable_to_index[axiom.effect]]
+        if cluster is not None:
+            cluster.axioms[axiom.effect].append(axiom)
 
     removed = 0
     with timers.timing("Simplifying axioms"):
@@ -196,19 +236,17 @@ def compute_clusters(axioms, goals, operators):
                 removed += old_size - len(cluster.axioms[variable])
     print("Translator axioms removed by simplifying: %d" % removed)
 
-    # Create links between clusters (positive dependencies).
-    for from_variable, depends_on in dependencies.positive_dependencies.items():
-        from_cluster = variable_to_cluster[from_variable]
-        for to_variable in depends_on:
-            to_cluster = variable_to_cluster[to_variable]
+    for from_index in dependencies.get_necessary_variable_indices():
+        from_cluster = variable_to_cluster[from_index]
+        # Create links between clusters (positive dependencies).
+        for to_index in dependencies.positive_dependencies[from_index]:
+            to_cluster = variable_to_cluster[to_index]
             if from_cluster is not to_cluster:
                 from_cluster.positive_children.add(to_cluster)
 
-    # Create links between clusters (negative dependencies).
-    for from_variable, depends_on in dependencies.negative_dependencies.items():
-        from_cluster = variable_to_cluster[from_variable]
-        for to_variable in depends_on:
-            to_cluster = variable_to_cluster[to_variable]
+        # Create links between clusters (negative dependencies).
+        for to_index in dependencies.negative_dependencies[from_index]:
+            to_cluster = variable_to_cluster[to_index]
             if from_cluster is to_cluster:
                 raise ValueError("axioms are not stratifiable")
             from_cluster.negative_children.add(to_cluster)
@@ -247,7 +285,14 @@ def compute_axiom_layers(clusters, strategy):
     return layers
 
 
-def compute_negative_axioms(clusters):
+# Add the negated axioms for all clusters that are needed negatively. Return
+# the number of negated axioms and the numbers of derived variables whose
+# negation is overapproximated because of cyclic dependencies and because the
+# exact negation would have more than max_negated_axioms axioms.
+def compute_negative_axioms(clusters, max_negated_axioms):
+    num_negated_axioms = 0
+    num_overapproximated_cyclic = 0
+    num_overapproximated_too_large = 0
     for cluster in clusters:
         if cluster.needed_negatively:
             if len(cluster.variables) > 1:
@@ -265,16 +310,35 @@ def compute_negative_axioms(clusters):
                 # (non-overapproximating) way is possible but more expensive.
                 # Again, see issue453 for details.
                 for variable in cluster.variables:
-                    name = cluster.axioms[variable][0].name
-                    negated_axiom = pddl.PropositionalAxiom(name, [], variable.negate())
-                    cluster.axioms[variable].append(negated_axiom)
+                    cluster.axioms[variable].append(
+                        overapproximate_negation(cluster.axioms[variable], variable))
+                num_overapproximated_cyclic += len(cluster.variables)
+                num_negated_axioms += len(cluster.variables)
             else:
                 variable = next(iter(cluster.variables))
-                negated_axioms = negate(cluster.axioms[variable])
+                negated_axioms = negate(cluster.axioms[variable], max_negated_axioms)
+                if negated_axioms is None:
+                    # The exact negation is too large. We use the same
+                    # overapproximation as for cyclic dependencies above.
+                    negated_axioms = [overapproximate_negation(
+                        cluster.axioms[variable], variable)]
+                    num_overapproximated_too_large += 1
                 cluster.axioms[variable] += negated_axioms
+                num_negated_axioms += len(negated_axioms)
+    return (num_negated_axioms, num_overapproximated_cyclic,
+            num_overapproximated_too_large)
+
+
+def overapproximate_negation(axioms, variable):
+    """Return an axiom that makes the given derived variable false
+    unconditionally."""
+    return pddl.PropositionalAxiom(axioms[0].name, [], variable.negate())
 
 
-def negate(axioms):
+# Return the negation of the given axioms (which must have the same head) in
+# DNF. If max_negated_axioms is positive and the negation consists of more
+# axioms before simplification, return None instead.
+def negate(axioms, max_negated_axioms=0):
     assert axioms
     result = [pddl.PropositionalAxiom(axioms[0].name, [], axioms[0].effect.negate())]
     for axiom in axioms:
@@ -289,6 +353,8 @@ def negate(axioms):
             for result_axiom in result:
                 result_axiom.condition.append(new_literal)
         else:
+            if 0 < max_negated_axioms < len(result) * len(condition):
+                return None
             new_result = []
             for literal in condition:
                 literal = literal.negate()
@@ -1,3 +1,5 @@
+from array import array
+
 import invariant_finder
 import options
 import pddl
@@ -110,6 +112,89 @@ def collect_all_mutex_groups(groups, atoms):
 def sort_groups(groups):
     return sorted(sorted(group) for group in groups)
 
+class MutexGroupIndex:
+    """Mutex groups in terms of the finite-domain facts (var/value
+    pairs) representing their atoms.
+
+    The facts of group i are (fact_vars[j], fact_values[j]) for
+    group_starts[i] <= j < group_starts[i + 1]. For every fact, we store
+    the ids of the groups that contain it. This allows to answer
+    queries about mutexes group by group rather than by enumerating
+    all pairs of facts in a group, which is quadratic in the group
+    size.
+    """
+
+    def __init__(self, strips_to_sas, ranges, groups, mutex_groups):
+        """strips_to_sas maps each atom to the facts representing it,
+        ranges are the variable domain sizes, groups are the groups
+        that define the variables, and mutex_groups are all mutex
+        groups (lists of atoms)."""
+        self.group_starts = array("q", [0])
+        self.fact_vars = array("i")
+        self.fact_values = array("i")
+        self.var_offsets = array("q", [0])
+        for var_range in ranges:
+            self.var_offsets.append(self.var_offsets[-1] + var_range)
+        self.groups_by_fact = [None] * self.var_offsets[-1]
+        for group_id, group in enumerate(mutex_groups):
+            for atom in group:
+                for var, value in strips_to_sas[atom]:
+                    self.fact_vars.append(var)
+                    self.fact_values.append(value)
+                    fact_id = self.var_offsets[var] + value
+                    if self.groups_by_fact[fact_id] is None:
+                        self.groups_by_fact[fact_id] = array("i")
+                    self.groups_by_fact[fact_id].append(group_id)
+            self.group_starts.append(len(self.fact_vars))
+
+        # A "lonely" atom forms a group of size 1 and hence is represented
+        # by a binary variable whose value 1 means that the atom is false.
+        self.lonely_vars = set()
+        for var, group in enumerate(groups):
+            if len(group) == 1:
+                assert strips_to_sas[group[0]] == [(var, 0)]
+                self.lonely_vars.add(var)
+
+    def __len__(self):
+        return len(self.group_starts) - 1
+
+    def get_group_size(self, group_id):
+        return self.group_starts[group_id + 1] - self.group_starts[group_id]
+
+    def get_group(self, group_id):
+        """Return the facts of the given group as a list of var/value
+        pairs."""
+        begin = self.group_starts[group_id]
+        end = self.group_starts[group_id + 1]
+        return list(zip(self.fact_vars[begin:end], self.fact_values[begin:end]))
+
+    def get_groups_of_fact(self, fact):
+        var, value = fact
+        return self.groups_by_fact[self.var_offsets[var] + value] or ()
+
+    def get_groups_of_facts(self, facts):
+        """Return the set of ids of all groups containing any of the
+        given facts."""
+        group_ids = set()
+        for fact in facts:
+            group_ids.update(self.get_groups_of_fact(fact))
+        return group_ids
+
+    def is_implied_by_groups(self, fact, group_ids):
+        """Return whether a condition that holds facts from the given
+        groups (see get_groups_of_facts) implies fact.
+
+        We only detect the following case: fact says that a lonely
+        atom X is false and the condition contains a fact representing
+        an atom that is mutex with X. The variable of fact must not
+        occur in the condition."""
+        var, value = fact
+        if value != 1 or var not in self.lonely_vars:
+            return False
+        return any(group_id in group_ids
+                   for group_id in self.get_groups_of_fact((var, 0)))
+
+
 def compute_groups(task: pddl.Task, atoms: Set[pddl.Literal],
     reachable_action_params: Dict[pddl.Action, List[str]],
     negative_in_goal: Set[pddl.Atom]) -> Tuple[
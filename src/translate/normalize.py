@@ -1,5 +1,6 @@
 #! /usr/bin/env python3
 
+from collections import defaultdict
 import copy
 from typing import Sequence
 
@@ -40,6 +41,16 @@ class PreconditionProxy(ConditionProxy):
         rules.append((rule_body, rule_head))
     def get_type_map(self):
         return self.owner.type_map
+    def eliminate_existential_quantifier(self):
+        precond = self.condition
+        if isinstance(precond, pddl.ExistentialCondition):
+            # Copy parameter list, since it can be shared with
+            # parameter lists of other versions of this action (e.g.
+            # created when splitting up disjunctive preconditions).
+            action = self.owner
+            action.parameters = list(action.parameters)
+            action.parameters.extend(precond.parameters)
+            self.set(precond.parts[0])
 
 class EffectConditionProxy(ConditionProxy):
     def __init__(self, action, effect):
@@ -61,6 +72,13 @@ class EffectConditionProxy(ConditionProxy):
             rules.append((rule_body, rule_head))
     def get_type_map(self):
         return self.action.type_map
+    def eliminate_existential_quantifier(self):
+        condition = self.condition
+        if isinstance(condition, pddl.ExistentialCondition):
+            effect = self.owner
+            effect.parameters = list(effect.parameters)
+            effect.parameters.extend(condition.parameters)
+            self.set(condition.parts[0])
 
 class AxiomConditionProxy(ConditionProxy):
     def __init__(self, axiom):
@@ -83,6 +101,16 @@ class AxiomConditionProxy(ConditionProxy):
         rules.append((eff_rule_body, eff_rule_head))
     def get_type_map(self):
         return self.owner.type_map
+    def eliminate_existential_quantifier(self):
+        precond = self.condition
+        if isinstance(precond, pddl.ExistentialCondition):
+            # Copy parameter list, since it can be shared with
+            # parameter lists of other versions of this axiom (e.g.
+            # created when splitting up disjunctive preconditions).
+            axiom = self.owner
+            axiom.parameters = list(axiom.parameters)
+            axiom.parameters.extend(precond.parameters)
+            self.set(precond.parts[0])
 
 class GoalConditionProxy(ConditionProxy):
     def __init__(self, task):
@@ -115,6 +143,10 @@ class GoalConditionProxy(ConditionProxy):
         type_map = {}
         self.condition.uniquify_variables(type_map)
         return type_map
+    def eliminate_existential_quantifier(self):
+        # Existential goals are compiled into axioms (see
+        # substitute_complicated_goal).
+        pass
 
 def get_action_predicate(action):
     name = action
@@ -133,12 +165,18 @@ def get_axiom_predicate(axiom):
 def get_pne_definition_predicate(pne: pddl.PrimitiveNumericExpression):
     return pddl.Atom(f"@def-{pne.symbol}", pne.args)
 
-def all_conditions(task):
-    for action in task.actions:
+def all_conditions(task, actions=None, axioms=None):
+    # By default, we iterate over the conditions of all actions and
+    # axioms of the task.
+    if actions is None:
+        actions = task.actions
+    if axioms is None:
+        axioms = task.axioms
+    for action in actions:
         yield PreconditionProxy(action)
         for effect in action.effects:
             yield EffectConditionProxy(action, effect)
-    for axiom in task.axioms:
+    for axiom in axioms:
         yield AxiomConditionProxy(axiom)
     yield GoalConditionProxy(task)
 
@@ -151,9 +189,12 @@ def all_conditions(task):
 # translated to NNF. The parameters of the new axioms are exactly the free
 # variables of <forall(vars, phi)>.
 
-def remove_universal_quantifiers(task):
+def remove_universal_quantifiers(task, table=None):
+    if table is None:
+        table = ConditionTable()
     def recurse(condition):
         # Uses new_axioms_by_condition and type_map from surrounding scope.
+        table.count_visit()
         if isinstance(condition, pddl.UniversalCondition):
             axiom_condition = condition.negate()
             parameters = sorted(axiom_condition.free_variables())
@@ -164,6 +205,8 @@ def remove_universal_quantifiers(task):
                 axiom = task.add_axiom(list(typed_parameters), condition)
                 new_axioms_by_condition[(condition, typed_parameters)] = axiom
             return pddl.NegatedAtom(axiom.name, parameters)
+        elif not table.contains(condition, pddl.UniversalCondition):
+            return condition
         else:
             new_parts = [recurse(part) for part in condition.parts]
             return condition.change_parts(new_parts)
@@ -171,11 +214,80 @@ def remove_universal_quantifiers(task):
     new_axioms_by_condition = {}
     for proxy in tuple(all_conditions(task)):
         # Cannot use generator because we add new axioms on the fly.
-        if proxy.condition.has_universal_part():
+        if table.contains(proxy.condition, pddl.UniversalCondition):
             type_map = proxy.get_type_map()
             proxy.set(recurse(proxy.condition))
 
 
+class ConditionTable:
+    """Memo tables for the normalization steps.
+
+    Since conditions are hash-consed (see pddl.conditions), shared
+    subtrees are the same node, and we can memoize the results of the
+    normalization steps per node, so each distinct subtree is only
+    transformed once. We count the nodes that each step visits and the
+    new condition nodes that are created while it runs."""
+    def __init__(self):
+        self.memos = defaultdict(dict)
+        self.steps = []
+        self.visited_nodes = defaultdict(int)
+        self.created_nodes = defaultdict(int)
+        self.step = None
+        self.num_created_conditions = 0
+
+    def _count_created_nodes(self):
+        num_created_conditions = pddl.conditions.get_number_of_created_conditions()
+        if self.step is not None:
+            self.created_nodes[self.step] += (
+                num_created_conditions - self.num_created_conditions)
+        self.num_created_conditions = num_created_conditions
+
+    def start_step(self, step):
+        """Count the following node visits and creations for the
+        given normalization step."""
+        self._count_created_nodes()
+        if step not in self.visited_nodes:
+            self.steps.append(step)
+            self.visited_nodes[step] = 0
+        self.step = step
+
+    def count_visit(self):
+        self.visited_nodes[self.step] += 1
+
+    def _memoized(self, name, condition, compute):
+        memo = self.memos[name]
+        result = memo.get(condition)
+        if result is None:
+            self.count_visit()
+            result = memo[condition] = compute(condition)
+        return result
+
+    def contains(self, condition, condition_class):
+        """Test if the condition has a part (or is) of the given class."""
+        memo = self.memos[condition_class]
+        result = memo.get(condition)
+        if result is None:
+            result = memo[condition] = (
+                isinstance(condition, condition_class) or
+                any(self.contains(part, condition_class)
+                    for part in condition.parts))
+        return result
+
+    def simplified(self, condition):
+        # Memoized version of Condition.simplified.
+        def compute(condition):
+            parts = [self.simplified(part) for part in condition.parts]
+            method = getattr(condition, "_simplified", condition._propagate)
+            return method(parts)
+        return self._memoized("simplified", condition, compute)
+
+    def get_statistics(self):
+        """Return a list of (step, visited nodes, created nodes) triples."""
+        self._count_created_nodes()
+        return [(step, self.visited_nodes[step], self.created_nodes[step])
+                for step in self.steps]
+
+
 # [2] Pull disjunctions to the root of the condition.
 #
 # After removing universal quantifiers, the (k-ary generalization of the)
@@ -183,12 +295,12 @@ def remove_universal_quantifiers(task):
 # (1) or(phi, or(psi, psi'))      ==  or(phi, psi, psi')
 # (2) exists(vars, or(phi, psi))  ==  or(exists(vars, phi), exists(vars, psi))
 # (3) and(phi, or(psi, psi'))     ==  or(and(phi, psi), and(phi, psi'))
-def build_DNF(task):
-    def recurse(condition):
+def build_DNF(condition, table):
+    def compute(condition):
         disjunctive_parts = []
         other_parts = []
         for part in condition.parts:
-            part = recurse(part)
+            part = build_DNF(part, table)
             if isinstance(part, pddl.Disjunction):
                 disjunctive_parts.append(part)
             else:
@@ -206,8 +318,9 @@ def build_DNF(task):
         # Rule (2): Distributivity disjunction/existential quantification.
         if isinstance(condition, pddl.ExistentialCondition):
             parameters = condition.parameters
-            result_parts = [pddl.ExistentialCondition(parameters, (part,))
-                            for part in disjunctive_parts[0].parts]
+            result_parts = [
+                pddl.ExistentialCondition(parameters, (part,))
+                for part in disjunctive_parts[0].parts]
             return pddl.Disjunction(result_parts)
 
         # Rule (3): Distributivity disjunction/conjunction.
@@ -221,21 +334,10 @@ def build_DNF(task):
                 for part2 in parts_to_distribute:
                     result_parts.append(pddl.Conjunction((part1, part2)))
         return pddl.Disjunction(result_parts)
+    return table._memoized("dnf", condition, compute)
 
-    for proxy in all_conditions(task):
-        if proxy.condition.has_disjunction():
-            proxy.set(recurse(proxy.condition).simplified())
-
-# [3] Split conditions at the outermost disjunction.
-def split_disjunctions(task):
-    for proxy in tuple(all_conditions(task)):
-        # Cannot use generator directly because we add/delete entries.
-        if isinstance(proxy.condition, pddl.Disjunction):
-            for part in proxy.condition.parts:
-                new_proxy = proxy.clone_owner()
-                new_proxy.set(part)
-                new_proxy.register_owner(task)
-            proxy.delete_owner(task)
+# [3] Split conditions at the outermost disjunction (see
+#     normalize_condition).
 
 # [4] Pull existential quantifiers out of conjunctions and group them.
 #
@@ -244,12 +346,12 @@ def split_disjunctions(task):
 # (1) exists(vars, exists(vars', phi))  ==  exists(vars + vars', phi)
 # (2) and(phi, exists(vars, psi))       ==  exists(vars, and(phi, psi)),
 #       if var does not occur in phi as a free variable.
-def move_existential_quantifiers(task):
-    def recurse(condition):
+def move_existential_quantifiers(condition, table):
+    def compute(condition):
         existential_parts = []
         other_parts = []
         for part in condition.parts:
-            part = recurse(part)
+            part = move_existential_quantifiers(part, table)
             if isinstance(part, pddl.ExistentialCondition):
                 existential_parts.append(part)
             else:
@@ -272,57 +374,39 @@ def move_existential_quantifiers(task):
             new_conjunction_parts += part.parts
         new_conjunction = pddl.Conjunction(new_conjunction_parts)
         return pddl.ExistentialCondition(new_parameters, (new_conjunction,))
-
-    for proxy in all_conditions(task):
-        if proxy.condition.has_existential_part():
-            proxy.set(recurse(proxy.condition).simplified())
-
-
-# [5a] Drop existential quantifiers from axioms, turning them
-#      into parameters.
-
-def eliminate_existential_quantifiers_from_axioms(task):
-    # Note: This is very redundant with the corresponding method for
-    # actions and could easily be merged if axioms and actions were
-    # unified.
-    for axiom in task.axioms:
-        precond = axiom.condition
-        if isinstance(precond, pddl.ExistentialCondition):
-            # Copy parameter list, since it can be shared with
-            # parameter lists of other versions of this axiom (e.g.
-            # created when splitting up disjunctive preconditions).
-            axiom.parameters = list(axiom.parameters)
-            axiom.parameters.extend(precond.parameters)
-            axiom.condition = precond.parts[0]
-
-
-# [5b] Drop existential quantifiers from action preconditions,
-#      turning them into action parameters (that don't form part of the
-#      name of the action).
-
-def eliminate_existential_quantifiers_from_preconditions(task):
-    for action in task.actions:
-        precond = action.precondition
-        if isinstance(precond, pddl.ExistentialCondition):
-            # Copy parameter list, since it can be shared with
-            # parameter lists of other versions of this action (e.g.
-            # created when splitting up disjunctive preconditions).
-            action.parameters = list(action.parameters)
-            action.parameters.extend(precond.parameters)
-            action.precondition = precond.parts[0]
-
-# [5c] Eliminate existential quantifiers from effect conditions
-#
-# For effect conditions, we replace "when exists(x, phi) then e" with
-# "forall(x): when phi then e.
-def eliminate_existential_quantifiers_from_conditional_effects(task):
-    for action in task.actions:
-        for effect in action.effects:
-            condition = effect.condition
-            if isinstance(condition, pddl.ExistentialCondition):
-                effect.parameters = list(effect.parameters)
-                effect.parameters.extend(condition.parameters)
-                effect.condition = condition.parts[0]
+    return table._memoized("existentials", condition, compute)
+
+# [5] Drop existential quantifiers from the conditions, turning them into
+#     parameters of the axioms and actions (that don't form part of the
+#     name of the action). For effect conditions, we replace
+#     "when exists(x, phi) then e" with "forall(x): when phi then e"
+#     (see the eliminate_existential_quantifier methods of the proxies).
+
+# Steps [2], [3], [4] and [5] are fused into a single pass over the
+# conditions, which transforms each condition completely before moving
+# on to the next one.
+def normalize_condition(task, proxy, table):
+    table.start_step("Building DNF")
+    condition = proxy.condition
+    if table.contains(condition, pddl.Disjunction):
+        condition = table.simplified(build_DNF(condition, table))
+        proxy.set(condition)
+    if isinstance(condition, pddl.Disjunction):
+        new_proxies = []
+        for part in condition.parts:
+            new_proxy = proxy.clone_owner()
+            new_proxy.set(part)
+            new_proxy.register_owner(task)
+            new_proxies.append(new_proxy)
+        proxy.delete_owner(task)
+    else:
+        new_proxies = [proxy]
+    for new_proxy in new_proxies:
+        table.start_step("Moving existential quantifiers")
+        if table.contains(new_proxy.condition, pddl.ExistentialCondition):
+            new_proxy.set(table.simplified(move_existential_quantifiers(
+                new_proxy.condition, table)))
+        new_proxy.eliminate_existential_quantifier()
 
 def substitute_complicated_goal(task):
     goal = task.goal
@@ -341,14 +425,16 @@ def substitute_complicated_goal(task):
 # that the task makes sense.
 
 def normalize(task):
-    remove_universal_quantifiers(task)
+    table = ConditionTable()
+    table.start_step("Removing universal quantifiers")
+    remove_universal_quantifiers(task, table)
     substitute_complicated_goal(task)
-    build_DNF(task)
-    split_disjunctions(task)
-    move_existential_quantifiers(task)
-    eliminate_existential_quantifiers_from_axioms(task)
-    eliminate_existential_quantifiers_from_preconditions(task)
-    eliminate_existential_quantifiers_from_conditional_effects(task)
+    for proxy in tuple(all_conditions(task)):
+        # Cannot use generator directly because we add/delete entries.
+        normalize_condition(task, proxy, table)
+    for step, visited_nodes, created_nodes in table.get_statistics():
+        print("%s: %d condition nodes visited, %d created." % (
+            step, visited_nodes, created_nodes))
 
     verify_axiom_predicates(task)
 
@@ -376,9 +462,9 @@ def verify_axiom_predicates(task):
 
 
 # [6] Build rules for exploration component.
-def build_exploration_rules(task):
+def build_exploration_rules(task, actions=None, axioms=None):
     result = []
-    for proxy in all_conditions(task):
+    for proxy in all_conditions(task, actions, axioms):
         proxy.build_rules(result)
     return result
 
@@ -28,14 +28,49 @@ def parse_args():
     argparser.add_argument(
         "--sas-file", default="output.sas",
         help="path to the SAS output file (default: %(default)s)")
+    argparser.add_argument(
+        "--timings-file",
+        help="write the time and peak memory of all translator phases "
+        "as JSON to this file")
     argparser.add_argument(
         "--invariant-generation-max-time", default=300, type=int,
         help="max time for invariant generation (default: %(default)ds)")
+    argparser.add_argument(
+        "--instantiation-processes", default=1, type=int,
+        help="number of processes used for instantiating the actions "
+        "(default: %(default)d). With more than one process, the atoms of "
+        "different action schemas are instantiated in parallel. This "
+        "requires the fork start method of the multiprocessing module.")
+    argparser.add_argument(
+        "--rule-cache-dir",
+        help="cache the compiled Datalog rules used for computing the "
+        "relaxed reachability model in this directory and reuse them for "
+        "other tasks of the same domain (default: no cache)")
+    argparser.add_argument(
+        "--cardinality-join-order", action="store_true",
+        help="order the joins of the Datalog rules used for computing the "
+        "relaxed reachability model based on cardinality estimates for "
+        "the static predicates of the initial state. Joins without such "
+        "estimates are ordered by their numbers of variables as usual.")
+    argparser.add_argument(
+        "--dump-join-plans", metavar="FILE",
+        help="write the split Datalog rules with the estimated and actual "
+        "sizes of their relations to this file (for debugging)")
+    argparser.add_argument(
+        "--max-mutex-facts", default=0, type=int,
+        help="max total number of facts in the mutex groups written to the "
+        "output (default: no limit). Mutex groups that would exceed the "
+        "limit are skipped. Set to 0 to disable the limit.")
     argparser.add_argument(
         "--add-implied-preconditions", action="store_true",
         help="infer additional preconditions. This setting can cause a "
         "severe performance penalty due to weaker relevance analysis "
         "(see issue7).")
+    argparser.add_argument(
+        "--keep-irrelevant-actions",
+        dest="filter_irrelevant_actions", action="store_false",
+        help="do not remove action schemas and axioms that cannot "
+        "contribute to reaching the goal before grounding")
     argparser.add_argument(
         "--keep-unreachable-facts",
         dest="filter_unreachable_facts", action="store_false",
@@ -49,6 +84,11 @@ def parse_args():
         "--keep-unimportant-variables",
         dest="filter_unimportant_vars", action="store_false",
         help="keep variables that do not influence the goal in the causal graph")
+    argparser.add_argument(
+        "--compact-sas-operators", action="store_true",
+        help="store the operators of the finite-domain task in flat integer "
+        "arrays instead of individual objects. This reduces memory usage "
+        "for tasks with many operators.")
     argparser.add_argument(
         "--dump-task", action="store_true",
         help="dump human-readable SAS+ representation of the task")
@@ -57,6 +97,12 @@ def parse_args():
         help="How to assign layers to derived variables. 'min' attempts to put as "
         "many variables into the same layer as possible, while 'max' puts each variable "
         "into its own layer unless it is part of a cycle.")
+    argparser.add_argument(
+        "--max-negated-axioms", default=1000000, type=int,
+        help="max number of axioms generated when negating the axioms of a "
+        "derived variable (default: %(default)d). If the negation is larger, "
+        "the derived variable is assumed to be false unconditionally "
+        "(overapproximation). Set to 0 to disable the limit.")
     return argparser.parse_args()
 
 
@@ -31,6 +31,8 @@ from .effects import Effect
 from .effects import SimpleEffect
 from .effects import UniversalEffect
 
+from .fact_index import FactIndex
+
 from .f_expression import Assign
 from .f_expression import Increase
 from .f_expression import NumericConstant
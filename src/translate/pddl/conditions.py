@@ -1,4 +1,5 @@
 from typing import List
+import weakref
 
 from .pddl_types import TypedObject
 
@@ -6,16 +7,69 @@ from .pddl_types import TypedObject
 # be hashed occasionally. Immutability also allows more efficient comparison
 # based on a precomputed hash value.
 #
+# Conditions are hash-consed (interned): creating a condition that is
+# structurally equal to an existing one returns the existing object (see
+# InternedCondition). Hence, equality of conditions is identity.
+#
 # Careful: Most other classes (e.g. Effects, Axioms, Actions) are not!
 
-class Condition:
+# Maps the keys of all live conditions (see get_key) to weak references
+# to the conditions. Conditions that are no longer referenced are removed
+# automatically. (This is a leaner version of weakref.WeakValueDictionary,
+# whose bookkeeping is noticeable when creating millions of atoms.)
+_conditions = {}
+# Number of conditions created so far (not counting conditions that were
+# returned from _conditions).
+_num_created_conditions = 0
+
+class _ConditionRef(weakref.ref):
+    __slots__ = ["key"]
+
+def _remove_condition(ref, conditions=_conditions):
+    # A new condition with the same key may have replaced the dead one.
+    if conditions.get(ref.key) is ref:
+        del conditions[ref.key]
+
+class InternedCondition(type):
+    """Metaclass of conditions that returns the existing condition when
+    creating a condition that is structurally equal to it."""
+    def __call__(cls, *args):
+        key = cls.get_key(*args)
+        ref = _conditions.get(key)
+        if ref is not None:
+            condition = ref()
+            if condition is not None:
+                return condition
+        global _num_created_conditions
+        _num_created_conditions += 1
+        condition = type.__call__(cls, *key[1:])
+        ref = _ConditionRef(condition, _remove_condition)
+        ref.key = key
+        _conditions[key] = ref
+        return condition
+
+def get_number_of_conditions():
+    return len(_conditions)
+
+def get_number_of_created_conditions():
+    return _num_created_conditions
+
+class Condition(metaclass=InternedCondition):
+    __slots__ = ["hash", "__weakref__"]
+    @classmethod
+    def get_key(cls, parts):
+        return (cls, tuple(parts))
     def __init__(self, parts: List["Condition"]):
         self.parts = tuple(parts)
         self.hash = hash((self.__class__, self.parts))
     def __hash__(self):
         return self.hash
-    def __ne__(self, other):
-        return not self == other
+    def __reduce__(self):
+        # Create copies and unpickled conditions via the metaclass, so
+        # that they are interned as well.
+        return (self.__class__, self.get_key_args())
+    def get_key_args(self):
+        return (self.parts,)
     def __lt__(self, other):
         return self.hash < other.hash
     def __le__(self, other):
@@ -74,26 +128,30 @@ class Condition:
         return False
 
 class ConstantCondition(Condition):
-    # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
-    __hash__ = Condition.__hash__
+    __slots__ = []
     parts = ()
+    @classmethod
+    def get_key(cls):
+        return (cls,)
     def __init__(self):
         self.hash = hash(self.__class__)
+    def get_key_args(self):
+        return ()
     def change_parts(self, parts):
         return self
-    def __eq__(self, other):
-        return self.__class__ is other.__class__
 
 class Impossible(Exception):
     pass
 
 class Falsity(ConstantCondition):
+    __slots__ = []
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
         raise Impossible()
     def negate(self):
         return Truth()
 
 class Truth(ConstantCondition):
+    __slots__ = []
     def to_untyped_strips(self):
         return []
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
@@ -102,17 +160,12 @@ class Truth(ConstantCondition):
         return Falsity()
 
 class JunctorCondition(Condition):
-    # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
-    __hash__ = Condition.__hash__
-    def __eq__(self, other):
-        # Compare hash first for speed reasons.
-        return (self.hash == other.hash and
-                self.__class__ is other.__class__ and
-                self.parts == other.parts)
+    __slots__ = ["parts"]
     def change_parts(self, parts):
         return self.__class__(parts)
 
 class Conjunction(JunctorCondition):
+    __slots__ = []
     def _simplified(self, parts):
         result_parts = []
         for part in parts:
@@ -140,6 +193,7 @@ class Conjunction(JunctorCondition):
         return Disjunction([p.negate() for p in self.parts])
 
 class Disjunction(JunctorCondition):
+    __slots__ = []
     def _simplified(self, parts):
         result_parts = []
         for part in parts:
@@ -160,20 +214,18 @@ class Disjunction(JunctorCondition):
         return True
 
 class QuantifiedCondition(Condition):
-    # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
-    __hash__ = Condition.__hash__
+    __slots__ = ["parameters", "parts"]
+    @classmethod
+    def get_key(cls, parameters, parts):
+        return (cls, tuple(parameters), tuple(parts))
     def __init__(self, parameters: List[TypedObject],
                  parts: List[Condition]) -> None:
         assert len(parts) == 1
         self.parameters = tuple(parameters)
         self.parts = tuple(parts)
         self.hash = hash((self.__class__, self.parameters, self.parts))
-    def __eq__(self, other):
-        # Compare hash first for speed reasons.
-        return (self.hash == other.hash and
-                self.__class__ is other.__class__ and
-                self.parameters == other.parameters and
-                self.parts == other.parts)
+    def get_key_args(self):
+        return (self.parameters, self.parts)
     def _dump(self, indent="  "):
         arglist = ", ".join(map(str, self.parameters))
         return "%s %s" % (self.__class__.__name__, arglist)
@@ -199,6 +251,7 @@ class QuantifiedCondition(Condition):
         return self.__class__(self.parameters, parts)
 
 class UniversalCondition(QuantifiedCondition):
+    __slots__ = []
     def _untyped(self, parts):
         type_literals = [par.get_atom().negate() for par in self.parameters]
         return UniversalCondition(self.parameters,
@@ -209,6 +262,7 @@ class UniversalCondition(QuantifiedCondition):
         return True
 
 class ExistentialCondition(QuantifiedCondition):
+    __slots__ = []
     def _untyped(self, parts):
         type_literals = [par.get_atom() for par in self.parameters]
         return ExistentialCondition(self.parameters,
@@ -222,22 +276,17 @@ class ExistentialCondition(QuantifiedCondition):
         return True
 
 class Literal(Condition):
-    # Defining __eq__ blocks inheritance of __hash__, so must set it explicitly.
-    __hash__ = Condition.__hash__
-    parts = []
-    __slots__ = ["predicate", "args", "hash"]
+    __slots__ = ["predicate", "args"]
+    parts = ()
+    @classmethod
+    def get_key(cls, predicate, args):
+        return (cls, predicate, tuple(args))
     def __init__(self, predicate: str, args: List[str]) -> None:
         self.predicate = predicate
         self.args = tuple(args)
         self.hash = hash((self.__class__, self.predicate, self.args))
-    def __eq__(self, other):
-        # Compare hash first for speed reasons.
-        return (self.hash == other.hash and
-                self.__class__ is other.__class__ and
-                self.predicate == other.predicate and
-                self.args == other.args)
-    def __ne__(self, other):
-        return not self == other
+    def get_key_args(self):
+        return (self.predicate, self.args)
     @property
     def key(self):
         return str(self.predicate), self.args
@@ -267,32 +316,45 @@ class Literal(Condition):
         return {arg for arg in self.args if arg[0] == "?"}
 
 class Atom(Literal):
+    __slots__ = []
     negated = False
     def to_untyped_strips(self):
         return [self]
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
-        args = [var_mapping.get(arg, arg) for arg in self.args]
-        atom = Atom(self.predicate, args)
-        if atom in fluent_facts:
+        # init_facts is a FactIndex (see fact_index), which knows the
+        # reachable fluent facts, so we do not need to check fluent_facts.
+        args = tuple([var_mapping.get(arg, arg) for arg in self.args])
+        static_args = init_facts.get_static_args(self.predicate)
+        if static_args is not None:
+            if args not in static_args:
+                raise Impossible()
+        else:
+            atom = init_facts.get_fluent_atom(self.predicate, args)
+            if atom is None:
+                # Unreachable fluent atoms are also false initially.
+                raise Impossible()
             result.append(atom)
-        elif atom not in init_facts:
-            raise Impossible()
     def negate(self):
         return NegatedAtom(self.predicate, self.args)
     def positive(self):
         return self
 
 class NegatedAtom(Literal):
+    __slots__ = []
     negated = True
     def _relaxed(self, parts):
         return Truth()
     def instantiate(self, var_mapping, init_facts, fluent_facts, result):
-        args = [var_mapping.get(arg, arg) for arg in self.args]
-        atom = Atom(self.predicate, args)
-        if atom in fluent_facts:
-            result.append(NegatedAtom(self.predicate, args))
-        elif atom in init_facts:
-            raise Impossible()
+        args = tuple([var_mapping.get(arg, arg) for arg in self.args])
+        static_args = init_facts.get_static_args(self.predicate)
+        if static_args is not None:
+            if args in static_args:
+                raise Impossible()
+        else:
+            negated_atom = init_facts.get_negated_fluent_atom(
+                self.predicate, args)
+            if negated_atom is not None:
+                result.append(negated_atom)
     def negate(self):
         return Atom(self.predicate, self.args)
     positive = negate
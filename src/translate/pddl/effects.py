@@ -20,6 +20,7 @@ def cartesian_product(*sequences):
 
 
 class Effect:
+    __slots__ = ["parameters", "condition", "literal"]
     def __init__(self, parameters: List[TypedObject], condition: Condition,
                  literal: Literal) -> None:
         self.parameters = parameters
@@ -55,12 +56,48 @@ class Effect:
             var_mapping = var_mapping.copy() # Will modify this.
             object_lists = [objects_by_type.get(par.type_name, [])
                             for par in self.parameters]
+            object_lists = self._restrict_object_lists(
+                object_lists, var_mapping, init_facts)
             for object_tuple in cartesian_product(*object_lists):
                 for (par, obj) in zip(self.parameters, object_tuple):
                     var_mapping[par.name] = obj
                 self._instantiate(var_mapping, init_facts, fluent_facts, result)
         else:
             self._instantiate(var_mapping, init_facts, fluent_facts, result)
+    def _restrict_object_lists(self, object_lists, var_mapping, init_facts):
+        """Remove the objects from the object lists of the parameters
+        that violate a static condition for all values of the other
+        parameters. This keeps the order of the objects."""
+        parameter_positions = {par.name: pos
+                               for pos, par in enumerate(self.parameters)}
+        if isinstance(self.condition, conditions.Conjunction):
+            parts = self.condition.parts
+        else:
+            parts = [self.condition]
+        for part in parts:
+            if not isinstance(part, conditions.Atom):
+                continue
+            parameters = [(arg_pos, parameter_positions[arg])
+                          for arg_pos, arg in enumerate(part.args)
+                          if arg in parameter_positions]
+            if (not parameters or
+                    init_facts.get_static_args(part.predicate) is None):
+                continue
+            bound_positions = tuple(
+                arg_pos for arg_pos, arg in enumerate(part.args)
+                if arg not in parameter_positions)
+            bound_values = tuple(var_mapping.get(part.args[arg_pos],
+                                                 part.args[arg_pos])
+                                 for arg_pos in bound_positions)
+            if any(value[0] == "?" for value in bound_values):
+                continue
+            matching_args = init_facts.get_matching_static_args(
+                part.predicate, bound_positions, bound_values)
+            for arg_pos, par_pos in parameters:
+                values = {args[arg_pos] for args in matching_args}
+                object_lists[par_pos] = [obj for obj in object_lists[par_pos]
+                                         if obj in values]
+        return object_lists
     def _instantiate(self, var_mapping, init_facts, fluent_facts, result):
         condition = []
         try:
@@ -82,6 +119,7 @@ class Effect:
 
 
 class ConditionalEffect:
+    __slots__ = ["condition", "effect"]
     def __init__(self, condition: Condition, effect: AnyEffect) -> None:
         if isinstance(effect, ConditionalEffect):
             self.condition = conditions.Conjunction([condition, effect.condition])
@@ -112,6 +150,7 @@ class ConditionalEffect:
         return None, self
 
 class UniversalEffect:
+    __slots__ = ["parameters", "effect"]
     def __init__(self, parameters: List[TypedObject], effect: AnyEffect):
         if isinstance(effect, UniversalEffect):
             self.parameters = parameters + effect.parameters
@@ -137,6 +176,7 @@ class UniversalEffect:
         return None, self
 
 class ConjunctiveEffect:
+    __slots__ = ["effects"]
     def __init__(self, effects: List[AnyEffect]) -> None:
         flattened_effects = []
         for effect in effects:
@@ -165,6 +205,7 @@ class ConjunctiveEffect:
         return cost_effect, ConjunctiveEffect(new_effects)
 
 class SimpleEffect:
+    __slots__ = ["effect"]
     def __init__(self, effect: Literal) -> None:
         self.effect = effect
     def dump(self, indent="  "):
@@ -175,6 +216,7 @@ class SimpleEffect:
         return None, self
 
 class CostEffect:
+    __slots__ = ["effect"]
     def __init__(self, effect: Increase) -> None:
         self.effect = effect
     def dump(self, indent="  "):
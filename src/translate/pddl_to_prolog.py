@@ -3,8 +3,11 @@
 
 import itertools
 
+import join_statistics
 import normalize
 import pddl
+import relevance_analysis
+import rule_cache
 import timers
 
 class PrologProgram:
@@ -21,6 +24,20 @@ class PrologProgram:
         self.objects |= set(atom.args)
     def add_rule(self, rule):
         self.rules.append(rule)
+    def add_compiled_rules(self, compiled_rules):
+        """Add the rules and facts of a list of CompiledRule objects. The
+        facts of the program (and hence its objects) must be complete
+        when calling this, because the @object facts are added here."""
+        if any(compiled.bound_effect_variables
+               for compiled in compiled_rules):
+            self.facts += [Fact(pddl.Atom("@object", [obj]))
+                           for obj in self.objects]
+        for compiled in compiled_rules:
+            for rule in compiled.instantiate(self.new_name):
+                self.add_rule(rule)
+        for compiled in compiled_rules:
+            for fact in compiled.get_facts():
+                self.add_fact(fact)
     def dump(self, file=None):
         for fact in self.facts:
             print(fact, file=file)
@@ -56,13 +73,8 @@ class PrologProgram:
         # Leaving it in at the moment regardless.
         must_add_predicate = False
         for rule in self.rules:
-            eff_vars = get_variables([rule.effect])
-            cond_vars = get_variables(rule.conditions)
-            if not eff_vars.issubset(cond_vars):
+            if rule.bind_effect_variables():
                 must_add_predicate = True
-                eff_vars -= cond_vars
-                for var in sorted(eff_vars):
-                    rule.add_condition(pddl.Atom("@object", [var]))
         if must_add_predicate:
             print("Unbound effect variables: Adding @object predicate.")
             self.facts += [Fact(pddl.Atom("@object", [obj])) for obj in self.objects]
@@ -116,6 +128,17 @@ class Rule:
         self.conditions.append(condition)
     def get_variables(self):
         return get_variables(self.conditions + [self.effect])
+    def bind_effect_variables(self):
+        """Add an @object condition for each effect variable that does
+        not occur in the conditions. Return True iff any were added."""
+        eff_vars = get_variables([self.effect])
+        cond_vars = get_variables(self.conditions)
+        if eff_vars.issubset(cond_vars):
+            return False
+        eff_vars -= cond_vars
+        for var in sorted(eff_vars):
+            self.add_condition(pddl.Atom("@object", [var]))
+        return True
     def _rename_duplicate_variables(self, atom, new_conditions):
         used_variables = set()
         for i, var_name in enumerate(atom.args):
@@ -142,6 +165,139 @@ class Rule:
         cond_str = ", ".join(map(str, self.conditions))
         return "%s :- %s." % (self.effect, cond_str)
 
+class CompiledRule:
+    """A rule of the exploration program after normalization and
+    splitting (see compile_rule).
+
+    The data of a compiled rule does not refer to the effect predicate
+    of the original rule (represented as None), to the names of the
+    auxiliary predicates introduced by splitting (represented by their
+    number) or to the actions and axioms used as condition predicates
+    (represented as ("@predicate", i) for the i-th of the
+    condition_predicates, see get_object_predicates), so that it can be
+    reused for all rules with the same conditions and effect arguments
+    (see rule_cache)."""
+    def __init__(self, effect_predicate, data, condition_predicates=()):
+        self.effect_predicate = effect_predicate
+        self.condition_predicates = condition_predicates
+        (self.rules, self.facts, self.bound_effect_variables,
+         self.renamed_duplicate_variables, self.num_new_names) = data
+    def _get_predicate(self, predicate, new_names):
+        if predicate is None:
+            return self.effect_predicate
+        elif isinstance(predicate, int):
+            return new_names[predicate]
+        elif isinstance(predicate, tuple):
+            return self.condition_predicates[predicate[1]]
+        return predicate
+    def instantiate(self, name_generator):
+        new_names = [next(name_generator) for _ in range(self.num_new_names)]
+        result = []
+        for type, conditions, (predicate, args) in self.rules:
+            rule = Rule(
+                [pddl.Atom(self._get_predicate(cond_predicate, new_names),
+                           cond_args)
+                 for cond_predicate, cond_args in conditions],
+                pddl.Atom(self._get_predicate(predicate, new_names), args))
+            rule.type = type
+            result.append(rule)
+        return result
+    def get_facts(self):
+        return [pddl.Atom(self.effect_predicate, args) for args in self.facts]
+
+def get_object_predicates(rule):
+    """Return the condition predicates of the rule that are not strings
+    (actions and axioms) in the order of their first occurrence."""
+    predicates = []
+    for cond in rule.conditions:
+        if (not isinstance(cond.predicate, str) and
+                all(cond.predicate is not pred for pred in predicates)):
+            predicates.append(cond.predicate)
+    return predicates
+
+def _get_predicate_key(predicate):
+    if isinstance(predicate, str):
+        return predicate
+    elif isinstance(predicate, pddl.Action):
+        return ("@action", predicate.name)
+    elif isinstance(predicate, pddl.Axiom):
+        return ("@axiom", predicate.name)
+    return None
+
+def get_rule_key(rule):
+    """Return a key that identifies the rule up to its effect predicate,
+    or None if the rule has conditions with unsupported predicates.
+    Actions and axioms used as condition predicates are identified by
+    their names, which are the same for all tasks of a domain."""
+    conditions = []
+    for cond in rule.conditions:
+        predicate_key = _get_predicate_key(cond.predicate)
+        if predicate_key is None:
+            return None
+        conditions.append((predicate_key, cond.args))
+    return (rule.effect.args, tuple(conditions))
+
+def compile_rule(rule, statistics=None):
+    """Normalize the rule (see PrologProgram.normalize) and split it
+    (see PrologProgram.split_rules), using the given join statistics
+    for ordering the joins if there are any. Return the data of the
+    resulting CompiledRule. Note that this modifies the rule."""
+    import split_rules
+    effect_predicate = rule.effect.predicate
+    object_predicates = get_object_predicates(rule)
+    def get_condition_predicate(predicate):
+        if isinstance(predicate, (str, int)):
+            return predicate
+        index = next(index for index, object_predicate
+                     in enumerate(object_predicates)
+                     if object_predicate is predicate)
+        return ("@predicate", index)
+    bound_effect_variables = rule.bind_effect_variables()
+    renamed_duplicate_variables = rule.rename_duplicate_variables()
+    new_names = itertools.count()
+    rules = []
+    facts = []
+    if rule.conditions:
+        for new_rule in split_rules.split_rule(rule, new_names, statistics):
+            predicate = new_rule.effect.predicate
+            if predicate is effect_predicate:
+                predicate = None
+            else:
+                assert isinstance(predicate, int)
+            rules.append((
+                new_rule.type,
+                tuple((get_condition_predicate(cond.predicate), cond.args)
+                      for cond in new_rule.conditions),
+                (predicate, new_rule.effect.args)))
+    else:
+        # Trivial rule: convert it into a fact.
+        assert not get_variables([rule.effect])
+        facts.append(rule.effect.args)
+    return (tuple(rules), tuple(facts), bound_effect_variables,
+            renamed_duplicate_variables, next(new_names))
+
+def compile_rules(rules, cache=None, statistics=None):
+    """Compile the rules, looking them up in the given RuleCache first
+    if there is one."""
+    compiled_rules = []
+    for rule in rules:
+        effect_predicate = rule.effect.predicate
+        condition_predicates = get_object_predicates(rule)
+        if cache is None:
+            data = compile_rule(rule, statistics)
+        else:
+            data = cache.get_compiled_rule(rule, statistics)
+        compiled_rules.append(
+            CompiledRule(effect_predicate, data, condition_predicates))
+    if any(compiled.bound_effect_variables for compiled in compiled_rules):
+        print("Unbound effect variables: Adding @object predicate.")
+    if any(compiled.renamed_duplicate_variables
+           for compiled in compiled_rules):
+        print("Duplicate arguments: Adding equality conditions.")
+    if any(compiled.facts for compiled in compiled_rules):
+        print("Trivial rules: Converted to facts.")
+    return compiled_rules
+
 def translate_typed_object(prog, obj, type_dict):
     supertypes = type_dict[obj.type_name].supertype_names
     for type_name in [obj.type_name] + supertypes:
@@ -160,18 +316,49 @@ def translate_facts(prog, task):
             # fact.fluent has been defined.
             prog.add_fact(normalize.get_pne_definition_predicate(fact.fluent))
 
-def translate(task):
+def translate(task, filter_irrelevant=False, rule_cache_dir=None,
+              cardinality_join_order=False):
     # Note: The function requires that the task has been normalized.
+    # With filter_irrelevant, the program does not contain rules for
+    # actions and axioms that are irrelevant for the goal (see
+    # relevance_analysis). With rule_cache_dir, compiled rules are
+    # cached in the given directory (see rule_cache). With
+    # cardinality_join_order, joins are ordered based on cardinality
+    # estimates for the static predicates (see join_statistics).
+    actions = task.actions
+    axioms = task.axioms
+    if filter_irrelevant:
+        with timers.timing("Computing relevant actions and axioms",
+                           block=True):
+            actions, axioms = relevance_analysis.compute_relevant_actions_and_axioms(
+                task)
+            print("%d of %d action schemas relevant." % (
+                len(actions), len(task.actions)))
+            print("%d of %d axiom schemas relevant." % (
+                len(axioms), len(task.axioms)))
     with timers.timing("Generating Datalog program"):
         prog = PrologProgram()
         translate_facts(prog, task)
-        for conditions, effect in normalize.build_exploration_rules(task):
-            prog.add_rule(Rule(conditions, effect))
-    with timers.timing("Normalizing Datalog program", block=True):
-        # Using block=True because normalization can output some messages
-        # in rare cases.
-        prog.normalize()
-        prog.split_rules()
+        rules = [Rule(conditions, effect)
+                 for conditions, effect in normalize.build_exploration_rules(
+                         task, actions, axioms)]
+    with timers.timing("Compiling Datalog rules", block=True):
+        # Normalizing and splitting the rules only depends on the rules
+        # themselves (and the join statistics), so we can reuse the
+        # results for other tasks of the same domain if there is a rule
+        # cache.
+        statistics = None
+        if cardinality_join_order:
+            statistics = join_statistics.compute_join_statistics(
+                [fact.atom for fact in prog.facts], rules)
+        cache = None
+        if rule_cache_dir is not None:
+            cache = rule_cache.RuleCache(rule_cache_dir, task.domain_name)
+        compiled_rules = compile_rules(rules, cache, statistics)
+        if cache is not None:
+            cache.print_statistics()
+            cache.save()
+        prog.add_compiled_rules(compiled_rules)
     return prog
 
 
@@ -1,4 +1,5 @@
-from typing import List, Tuple
+from array import array
+from typing import List, Tuple, Union
 
 SAS_FILE_VERSION = 3
 
@@ -19,15 +20,19 @@ class SASTask:
                  mutexes: List["SASMutexGroup"],
                  init: "SASInit",
                  goal: "SASGoal",
-                 operators: List["SASOperator"],
+                 operators: Union[List["SASOperator"], "SASOperatorTable"],
                  axioms: List["SASAxiom"],
                  metric: bool) -> None:
         self.variables = variables
         self.mutexes = mutexes
         self.init = init
         self.goal = goal
-        self.operators = sorted(operators, key=lambda op: (
-            op.name, op.prevail, op.pre_post))
+        if isinstance(operators, SASOperatorTable):
+            operators.sort()
+            self.operators = operators
+        else:
+            self.operators = sorted(operators, key=lambda op: (
+                op.name, op.prevail, op.pre_post))
         self.axioms = sorted(axioms, key=lambda axiom: (
             axiom.condition, axiom.effect))
         self.metric = metric
@@ -98,8 +103,11 @@ class SASTask:
         self.init.output(stream)
         self.goal.output(stream)
         print(len(self.operators), file=stream)
-        for op in self.operators:
-            op.output(stream)
+        if isinstance(self.operators, SASOperatorTable):
+            self.operators.output(stream)
+        else:
+            for op in self.operators:
+                op.output(stream)
         print(len(self.axioms), file=stream)
         for axiom in self.axioms:
             axiom.output(stream)
@@ -110,8 +118,11 @@ class SASTask:
         for mutex in self.mutexes:
             task_size += mutex.get_encoding_size()
         task_size += self.goal.get_encoding_size()
-        for op in self.operators:
-            task_size += op.get_encoding_size()
+        if isinstance(self.operators, SASOperatorTable):
+            task_size += self.operators.get_encoding_size()
+        else:
+            for op in self.operators:
+                task_size += op.get_encoding_size()
         for axiom in self.axioms:
             task_size += axiom.get_encoding_size()
         return task_size
@@ -268,7 +279,8 @@ class SASOperator:
         self.pre_post = self._canonical_pre_post(pre_post)
         self.cost = cost
 
-    def _canonical_pre_post(self, pre_post):
+    @staticmethod
+    def _canonical_pre_post(pre_post):
         # Return a sorted and uniquified version of pre_post. We would
         # like to just use sorted(set(pre_post)), but this fails because
         # the effect conditions are a list and hence not hashable.
@@ -407,6 +419,304 @@ class SASOperator:
                 conditions[var] = pre
         return sorted(conditions.items())
 
+class SASOperatorView:
+    """Read-only view of an operator stored in a SASOperatorTable.
+
+    Views offer the same attributes and (non-mutating) methods as
+    SASOperator. The prevail and pre_post lists are created on every
+    access, so code that uses them repeatedly should store them."""
+
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "SASOperatorTable", index: int) -> None:
+        self._table = table
+        self._index = index
+
+    @property
+    def name(self):
+        return self._table.names[self._index]
+
+    @property
+    def cost(self):
+        return self._table.costs[self._index]
+
+    @property
+    def prevail(self):
+        return self._table.get_prevail(self._index)
+
+    @property
+    def pre_post(self):
+        return self._table.get_pre_post(self._index)
+
+    _canonical_pre_post = staticmethod(SASOperator._canonical_pre_post)
+    validate = SASOperator.validate
+    dump = SASOperator.dump
+    output = SASOperator.output
+    get_encoding_size = SASOperator.get_encoding_size
+    get_applicability_conditions = SASOperator.get_applicability_conditions
+
+
+class SASOperatorTable:
+    """Compact representation of a list of operators.
+
+    Instead of one SASOperator object per operator with nested lists
+    and tuples, the table stores all operators in flat integer arrays
+    ("struct of arrays"):
+
+    - names[op] and costs[op] are the name and cost of operator op.
+    - The prevail conditions of op are the pairs
+      (prevail_vars[i], prevail_values[i]) for
+      prevail_starts[op] <= i < prevail_starts[op + 1].
+    - The pre_post entries of op are the triples
+      (effect_vars[e], effect_pres[e], effect_posts[e]) for
+      effect_starts[op] <= e < effect_starts[op + 1].
+    - The effect conditions of pre_post entry e are the pairs
+      (condition_vars[i], condition_values[i]) for
+      condition_starts[e] <= i < condition_starts[e + 1].
+
+    This needs only a fraction of the memory of a list of SASOperator
+    objects. Indexing and iterating yield SASOperatorView objects, so
+    code that only reads operators works with both representations.
+    Stages that modify operators either build a new table or use the
+    bulk methods (e.g., renumber_variables). Operators are appended in
+    the canonical form established by SASOperator.__init__.
+    """
+
+    def __init__(self) -> None:
+        self.names = []  # type: List[str]
+        self.costs = array("q")
+        self.prevail_starts = array("q", [0])
+        self.prevail_vars = array("i")
+        self.prevail_values = array("i")
+        self.effect_starts = array("q", [0])
+        self.effect_vars = array("i")
+        self.effect_pres = array("i")
+        self.effect_posts = array("i")
+        self.condition_starts = array("q", [0])
+        self.condition_vars = array("i")
+        self.condition_values = array("i")
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("operator index out of range")
+        return SASOperatorView(self, index % len(self))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield SASOperatorView(self, index)
+
+    def append(self, op) -> None:
+        """Append a SASOperator (or an operator view) to the table.
+
+        The prevail conditions and pre_post entries of op are stored
+        in the given order, i.e., they must already be in the desired
+        (usually canonical) order."""
+        self.names.append(op.name)
+        self.costs.append(op.cost)
+        for var, val in op.prevail:
+            self.prevail_vars.append(var)
+            self.prevail_values.append(val)
+        self.prevail_starts.append(len(self.prevail_vars))
+        for var, pre, post, cond in op.pre_post:
+            self.effect_vars.append(var)
+            self.effect_pres.append(pre)
+            self.effect_posts.append(post)
+            for cvar, cval in cond:
+                self.condition_vars.append(cvar)
+                self.condition_values.append(cval)
+            self.condition_starts.append(len(self.condition_vars))
+        self.effect_starts.append(len(self.effect_vars))
+
+    def extend(self, operators) -> None:
+        for op in operators:
+            self.append(op)
+
+    def get_prevail(self, index):
+        begin = self.prevail_starts[index]
+        end = self.prevail_starts[index + 1]
+        return list(zip(self.prevail_vars[begin:end],
+                        self.prevail_values[begin:end]))
+
+    def get_pre_post(self, index):
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        pre_post = []
+        for eff in range(self.effect_starts[index],
+                         self.effect_starts[index + 1]):
+            begin = condition_starts[eff]
+            end = condition_starts[eff + 1]
+            cond = list(zip(condition_vars[begin:end],
+                            condition_values[begin:end]))
+            pre_post.append((self.effect_vars[eff], self.effect_pres[eff],
+                             self.effect_posts[eff], cond))
+        return pre_post
+
+    def sort(self) -> None:
+        """Sort the operators like SASTask sorts lists of operators,
+        i.e., by (name, prevail, pre_post)."""
+        names = self.names
+        order = sorted(range(len(self)), key=names.__getitem__)
+        # Operators rarely share names, so we only compare prevail
+        # conditions and pre_post entries for operators with equal names.
+        begin = 0
+        while begin < len(order):
+            end = begin + 1
+            while end < len(order) and names[order[end]] == names[order[begin]]:
+                end += 1
+            if end - begin > 1:
+                order[begin:end] = sorted(order[begin:end], key=lambda op: (
+                    self.get_prevail(op), self.get_pre_post(op)))
+            begin = end
+        if any(op != index for index, op in enumerate(order)):
+            self._permute(order)
+
+    def _permute(self, order):
+        """Reorder the table such that the i-th operator is the operator
+        that was previously at position order[i]."""
+        table = SASOperatorTable()
+        table.names = [self.names[op] for op in order]
+        table.costs = array("q", (self.costs[op] for op in order))
+        for op in order:
+            begin = self.prevail_starts[op]
+            end = self.prevail_starts[op + 1]
+            table.prevail_vars.extend(self.prevail_vars[begin:end])
+            table.prevail_values.extend(self.prevail_values[begin:end])
+            table.prevail_starts.append(len(table.prevail_vars))
+            begin = self.effect_starts[op]
+            end = self.effect_starts[op + 1]
+            table.effect_vars.extend(self.effect_vars[begin:end])
+            table.effect_pres.extend(self.effect_pres[begin:end])
+            table.effect_posts.extend(self.effect_posts[begin:end])
+            table.effect_starts.append(len(table.effect_vars))
+            for eff in range(begin, end):
+                cond_begin = self.condition_starts[eff]
+                cond_end = self.condition_starts[eff + 1]
+                table.condition_vars.extend(
+                    self.condition_vars[cond_begin:cond_end])
+                table.condition_values.extend(
+                    self.condition_values[cond_begin:cond_end])
+                table.condition_starts.append(len(table.condition_vars))
+        self.__dict__.update(table.__dict__)
+
+    def renumber_variables(self, new_var) -> None:
+        """Replace each variable v by new_var[v] in place.
+
+        Conditions and effects on variables v with new_var[v] == -1 are
+        removed, and so are operators that have no effects left. The
+        order of the remaining operators, conditions and effects is
+        preserved."""
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        effect_starts = self.effect_starts
+        prevail_starts = self.prevail_starts
+        # Each array is compacted in place: new_* is the number of
+        # entries kept so far, which never exceeds the read position.
+        new_ops = new_effs = new_prevails = new_conds = 0
+        cond_begin = prevail_begin = eff_begin = 0
+        for op in range(len(self)):
+            eff_end = effect_starts[op + 1]
+            op_new_effs = new_effs
+            op_new_conds = new_conds
+            for eff in range(eff_begin, eff_end):
+                cond_end = condition_starts[eff + 1]
+                var = new_var[self.effect_vars[eff]]
+                if var != -1:
+                    for cond in range(cond_begin, cond_end):
+                        cvar = new_var[condition_vars[cond]]
+                        if cvar != -1:
+                            condition_vars[op_new_conds] = cvar
+                            condition_values[op_new_conds] = condition_values[cond]
+                            op_new_conds += 1
+                    self.effect_vars[op_new_effs] = var
+                    self.effect_pres[op_new_effs] = self.effect_pres[eff]
+                    self.effect_posts[op_new_effs] = self.effect_posts[eff]
+                    op_new_effs += 1
+                    condition_starts[op_new_effs] = op_new_conds
+                cond_begin = cond_end
+            eff_begin = eff_end
+            prevail_end = prevail_starts[op + 1]
+            if op_new_effs > new_effs:
+                for index in range(prevail_begin, prevail_end):
+                    var = new_var[self.prevail_vars[index]]
+                    if var != -1:
+                        self.prevail_vars[new_prevails] = var
+                        self.prevail_values[new_prevails] = (
+                            self.prevail_values[index])
+                        new_prevails += 1
+                self.names[new_ops] = self.names[op]
+                self.costs[new_ops] = self.costs[op]
+                new_ops += 1
+                prevail_starts[new_ops] = new_prevails
+                effect_starts[new_ops] = new_effs = op_new_effs
+                new_conds = op_new_conds
+            prevail_begin = prevail_end
+        del self.names[new_ops:]
+        del self.costs[new_ops:]
+        del prevail_starts[new_ops + 1:]
+        del self.prevail_vars[new_prevails:]
+        del self.prevail_values[new_prevails:]
+        del effect_starts[new_ops + 1:]
+        del self.effect_vars[new_effs:]
+        del self.effect_pres[new_effs:]
+        del self.effect_posts[new_effs:]
+        del condition_starts[new_effs + 1:]
+        del condition_vars[new_conds:]
+        del condition_values[new_conds:]
+
+    def validate(self, variables):
+        for op in self:
+            op.validate(variables)
+
+    def dump(self):
+        for op in self:
+            op.dump()
+
+    def output(self, stream):
+        """Write all operators in the same format as SASOperator.output."""
+        prevail_vars = self.prevail_vars
+        prevail_values = self.prevail_values
+        condition_starts = self.condition_starts
+        condition_vars = self.condition_vars
+        condition_values = self.condition_values
+        for op, name in enumerate(self.names):
+            lines = ["begin_operator", name[1:-1]]
+            begin = self.prevail_starts[op]
+            end = self.prevail_starts[op + 1]
+            lines.append(str(end - begin))
+            for index in range(begin, end):
+                lines.append("%d %d" % (prevail_vars[index],
+                                        prevail_values[index]))
+            begin = self.effect_starts[op]
+            end = self.effect_starts[op + 1]
+            lines.append(str(end - begin))
+            for eff in range(begin, end):
+                cond_begin = condition_starts[eff]
+                cond_end = condition_starts[eff + 1]
+                parts = [str(cond_end - cond_begin)]
+                for index in range(cond_begin, cond_end):
+                    parts.append("%d %d" % (condition_vars[index],
+                                            condition_values[index]))
+                parts.append("%d %d %d" % (self.effect_vars[eff],
+                                           self.effect_pres[eff],
+                                           self.effect_posts[eff]))
+                lines.append(" ".join(parts))
+            lines.append(str(self.costs[op]))
+            lines.append("end_operator\n")
+            stream.write("\n".join(lines))
+
+    def get_encoding_size(self):
+        # Same as the sum of SASOperator.get_encoding_size over all
+        # operators: 1 per operator, prevail condition, effect and effect
+        # condition, plus 1 per precondition.
+        num_preconditions = len(self.effect_pres) - self.effect_pres.count(-1)
+        return (len(self) + len(self.prevail_vars) + len(self.effect_vars) +
+                len(self.condition_vars) + num_preconditions)
+
 
 class SASAxiom:
     def __init__(self, condition: List[VarValPair], effect: VarValPair) -> None:
@@ -230,7 +230,7 @@ class VarValueRenaming:
         self.apply_to_mutexes(task.mutexes)
         self.apply_to_init(task.init)
         self.apply_to_goals(task.goal.pairs)
-        self.apply_to_operators(task.operators)
+        task.operators = self.apply_to_operators(task.operators)
         self.apply_to_axioms(task.axioms)
 
     def apply_to_variables(self, variables):
@@ -296,7 +296,13 @@ class VarValueRenaming:
             raise TriviallySolvable
 
     def apply_to_operators(self, operators):
-        new_operators = []
+        # In contrast to the other methods, we return the new operators
+        # because we cannot replace the contents of an operator table
+        # in-place.
+        if isinstance(operators, sas_tasks.SASOperatorTable):
+            new_operators = sas_tasks.SASOperatorTable()
+        else:
+            new_operators = []
         num_removed = 0
         for op in operators:
             new_op = self.translate_operator(op)
@@ -307,7 +313,7 @@ class VarValueRenaming:
             else:
                 new_operators.append(new_op)
         print("%d operators removed" % num_removed)
-        operators[:] = new_operators
+        return new_operators
 
     def apply_to_axioms(self, axioms):
         new_axioms = []
@@ -0,0 +1,26 @@
+import copy
+import pickle
+
+import pddl
+
+
+def test_conditions_are_interned():
+    atom = pddl.Atom("at", ["a", "b"])
+    assert pddl.Atom("at", ("a", "b")) is atom
+    assert pddl.NegatedAtom("at", ("a", "b")) is not atom
+    assert atom.negate().negate() is atom
+    conjunction = pddl.Conjunction([atom, pddl.Atom("clear", ["a"])])
+    assert pddl.Conjunction([pddl.Atom("at", ["a", "b"]),
+                             pddl.Atom("clear", ["a"])]) is conjunction
+    assert pddl.Truth() is pddl.Truth()
+    assert not hasattr(atom, "__dict__")
+
+
+def test_copies_are_interned():
+    condition = pddl.ExistentialCondition(
+        [pddl.TypedObject("?x", "object")],
+        [pddl.Conjunction([pddl.Atom("at", ["?x", "b"]),
+                           pddl.NegatedAtom("clear", ["?x"])])])
+    assert pickle.loads(pickle.dumps(condition)) is condition
+    assert copy.copy(condition) is condition
+    assert copy.deepcopy(condition) is condition
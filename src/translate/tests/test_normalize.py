@@ -0,0 +1,58 @@
+import normalize
+import pddl
+import pddl_parser
+
+DOMAIN = """
+(define (domain adl)
+  (:requirements :adl)
+  (:predicates (p ?x) (q ?x) (r ?x ?y) (done ?x))
+  (:action act :parameters (?x)
+    :precondition (and (p ?x)
+                       (or (q ?x) (exists (?y) (and (r ?x ?y) (or (p ?y) (q ?y))))))
+    :effect (and (done ?x)
+                 (when (exists (?z) (r ?z ?x)) (not (p ?x))))))
+"""
+
+PROBLEM = """
+(define (problem p) (:domain adl)
+  (:objects a b)
+  (:init (p a) (r a b))
+  (:goal (forall (?x) (done ?x))))
+"""
+
+
+def test_normalize(tmp_path):
+    domain_file = tmp_path / "domain.pddl"
+    problem_file = tmp_path / "problem.pddl"
+    domain_file.write_text(DOMAIN)
+    problem_file.write_text(PROBLEM)
+    task = pddl_parser.open(domain_filename=str(domain_file),
+                            task_filename=str(problem_file))
+    normalize.normalize(task)
+
+    # The disjunctive precondition is split into three actions, two of
+    # which get the existentially quantified variable as a parameter.
+    assert [len(action.parameters) for action in task.actions] == [1, 2, 2]
+    for action in task.actions:
+        assert isinstance(action.precondition, pddl.Conjunction)
+        assert all(isinstance(part, pddl.Literal)
+                   for part in action.precondition.parts)
+    # The effect is shared by the actions, and its existential
+    # condition is turned into an effect parameter.
+    effects = task.actions[0].effects
+    assert all(action.effects is effects for action in task.actions)
+    assert [len(effect.parameters) for effect in effects] == [0, 1]
+    # The universal goal is compiled into an axiom.
+    assert task.goal == pddl.NegatedAtom(task.axioms[0].name, [])
+
+
+def test_condition_table_shares_equal_nodes():
+    table = normalize.ConditionTable()
+    first = pddl.Disjunction([pddl.Atom("p", ["?x"]), pddl.Atom("q", ["?x"])])
+    second = pddl.Disjunction([pddl.Atom("p", ["?x"]), pddl.Atom("q", ["?x"])])
+    condition = pddl.Conjunction([first, pddl.Atom("r", ["?x"])])
+    assert first is second
+    dnf = normalize.build_DNF(condition, table)
+    assert dnf is normalize.build_DNF(
+        pddl.Conjunction([second, pddl.Atom("r", ["?x"])]), table)
+    assert isinstance(dnf, pddl.Disjunction) and len(dnf.parts) == 2
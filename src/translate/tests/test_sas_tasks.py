@@ -0,0 +1,60 @@
+from io import StringIO
+
+import sas_tasks
+import variable_order
+
+
+def make_operators():
+    return [
+        sas_tasks.SASOperator(
+            "(b)", [(3, 1), (0, 0)], [(1, -1, 1, [(2, 0)]), (1, -1, 0, [])], 2),
+        sas_tasks.SASOperator("(a)", [], [(2, 0, 1, [])], 1),
+        sas_tasks.SASOperator("(b)", [], [(0, 1, 0, [(1, 0), (3, 1)])], 0),
+        sas_tasks.SASOperator("(c)", [(2, 1)], [(3, -1, 0, [])], 1),
+    ]
+
+
+def make_task(operators):
+    variables = sas_tasks.SASVariables(
+        [2, 2, 2, 2], [-1, -1, -1, -1],
+        [["Atom v%d(%d)" % (var, val) for val in range(2)]
+         for var in range(4)])
+    init = sas_tasks.SASInit([0, 0, 0, 0])
+    goal = sas_tasks.SASGoal([(1, 1)])
+    return sas_tasks.SASTask(variables, [], init, goal, operators, [], True)
+
+
+def make_table():
+    table = sas_tasks.SASOperatorTable()
+    table.extend(make_operators())
+    return table
+
+
+def get_output(task):
+    stream = StringIO()
+    task.output(stream)
+    return stream.getvalue()
+
+
+def test_operator_table_matches_operator_list():
+    list_task = make_task(make_operators())
+    table_task = make_task(make_table())
+    assert get_output(table_task) == get_output(list_task)
+    assert table_task.get_encoding_size() == list_task.get_encoding_size()
+    table_task.validate()
+    for op, view in zip(list_task.operators, table_task.operators):
+        assert view.name == op.name
+        assert view.prevail == op.prevail
+        assert view.pre_post == op.pre_post
+        assert view.cost == op.cost
+        assert (view.get_applicability_conditions() ==
+                op.get_applicability_conditions())
+
+
+def test_operator_table_renumber_variables():
+    list_task = make_task(make_operators())
+    table_task = make_task(make_table())
+    for task in [list_task, table_task]:
+        variable_order.VariableOrder([3, 0, 2], 4).apply_to_task(task)
+    assert len(table_task.operators) == len(list_task.operators) == 3
+    assert get_output(table_task) == get_output(list_task)
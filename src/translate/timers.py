@@ -1,8 +1,11 @@
 import contextlib
+import json
 import os
 import sys
 import time
 
+import tools
+
 
 class Timer:
     def __init__(self):
@@ -18,18 +21,63 @@ class Timer:
             self._clock() - self.start_clock,
             time.time() - self.start_time)
 
+    def get_cpu_time(self):
+        return self._clock() - self.start_clock
+
+    def get_wall_clock_time(self):
+        return time.time() - self.start_time
+
+
+# Records of all finished timing blocks in the order in which they
+# finished. Nested blocks finish (and are recorded) before their
+# enclosing blocks.
+_records = []
+_depth = 0
+
+
+def _get_peak_memory_in_kb():
+    try:
+        return tools.get_peak_memory_in_kb()
+    except Warning:
+        return None
+
 
 @contextlib.contextmanager
 def timing(text, block=False):
+    global _depth
     timer = Timer()
     if block:
         print("%s..." % text)
     else:
         print("%s..." % text, end=' ')
     sys.stdout.flush()
-    yield
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+    _records.append({
+        "name": text,
+        "depth": _depth,
+        "cpu_time": timer.get_cpu_time(),
+        "wall_clock_time": timer.get_wall_clock_time(),
+        "peak_memory": _get_peak_memory_in_kb(),
+    })
     if block:
         print("%s: %s" % (text, timer))
     else:
         print(timer)
     sys.stdout.flush()
+
+
+def get_records():
+    """Return a list of dictionaries describing all finished timing
+    blocks with their name, nesting depth, CPU and wall-clock time (in
+    seconds) and the peak memory (in KB) of the process at the end of
+    the block (None if it cannot be determined)."""
+    return list(_records)
+
+
+def write_records(filename):
+    with open(filename, "w") as records_file:
+        json.dump(get_records(), records_file, indent=2)
@@ -177,7 +177,7 @@ def translate_strips_conditions(
 
 
 def translate_strips_operator(operator, dictionary, ranges, mutex_dict,
-                              mutex_ranges, implied_facts):
+                              mutex_ranges, mutex_index):
     conditions = translate_strips_conditions(operator.precondition, dictionary,
                                              ranges, mutex_dict, mutex_ranges)
     if conditions is None:
@@ -186,7 +186,7 @@ def translate_strips_operator(operator, dictionary, ranges, mutex_dict,
     for condition in conditions:
         op = translate_strips_operator_aux(operator, dictionary, ranges,
                                            mutex_dict, mutex_ranges,
-                                           implied_facts, condition)
+                                           mutex_index, condition)
         if op is not None:
             sas_operators.append(op)
     return sas_operators
@@ -211,7 +211,7 @@ def negate_and_translate_condition(condition, dictionary, ranges, mutex_dict,
 
 
 def translate_strips_operator_aux(operator, dictionary, ranges, mutex_dict,
-                                  mutex_ranges, implied_facts, condition):
+                                  mutex_ranges, mutex_index, condition):
 
     # collect all add effects
     effects_by_variable = defaultdict(lambda: defaultdict(list))
@@ -277,15 +277,13 @@ def translate_strips_operator_aux(operator, dictionary, ranges, mutex_dict,
                         effects_by_variable[var][none_of_those].append(new_cond)
 
     return build_sas_operator(operator.name, condition, effects_by_variable,
-                              operator.cost, ranges, implied_facts)
+                              operator.cost, ranges, mutex_index)
 
 
 def build_sas_operator(name, condition, effects_by_variable, cost, ranges,
-                       implied_facts):
+                       mutex_index):
     if options.add_implied_preconditions:
-        implied_precondition = set()
-        for fact in condition.items():
-            implied_precondition.update(implied_facts[fact])
+        condition_groups = mutex_index.get_groups_of_facts(condition.items())
     prevail_and_pre = dict(condition)
     pre_post = []
     for var, effects_on_var in effects_by_variable.items():
@@ -306,7 +304,8 @@ def build_sas_operator(name, condition, effects_by_variable, cost, ranges,
                     global simplified_effect_condition_counter
                     simplified_effect_condition_counter += 1
                 if (options.add_implied_preconditions and pre == -1 and
-                        (var, 1 - post) in implied_precondition):
+                        mutex_index.is_implied_by_groups(
+                            (var, 1 - post), condition_groups)):
                     global added_implied_precondition_counter
                     added_implied_precondition_counter += 1
                     pre = 1 - post
@@ -395,12 +394,15 @@ def translate_strips_axiom(axiom, dictionary, ranges, mutex_dict, mutex_ranges):
 
 
 def translate_strips_operators(actions, strips_to_sas, ranges, mutex_dict,
-                               mutex_ranges, implied_facts):
-    result = []
+                               mutex_ranges, mutex_index):
+    if options.compact_sas_operators:
+        result = sas_tasks.SASOperatorTable()
+    else:
+        result = []
     for action in actions:
         sas_ops = translate_strips_operator(action, strips_to_sas, ranges,
                                             mutex_dict, mutex_ranges,
-                                            implied_facts)
+                                            mutex_index)
         result.extend(sas_ops)
     return result
 
@@ -460,10 +462,13 @@ def translate_task(
         actions: List[pddl.PropositionalAction],
         axioms: List[pddl.PropositionalAxiom],
         metric: bool,
-        implied_facts: Dict[VarValPair, List[VarValPair]]) -> sas_tasks.SASTask:
+        # index of all mutex groups (only used with
+        # options.add_implied_preconditions)
+        mutex_index: Optional[fact_groups.MutexGroupIndex]) -> sas_tasks.SASTask:
     with timers.timing("Processing axioms", block=True):
-        axioms, axiom_layer_dict = axiom_rules.handle_axioms(actions, axioms, goals,
-                                                             options.layer_strategy)
+        axioms, axiom_layer_dict = axiom_rules.handle_axioms(
+            actions, axioms, goals, options.layer_strategy,
+            options.max_negated_axioms)
 
     if options.dump_task:
         # Remove init facts that don't occur in strips_to_sas: they're constant.
@@ -502,7 +507,7 @@ def translate_task(
 
     operators = translate_strips_operators(actions, strips_to_sas, ranges,
                                            mutex_dict, mutex_ranges,
-                                           implied_facts)
+                                           mutex_index)
     axioms = translate_strips_axioms(axioms, strips_to_sas, ranges, mutex_dict,
                                      mutex_ranges)
 
@@ -548,7 +553,10 @@ def unsolvable_sas_task(msg):
 def pddl_to_sas(task):
     with timers.timing("Instantiating", block=True):
         (relaxed_reachable, atoms, actions, goal_list, axioms,
-         reachable_action_params) = instantiate.explore(task)
+         reachable_action_params) = instantiate.explore(
+             task, options.instantiation_processes,
+             options.filter_irrelevant_actions, options.rule_cache_dir,
+             options.cardinality_join_order, options.dump_join_plans)
 
     if not relaxed_reachable:
         return unsolvable_sas_task("No relaxed solution")
@@ -573,16 +581,16 @@ def pddl_to_sas(task):
         mutex_ranges, mutex_dict = strips_to_sas_dictionary(
             mutex_groups, assert_partial=False)
 
-    if options.add_implied_preconditions:
-        with timers.timing("Building implied facts dictionary..."):
-            implied_facts = build_implied_facts(strips_to_sas, groups,
-                                                mutex_groups)
+    if options.use_partial_encoding or options.add_implied_preconditions:
+        with timers.timing("Building mutex group index"):
+            mutex_index = fact_groups.MutexGroupIndex(
+                strips_to_sas, ranges, groups, mutex_groups)
     else:
-        implied_facts = {}
+        mutex_index = None
 
     with timers.timing("Building mutex information", block=True):
         if options.use_partial_encoding:
-            mutex_key = build_mutex_key(strips_to_sas, mutex_groups)
+            mutex_key = build_mutex_key(mutex_index, options.max_mutex_facts)
             # mutex key represents the same information as mutex_groups but in
             # FDR representation from strips_to_sas dictionary.
         else:
@@ -598,7 +606,7 @@ def pddl_to_sas(task):
             strips_to_sas, ranges, translation_key,
             mutex_dict, mutex_ranges, mutex_key,
             task.init, goal_list, actions, axioms, task.use_min_cost_metric,
-            implied_facts)
+            mutex_index)
 
     print("%d effect conditions simplified" %
           simplified_effect_condition_counter)
@@ -623,65 +631,29 @@ def pddl_to_sas(task):
     return sas_task
 
 
-def build_mutex_key(strips_to_sas, groups):
+def build_mutex_key(mutex_index, max_mutex_facts):
+    ## Represent the mutex groups in terms of the strips_to_sas
+    ## dictionary. If max_mutex_facts is positive, we only keep groups
+    ## as long as their total number of facts stays within this limit.
+    ## Groups of size 1 carry no mutex information and do not count.
     assert options.use_partial_encoding
     group_keys = []
-    for group in groups:
-        group_key = []
-        for fact in group:
-            represented_by = strips_to_sas[fact]
-            assert len(represented_by) == 1
-            group_key.append(represented_by[0])
-        group_keys.append(group_key)
+    num_facts = 0
+    num_skipped = 0
+    for group_id in range(len(mutex_index)):
+        group_size = mutex_index.get_group_size(group_id)
+        if group_size > 1:
+            if max_mutex_facts and num_facts + group_size > max_mutex_facts:
+                num_skipped += 1
+                continue
+            num_facts += group_size
+        group_keys.append(mutex_index.get_group(group_id))
+    if num_skipped:
+        print("%d mutex groups skipped (mutex information too large)" %
+              num_skipped)
     return group_keys
 
 
-def build_implied_facts(strips_to_sas, groups, mutex_groups):
-    ## Compute a dictionary mapping facts (FDR pairs) to lists of FDR
-    ## pairs implied by that fact. In other words, in all states
-    ## containing p, all pairs in implied_facts[p] must also be true.
-    ##
-    ## There are two simple cases where a pair p implies a pair q != p
-    ## in our FDR encodings:
-    ## 1. p and q encode the same fact
-    ## 2. p encodes a STRIPS proposition X, q encodes a STRIPS literal
-    ##    "not Y", and X and Y are mutex.
-    ##
-    ## The first case cannot arise when we use partial encodings, and
-    ## when we use full encodings, I don't think it would give us any
-    ## additional information to exploit in the operator translation,
-    ## so we only use the second case.
-    ##
-    ## Note that for a pair q to encode a fact "not Y", Y must form a
-    ## fact group of size 1. We call such propositions Y "lonely".
-
-    ## In the first step, we compute a dictionary mapping each lonely
-    ## proposition to its variable number.
-    lonely_propositions = {}
-    for var_no, group in enumerate(groups):
-        if len(group) == 1:
-            lonely_prop = group[0]
-            assert strips_to_sas[lonely_prop] == [(var_no, 0)]
-            lonely_propositions[lonely_prop] = var_no
-
-    ## Then we compute implied facts as follows: for each mutex group,
-    ## check if prop is lonely (then and only then "not prop" has a
-    ## representation as an FDR pair). In that case, all other facts
-    ## in this mutex group imply "not prop".
-    implied_facts = defaultdict(list)
-    for mutex_group in mutex_groups:
-        for prop in mutex_group:
-            prop_var = lonely_propositions.get(prop)
-            if prop_var is not None:
-                prop_is_false = (prop_var, 1)
-                for other_prop in mutex_group:
-                    if other_prop is not prop:
-                        for other_fact in strips_to_sas[other_prop]:
-                            implied_facts[other_fact].append(prop_is_false)
-
-    return implied_facts
-
-
 def dump_statistics(sas_task):
     print("Translator variables: %d" % len(sas_task.variables.ranges))
     print("Translator derived variables: %d" %
@@ -709,7 +681,7 @@ def main():
         task = pddl_parser.open(
             domain_filename=options.domain, task_filename=options.task)
 
-    with timers.timing("Normalizing task"):
+    with timers.timing("Normalizing task", block=True):
         normalize.normalize(task)
 
     if options.generate_relaxed_task:
@@ -726,6 +698,8 @@ def main():
         with open(options.sas_file, "w") as output_file:
             sas_task.output(output_file)
     print("Done! %s" % timer)
+    if options.timings_file:
+        timers.write_records(options.timings_file)
 
 
 def handle_sigxcpu(signum, stackframe):
@@ -1,10 +1,25 @@
-from collections import defaultdict, deque
+from array import array
+from collections import Counter, defaultdict, deque
 from itertools import chain
 import heapq
 
+import sas_tasks
 import sccs
+import timers
 
 DEBUG = False
+# Use NumPy (if available) to build causal graphs with at least this many
+# (non-unique) edges. We only import NumPy in this case because importing it
+# is comparatively expensive.
+NUMPY_MIN_EDGES = 100000
+
+
+def _import_numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
 
 class CausalGraph:
     """Weighted causal graph used for defining a variable order.
@@ -21,19 +36,21 @@ class CausalGraph:
     description in the JAIR paper to reproduce the behaviour of the
     original implementation in the preprocessor component of the
     planner.
+
+    The graph is stored in compressed sparse row format: the weighted
+    edges leaving variable v are (targets[i], weights[i]) for
+    offsets[v] <= i < offsets[v + 1], sorted by target.
     """
 
     def __init__(self, sas_task):
-        self.weighted_graph = defaultdict(lambda: defaultdict(int))
-        ## var_no -> (var_no -> number)
-        self.predecessor_graph = defaultdict(set)
-        self.ordering = []
-
-        self.weight_graph_from_ops(sas_task.operators)
-        self.weight_graph_from_axioms(sas_task.axioms)
-
         self.num_variables = len(sas_task.variables.ranges)
         self.goal_map = dict(sas_task.goal.pairs)
+        self.ordering = []
+
+        edge_keys = array("q")
+        self.collect_edges_from_ops(sas_task.operators, edge_keys)
+        self.collect_edges_from_axioms(sas_task.axioms, edge_keys)
+        self.build_weighted_graph(edge_keys)
 
     def get_ordering(self):
         if not self.ordering:
@@ -41,12 +58,30 @@ class CausalGraph:
             self.calculate_topological_pseudo_sort(sccs)
         return self.ordering
 
-    def weight_graph_from_ops(self, operators):
+    def get_successors(self, var):
+        begin, end = self.offsets[var], self.offsets[var + 1]
+        return self.targets[begin:end]
+
+    def get_weighted_successors(self, var):
+        begin, end = self.offsets[var], self.offsets[var + 1]
+        return zip(self.targets[begin:end], self.weights[begin:end])
+
+    def collect_edges_from_ops(self, operators, edge_keys):
+        ### Each edge source->target is encoded as the integer
+        ### source * num_variables + target and occurs once for every
+        ### time it is encountered, i.e., its weight is the number of
+        ### its occurrences.
+        ###
         ### A source variable can be processed several times. This was
         ### probably not intended originally but in experiments (cf.
         ### issue26) it performed better than the (clearer) weighting
         ### described in the Fast Downward paper (which would require
         ### a more complicated implementation).
+        if isinstance(operators, sas_tasks.SASOperatorTable):
+            self.collect_edges_from_op_table(operators, edge_keys)
+            return
+        num_variables = self.num_variables
+        append = edge_keys.append
         for op in operators:
             source_vars = [var for (var, value) in op.prevail]
             for var, pre, _, _ in op.pre_post:
@@ -56,22 +91,70 @@ class CausalGraph:
             for target, _, _, cond in op.pre_post:
                 for source in chain(source_vars, (var for var, _ in cond)):
                     if source != target:
-                        self.weighted_graph[source][target] += 1
-                        self.predecessor_graph[target].add(source)
+                        append(source * num_variables + target)
+
+    def collect_edges_from_op_table(self, table, edge_keys):
+        # Same as collect_edges_from_ops, but works directly on the
+        # arrays of the operator table.
+        num_variables = self.num_variables
+        append = edge_keys.append
+        prevail_vars = table.prevail_vars
+        effect_vars = table.effect_vars
+        effect_pres = table.effect_pres
+        condition_starts = table.condition_starts
+        condition_vars = table.condition_vars
+        for op in range(len(table)):
+            eff_begin = table.effect_starts[op]
+            eff_end = table.effect_starts[op + 1]
+            source_vars = prevail_vars[
+                table.prevail_starts[op]:table.prevail_starts[op + 1]].tolist()
+            for eff in range(eff_begin, eff_end):
+                if effect_pres[eff] != -1:
+                    source_vars.append(effect_vars[eff])
+            for eff in range(eff_begin, eff_end):
+                target = effect_vars[eff]
+                for source in chain(source_vars, condition_vars[
+                        condition_starts[eff]:condition_starts[eff + 1]]):
+                    if source != target:
+                        append(source * num_variables + target)
 
-    def weight_graph_from_axioms(self, axioms):
+    def collect_edges_from_axioms(self, axioms, edge_keys):
+        num_variables = self.num_variables
         for ax in axioms:
             target = ax.effect[0]
             for source, _ in ax.condition:
                 if source != target:
-                    self.weighted_graph[source][target] += 1
-                    self.predecessor_graph[target].add(source)
+                    edge_keys.append(source * num_variables + target)
+
+    def build_weighted_graph(self, edge_keys):
+        numpy = None
+        if len(edge_keys) >= NUMPY_MIN_EDGES:
+            numpy = _import_numpy()
+        if numpy is not None:
+            keys, weights = numpy.unique(
+                numpy.frombuffer(edge_keys, dtype=numpy.int64),
+                return_counts=True)
+            sources = keys // self.num_variables
+            self.targets = (keys % self.num_variables).tolist()
+            self.weights = weights.tolist()
+            self.offsets = numpy.searchsorted(
+                sources, numpy.arange(self.num_variables + 1)).tolist()
+        else:
+            key_to_weight = Counter(edge_keys)
+            self.targets = []
+            self.weights = []
+            self.offsets = [0] * (self.num_variables + 1)
+            for key in sorted(key_to_weight):
+                source, target = divmod(key, self.num_variables)
+                self.targets.append(target)
+                self.weights.append(key_to_weight[key])
+                self.offsets[source + 1] += 1
+            for var in range(self.num_variables):
+                self.offsets[var + 1] += self.offsets[var]
 
     def get_strongly_connected_components(self):
-        unweighted_graph = [[] for _ in range(self.num_variables)]
-        assert len(self.weighted_graph) <= self.num_variables
-        for source, target_weights in self.weighted_graph.items():
-            unweighted_graph[source] = sorted(target_weights.keys())
+        unweighted_graph = [self.get_successors(var)
+                            for var in range(self.num_variables)]
         return sccs.get_sccs_adjacency_list(unweighted_graph)
 
     def calculate_topological_pseudo_sort(self, sccs):
@@ -80,13 +163,14 @@ class CausalGraph:
                 # component needs to be turned into acyclic subgraph
 
                 # Compute subgraph induced by scc
+                scc_vars = set(scc)
                 subgraph = defaultdict(list)
                 for var in scc:
                     # for each variable in component only list edges inside
                     # component.
                     subgraph_edges = subgraph[var]
-                    for target, cost in sorted(self.weighted_graph[var].items()):
-                        if target in scc:
+                    for target, cost in self.get_weighted_successors(var):
+                        if target in scc_vars:
                             if target in self.goal_map:
                                 subgraph_edges.append((target, 100000 + cost))
                             subgraph_edges.append((target, cost))
@@ -95,23 +179,28 @@ class CausalGraph:
             else:
                 self.ordering.append(scc[0])
 
+    def get_predecessor_graph(self):
+        predecessors = [[] for _ in range(self.num_variables)]
+        for source in range(self.num_variables):
+            for target in self.get_successors(source):
+                predecessors[target].append(source)
+        return predecessors
+
     def calculate_important_vars(self, goal):
-        # Note for future refactoring: it is perhaps more idiomatic
-        # and efficient to use a set rather than a defaultdict(bool).
-        necessary = defaultdict(bool)
+        predecessors = self.get_predecessor_graph()
+        necessary = [False] * self.num_variables
+        stack = []
         for var, _ in goal.pairs:
             if not necessary[var]:
                 necessary[var] = True
-                self.dfs(var, necessary)
-        return necessary
-
-    def dfs(self, node, necessary):
-        stack = [pred for pred in self.predecessor_graph[node]]
+                stack.append(var)
         while stack:
-            n = stack.pop()
-            if not necessary[n]:
-                necessary[n] = True
-                stack.extend(pred for pred in self.predecessor_graph[n])
+            var = stack.pop()
+            for pred in predecessors[var]:
+                if not necessary[pred]:
+                    necessary[pred] = True
+                    stack.append(pred)
+        return necessary
 
 
 class MaxDAG:
@@ -181,14 +270,17 @@ class MaxDAG:
 
 class VariableOrder:
     """Apply a given variable order to a SAS task."""
-    def __init__(self, ordering):
+    def __init__(self, ordering, num_variables):
         """Ordering is a list of variable numbers in the desired order.
 
         If a variable does not occur in the ordering, it is removed
         from the task.
         """
         self.ordering = ordering
-        self.new_var = {v: i for i, v in enumerate(ordering)}
+        # new_var[v] is the new number of variable v or -1 if v is removed.
+        self.new_var = [-1] * num_variables
+        for i, v in enumerate(ordering):
+            self.new_var[v] = i
 
     def apply_to_task(self, sas_task):
         self._apply_to_variables(sas_task.variables)
@@ -216,15 +308,17 @@ class VariableOrder:
         init.values = [init.values[var] for var in self.ordering]
 
     def _apply_to_goal(self, goal):
-        goal.pairs = sorted((self.new_var[var], val)
+        new_var = self.new_var
+        goal.pairs = sorted((new_var[var], val)
                             for var, val in goal.pairs
-                            if var in self.new_var)
+                            if new_var[var] != -1)
 
     def _apply_to_mutexes(self, mutexes):
+        new_var = self.new_var
         new_mutexes = []
         for group in mutexes:
-            facts = [(self.new_var[var], val) for var, val in group.facts
-                     if var in self.new_var]
+            facts = [(new_var[var], val) for var, val in group.facts
+                     if new_var[var] != -1]
             if facts and len({var for var, _ in facts}) > 1:
                 group.facts = facts
                 new_mutexes.append(group)
@@ -233,52 +327,70 @@ class VariableOrder:
         mutexes[:] = new_mutexes
 
     def _apply_to_operators(self, operators):
-        new_ops = []
+        if isinstance(operators, sas_tasks.SASOperatorTable):
+            num_operators = len(operators)
+            operators.renumber_variables(self.new_var)
+            print("%s of %s operators necessary." % (len(operators),
+                                                     num_operators))
+            return
+        # We renumber the operators in place and move the necessary
+        # operators to the front of the list.
+        new_var = self.new_var
+        num_operators = len(operators)
+        num_new_ops = 0
         for op in operators:
             pre_post = []
             for eff_var, pre, post, cond in op.pre_post:
-                if eff_var in self.new_var:
-                    new_cond = list((self.new_var[var], val)
-                                    for var, val in cond
-                                    if var in self.new_var)
-                    pre_post.append(
-                        (self.new_var[eff_var], pre, post, new_cond))
+                new_eff_var = new_var[eff_var]
+                if new_eff_var != -1:
+                    new_cond = [(new_var[var], val) for var, val in cond
+                                if new_var[var] != -1]
+                    pre_post.append((new_eff_var, pre, post, new_cond))
             if pre_post:
                 op.pre_post = pre_post
-                op.prevail = [(self.new_var[var], val)
+                op.prevail = [(new_var[var], val)
                               for var, val in op.prevail
-                              if var in self.new_var]
-                new_ops.append(op)
-        print("%s of %s operators necessary." % (len(new_ops),
-                                                 len(operators)))
-        operators[:] = new_ops
+                              if new_var[var] != -1]
+                operators[num_new_ops] = op
+                num_new_ops += 1
+        del operators[num_new_ops:]
+        print("%s of %s operators necessary." % (num_new_ops,
+                                                 num_operators))
 
     def _apply_to_axioms(self, axioms):
-        new_axioms = []
+        new_var = self.new_var
+        num_axioms = len(axioms)
+        num_new_axioms = 0
         for ax in axioms:
             eff_var, eff_val = ax.effect
-            if eff_var in self.new_var:
-                ax.condition = [(self.new_var[var], val)
+            if new_var[eff_var] != -1:
+                ax.condition = [(new_var[var], val)
                                 for var, val in ax.condition
-                                if var in self.new_var]
-                ax.effect = (self.new_var[eff_var], eff_val)
-                new_axioms.append(ax)
-        print("%s of %s axiom rules necessary." % (len(new_axioms),
-                                                   len(axioms)))
-        axioms[:] = new_axioms
+                                if new_var[var] != -1]
+                ax.effect = (new_var[eff_var], eff_val)
+                axioms[num_new_axioms] = ax
+                num_new_axioms += 1
+        del axioms[num_new_axioms:]
+        print("%s of %s axiom rules necessary." % (num_new_axioms,
+                                                   num_axioms))
 
 
 def find_and_apply_variable_order(sas_task, reorder_vars=True,
                                   filter_unimportant_vars=True):
     if reorder_vars or filter_unimportant_vars:
-        cg = CausalGraph(sas_task)
+        num_variables = len(sas_task.variables.ranges)
+        with timers.timing("Building causal graph"):
+            cg = CausalGraph(sas_task)
         if reorder_vars:
-            order = cg.get_ordering()
+            with timers.timing("Computing variable order"):
+                order = cg.get_ordering()
         else:
-            order = list(range(len(sas_task.variables.ranges)))
+            order = list(range(num_variables))
         if filter_unimportant_vars:
-            necessary = cg.calculate_important_vars(sas_task.goal)
-            print("%s of %s variables necessary." % (len(necessary),
+            with timers.timing("Computing necessary variables"):
+                necessary = cg.calculate_important_vars(sas_task.goal)
+            print("%s of %s variables necessary." % (sum(necessary),
                                                      len(order)))
             order = [var for var in order if necessary[var]]
-        VariableOrder(order).apply_to_task(sas_task)
+        with timers.timing("Applying variable order", block=True):
+            VariableOrder(order, num_variables).apply_to_task(sas_task)